@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark checkpoint cleanup on a synthetic table.
+
+Builds a throwaway SQLite database with N workflow checkpoints (by default
+1M, 80% expired), then runs cleanup either as one unbounded statement
+(the old behaviour) or through cleanup_expired_checkpoints' batched path,
+reporting wall time, the longest single transaction and peak Python heap.
+
+Usage:
+    python scripts/bench_cleanup.py                       # 1M rows, both modes
+    python scripts/bench_cleanup.py --rows 200000 --batch-size 2000
+    python scripts/bench_cleanup.py --mode batched --payload-kb 8
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "synde_web.settings")
+
+
+def setup_database(path: str):
+    """Point Django at a fresh SQLite file and create the schema."""
+    from django.conf import settings
+    settings.DATABASES["default"]["NAME"] = path
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+
+
+def populate(rows: int, payload_kb: int, expired_fraction: float = 0.8):
+    """Insert synthetic checkpoints, most of them old enough to be deleted."""
+    from datetime import timedelta
+    from django.utils import timezone
+    from synde_web.models import WorkflowCheckpoint
+
+    old = timezone.now() - timedelta(days=30)
+    payload = {"state": "x" * (payload_kb * 1024)}
+    expired_rows = int(rows * expired_fraction)
+    chunk = 10000
+
+    for start in range(0, rows, chunk):
+        objs = []
+        for i in range(start, min(start + chunk, rows)):
+            expired = i < expired_rows
+            objs.append(WorkflowCheckpoint(
+                job_id=f"job-{i}",
+                thread_id=f"job-{i}",
+                checkpoint_id=str(i),
+                checkpoint_data=payload,
+                status=("completed", "failed", "expired")[i % 3] if expired else "active",
+            ))
+        WorkflowCheckpoint.objects.bulk_create(objs)
+
+    # auto_now ignores explicit values on insert, so age the rows afterwards
+    WorkflowCheckpoint.objects.exclude(status="active").update(updated_at=old)
+    return expired_rows
+
+
+def run_unbounded(days: int):
+    """The previous implementation: one statement per pass."""
+    from datetime import timedelta
+    from django.utils import timezone
+    from synde_web.models import WorkflowCheckpoint
+
+    cutoff = timezone.now() - timedelta(days=days)
+    start = time.perf_counter()
+    deleted, _ = WorkflowCheckpoint.objects.filter(
+        status__in=["completed", "failed", "expired"], updated_at__lt=cutoff
+    ).delete()
+    elapsed = time.perf_counter() - start
+    return {"deleted": deleted, "batches": 1, "max_batch_seconds": elapsed}
+
+
+def run_batched(days: int, batch_size: int):
+    from synde_web.tasks import cleanup_expired_checkpoints
+    return cleanup_expired_checkpoints(days=days, batch_size=batch_size)["deleted"]
+
+
+def main():
+    import argparse
+    from rich.console import Console
+    from rich.table import Table
+
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint cleanup")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic checkpoints")
+    parser.add_argument("--payload-kb", type=int, default=1, help="checkpoint_data size per row")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per transaction")
+    parser.add_argument("--mode", choices=["both", "unbounded", "batched"], default="both")
+    args = parser.parse_args()
+
+    console = Console()
+    modes = ["unbounded", "batched"] if args.mode == "both" else [args.mode]
+
+    table = Table(title=f"Checkpoint cleanup ({args.rows:,} rows, {args.payload_kb} KB payloads)")
+    table.add_column("Mode")
+    table.add_column("Deleted", justify="right")
+    table.add_column("Batches", justify="right")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("Longest txn (s)", justify="right")
+    table.add_column("Peak heap (MB)", justify="right")
+
+    with tempfile.TemporaryDirectory(prefix="synde-cleanup-") as workdir:
+        db_path = os.path.join(workdir, "bench.sqlite3")
+        setup_database(db_path)
+
+        from django.db import connection
+        import synde_web.tasks  # noqa: F401  (import cost outside the timed region)
+
+        for mode in modes:
+            console.print(f"Populating {args.rows:,} checkpoints for {mode} run...")
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM synde_workflow_checkpoints")
+            populate(args.rows, args.payload_kb)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            if mode == "unbounded":
+                stats = run_unbounded(days=7)
+            else:
+                stats = run_batched(days=7, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            table.add_row(
+                mode,
+                f"{stats['deleted']:,}",
+                str(stats["batches"]),
+                f"{elapsed:.2f}",
+                f"{stats['max_batch_seconds']:.3f}",
+                f"{peak / (1024 * 1024):.1f}",
+            )
+
+        connection.close()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Compare the streaming FASTA/PDB parsers with read-everything parsing.
+
+Generates synthetic files of the requested size, then reports wall time and
+peak Python heap (tracemalloc) for:
+
+    buffered    f.read() + str.split, as the upload view used to do
+    streaming   iter_lines over 64 KB chunks, as the upload view does now
+
+and, for sequence extraction from a large multi-chain PDB:
+
+    line scan   PdbScan, one Python line at a time
+    vectorized  parse_structure, fixed-column slicing with NumPy
+
+Usage:
+    python scripts/bench_parsers.py --size-mb 100
+    python scripts/bench_parsers.py --size-mb 20 --keep /tmp/parser-bench
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+RESIDUES = ["ALA", "GLY", "LEU", "SER", "VAL", "LYS", "GLU", "ASP"]
+
+
+def write_fasta(path: Path, size_bytes: int, seed: int = 0):
+    """Write a multi-record FASTA file of roughly ``size_bytes``."""
+    rng = random.Random(seed)
+    written = 0
+    index = 0
+    with open(path, "w") as f:
+        while written < size_bytes:
+            seq = "".join(rng.choice(AMINO_ACIDS) for _ in range(rng.randint(100, 600)))
+            record = f">seq{index} synthetic\n" + "\n".join(
+                seq[i:i + 60] for i in range(0, len(seq), 60)
+            ) + "\n"
+            f.write(record)
+            written += len(record)
+            index += 1
+
+
+def write_pdb(path: Path, size_bytes: int):
+    """Write a multi-model PDB file of roughly ``size_bytes``."""
+    written = 0
+    model = 0
+    with open(path, "w") as f:
+        while written < size_bytes:
+            model += 1
+            lines = [f"MODEL     {model:4d}\n"]
+            serial = 1
+            for resnum in range(1, 501):
+                res = RESIDUES[resnum % len(RESIDUES)]
+                for atom in ("N", "CA", "C", "O"):
+                    lines.append(
+                        f"ATOM  {serial:5d}  {atom:<3s} {res} A{resnum:4d}    "
+                        f"{1.0:8.3f}{2.0:8.3f}{3.0:8.3f}  1.00 90.00           {atom[0]}\n"
+                    )
+                    serial += 1
+            lines.append("ENDMDL\n")
+            chunk = "".join(lines)
+            f.write(chunk)
+            written += len(chunk)
+
+
+def write_multichain_pdb(path: Path, size_bytes: int, residues_per_chain: int = 500):
+    """Write a single-model PDB of roughly ``size_bytes`` with many chains."""
+    chain_ids = [chr(c) for c in range(ord("A"), ord("Z") + 1)] + [str(d) for d in range(10)]
+    written = 0
+    serial = 1
+    chain = 0
+    with open(path, "w") as f:
+        while written < size_bytes:
+            chain_id = chain_ids[chain % len(chain_ids)]
+            offset = chain // len(chain_ids) * residues_per_chain
+            lines = []
+            for resnum in range(offset + 1, offset + residues_per_chain + 1):
+                res = RESIDUES[resnum % len(RESIDUES)]
+                for i, atom in enumerate(("N", "CA", "C", "O")):
+                    lines.append(
+                        f"ATOM  {serial % 100000:5d}  {atom:<3s} {res} {chain_id}{resnum % 10000:4d}    "
+                        f"{resnum * 3.8 % 999:8.3f}{chain * 1.5 % 999:8.3f}{i * 1.2:8.3f}"
+                        f"  1.00 {50 + resnum % 50:5.2f}           {atom[0]}\n"
+                    )
+                    serial += 1
+            lines.append("TER\n")
+            chunk = "".join(lines)
+            f.write(chunk)
+            written += len(chunk)
+            chain += 1
+
+
+def buffered_fasta(path: Path) -> int:
+    from synde_graph.utils.fasta import parse_fasta
+    with open(path, "r") as f:
+        return len(parse_fasta(f.read()))
+
+
+def streaming_fasta(path: Path) -> int:
+    from synde_graph.utils.fasta import iter_fasta
+    from synde_graph.utils.streams import iter_chunks, iter_lines
+    with open(path, "rb") as f:
+        return sum(1 for _ in iter_fasta(iter_lines(iter_chunks(f))))
+
+
+def buffered_pdb(path: Path) -> int:
+    from synde_graph.utils.pdb import scan_pdb
+    with open(path, "r") as f:
+        return scan_pdb(f.read().split("\n")).atom_count
+
+
+def streaming_pdb(path: Path) -> int:
+    from synde_graph.utils.pdb import scan_pdb
+    from synde_graph.utils.streams import iter_chunks, iter_lines
+    with open(path, "rb") as f:
+        return scan_pdb(iter_lines(iter_chunks(f))).atom_count
+
+
+def line_scan_sequence(path: Path) -> int:
+    from synde_graph.utils.pdb import extract_sequence_from_pdb
+    with open(path, "r") as f:
+        return len(extract_sequence_from_pdb(f.read()))
+
+
+def vectorized_sequence(path: Path) -> int:
+    from synde_graph.utils.structure import parse_structure
+    with open(path, "r") as f:
+        return len(parse_structure(f.read(), cache=False).sequence())
+
+
+def measure(fn, path: Path):
+    """Return (result, seconds, peak MB) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    import argparse
+    from rich.console import Console
+    from rich.table import Table
+
+    parser = argparse.ArgumentParser(description="Benchmark FASTA/PDB parsing")
+    parser.add_argument("--size-mb", type=int, default=100, help="Synthetic file size in MB")
+    parser.add_argument("--keep", type=str, default=None, help="Directory to keep generated files in")
+    args = parser.parse_args()
+
+    console = Console()
+    workdir = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="synde-parsers-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    size = args.size_mb * 1024 * 1024
+
+    fasta_path = workdir / "synthetic.fasta"
+    pdb_path = workdir / "synthetic.pdb"
+    if not fasta_path.exists():
+        console.print(f"Generating {args.size_mb} MB FASTA...")
+        write_fasta(fasta_path, size)
+    if not pdb_path.exists():
+        console.print(f"Generating {args.size_mb} MB PDB...")
+        write_pdb(pdb_path, size)
+    multichain_path = workdir / "multichain.pdb"
+    if not multichain_path.exists():
+        console.print(f"Generating {args.size_mb} MB multi-chain PDB...")
+        write_multichain_pdb(multichain_path, size)
+
+    table = Table(title=f"Parser benchmark ({args.size_mb} MB inputs)")
+    table.add_column("Input")
+    table.add_column("Mode")
+    table.add_column("Result", justify="right")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Peak heap (MB)", justify="right")
+
+    cases = [
+        ("FASTA", "buffered", buffered_fasta, fasta_path),
+        ("FASTA", "streaming", streaming_fasta, fasta_path),
+        ("PDB", "buffered", buffered_pdb, pdb_path),
+        ("PDB", "streaming", streaming_pdb, pdb_path),
+        ("PDB sequence", "line scan", line_scan_sequence, multichain_path),
+        ("PDB sequence", "vectorized", vectorized_sequence, multichain_path),
+    ]
+    for label, mode, fn, path in cases:
+        result, elapsed, peak = measure(fn, path)
+        table.add_row(label, mode, str(result), f"{elapsed:.2f}", f"{peak:.1f}")
+
+    console.print(table)
+
+    if not args.keep:
+        for path in (fasta_path, pdb_path, multichain_path):
+            os.remove(path)
+        workdir.rmdir()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Contention benchmark for the Redis workflow rate limiter.
+
+Simulates many users submitting workflows from a pool of threads against a
+local Redis: every submission calls RateLimiter.admit with a workflow slot,
+"runs" for a random hold time, then releases the slot. Reports throughput,
+admission latency percentiles and refusals by reason, and checks that no
+user ever exceeded the token bucket or held more slots than allowed.
+
+Usage:
+    python scripts/bench_ratelimit.py                          # 200 users, 32 threads, 10s
+    python scripts/bench_ratelimit.py --users 2000 --threads 64 --seconds 30
+    python scripts/bench_ratelimit.py --redis-url redis://localhost:6379/15
+"""
+
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(limiter, users: int, threads: int, seconds: float, hold_ms: float, seed: int):
+    """Hammer the limiter; returns per-thread results merged."""
+    population = [
+        SimpleNamespace(id=i + 1, monthly_quota=10**9, current_usage=0)
+        for i in range(users)
+    ]
+    latencies = []
+    outcomes = Counter()
+    admitted = Counter()
+    running = defaultdict(int)
+    peak_running = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(index: int):
+        rng = random.Random(seed + index)
+        local_latencies = []
+        slot = 0
+        while time.perf_counter() < deadline:
+            user = rng.choice(population)
+            slot += 1
+            slot_id = f"bench-{index}-{slot}"
+
+            started = time.perf_counter()
+            admission = limiter.admit(user, slot_id=slot_id)
+            local_latencies.append(time.perf_counter() - started)
+
+            with lock:
+                outcomes[admission.reason or "admitted"] += 1
+                if admission.allowed:
+                    admitted[user.id] += 1
+                    running[user.id] += 1
+                    peak_running[user.id] = max(peak_running[user.id], running[user.id])
+
+            if admission.allowed:
+                time.sleep(rng.uniform(0, 2 * hold_ms) / 1000)
+                with lock:
+                    running[user.id] -= 1
+                limiter.release(user.id, slot_id)
+
+        with lock:
+            latencies.extend(local_latencies)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "outcomes": outcomes,
+        "admitted": admitted,
+        "peak_running": peak_running,
+    }
+
+
+def main():
+    import argparse
+    import redis
+    from rich.console import Console
+    from rich.table import Table
+    from synde_web.ratelimit import RateLimiter
+
+    parser = argparse.ArgumentParser(description="Benchmark the workflow rate limiter")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="Scratch Redis DB (flushed)")
+    parser.add_argument("--users", type=int, default=200, help="Simulated users")
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent submitters")
+    parser.add_argument("--seconds", type=float, default=10, help="Run time")
+    parser.add_argument("--burst", type=int, default=10, help="Token bucket capacity")
+    parser.add_argument("--per-minute", type=float, default=12, help="Sustained rate per user")
+    parser.add_argument("--max-concurrent", type=int, default=3, help="Slots per user")
+    parser.add_argument("--hold-ms", type=float, default=5, help="Mean time a slot is held")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    console = Console()
+    client = redis.Redis.from_url(args.redis_url, decode_responses=True,
+                                  max_connections=args.threads + 4)
+    client.flushdb()
+    limiter = RateLimiter(client, burst=args.burst, per_minute=args.per_minute,
+                          max_concurrent=args.max_concurrent)
+
+    console.print(f"{args.users} users, {args.threads} threads, {args.seconds:.0f}s against {args.redis_url}")
+    stats = run(limiter, args.users, args.threads, args.seconds, args.hold_ms, args.seed)
+
+    total = sum(stats["outcomes"].values())
+    lat_ms = [x * 1000 for x in stats["latencies"]]
+
+    table = Table(title="Rate limiter contention")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("Admission checks", f"{total:,}")
+    table.add_row("Checks / s", f"{total / stats['elapsed']:,.0f}")
+    table.add_row("p50 latency (ms)", f"{percentile(lat_ms, 50):.3f}")
+    table.add_row("p99 latency (ms)", f"{percentile(lat_ms, 99):.3f}")
+    for reason in ("admitted", "rate", "concurrency", "quota"):
+        table.add_row(reason, f"{stats['outcomes'][reason]:,}")
+    console.print(table)
+
+    # Invariants: the bucket allows at most burst + refill over the run, and
+    # no user held more slots than max_concurrent at once
+    allowance = args.burst + args.per_minute / 60 * stats["elapsed"] + 1 if args.per_minute > 0 else float("inf")
+    over_rate = {u: n for u, n in stats["admitted"].items() if n > allowance}
+    over_slots = {u: n for u, n in stats["peak_running"].items() if n > args.max_concurrent}
+    pending = sum(limiter.drain_pending_usage().values())
+
+    ok = not over_rate and not over_slots and pending == stats["outcomes"]["admitted"]
+    console.print(
+        f"Users over rate: {len(over_rate)}, over concurrency: {len(over_slots)}, "
+        f"pending usage {pending:,} vs admitted {stats['outcomes']['admitted']:,}"
+    )
+    console.print("[green]Invariants hold[/green]" if ok else "[red]Invariant violated[/red]")
+    client.flushdb()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
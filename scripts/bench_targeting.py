@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark confidence- and pocket-masked mutation targeting.
+
+Builds a synthetic predicted structure (compact core, disordered termini
+and one low-confidence loop, pLDDT in the B-factor column) with a pocket,
+and a synthetic fitness oracle in which beneficial single mutations
+concentrate in confident residues near the pocket. Then compares:
+
+    blind     positions sampled uniformly, as generation used to do
+    targeted  positions from candidate_positions (pLDDT + pocket distance)
+
+For the targeted run with ``--budget`` evaluated candidates, it reports
+the mean score of the top-k mutants, and how many blind candidates were
+needed to reach the same top-k score (averaged over ``--seeds`` runs).
+
+The oracle is an assumption, not a measurement: it encodes the premise
+that disordered and distant residues rarely yield top-ranked mutants.
+
+Usage:
+    python scripts/bench_targeting.py
+    python scripts/bench_targeting.py --length 400 --budget 40 --top-k 5
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+RESIDUES = ["ALA", "GLY", "LEU", "SER", "VAL", "LYS", "GLU", "ASP", "THR", "ILE"]
+
+
+def synthetic_structure(length: int, rng: np.random.Generator):
+    """(pdb_data, sequence, pLDDT, CA coords) of a synthetic predicted structure."""
+    n_term, c_term = length // 12, length // 10
+    loop = slice(length // 2 - 10, length // 2 + 10)
+
+    plddt = rng.uniform(80, 95, length)
+    plddt[:n_term] = rng.uniform(30, 50, n_term)
+    plddt[-c_term:] = rng.uniform(30, 50, c_term)
+    plddt[loop] = rng.uniform(45, 60, loop.stop - loop.start)
+
+    # Core: random walk of 3.8 A steps pulled toward the origin; tails drift away
+    coords = np.zeros((length, 3))
+    for i in range(1, length):
+        step = rng.normal(size=3)
+        if plddt[i] >= 70:
+            step -= 0.02 * coords[i - 1]
+        else:
+            step += 0.5 * coords[i - 1] / (np.linalg.norm(coords[i - 1]) + 1e-6)
+        coords[i] = coords[i - 1] + 3.8 * step / np.linalg.norm(step)
+
+    names = [RESIDUES[i % len(RESIDUES)] for i in range(length)]
+    lines = [
+        f"ATOM  {i + 1:5d}  CA  {names[i]} A{i + 1:4d}    "
+        f"{x:8.3f}{y:8.3f}{z:8.3f}  1.00{plddt[i]:6.2f}           C"
+        for i, (x, y, z) in enumerate(coords)
+    ]
+    from synde_graph.utils.pdb import THREE_TO_ONE
+    sequence = "".join(THREE_TO_ONE[name] for name in names)
+    return "\n".join(lines + ["END"]), sequence, plddt, coords
+
+
+def pocket_around(coords: np.ndarray, plddt: np.ndarray, size: int, rng: np.random.Generator):
+    """The ``size`` residues closest to a random confident residue, as fpocket labels."""
+    center = rng.choice(np.flatnonzero(plddt >= 80))
+    nearest = np.argsort(np.linalg.norm(coords - coords[center], axis=1))[:size]
+    return {1: [f"A:{i + 1}" for i in sorted(nearest)]}
+
+
+def oracle(coords: np.ndarray, plddt: np.ndarray, pocket: dict, rng: np.random.Generator) -> np.ndarray:
+    """(L, 19) true scores of every single mutation."""
+    pocket_idx = [int(label.split(":")[1]) - 1 for label in pocket[1]]
+    distance = np.linalg.norm(coords[:, None] - coords[pocket_idx][None], axis=2).min(axis=1)
+    signal = np.where(plddt >= 70, 2.0 * np.exp(-distance / 6.0), 0.0)
+    return signal[:, None] + rng.normal(0, 0.7, (len(coords), 19))
+
+
+def top_k(scores: np.ndarray, positions: np.ndarray, n: int, k: int, rng: np.random.Generator) -> float:
+    """Mean of the top-k true scores among ``n`` sampled single mutants."""
+    pos = rng.choice(positions, n)
+    aa = rng.integers(0, 19, n)
+    return float(np.sort(scores[pos, aa])[-k:].mean())
+
+
+def main():
+    import argparse
+    from rich.console import Console
+    from rich.table import Table
+
+    from synde_graph.utils.mutation_targets import candidate_positions
+    from synde_graph.utils.structure import residue_plddt_from_pdb
+
+    parser = argparse.ArgumentParser(description="Benchmark masked mutation targeting")
+    parser.add_argument("--length", type=int, default=350, help="Residues in the synthetic protein")
+    parser.add_argument("--budget", type=int, default=60, help="Candidates evaluated when targeted")
+    parser.add_argument("--top-k", type=int, default=10, help="Mutants whose mean score is compared")
+    parser.add_argument("--seeds", type=int, default=20, help="Synthetic proteins to average over")
+    args = parser.parse_args()
+
+    console = Console()
+    targeted_counts, blind_counts, kept = [], [], []
+    targeted_scores, blind_scores = [], []
+
+    for seed in range(args.seeds):
+        rng = np.random.default_rng(seed)
+        pdb_data, sequence, plddt, coords = synthetic_structure(args.length, rng)
+        pocket = pocket_around(coords, plddt, 12, rng)
+        scores = oracle(coords, plddt, pocket, rng)
+
+        positions = np.array(candidate_positions(sequence, residue_plddt_from_pdb(pdb_data), pdb_data, pocket))
+        everywhere = np.arange(args.length)
+        kept.append(len(positions))
+
+        target = np.mean([top_k(scores, positions, args.budget, args.top_k, rng) for _ in range(50)])
+        # Smallest blind budget reaching the same top-k score
+        n = args.budget
+        while True:
+            blind = np.mean([top_k(scores, everywhere, n, args.top_k, rng) for _ in range(50)])
+            if blind >= target or n >= 19 * args.length:
+                break
+            n = int(n * 1.1) + 1
+
+        targeted_counts.append(args.budget)
+        blind_counts.append(n)
+        targeted_scores.append(target)
+        blind_scores.append(blind)
+
+    table = Table(title=f"Mutation targeting ({args.length} aa, top-{args.top_k}, {args.seeds} proteins)")
+    table.add_column("Mode")
+    table.add_column("Positions", justify="right")
+    table.add_column("Evaluated", justify="right")
+    table.add_column(f"Top-{args.top_k} score", justify="right")
+    table.add_row("blind", str(args.length), f"{np.mean(blind_counts):.0f}", f"{np.mean(blind_scores):.2f}")
+    table.add_row("targeted", f"{np.mean(kept):.0f}", f"{np.mean(targeted_counts):.0f}", f"{np.mean(targeted_scores):.2f}")
+    console.print(table)
+
+    reduction = 1 - np.mean(targeted_counts) / np.mean(blind_counts)
+    console.print(f"Evaluated candidates reduced by {reduction:.0%} for the same top-{args.top_k} score")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ const Chat = {
     messagesContainer: null,
     inputElement: null,
     sendButton: null,
+    stopButton: null,
     activeWorkflowId: null,
     uploadedFile: null,  // Track uploaded file
 
@@ -13,6 +14,7 @@ const Chat = {
         this.messagesContainer = document.getElementById('chat-messages');
         this.inputElement = document.getElementById('chat-input');
         this.sendButton = document.getElementById('send-btn');
+        this.stopButton = document.getElementById('stop-btn');
 
         if (!this.inputElement || !this.sendButton) return;
 
@@ -34,10 +36,39 @@ const Chat = {
         // Auto-scroll to bottom
         this.scrollToBottom();
 
+        // Set up stop button
+        if (this.stopButton) {
+            this.stopButton.addEventListener('click', () => this.cancelWorkflow(this.activeWorkflowId));
+        }
+
         // Check for active workflows
         this.checkActiveWorkflows();
     },
 
+    setActiveWorkflow(workflowId) {
+        this.setActiveWorkflow(workflowId);
+        if (this.stopButton) {
+            this.stopButton.style.display = workflowId ? '' : 'none';
+        }
+    },
+
+    async cancelWorkflow(workflowId) {
+        // Only on an explicit Stop: leaving the page keeps the workflow
+        // running, and checkActiveWorkflows() resumes it on return
+        if (!workflowId) return;
+
+        this.stopButton.disabled = true;
+        try {
+            await App.api(`/api/workflow/${workflowId}/cancel/`, { method: 'POST' });
+            SSE.disconnect();
+            this.failWorkflow(workflowId, 'Workflow cancelled');
+        } catch (error) {
+            App.notify('Failed to cancel workflow: ' + error.message, 'error');
+        } finally {
+            this.stopButton.disabled = false;
+        }
+    },
+
     setupFileUpload() {
         const attachBtn = document.getElementById('attach-btn');
         if (!attachBtn) {
@@ -174,7 +205,7 @@ const Chat = {
         if (fileData.file_type === 'pdb') {
             details = `${fileData.metadata.atom_count} atoms, ${fileData.metadata.residue_count} residues`;
         } else if (fileData.sequences) {
-            const seqCount = Object.keys(fileData.sequences).length;
+            const seqCount = fileData.sequence_count || Object.keys(fileData.sequences).length;
             details = `${seqCount} sequence${seqCount > 1 ? 's' : ''}`;
         }
 
@@ -330,7 +361,7 @@ const Chat = {
             });
 
             // Start SSE for workflow updates
-            this.activeWorkflowId = response.workflow_id;
+            this.setActiveWorkflow(response.workflow_id);
             SSE.connect(conversationId, response.workflow_id);
 
         } catch (error) {
@@ -497,7 +528,7 @@ const Chat = {
             }
         }
 
-        this.activeWorkflowId = null;
+        this.setActiveWorkflow(null);
     },
 
     failWorkflow(workflowId, error) {
@@ -519,7 +550,7 @@ const Chat = {
             }
         }
 
-        this.activeWorkflowId = null;
+        this.setActiveWorkflow(null);
     },
 
     scrollToBottom() {
@@ -565,7 +596,7 @@ const Chat = {
         statusElements.forEach(el => {
             const workflowId = el.dataset.workflowId;
             if (workflowId && App.conversationId) {
-                this.activeWorkflowId = workflowId;
+                this.setActiveWorkflow(workflowId);
                 SSE.connect(App.conversationId, workflowId);
             }
         });
@@ -47,6 +47,12 @@ const SSE = {
                 this.disconnect();
             });
 
+            this.eventSource.addEventListener('cancelled', (e) => {
+                console.log('SSE cancelled:', JSON.parse(e.data));
+                Chat.failWorkflow(workflowId, 'Workflow cancelled');
+                this.disconnect();
+            });
+
             this.eventSource.addEventListener('error', (e) => {
                 if (e.data) {
                     const data = JSON.parse(e.data);
@@ -7,10 +7,20 @@ Provides checkpointers for:
 - Redis (production)
 """
 
-from synde_checkpointer.memory import MemoryCheckpointer
-from synde_checkpointer.sqlite import SqliteCheckpointer
+from typing import TYPE_CHECKING
+
+from synde_graph._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from synde_checkpointer.memory import MemoryCheckpointer
+    from synde_checkpointer.sqlite import SqliteCheckpointer
 
 __all__ = [
     "MemoryCheckpointer",
     "SqliteCheckpointer",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "synde_checkpointer.memory": ["MemoryCheckpointer"],
+    "synde_checkpointer.sqlite": ["SqliteCheckpointer"],
+})
@@ -2,6 +2,15 @@
 CLI tool for testing SynDe LangGraph workflows.
 """
 
-from synde_cli.main import app
+from typing import TYPE_CHECKING
+
+from synde_graph._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from synde_cli.main import app
 
 __all__ = ["app"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "synde_cli.main": ["app"],
+})
@@ -0,0 +1,287 @@
+"""
+End-to-end workflow benchmark suite.
+
+Replays a corpus of representative queries through run_workflow (threads)
+or run_workflow_async (asyncio) at a fixed concurrency and reports latency
+percentiles, throughput, per-node time and peak RSS. Reports are plain
+JSON so they can be stored as a baseline and compared on later runs.
+"""
+
+import asyncio
+import json
+import math
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from synde_graph.utils.instrumentation import NodeTimer
+
+
+# =============================================================================
+# Query Corpus
+# =============================================================================
+
+BENCH_SEQUENCE = (
+    "MKTVRQERLKSIVRILERSKEPVSGAQLAEELSVSRQVIVQDIAYLRSLGYNIVATPRGYVLAGG"
+    "SDHWKLAEEFGVTPEEAKRLAQE"
+)
+
+# Each entry: category, query and optional session data. Queries carry their
+# own sequence so no UniProt/PubChem lookups happen during a run.
+BENCH_CORPUS: List[Dict[str, Any]] = [
+    {"category": "prediction", "query": f"Predict EC number for {BENCH_SEQUENCE}"},
+    {"category": "prediction", "query": f"Predict melting temperature of {BENCH_SEQUENCE}"},
+    {"category": "prediction", "query": "Predict stability of this enzyme",
+     "session_data": {"last_protein_sequence": BENCH_SEQUENCE}},
+    {"category": "generation", "query": f"Generate thermostable variants of {BENCH_SEQUENCE}"},
+    {"category": "generation", "query": f"Design mutants with higher activity for {BENCH_SEQUENCE}"},
+    {"category": "theory", "query": "Explain how directed evolution works"},
+    {"category": "theory", "query": "Describe the mechanism of serine proteases"},
+    {"category": "fallback", "query": ""},
+]
+
+
+def load_corpus(path: Optional[str] = None, categories: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Load the benchmark corpus.
+
+    Args:
+        path: Optional JSON file with a list of {"category", "query", "session_data"}
+        categories: Optional category filter
+
+    Returns:
+        List of corpus entries
+    """
+    corpus = BENCH_CORPUS
+    if path:
+        with open(path, "r") as f:
+            corpus = json.load(f)
+
+    if categories:
+        corpus = [entry for entry in corpus if entry.get("category") in categories]
+
+    if not corpus:
+        raise ValueError("Benchmark corpus is empty")
+
+    return corpus
+
+
+# =============================================================================
+# Statistics
+# =============================================================================
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100); 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_stats(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of a list of latencies (seconds)."""
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "max": max(values) if values else 0.0,
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def _run_one(entry: Dict[str, Any], timer: NodeTimer) -> Dict[str, Any]:
+    from synde_graph.graph import run_workflow
+
+    start = time.perf_counter()
+    error = None
+    try:
+        run_workflow(
+            user_query=entry["query"],
+            session_data=entry.get("session_data"),
+            callbacks=[timer],
+        )
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {"category": entry["category"], "latency": time.perf_counter() - start, "error": error}
+
+
+async def _run_one_async(entry: Dict[str, Any], timer: NodeTimer, limit: asyncio.Semaphore) -> Dict[str, Any]:
+    from synde_graph.graph import run_workflow_async
+
+    async with limit:
+        start = time.perf_counter()
+        error = None
+        try:
+            await run_workflow_async(
+                user_query=entry["query"],
+                session_data=entry.get("session_data"),
+                callbacks=[timer],
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return {"category": entry["category"], "latency": time.perf_counter() - start, "error": error}
+
+
+def run_benchmark(
+    iterations: int = 5,
+    concurrency: int = 1,
+    use_async: bool = False,
+    corpus: Optional[List[Dict[str, Any]]] = None,
+    warmup: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the workflow benchmark.
+
+    Args:
+        iterations: Passes over the corpus
+        concurrency: Workflows in flight at once
+        use_async: Use run_workflow_async on an event loop instead of threads
+        corpus: Corpus entries (defaults to BENCH_CORPUS)
+        warmup: Run each query once untimed before measuring
+
+    Returns:
+        JSON-serializable benchmark report
+    """
+    corpus = corpus or BENCH_CORPUS
+    jobs = [entry for _ in range(iterations) for entry in corpus]
+
+    if warmup:
+        warm_timer = NodeTimer()
+        for entry in corpus:
+            _run_one(entry, warm_timer)
+
+    timer = NodeTimer()
+    start = time.perf_counter()
+
+    if use_async:
+        async def _main():
+            limit = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*(_run_one_async(e, timer, limit) for e in jobs))
+        runs = asyncio.run(_main())
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            runs = list(pool.map(lambda e: _run_one(e, timer), jobs))
+
+    wall = time.perf_counter() - start
+    latencies = [r["latency"] for r in runs]
+    errors = [r for r in runs if r["error"]]
+
+    by_category: Dict[str, Dict[str, Any]] = {}
+    for category in sorted({r["category"] for r in runs}):
+        values = [r["latency"] for r in runs if r["category"] == category]
+        by_category[category] = {"count": len(values), **latency_stats(values)}
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mode": "async" if use_async else "sync",
+            "concurrency": concurrency,
+            "iterations": iterations,
+            "corpus_size": len(corpus),
+            "mock_gpu": os.getenv("MOCK_GPU", "false"),
+            "gpu_backend": os.getenv("GPU_BACKEND", "celery"),
+        },
+        "summary": {
+            "workflows": len(runs),
+            "errors": len(errors),
+            "wall_s": wall,
+            "throughput_wps": len(runs) / wall if wall > 0 else 0.0,
+            "latency_s": latency_stats(latencies),
+            "peak_rss_mb": peak_rss_mb(),
+        },
+        "by_category": by_category,
+        "nodes": timer.summary(),
+        "error_samples": [r["error"] for r in errors[:5]],
+    }
+
+
+# =============================================================================
+# Baselines
+# =============================================================================
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    """Write a report as JSON, creating parent directories."""
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, sort_keys=True))
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Load a JSON report."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.2,
+) -> List[Dict[str, Any]]:
+    """
+    Compare a report with a baseline.
+
+    Latency percentiles regress when they grow by more than ``tolerance``
+    (fractional); throughput regresses when it drops by more than that.
+
+    Args:
+        report: Current benchmark report
+        baseline: Stored baseline report
+        tolerance: Allowed fractional change (0.2 = 20%)
+
+    Returns:
+        List of {"metric", "baseline", "current", "change"} for each metric,
+        with "regression" set where the tolerance is exceeded
+    """
+    rows = []
+
+    def _row(metric: str, base: float, current: float, higher_is_worse: bool) -> None:
+        if not base:
+            return
+        change = (current - base) / base
+        worse = change > tolerance if higher_is_worse else change < -tolerance
+        rows.append({
+            "metric": metric,
+            "baseline": base,
+            "current": current,
+            "change": change,
+            "regression": worse,
+        })
+
+    base_latency = baseline.get("summary", {}).get("latency_s", {})
+    cur_latency = report["summary"]["latency_s"]
+    for key in ("p50", "p95", "p99"):
+        _row(f"latency_{key}", base_latency.get(key, 0.0), cur_latency[key], higher_is_worse=True)
+
+    _row(
+        "throughput_wps",
+        baseline.get("summary", {}).get("throughput_wps", 0.0),
+        report["summary"]["throughput_wps"],
+        higher_is_worse=False,
+    )
+
+    return rows
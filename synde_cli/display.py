@@ -168,23 +168,300 @@ def display_pdb_info(pdb_content: str):
     Args:
         pdb_content: PDB file content
     """
-    lines = pdb_content.split("\n")
+    from synde_graph.utils.structure import parse_structure
 
-    # Count atoms and residues
-    atoms = [l for l in lines if l.startswith("ATOM")]
-    residues = set()
-    chains = set()
-
-    for line in atoms:
-        if len(line) >= 22:
-            chains.add(line[21])
-        if len(line) >= 26:
-            residues.add((line[21], line[22:26].strip()))
+    structure = parse_structure(pdb_content)
+    plddt = structure.residue_plddt()
 
     info = (
-        f"[bold]Atoms:[/bold] {len(atoms)}\n"
-        f"[bold]Residues:[/bold] {len(residues)}\n"
-        f"[bold]Chains:[/bold] {', '.join(sorted(chains))}"
+        f"[bold]Atoms:[/bold] {structure.atom_count}\n"
+        f"[bold]Residues:[/bold] {structure.residue_count}\n"
+        f"[bold]Chains:[/bold] {', '.join(structure.chains)}"
     )
+    if len(plddt):
+        info += f"\n[bold]Mean B-factor/pLDDT:[/bold] {plddt.mean():.1f}"
 
     console.print(Panel(info, title="[green]PDB Structure[/green]"))
+
+
+def display_bench_report(report: Dict[str, Any], comparison: list = None):
+    """
+    Display a benchmark report.
+
+    Args:
+        report: Report from synde_cli.bench.run_benchmark
+        comparison: Optional rows from compare_to_baseline
+    """
+    meta = report["meta"]
+    summary = report["summary"]
+    latency = summary["latency_s"]
+    rss = summary["peak_rss_mb"]
+
+    console.print(Panel(
+        f"[bold]Mode:[/bold] {meta['mode']} x{meta['concurrency']}  "
+        f"[bold]Workflows:[/bold] {summary['workflows']} ({summary['errors']} errors)\n"
+        f"[bold]Throughput:[/bold] {summary['throughput_wps']:.2f} workflows/s  "
+        f"[bold]Wall:[/bold] {summary['wall_s']:.2f}s\n"
+        f"[bold]Latency:[/bold] p50 {latency['p50'] * 1000:.1f}ms  "
+        f"p95 {latency['p95'] * 1000:.1f}ms  p99 {latency['p99'] * 1000:.1f}ms\n"
+        f"[bold]Peak RSS:[/bold] {f'{rss:.1f} MB' if rss is not None else 'n/a'}",
+        title="[blue]Benchmark[/blue]",
+    ))
+
+    table = Table(title="Latency by Category")
+    table.add_column("Category", style="cyan")
+    table.add_column("Count", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    for category, stats in report["by_category"].items():
+        table.add_row(
+            category,
+            str(stats["count"]),
+            f"{stats['p50'] * 1000:.1f}",
+            f"{stats['p95'] * 1000:.1f}",
+            f"{stats['p99'] * 1000:.1f}",
+        )
+    console.print(table)
+
+    table = Table(title="Per-Node Time (inclusive)")
+    table.add_column("Node", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Mean (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    table.add_column("Total (s)", justify="right")
+    nodes = sorted(report["nodes"].items(), key=lambda item: item[1]["total_s"], reverse=True)
+    for node, stats in nodes:
+        table.add_row(
+            node,
+            str(stats["calls"]),
+            f"{stats['mean_s'] * 1000:.2f}",
+            f"{stats['max_s'] * 1000:.2f}",
+            f"{stats['total_s']:.3f}",
+        )
+    console.print(table)
+
+    if comparison:
+        table = Table(title="Baseline Comparison")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Baseline", justify="right")
+        table.add_column("Current", justify="right")
+        table.add_column("Change", justify="right")
+        for row in comparison:
+            color = "red" if row["regression"] else "green"
+            table.add_row(
+                row["metric"],
+                f"{row['baseline']:.4f}",
+                f"{row['current']:.4f}",
+                f"[{color}]{row['change'] * 100:+.1f}%[/{color}]",
+            )
+        console.print(table)
+
+
+def display_runtime_report(rows: list, fits: Dict[str, Any]):
+    """
+    Display recorded GPU runtimes.
+
+    Args:
+        rows: Rows from RuntimeStatsStore.report
+        fits: Model name -> RuntimeFit (or None with too few samples)
+    """
+    table = Table(title="GPU Runtimes by Sequence Length")
+    table.add_column("Model", style="cyan")
+    table.add_column("Length (aa)")
+    table.add_column("Count", justify="right")
+    table.add_column("Mean (s)", justify="right")
+    table.add_column("p50 (s)", justify="right")
+    table.add_column("p90 (s)", justify="right")
+    table.add_column("Max (s)", justify="right")
+    for row in rows:
+        table.add_row(
+            row["model"],
+            row["bucket"],
+            str(row["count"]),
+            f"{row['mean']:.1f}",
+            f"{row['p50']:.1f}",
+            f"{row['p90']:.1f}",
+            f"{row['max']:.1f}",
+        )
+    console.print(table)
+
+    for model, fit in fits.items():
+        if fit is None:
+            console.print(f"[yellow]{model}:[/yellow] too few samples to predict")
+        else:
+            console.print(
+                f"[bold]{model}:[/bold] {fit.intercept:.1f}s + {fit.slope:.3f}s/aa "
+                f"(n={fit.samples})"
+            )
+
+
+def display_profile_report(report):
+    """
+    Display a per-node workflow profile.
+
+    Args:
+        report: ProfileReport from synde_cli.profiling.profile_workflow
+    """
+    unit = "sampled" if report.profiler == "sampling" else "profiled"
+    profiled = sum(node.profiled_s for node in report.nodes) or 1.0
+
+    table = Table(title=f"Time by Node ({report.profiler}, {report.total_s:.2f}s total)")
+    table.add_column("Node", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column(f"Self, {unit} (s)", justify="right")
+    table.add_column("Share", justify="right")
+    for node in report.nodes:
+        table.add_row(
+            node.node,
+            str(node.calls),
+            f"{node.wall_s:.3f}",
+            f"{node.profiled_s:.3f}",
+            f"{node.profiled_s / profiled:.0%}",
+        )
+    console.print(table)
+
+    for node in report.nodes:
+        if node.functions:
+            functions = Table(title=f"Top functions: {node.node}")
+            functions.add_column("Function", style="green")
+            functions.add_column("Self (s)", justify="right")
+            functions.add_column("Total (s)", justify="right")
+            if report.profiler == "cprofile":
+                functions.add_column("Calls", justify="right")
+            for stat in node.functions:
+                row = [stat.function, f"{stat.self_s:.4f}", f"{stat.total_s:.4f}"]
+                if report.profiler == "cprofile":
+                    row.append(str(stat.calls))
+                functions.add_row(*row)
+            console.print(functions)
+
+        if node.allocations:
+            allocations = Table(title=f"Allocation growth: {node.node}")
+            allocations.add_column("Line", style="magenta")
+            allocations.add_column("Size (KiB)", justify="right")
+            allocations.add_column("Blocks", justify="right")
+            for stat in node.allocations:
+                allocations.add_row(stat.location, f"{stat.size_bytes / 1024:.1f}", str(stat.count))
+            console.print(allocations)
+
+
+def display_replay_report(report, trace):
+    """
+    Display the outcome of a trace replay.
+
+    Args:
+        report: ReplayReport from synde_cli.replay.replay_workflow
+        trace: The replayed WorkflowTrace
+    """
+    table = Table(title=f"Replay (latency x{report.scale:g})")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    runs = ", ".join(f"{s:.3f}" for s in report.runs_s) if len(report.runs_s) > 1 else None
+    table.add_row("Wall time (s)", f"{report.wall_s:.3f}" + (f" (runs: {runs})" if runs else ""))
+    if report.recorded_s is not None:
+        table.add_row("Recorded wall time (s)", f"{report.recorded_s:.3f}")
+    table.add_row("Recorded external latency (s)", f"{report.recorded_latency_s:.3f}")
+    table.add_row("Replayed latency (s)", f"{report.delayed_s:.3f}")
+    table.add_row("Calls served", f"{report.served}/{report.events}")
+    console.print(table)
+
+    calls = Table(title="Recorded Calls")
+    calls.add_column("Kind", style="green")
+    calls.add_column("Name")
+    calls.add_column("Count", justify="right")
+    for (kind, name), count in sorted(trace.counts().items()):
+        calls.add_row(kind, name, str(count))
+    console.print(calls)
+
+    if report.misses:
+        missed = ", ".join(f"{kind}:{name}" for kind, name in report.misses)
+        console.print(f"[red]Calls not found in the trace: {missed}[/red]")
+    elif report.served < report.events:
+        console.print(f"[yellow]{report.events - report.served} recorded calls were not made[/yellow]")
+    else:
+        console.print("[green]Deterministic: every call was served from the trace[/green]")
+
+
+def display_import_report(reports: list, budgets: Dict[str, Any], top: int = 10):
+    """
+    Display import-time measurements.
+
+    Args:
+        reports: ImportReports from measure_import
+        budgets: Module -> ImportBudget, for the modules that have one
+        top: Slowest modules to list per import
+    """
+    from synde_cli.importtime import HEAVY_MODULES
+
+    table = Table(title="Cold-Start Import Time")
+    table.add_column("Module", style="cyan")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("Budget (ms)", justify="right")
+    table.add_column("Modules", justify="right")
+    table.add_column("Heavy dependencies")
+    for report in reports:
+        budget = budgets.get(report.module)
+        heavy = report.loaded_packages(HEAVY_MODULES)
+        forbidden = set(report.loaded_packages(budget.forbidden)) if budget else set()
+        over = budget is not None and report.cumulative_ms > budget.max_ms
+        table.add_row(
+            report.module,
+            f"[red]{report.cumulative_ms:.1f}[/red]" if over else f"{report.cumulative_ms:.1f}",
+            f"{budget.max_ms:.0f}" if budget else "-",
+            str(len(report.records)),
+            ", ".join(f"[red]{name}[/red]" if name in forbidden else name for name in heavy) or "-",
+        )
+    console.print(table)
+
+    for report in reports:
+        if top <= 0 or not report.records:
+            continue
+        slowest = Table(title=f"Slowest imports under {report.module}")
+        slowest.add_column("Module", style="cyan")
+        slowest.add_column("Self (ms)", justify="right")
+        slowest.add_column("Cumulative (ms)", justify="right")
+        for record in report.slowest(top):
+            slowest.add_row(record.module, f"{record.self_us / 1000:.1f}", f"{record.cumulative_us / 1000:.1f}")
+        console.print(slowest)
+
+
+def batch_results_table(results: list, total: int, max_rows: int = 30) -> Table:
+    """
+    Build the live results table for a batch screen.
+
+    Args:
+        results: BatchRecordResult rows received so far
+        total: Number of records in the library
+        max_rows: Show only the most recent rows beyond this many
+    """
+    table = Table(title=f"Batch Results ({len(results)}/{total})")
+    table.add_column("Record", style="cyan")
+    table.add_column("Len", justify="right")
+    table.add_column("Status")
+    table.add_column("pLDDT", justify="right")
+    table.add_column("EC")
+    table.add_column("Tm (C)", justify="right")
+    table.add_column("DDG", justify="right")
+    table.add_column("Note", style="dim")
+
+    def _num(value):
+        return f"{value:.2f}" if isinstance(value, (int, float)) else ""
+
+    colors = {"success": "green", "failed": "red", "skipped": "yellow"}
+    for result in results[-max_rows:]:
+        color = colors.get(result.status, "white")
+        note = result.error or (f"= {result.duplicate_of}" if result.duplicate_of else "")
+        table.add_row(
+            result.record_id,
+            str(result.sequence_length),
+            f"[{color}]{result.status}[/{color}]",
+            _num(result.avg_plddt),
+            result.ec_number or "",
+            _num(result.tm),
+            _num(result.stability_ddg),
+            note[:40],
+        )
+
+    return table
@@ -0,0 +1,154 @@
+"""
+Import-time benchmark.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter,
+parses the per-module timings CPython writes to stderr and reports the
+cumulative cost with the slowest modules behind it. ``IMPORT_BUDGETS``
+holds the cold-start budgets enforced by the test suite: the entry
+points must stay within their time budget and must not load any of the
+heavy dependencies the commands they serve do not need.
+"""
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Written to stderr right before the measured import, to leave out the
+# modules the interpreter loads at startup
+_START_MARKER = "synde-importtime-start"
+
+# Heavy third-party packages, loaded only by the code paths that use them
+HEAVY_MODULES = ["langgraph", "langchain_core", "celery", "redis", "requests", "numpy", "dotenv"]
+
+
+@dataclass(frozen=True)
+class ImportBudget:
+    """Cold-start budget of one module."""
+    module: str
+    max_ms: float
+    forbidden: List[str] = field(default_factory=lambda: list(HEAVY_MODULES))
+
+
+IMPORT_BUDGETS: List[ImportBudget] = [
+    # `synde version`, `synde list-nodes`: typer and rich only
+    ImportBudget("synde_cli.main", 400.0),
+    # Package roots export lazily (see synde_graph._lazy)
+    ImportBudget("synde_graph", 50.0),
+    ImportBudget("synde_graph.config", 50.0),
+    ImportBudget("synde_gpu", 50.0),
+    ImportBudget("synde_graph.utils", 50.0),
+    # The worker needs Redis for GPU tasks, but not Celery until it submits one
+    ImportBudget("synde_gpu.tasks", 1000.0, forbidden=["celery", "langgraph"]),
+]
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    """Import cost of a module, from the fastest of several runs."""
+    module: str
+    cumulative_ms: float
+    runs_ms: List[float]
+    records: List[ImportRecord]
+
+    @property
+    def loaded(self) -> List[str]:
+        """Every module the import loaded."""
+        return [r.module for r in self.records]
+
+    def loaded_packages(self, names: Sequence[str]) -> List[str]:
+        """Those of ``names`` the import loaded (as a package or any submodule)."""
+        top = {module.split(".")[0] for module in self.loaded}
+        return [name for name in names if name in top or name in self.loaded]
+
+    def slowest(self, n: int = 15) -> List[ImportRecord]:
+        """Modules with the most self time."""
+        return sorted(self.records, key=lambda r: r.self_us, reverse=True)[:n]
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable summary."""
+        return {
+            "module": self.module,
+            "cumulative_ms": round(self.cumulative_ms, 2),
+            "runs_ms": [round(ms, 2) for ms in self.runs_ms],
+            "heavy_modules": self.loaded_packages(HEAVY_MODULES),
+            "slowest": [
+                {"module": r.module, "self_ms": r.self_us / 1000, "cumulative_ms": r.cumulative_us / 1000}
+                for r in self.slowest()
+            ],
+        }
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    Records of ``-X importtime`` stderr, in output order.
+
+    Lines look like ``import time:  self [us] | cumulative | imported package``,
+    with the package name indented two spaces per nesting level. Other
+    lines (the header, tracebacks) are skipped.
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|", 2)
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Header
+        name = parts[2].rstrip()
+        indent = len(name) - len(name.lstrip(" "))
+        records.append(ImportRecord(name.strip(), self_us, cumulative_us, max(indent - 1, 0) // 2))
+    return records
+
+
+def measure_import(module: str, runs: int = 3, python: Optional[str] = None) -> ImportReport:
+    """
+    Import cost of ``module`` (with its parent packages) in fresh interpreters.
+
+    Args:
+        module: Dotted module name
+        runs: Interpreters to start; the fastest run is reported
+        python: Interpreter (default: the running one)
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get("PYTHONPATH")]))}
+    best: Optional[List[ImportRecord]] = None
+    runs_ms = []
+
+    for _ in range(max(runs, 1)):
+        proc = subprocess.run(
+            [
+                python or sys.executable, "-X", "importtime", "-c",
+                f"import sys; sys.stderr.write({_START_MARKER!r} + '\\n'); import {module}",
+            ],
+            capture_output=True, text=True, env=env, cwd=PROJECT_ROOT,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip()[-2000:]}")
+
+        records = parse_importtime(proc.stderr.partition(_START_MARKER)[2])
+        # Parent packages are imported first, as separate top-level entries
+        total = sum(r.cumulative_us for r in records if r.depth == 0)
+        runs_ms.append(total / 1000)
+        if best is None or runs_ms[-1] <= min(runs_ms):
+            best = records
+
+    return ImportReport(module, min(runs_ms), runs_ms, best or [])
@@ -7,15 +7,13 @@ and debugging checkpointed states.
 
 import os
 import sys
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
-from rich.markdown import Markdown
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -39,6 +37,7 @@ def run(
     pdb: Optional[str] = typer.Option(None, "--pdb", "-p", help="Path to PDB file"),
     ligand: Optional[str] = typer.Option(None, "--ligand", "-l", help="Ligand name or SMILES"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed output"),
+    record: Optional[Path] = typer.Option(None, "--record", help="Save a trace of the external calls for `synde replay`"),
 ):
     """
     Run a complete SynDe workflow.
@@ -46,11 +45,13 @@ def run(
     Examples:
         synde run "Predict EC number for P00720" --mock
         synde run "Generate thermostable variants" --sequence "MKTVRQ..." --mock
+        synde run "Predict Tm of MKTVRQ..." --record trace.bin
     """
     # Set mock mode
     if mock:
         os.environ["MOCK_GPU"] = "true"
 
+    from rich.progress import Progress, SpinnerColumn, TextColumn
     from synde_graph.graph import run_workflow
     from synde_cli.display import display_workflow_result
 
@@ -78,16 +79,23 @@ def run(
     ) as progress:
         task = progress.add_task("Running workflow...", total=None)
 
-        result = run_workflow(
-            user_query=query,
+        workflow_kwargs = dict(
             uploaded_pdb_path=pdb,
             uploaded_pdb_content=pdb_content,
             session_data=session_data if session_data else None,
         )
+        if record:
+            from synde_cli.replay import record_workflow
+
+            result, trace = record_workflow(record, query, **workflow_kwargs)
+        else:
+            result = run_workflow(user_query=query, **workflow_kwargs)
 
         progress.remove_task(task)
 
     display_workflow_result(result, verbose=verbose)
+    if record:
+        console.print(f"Trace of {len(trace.events)} external calls written to {record}")
 
 
 @app.command("test-node")
@@ -179,6 +187,344 @@ def debug(
         console.print("[red]No checkpoint database found[/red]")
 
 
+@app.command()
+def batch(
+    fasta: Path = typer.Argument(..., help="Multi-sequence FASTA file", exists=True, dir_okay=False),
+    properties: str = typer.Option("ec_number,tm", "--properties", "-P", help="Comma-separated properties"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Records screened at once"),
+    ligand: Optional[str] = typer.Option(None, "--ligand", "-l", help="Substrate SMILES (enables kcat)"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Write results (.csv or .parquet)"),
+    mock: bool = typer.Option(False, "--mock", "-m", help="Run with mock GPU responses"),
+):
+    """
+    Screen every sequence in a FASTA library with the prediction workflow.
+
+    Examples:
+        synde batch library.fasta --mock --output results.csv
+        synde batch library.fasta -P ec_number,tm,stability -c 8 -o results.parquet
+    """
+    if mock:
+        os.environ["MOCK_GPU"] = "true"
+
+    from rich.live import Live
+    from synde_graph.batch import iter_batch_screen, write_results
+    from synde_graph.utils.fasta import iter_fasta
+    from synde_cli.display import batch_results_table
+
+    # First pass keeps only the record IDs (for the output order); the
+    # screen streams the sequences from a second pass
+    with fasta.open() as f:
+        order = {record_id: i for i, (record_id, _) in enumerate(iter_fasta(f))}
+    if not order:
+        console.print("[red]No sequences found in FASTA file[/red]")
+        raise typer.Exit(1)
+
+    property_list = [p.strip() for p in properties.split(",") if p.strip()]
+    console.print(Panel(
+        f"[bold]Records:[/bold] {len(order)}  [bold]Properties:[/bold] {', '.join(property_list)}  "
+        f"[bold]Concurrency:[/bold] {concurrency}",
+        title="SynDe Batch Screen",
+    ))
+
+    results = []
+    live = Live(batch_results_table(results, len(order)), console=console, refresh_per_second=4)
+    with fasta.open() as f, live:
+        for result in iter_batch_screen(iter_fasta(f), property_list, concurrency, ligand_smiles=ligand):
+            results.append(result)
+            live.update(batch_results_table(results, len(order)))
+
+    if output:
+        write_results(sorted(results, key=lambda r: order[r.record_id]), output)
+        console.print(f"Results written to {output}")
+
+
+@app.command()
+def bench(
+    iterations: int = typer.Option(5, "--iterations", "-n", help="Passes over the query corpus"),
+    concurrency: int = typer.Option(1, "--concurrency", "-c", help="Workflows in flight at once"),
+    use_async: bool = typer.Option(False, "--async", help="Use run_workflow_async instead of threads"),
+    category: Optional[List[str]] = typer.Option(None, "--category", help="Only run this query category (repeatable)"),
+    corpus: Optional[str] = typer.Option(None, "--corpus", help="JSON query corpus (default: built-in)"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Write the JSON report here"),
+    baseline: Optional[str] = typer.Option(None, "--baseline", "-b", help="Compare against this JSON report"),
+    save_baseline: bool = typer.Option(False, "--save-baseline", help="Write the report to --baseline"),
+    tolerance: float = typer.Option(0.2, "--tolerance", help="Allowed regression vs baseline (0.2 = 20%)"),
+    mock: bool = typer.Option(True, "--mock/--no-mock", help="Run with mock GPU responses"),
+):
+    """
+    Benchmark end-to-end workflow latency and throughput.
+
+    Exits with code 1 when a baseline comparison shows a regression.
+
+    Examples:
+        synde bench -n 10 -c 4 --output bench.json
+        synde bench --async -c 8 --baseline benchmarks/baseline.json
+        synde bench --baseline benchmarks/baseline.json --save-baseline
+    """
+    if mock:
+        os.environ["MOCK_GPU"] = "true"
+
+    from synde_cli.bench import (
+        run_benchmark,
+        load_corpus,
+        save_report,
+        load_report,
+        compare_to_baseline,
+    )
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from synde_cli.display import display_bench_report
+
+    entries = load_corpus(corpus, category)
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task(f"Running {iterations * len(entries)} workflows...", total=None)
+        report = run_benchmark(
+            iterations=iterations,
+            concurrency=concurrency,
+            use_async=use_async,
+            corpus=entries,
+        )
+        progress.remove_task(task)
+
+    comparison = None
+    if baseline and os.path.exists(baseline) and not save_baseline:
+        comparison = compare_to_baseline(report, load_report(baseline), tolerance)
+        report["baseline_comparison"] = comparison
+
+    display_bench_report(report, comparison)
+
+    if output:
+        save_report(report, output)
+        console.print(f"Report written to {output}")
+
+    if save_baseline:
+        if not baseline:
+            console.print("[red]--save-baseline requires --baseline PATH[/red]")
+            raise typer.Exit(2)
+        save_report(report, baseline)
+        console.print(f"Baseline written to {baseline}")
+
+    if comparison and any(row["regression"] for row in comparison):
+        console.print(f"[red]Regression beyond {tolerance:.0%} of baseline[/red]")
+        raise typer.Exit(1)
+
+
+@app.command()
+def profile(
+    query: Optional[str] = typer.Argument(None, help="User query to profile (not with --replay)"),
+    mock: bool = typer.Option(False, "--mock", "-m", help="Run with mock GPU responses"),
+    sequence: Optional[str] = typer.Option(None, "--sequence", "-s", help="Protein sequence"),
+    pdb: Optional[str] = typer.Option(None, "--pdb", "-p", help="Path to PDB file"),
+    profiler: str = typer.Option("sampling", "--profiler", "-P", help="sampling or cprofile"),
+    interval: float = typer.Option(0.005, "--interval", help="Seconds between stack samples (sampling)"),
+    top: int = typer.Option(10, "--top", "-n", help="Functions and allocation sites shown per node"),
+    memory: bool = typer.Option(False, "--memory", help="Diff tracemalloc snapshots per node"),
+    collapsed: Path = typer.Option(Path("profile.folded"), "--collapsed", "-o", help="Collapsed-stack output file"),
+    json_output: Optional[Path] = typer.Option(None, "--json", help="Also write the report as JSON"),
+    replay: Optional[Path] = typer.Option(None, "--replay", "-r", help="Profile a replay of this trace (see `synde replay`)"),
+    scale: float = typer.Option(0.0, "--scale", help="Recorded latency factor under --replay"),
+):
+    """
+    Profile a workflow run and attribute CPU time (and allocations) to nodes.
+
+    Writes collapsed stacks for flamegraph.pl, speedscope or inferno.
+
+    Examples:
+        synde profile "Predict Tm of MKTVRQ..." --mock
+        synde profile "Generate thermostable variants" -s MKTVRQ... --mock -P cprofile --memory
+        synde profile --replay trace.bin
+        flamegraph.pl profile.folded > profile.svg
+    """
+    import json
+    from contextlib import nullcontext
+    from synde_cli.profiling import PROFILERS, profile_workflow
+    from synde_cli.display import display_profile_report
+
+    if profiler not in PROFILERS:
+        console.print(f"[red]Unknown profiler {profiler!r}; use one of: {', '.join(PROFILERS)}[/red]")
+        raise typer.Exit(1)
+    if (query is None) == (replay is None):
+        console.print("[red]Give either a query or --replay TRACE[/red]")
+        raise typer.Exit(1)
+    if mock:
+        os.environ["MOCK_GPU"] = "true"
+
+    serving = nullcontext()
+    if replay:
+        from synde_cli.replay import replaying, workflow_inputs
+
+        trace = _load_trace(replay)
+        if trace.meta.get("mock"):
+            os.environ["MOCK_GPU"] = "true"
+        query, workflow_kwargs = workflow_inputs(trace)
+        serving = replaying(trace, scale=scale)
+    else:
+        workflow_kwargs = dict(
+            uploaded_pdb_path=pdb,
+            uploaded_pdb_content=Path(pdb).read_text() if pdb and os.path.exists(pdb) else None,
+            session_data={"last_protein_sequence": sequence} if sequence else None,
+        )
+
+    with console.status(f"Profiling workflow ({profiler})..."), serving:
+        report = profile_workflow(
+            query,
+            profiler=profiler,
+            interval=interval,
+            memory=memory,
+            top=top,
+            **workflow_kwargs,
+        )
+
+    display_profile_report(report)
+
+    report.write_collapsed(collapsed)
+    console.print(f"Collapsed stacks written to {collapsed}")
+    if json_output:
+        json_output.write_text(json.dumps(report.to_dict(), indent=2))
+        console.print(f"Report written to {json_output}")
+
+
+@app.command()
+def replay(
+    trace_file: Path = typer.Argument(..., help="Trace written by `synde run --record`"),
+    scale: float = typer.Option(1.0, "--scale", help="Factor applied to recorded latencies (0 = no delay)"),
+    repeat: int = typer.Option(1, "--repeat", "-n", help="Replays to run"),
+    json_output: Optional[Path] = typer.Option(None, "--json", help="Also write the summary as JSON"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed output"),
+):
+    """
+    Rerun a recorded workflow with GPU and PubChem calls served from its trace.
+
+    No GPU worker or network is needed, and the run is deterministic. Exits
+    with status 1 if the workflow made calls the trace cannot answer.
+
+    Examples:
+        synde run "Predict Tm of MKTVRQ..." --record trace.bin
+        synde replay trace.bin
+        synde replay trace.bin --scale 0 --repeat 5 --json replay.json
+    """
+    import json
+    from synde_cli.replay import replay_workflow
+    from synde_cli.display import display_replay_report, display_workflow_result
+
+    trace = _load_trace(trace_file)
+    if scale < 0:
+        console.print("[red]--scale must be >= 0[/red]")
+        raise typer.Exit(1)
+    if trace.meta.get("mock"):
+        os.environ["MOCK_GPU"] = "true"
+
+    console.print(Panel(f"[bold blue]Query:[/bold blue] {trace.meta.get('query', '')}", title="SynDe Replay"))
+    with console.status(f"Replaying {len(trace.events)} external calls..."):
+        report = replay_workflow(trace, scale=scale, repeat=repeat)
+
+    display_workflow_result(report.result, verbose=verbose)
+    display_replay_report(report, trace)
+
+    if json_output:
+        json_output.write_text(json.dumps(report.to_dict(), indent=2))
+        console.print(f"Summary written to {json_output}")
+    if not report.deterministic:
+        raise typer.Exit(1)
+
+
+def _load_trace(path: Path):
+    """A WorkflowTrace from ``path``; exits with a message if it cannot be read."""
+    from synde_graph.utils.trace import WorkflowTrace
+
+    try:
+        return WorkflowTrace.load(path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+
+@app.command("runtime-report")
+def runtime_report(
+    db: Optional[str] = typer.Option(None, "--db", help="Runtime stats database (default: GPU_RUNTIME_STATS_DB)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON"),
+):
+    """
+    Summarize recorded GPU task runtimes and the fitted latency models.
+
+    Examples:
+        synde runtime-report
+        synde runtime-report --db synde_outputs/gpu_runtime_stats.db --json
+    """
+    import json
+    from dataclasses import asdict
+    from synde_graph.config import RuntimeStatsSettings
+    from synde_gpu.runtime_stats import RuntimeStatsStore
+    from synde_cli.display import display_runtime_report
+
+    path = Path(db) if db else RuntimeStatsSettings.DB_PATH
+    if not path.exists():
+        console.print(f"[red]No runtime stats database at {path}[/red]")
+        raise typer.Exit(1)
+
+    store = RuntimeStatsStore(path)
+    rows = store.report()
+    fits = {model: store.fit(model) for model in dict.fromkeys(row["model"] for row in rows)}
+
+    if as_json:
+        payload = {
+            "buckets": rows,
+            "fits": {
+                model: {k: v for k, v in asdict(fit).items() if k != "residuals"} if fit else None
+                for model, fit in fits.items()
+            },
+        }
+        typer.echo(json.dumps(payload, indent=2))
+    else:
+        display_runtime_report(rows, fits)
+
+
+@app.command("import-time")
+def import_time(
+    modules: Optional[List[str]] = typer.Argument(None, help="Modules to import (default: the budgeted entry points)"),
+    runs: int = typer.Option(3, "--runs", "-r", help="Fresh interpreters per module; the fastest counts"),
+    top: int = typer.Option(10, "--top", help="Slowest modules to show per import"),
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON"),
+):
+    """
+    Measure cold-start import time with python -X importtime.
+
+    Exits non-zero when a budgeted module exceeds its time budget or loads
+    a heavy dependency it should not.
+
+    Examples:
+        synde import-time
+        synde import-time synde_graph.graph --runs 5 --json
+    """
+    import json
+    from synde_cli.importtime import IMPORT_BUDGETS, measure_import
+    from synde_cli.display import display_import_report
+
+    budgets = {budget.module: budget for budget in IMPORT_BUDGETS}
+    reports = [measure_import(module, runs=runs) for module in (modules or list(budgets))]
+
+    over = [
+        report.module for report in reports
+        if report.module in budgets and (
+            report.cumulative_ms > budgets[report.module].max_ms
+            or report.loaded_packages(budgets[report.module].forbidden)
+        )
+    ]
+
+    if as_json:
+        typer.echo(json.dumps([report.to_dict() for report in reports], indent=2))
+    else:
+        display_import_report(reports, budgets, top=top)
+
+    if over:
+        console.print(f"[red]Over budget: {', '.join(over)}[/red]")
+        raise typer.Exit(1)
+
+
 @app.command()
 def list_nodes():
     """List all available workflow nodes."""
@@ -0,0 +1,425 @@
+"""
+Per-node CPU and memory profiling of workflow runs.
+
+Runs a query through run_workflow with a callback handler that knows which
+graph node each thread is executing (subgraph nodes are nested under the
+node that invoked the subgraph, e.g. ``prediction_subgraph/run_esmfold``),
+and attributes profile data to those nodes:
+
+- ``sampling``: a background thread samples every thread's Python stack
+  every ``interval`` seconds (wall clock, so waits count too). Samples
+  become collapsed stacks (``node;frame;frame count``) for flamegraph.pl,
+  speedscope or inferno, and a per-node function table.
+- ``cprofile``: a deterministic cProfile per node run. The collapsed file
+  then has one line per node and function, weighted by self time in
+  microseconds, since cProfile keeps caller edges rather than stacks.
+
+With ``memory=True``, tracemalloc snapshots taken when a node starts and
+finishes are diffed and the largest allocation growth per node is kept.
+Snapshots cover the whole process, so nodes running concurrently share
+their allocations.
+
+Usage:
+    report = profile_workflow("Predict Tm of MKTV...", profiler="sampling", memory=True)
+    report.write_collapsed("workflow.folded")
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from synde_graph.utils.instrumentation import node_name_from_callback
+
+PROFILERS = ("sampling", "cprofile")
+
+# Attribution of runner-thread samples taken outside any node
+OUTSIDE_NODES = "(langgraph)"
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Allocations made by the profiler itself
+_OWN_FILES = {__file__, tracemalloc.__file__, cProfile.__file__, pstats.__file__}
+
+
+@dataclass
+class FunctionStat:
+    """Time of one function within a node."""
+    function: str
+    self_s: float
+    total_s: float
+    calls: Optional[int] = None  # cProfile only
+
+
+@dataclass
+class AllocationStat:
+    """Net allocation growth at one source line during a node."""
+    location: str
+    size_bytes: int
+    count: int
+
+
+@dataclass
+class NodeProfile:
+    """Profile of one node (all its runs)."""
+    node: str
+    calls: int = 0
+    wall_s: float = 0.0
+    profiled_s: float = 0.0
+    functions: List[FunctionStat] = field(default_factory=list)
+    allocations: List[AllocationStat] = field(default_factory=list)
+
+
+@dataclass
+class ProfileReport:
+    """Result of profile_workflow."""
+    query: str
+    profiler: str
+    interval: Optional[float]
+    total_s: float
+    nodes: List[NodeProfile]
+    collapsed: List[str]
+    result: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def write_collapsed(self, path) -> Path:
+        """Write the collapsed stacks (one ``stack count`` per line)."""
+        path = Path(path)
+        path.write_text("\n".join(self.collapsed) + "\n" if self.collapsed else "")
+        return path
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable report (without the workflow result)."""
+        return {
+            "query": self.query,
+            "profiler": self.profiler,
+            "interval": self.interval,
+            "total_s": self.total_s,
+            "nodes": [asdict(node) for node in self.nodes],
+        }
+
+
+def _location(filename: str) -> str:
+    """Short source path: relative to the project, or to site-packages."""
+    try:
+        return str(Path(filename).resolve().relative_to(PROJECT_ROOT))
+    except (ValueError, OSError):
+        pass
+    marker = f"site-packages{os.sep}"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+def _code_label(code: CodeType) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({_location(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _pstats_label(key: Tuple[str, int, str]) -> str:
+    filename, line, name = key
+    if filename == "~":
+        return name.replace(";", ",")  # Built-in
+    return f"{name} ({_location(filename)}:{line})".replace(";", ",")
+
+
+class NodeProfiler(BaseCallbackHandler):
+    """
+    Callback handler attributing profile data to graph nodes.
+
+    Tracks the node path each thread is running from LangGraph's chain
+    callbacks, which are called from the thread that runs the node.
+    """
+
+    def __init__(self, profiler: str = "sampling", interval: float = 0.005, memory: bool = False):
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r}; expected one of {', '.join(PROFILERS)}")
+        self.profiler = profiler
+        self.interval = interval
+        self.memory = memory
+        self.runner: Optional[int] = None
+        self.elapsed = 0.0
+
+        self._lock = threading.Lock()
+        self._paths: Dict[UUID, Tuple[str, ...]] = {}  # Every chain run -> enclosing node path
+        self._nodes: Dict[UUID, Tuple[int, Tuple[str, ...], float]] = {}  # Node run -> thread, path, start
+        self._threads: Dict[int, List[UUID]] = {}  # Thread -> stack of node runs
+        self.wall: Dict[Tuple[str, ...], List[float]] = {}
+
+        # sampling
+        self.samples: Counter = Counter()  # (path, code stack) -> samples
+        self.ticks = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # cprofile
+        self._profiles: Dict[UUID, cProfile.Profile] = {}
+        self.stats: Dict[Tuple[str, ...], pstats.Stats] = {}
+        self.unprofiled = 0
+
+        # memory
+        self._snapshots: Dict[UUID, tracemalloc.Snapshot] = {}
+        self.allocations: Dict[Tuple[str, ...], Counter] = {}
+        self.allocation_counts: Dict[Tuple[str, ...], Counter] = {}
+
+    # -------------------------------------------------------------------------
+    # Run lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start profiling; the calling thread is the one running the graph."""
+        self.runner = threading.get_ident()
+        self._started = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.profiler == "sampling":
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="synde-profiler", daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> float:
+        """Stop profiling; returns the elapsed wall time."""
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.elapsed = time.perf_counter() - self._started
+        return self.elapsed
+
+    # -------------------------------------------------------------------------
+    # Callbacks
+    # -------------------------------------------------------------------------
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = node_name_from_callback(kwargs.get("name"), metadata)
+        thread = threading.get_ident()
+        with self._lock:
+            path = self._paths.get(parent_run_id, ())
+            if node:
+                path = path + (node,)
+            self._paths[run_id] = path
+            if not node:
+                return
+            stack = self._threads.setdefault(thread, [])
+            outer = stack[-1] if stack else None
+            stack.append(run_id)
+            self._nodes[run_id] = (thread, path, time.perf_counter())
+
+        # Profiler bookkeeping (snapshots included) stays out of the profiles
+        if self.profiler == "cprofile" and outer in self._profiles:
+            # One profiler per thread at a time: pause the enclosing node's
+            self._profiles[outer].disable()
+        if self.memory:
+            self._snapshots[run_id] = tracemalloc.take_snapshot()
+        if self.profiler == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self._profiles[run_id] = profile
+            except ValueError:
+                # Another thread's profiler is active (Python 3.12+)
+                self.unprofiled += 1
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            self._paths.pop(run_id, None)
+            started = self._nodes.pop(run_id, None)
+            if started is None:
+                return
+            thread, path, start = started
+            stack = self._threads.get(thread, [])
+            if run_id in stack:
+                stack.remove(run_id)
+            outer = stack[-1] if stack else None
+            self.wall.setdefault(path, []).append(time.perf_counter() - start)
+
+        profile = self._profiles.pop(run_id, None)
+        if profile is not None:
+            profile.disable()
+            with self._lock:
+                if path in self.stats:
+                    self.stats[path].add(profile)
+                else:
+                    self.stats[path] = pstats.Stats(profile)
+
+        before = self._snapshots.pop(run_id, None)
+        if before is not None and tracemalloc.is_tracing():
+            diff = tracemalloc.take_snapshot().compare_to(before, "lineno")
+            with self._lock:
+                sizes = self.allocations.setdefault(path, Counter())
+                counts = self.allocation_counts.setdefault(path, Counter())
+                for stat in diff:
+                    frame = stat.traceback[0]
+                    if stat.size_diff and frame.filename not in _OWN_FILES:
+                        location = f"{_location(frame.filename)}:{frame.lineno}"
+                        sizes[location] += stat.size_diff
+                        counts[location] += stat.count_diff
+
+        if self.profiler == "cprofile" and outer in self._profiles:
+            self._profiles[outer].enable()
+
+    # -------------------------------------------------------------------------
+    # Sampling
+    # -------------------------------------------------------------------------
+
+    def current_path(self, thread: int) -> Optional[Tuple[str, ...]]:
+        """Node path a thread is running, or None outside nodes."""
+        with self._lock:
+            stack = self._threads.get(thread)
+            if stack:
+                return self._nodes[stack[-1]][1]
+        return None
+
+    def _sample_loop(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.ticks += 1
+            for thread, frame in sys._current_frames().items():
+                if thread == me:
+                    continue
+                path = self.current_path(thread)
+                if path is None:
+                    if thread != self.runner:
+                        continue  # Idle pool threads
+                    path = (OUTSIDE_NODES,)
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                if _CALLBACK_CODES.intersection(codes):
+                    continue  # Profiler bookkeeping
+                self.samples[(path, tuple(reversed(codes)))] += 1
+
+    # -------------------------------------------------------------------------
+    # Report
+    # -------------------------------------------------------------------------
+
+    def report(self, query: str, top: int = 10, result: Optional[Dict[str, Any]] = None) -> ProfileReport:
+        """Per-node profiles and collapsed stacks of the finished run."""
+        nodes: Dict[Tuple[str, ...], NodeProfile] = {}
+
+        def node_for(path: Tuple[str, ...]) -> NodeProfile:
+            if path not in nodes:
+                times = self.wall.get(path, [])
+                nodes[path] = NodeProfile("/".join(path), calls=len(times), wall_s=sum(times))
+            return nodes[path]
+
+        for path in self.wall:
+            node_for(path)
+
+        collapsed: List[str] = []
+        if self.profiler == "sampling":
+            seconds = self.elapsed / self.ticks if self.ticks else self.interval
+            self_samples: Dict[Tuple[str, ...], Counter] = {}
+            total_samples: Dict[Tuple[str, ...], Counter] = {}
+            for (path, codes), count in self.samples.items():
+                node_for(path).profiled_s += count * seconds
+                if codes:
+                    self_samples.setdefault(path, Counter())[codes[-1]] += count
+                totals = total_samples.setdefault(path, Counter())
+                for code in set(codes):
+                    totals[code] += count
+                frames = [f"[{name}]" for name in path] + [_code_label(code) for code in codes]
+                collapsed.append(f"{';'.join(frames)} {count}")
+
+            for path, counts in self_samples.items():
+                node_for(path).functions = [
+                    FunctionStat(_code_label(code), n * seconds, total_samples[path][code] * seconds)
+                    for code, n in counts.most_common(top)
+                ]
+        else:
+            for path, stats in self.stats.items():
+                node = node_for(path)
+                entries = stats.stats  # (file, line, name) -> (cc, nc, tt, ct, callers)
+                node.profiled_s = sum(tt for _, _, tt, _, _ in entries.values())
+                ranked = sorted(entries.items(), key=lambda item: item[1][2], reverse=True)
+                node.functions = [
+                    FunctionStat(_pstats_label(key), tt, ct, calls=nc)
+                    for key, (cc, nc, tt, ct, callers) in ranked[:top]
+                ]
+                prefix = ";".join(f"[{name}]" for name in path)
+                for key, (cc, nc, tt, ct, callers) in ranked:
+                    micros = int(tt * 1e6)
+                    if micros:
+                        collapsed.append(f"{prefix};{_pstats_label(key)} {micros}")
+
+        for path, sizes in self.allocations.items():
+            counts = self.allocation_counts[path]
+            node_for(path).allocations = [
+                AllocationStat(location, size, counts[location])
+                for location, size in sizes.most_common(top) if size > 0
+            ]
+
+        return ProfileReport(
+            query=query,
+            profiler=self.profiler,
+            interval=self.interval if self.profiler == "sampling" else None,
+            total_s=self.elapsed,
+            nodes=sorted(nodes.values(), key=lambda node: node.profiled_s, reverse=True),
+            collapsed=sorted(collapsed),
+            result=result or {},
+        )
+
+
+# Samples inside these are the profiler's own work
+_CALLBACK_CODES = {NodeProfiler.on_chain_start.__code__, NodeProfiler._finish.__code__}
+
+
+def profile_workflow(
+    query: str,
+    profiler: str = "sampling",
+    interval: float = 0.005,
+    memory: bool = False,
+    top: int = 10,
+    **workflow_kwargs: Any,
+) -> ProfileReport:
+    """
+    Run a query through the workflow under a profiler.
+
+    Args:
+        query: User query
+        profiler: "sampling" or "cprofile"
+        interval: Seconds between stack samples (sampling only)
+        memory: Diff tracemalloc snapshots per node
+        top: Functions and allocation sites kept per node
+        **workflow_kwargs: Passed to run_workflow (session_data, uploaded_pdb_content, ...)
+
+    Returns:
+        ProfileReport, with the final workflow state as ``result``
+    """
+    from synde_graph.graph import run_workflow
+
+    node_profiler = NodeProfiler(profiler=profiler, interval=interval, memory=memory)
+    node_profiler.start()
+    try:
+        result = run_workflow(query, callbacks=[node_profiler], **workflow_kwargs)
+    finally:
+        node_profiler.stop()
+    return node_profiler.report(query, top=top, result=result)
@@ -0,0 +1,208 @@
+"""
+Workflow recording and deterministic replay.
+
+``record_workflow`` runs a query with a TraceRecorder installed and saves
+the trace: the workflow inputs plus every external call (GPU tasks,
+PubChem lookups) with its output and latency. ``replay_workflow`` runs
+the same inputs again with the calls served from the trace, so the graph
+follows the recorded path without a GPU worker or network access, with
+the recorded latencies scaled by ``scale`` (0 measures the workflow's own
+CPU cost alone). See synde_graph.utils.trace.
+
+Both run with an empty structure registry of their own, so a structure
+cached by an earlier run cannot skip (or add) an ESMFold call, and seed
+the ``random`` module (used by the placeholder predictors and mutant
+generation) with the seed kept in the trace.
+
+Usage:
+    record_workflow("trace.bin", "Predict Tm of MKTV...")
+    report = replay_workflow(WorkflowTrace.load("trace.bin"), scale=0)
+"""
+
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from synde_graph.config import StructureRegistrySettings
+from synde_graph.utils.structure_registry import StructureRegistry, set_structure_registry
+from synde_graph.utils.trace import (
+    TraceRecorder,
+    TraceReplay,
+    WorkflowTrace,
+    set_trace_recorder,
+    set_trace_replay,
+)
+
+# run_workflow arguments kept in the trace header
+_WORKFLOW_INPUTS = ("user_id", "uploaded_pdb_path", "uploaded_pdb_content", "session_data")
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of replaying a trace."""
+    query: str
+    scale: float
+    runs_s: List[float]  # Wall time of each replay
+    recorded_s: Optional[float]  # Wall time of the recorded run
+    recorded_latency_s: float  # Time the recorded run spent in external calls
+    delayed_s: float  # Time the last replay slept in their place
+    events: int
+    served: int
+    misses: List[Tuple[str, str]] = field(default_factory=list)
+    result: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def wall_s(self) -> float:
+        """Median replay wall time."""
+        return statistics.median(self.runs_s)
+
+    @property
+    def deterministic(self) -> bool:
+        """Every external call was answered from the trace and every event was used."""
+        return not self.misses and self.served == self.events
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable summary (without the workflow result)."""
+        return {
+            "query": self.query,
+            "scale": self.scale,
+            "wall_s": round(self.wall_s, 4),
+            "runs_s": [round(s, 4) for s in self.runs_s],
+            "recorded_s": self.recorded_s,
+            "recorded_latency_s": round(self.recorded_latency_s, 4),
+            "delayed_s": round(self.delayed_s, 4),
+            "events": self.events,
+            "served": self.served,
+            "misses": [f"{kind}:{name}" for kind, name in self.misses],
+        }
+
+
+@contextmanager
+def _private_structure_registry() -> Iterator[None]:
+    """Use an empty, temporary structure registry inside the block."""
+    if not StructureRegistrySettings.ENABLED:
+        yield
+        return
+    with tempfile.TemporaryDirectory(prefix="synde-trace-") as root:
+        set_structure_registry(StructureRegistry(root))
+        try:
+            yield
+        finally:
+            # The default registry is reopened on next use
+            set_structure_registry(None)
+
+
+def record_workflow(
+    path: Union[str, Path],
+    query: str,
+    seed: Optional[int] = None,
+    **workflow_kwargs: Any,
+) -> Tuple[Dict[str, Any], WorkflowTrace]:
+    """
+    Run a query and save the trace of its external calls.
+
+    Args:
+        path: Trace file to write
+        query: User query
+        seed: Seed for the ``random`` module (default: drawn at random)
+        **workflow_kwargs: Passed to run_workflow (session_data, uploaded_pdb_content, ...)
+
+    Returns:
+        The final workflow state and the saved trace
+    """
+    from synde_graph.graph import run_workflow
+    from synde_gpu.mocks import is_mock_mode
+
+    job_id = workflow_kwargs.pop("job_id", None) or str(uuid.uuid4())[:8]
+    seed = seed if seed is not None else random.randrange(2**32)
+    recorder = TraceRecorder(meta={
+        "query": query,
+        "job_id": job_id,
+        "seed": seed,
+        "mock": is_mock_mode(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "inputs": {name: workflow_kwargs.get(name) for name in _WORKFLOW_INPUTS},
+    })
+
+    set_trace_recorder(recorder)
+    start = time.perf_counter()
+    try:
+        with _private_structure_registry():
+            random.seed(seed)
+            result = run_workflow(query, job_id=job_id, **workflow_kwargs)
+    finally:
+        set_trace_recorder(None)
+
+    trace = recorder.trace()
+    trace.meta["wall_s"] = round(time.perf_counter() - start, 4)
+    trace.save(path)
+    return result, trace
+
+
+def workflow_inputs(trace: WorkflowTrace) -> Tuple[str, Dict[str, Any]]:
+    """The query and run_workflow arguments of a recorded run."""
+    inputs = {name: value for name, value in trace.meta.get("inputs", {}).items() if value is not None}
+    return trace.meta.get("query", ""), {"job_id": trace.meta.get("job_id"), **inputs}
+
+
+@contextmanager
+def replaying(trace: WorkflowTrace, scale: float = 1.0) -> Iterator[TraceReplay]:
+    """Serve external calls from ``trace`` inside the block, seeded as recorded."""
+    replay = TraceReplay(trace, scale=scale)
+    with _private_structure_registry():
+        if trace.meta.get("seed") is not None:
+            random.seed(trace.meta["seed"])
+        set_trace_replay(replay)
+        try:
+            yield replay
+        finally:
+            set_trace_replay(None)
+
+
+def replay_workflow(
+    trace: WorkflowTrace,
+    scale: float = 1.0,
+    repeat: int = 1,
+    callbacks: Optional[List[Any]] = None,
+) -> ReplayReport:
+    """
+    Rerun a recorded workflow with its external calls served from the trace.
+
+    Args:
+        trace: The recorded run
+        scale: Factor applied to recorded latencies (0 = no delay)
+        repeat: Replays to run; the report has each wall time
+        callbacks: LangChain callback handlers (e.g. NodeTimer)
+
+    Returns:
+        ReplayReport, with the final state of the last replay as ``result``
+    """
+    from synde_graph.graph import run_workflow
+
+    query, kwargs = workflow_inputs(trace)
+    runs_s = []
+    for _ in range(max(repeat, 1)):
+        with replaying(trace, scale) as replay:
+            start = time.perf_counter()
+            result = run_workflow(query, callbacks=callbacks, **kwargs)
+            runs_s.append(time.perf_counter() - start)
+
+    return ReplayReport(
+        query=query,
+        scale=scale,
+        runs_s=runs_s,
+        recorded_s=trace.meta.get("wall_s"),
+        recorded_latency_s=trace.recorded_latency,
+        delayed_s=replay.delayed,
+        events=len(trace.events),
+        served=replay.served,
+        misses=replay.misses,
+        result=result,
+    )
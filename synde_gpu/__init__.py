@@ -2,30 +2,88 @@
 GPU task interface for SynDe LangGraph.
 
 Provides task proxies to synde-minimal GPU tasks, an improved async manager,
-distributed locking, and mock responses for testing.
+priority scheduling with admission control, per-model circuit breakers,
+a ledger for reattaching after workflow retries, distributed locking, and
+mock responses for testing.
 """
 
-from synde_gpu.tasks import (
-    call_esmfold,
-    call_clean_ec,
-    call_deepenzyme,
-    call_temberture,
-    call_flan_extractor,
-    call_fpocket,
-)
-
-from synde_gpu.manager import (
-    GpuTaskManager,
-    TaskStatus,
-    GpuTaskResult,
-    execute_gpu_task,
-)
-
-from synde_gpu.mocks import (
-    MockGpuResponses,
-    get_mock_response,
-    is_mock_mode,
-)
+from typing import TYPE_CHECKING
+
+from synde_graph._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from synde_gpu.tasks import (
+        call_esmfold,
+        call_clean_ec,
+        call_deepenzyme,
+        call_temberture,
+        call_flan_extractor,
+        call_fpocket,
+    )
+
+    from synde_gpu.circuit import (
+        CircuitBreaker,
+        ResultCache,
+        circuit_states,
+        get_circuit_breaker,
+    )
+
+    from synde_gpu.ledger import (
+        GpuTaskLedger,
+        get_task_ledger,
+    )
+
+    from synde_gpu.manager import (
+        GpuTaskManager,
+        TaskStatus,
+        GpuTaskResult,
+        execute_gpu_task,
+    )
+
+    from synde_gpu.mocks import (
+        MockGpuResponses,
+        get_mock_response,
+        is_mock_mode,
+        seed_mock_responses,
+    )
+
+    from synde_gpu.polling import (
+        EtaSchedule,
+        ExponentialBackoff,
+        FixedInterval,
+        PollingStrategy,
+        default_strategy,
+        detection_lag_summary,
+    )
+
+    from synde_gpu.runtime_stats import (
+        RuntimeStatsStore,
+        get_runtime_stats,
+        predict_runtime,
+        runtime_timeout,
+        typical_runtime,
+    )
+
+    from synde_gpu.scheduling import (
+        AdmissionController,
+        GpuAdmissionRejected,
+        PRIORITY_BACKGROUND,
+        PRIORITY_BATCH,
+        PRIORITY_INTERACTIVE,
+        get_admission_controller,
+        priority_class,
+        queue_depths,
+        queue_for,
+        set_priority_class,
+    )
+
+    from synde_gpu.simulator import (
+        GpuSimulator,
+        SimulatedAsyncResult,
+        get_simulator,
+        is_simulated_mode,
+        load_profile,
+    )
 
 __all__ = [
     # Task proxies
@@ -35,6 +93,14 @@ __all__ = [
     "call_temberture",
     "call_flan_extractor",
     "call_fpocket",
+    # Circuit breakers
+    "CircuitBreaker",
+    "ResultCache",
+    "circuit_states",
+    "get_circuit_breaker",
+    # Ledger
+    "GpuTaskLedger",
+    "get_task_ledger",
     # Manager
     "GpuTaskManager",
     "TaskStatus",
@@ -44,4 +110,99 @@ __all__ = [
     "MockGpuResponses",
     "get_mock_response",
     "is_mock_mode",
+    "seed_mock_responses",
+    # Polling
+    "EtaSchedule",
+    "ExponentialBackoff",
+    "FixedInterval",
+    "PollingStrategy",
+    "default_strategy",
+    "detection_lag_summary",
+    # Runtime history
+    "RuntimeStatsStore",
+    "get_runtime_stats",
+    "predict_runtime",
+    "runtime_timeout",
+    "typical_runtime",
+    # Scheduling
+    "AdmissionController",
+    "GpuAdmissionRejected",
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_BATCH",
+    "PRIORITY_INTERACTIVE",
+    "get_admission_controller",
+    "priority_class",
+    "queue_depths",
+    "queue_for",
+    "set_priority_class",
+    # Simulator
+    "GpuSimulator",
+    "SimulatedAsyncResult",
+    "get_simulator",
+    "is_simulated_mode",
+    "load_profile",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "synde_gpu.tasks": [
+        "call_esmfold",
+        "call_clean_ec",
+        "call_deepenzyme",
+        "call_temberture",
+        "call_flan_extractor",
+        "call_fpocket",
+    ],
+    "synde_gpu.circuit": [
+        "CircuitBreaker",
+        "ResultCache",
+        "circuit_states",
+        "get_circuit_breaker",
+    ],
+    "synde_gpu.ledger": ["GpuTaskLedger", "get_task_ledger"],
+    "synde_gpu.manager": [
+        "GpuTaskManager",
+        "TaskStatus",
+        "GpuTaskResult",
+        "execute_gpu_task",
+    ],
+    "synde_gpu.mocks": [
+        "MockGpuResponses",
+        "get_mock_response",
+        "is_mock_mode",
+        "seed_mock_responses",
+    ],
+    "synde_gpu.polling": [
+        "EtaSchedule",
+        "ExponentialBackoff",
+        "FixedInterval",
+        "PollingStrategy",
+        "default_strategy",
+        "detection_lag_summary",
+    ],
+    "synde_gpu.runtime_stats": [
+        "RuntimeStatsStore",
+        "get_runtime_stats",
+        "predict_runtime",
+        "runtime_timeout",
+        "typical_runtime",
+    ],
+    "synde_gpu.scheduling": [
+        "AdmissionController",
+        "GpuAdmissionRejected",
+        "PRIORITY_BACKGROUND",
+        "PRIORITY_BATCH",
+        "PRIORITY_INTERACTIVE",
+        "get_admission_controller",
+        "priority_class",
+        "queue_depths",
+        "queue_for",
+        "set_priority_class",
+    ],
+    "synde_gpu.simulator": [
+        "GpuSimulator",
+        "SimulatedAsyncResult",
+        "get_simulator",
+        "is_simulated_mode",
+        "load_profile",
+    ],
+})
@@ -0,0 +1,331 @@
+"""
+Per-model circuit breakers and fallbacks for GPU tasks.
+
+When a GPU worker is down, every call to its model used to wait out the
+full timeout. A circuit breaker per model counts consecutive failures and
+timeouts; once ``GPU_CIRCUIT_FAILURES`` is reached it opens and calls
+fail fast. After ``GPU_CIRCUIT_RECOVERY`` seconds one probe call is let
+through (half-open): success closes the circuit, failure re-opens it.
+State lives in Redis, so all workers see the same circuit.
+
+While a call fails or its circuit is open, the model's fallback
+(GPU_FALLBACK) decides what the caller gets:
+
+- "cache": the last successful result for the same inputs, if any. Inputs
+  are compared by content (sequence, SMILES, PDB digest), not by per-job
+  arguments such as job ids or structure file paths
+- "skip": TaskStatus.UNAVAILABLE at once; nodes report the model as
+  skipped instead of blocking the workflow
+
+Usage:
+    breaker = get_circuit_breaker()
+    if breaker.allow("temberture"):
+        ...run the task...
+        breaker.record_success("temberture")
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import redis
+from redis.backoff import NoBackoff
+from redis.exceptions import RedisError
+from redis.retry import Retry
+
+from synde_graph.config import LANGGRAPH_CHECKPOINT_DB, CircuitBreakerSettings, get_redis_url
+from synde_gpu.ledger import input_hash
+from synde_gpu.locking import parse_mapping
+from synde_gpu.scheduling import TASK_MODELS
+
+logger = logging.getLogger(__name__)
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+UNKNOWN = "unknown"  # Redis unavailable; calls are allowed as if closed
+
+# Fallback modes
+FALLBACK_CACHE = "cache"
+FALLBACK_SKIP = "skip"
+
+# After a Redis error, seconds during which breakers stay out of the way
+REDIS_RETRY_AFTER = 30.0
+
+
+# KEYS: circuit hash. ARGV: recovery timeout, probe ttl.
+# Returns {state, allowed}; in half-open state one caller at a time probes.
+ALLOW_SCRIPT = """
+local opened = redis.call('HGET', KEYS[1], 'opened_at')
+if not opened then
+    return {'closed', 1}
+end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+if now - tonumber(opened) < tonumber(ARGV[1]) then
+    return {'open', 0}
+end
+local probe = tonumber(redis.call('HGET', KEYS[1], 'probe_until') or '0')
+if probe > now then
+    return {'half_open', 0}
+end
+redis.call('HSET', KEYS[1], 'probe_until', tostring(now + tonumber(ARGV[2])))
+return {'half_open', 1}
+"""
+
+# KEYS: circuit hash. ARGV: failure threshold, key ttl.
+# Counts a failure; trips the circuit at the threshold and re-opens it
+# after a failed probe. Returns the consecutive failure count.
+FAILURE_SCRIPT = """
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+if redis.call('HEXISTS', KEYS[1], 'opened_at') == 1 or failures >= tonumber(ARGV[1]) then
+    local t = redis.call('TIME')
+    redis.call('HSET', KEYS[1], 'opened_at', tostring(tonumber(t[1]) + tonumber(t[2]) / 1000000))
+    redis.call('HDEL', KEYS[1], 'probe_until')
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return failures
+"""
+
+
+def _client() -> redis.Redis:
+    return redis.Redis.from_url(
+        get_redis_url(LANGGRAPH_CHECKPOINT_DB),
+        decode_responses=True,
+        socket_connect_timeout=1,
+        socket_timeout=1,
+        retry=Retry(NoBackoff(), 0),
+    )
+
+
+class CircuitBreaker:
+    """
+    Redis-backed circuit breaker per GPU model.
+
+    Redis errors never block GPU work: the breaker then allows every call
+    and stops consulting Redis for REDIS_RETRY_AFTER seconds.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        failure_threshold: int = CircuitBreakerSettings.FAILURE_THRESHOLD,
+        recovery_timeout: int = CircuitBreakerSettings.RECOVERY_TIMEOUT,
+        reset_after: int = CircuitBreakerSettings.RESET_AFTER,
+        prefix: str = "synde:gpu_circuit",
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            redis_client: Optional Redis client (defaults to the checkpoint DB)
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_timeout: Seconds a circuit stays open before a probe
+            reset_after: Seconds without failures after which a circuit's
+                state is dropped
+            prefix: Key prefix
+        """
+        self.redis = redis_client or _client()
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.reset_after = max(reset_after, recovery_timeout)
+        self.prefix = prefix
+        self._allow = self.redis.register_script(ALLOW_SCRIPT)
+        self._failure = self.redis.register_script(FAILURE_SCRIPT)
+        self._unavailable_until = 0.0
+
+    def _key(self, model: str) -> str:
+        return f"{self.prefix}:{model}"
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._unavailable_until
+
+    def _redis_failed(self, action: str, model: str, error: RedisError) -> None:
+        logger.warning(f"Circuit breaker could not {action} for {model}: {error}")
+        self._unavailable_until = time.monotonic() + REDIS_RETRY_AFTER
+
+    def allow(self, model: str) -> bool:
+        """Whether a call to ``model`` may go ahead (closed, or the half-open probe)."""
+        if not self._available():
+            return True
+        try:
+            # A probe that never reports back is replaced after recovery_timeout
+            _, allowed = self._allow(
+                keys=[self._key(model)], args=[self.recovery_timeout, self.recovery_timeout]
+            )
+            return bool(int(allowed))
+        except RedisError as e:
+            self._redis_failed("check the circuit", model, e)
+            return True
+
+    def record_success(self, model: str) -> None:
+        """Close the model's circuit and reset its failure count."""
+        if not self._available():
+            return
+        try:
+            self.redis.delete(self._key(model))
+        except RedisError as e:
+            self._redis_failed("record a success", model, e)
+
+    def record_failure(self, model: str) -> int:
+        """Count a failure or timeout; returns the consecutive failures (0 if unknown)."""
+        if not self._available():
+            return 0
+        try:
+            return int(self._failure(
+                keys=[self._key(model)], args=[self.failure_threshold, self.reset_after]
+            ))
+        except RedisError as e:
+            self._redis_failed("record a failure", model, e)
+            return 0
+
+    def state(self, model: str) -> str:
+        """
+        Current state of the model's circuit: "closed", "open" or "half_open",
+        or "unknown" while Redis is unavailable (calls are then allowed).
+        """
+        if not self._available():
+            return UNKNOWN
+        try:
+            opened_at = self.redis.hget(self._key(model), "opened_at")
+            if opened_at is None:
+                return CLOSED
+            seconds, micros = self.redis.time()
+        except RedisError as e:
+            self._redis_failed("read the circuit", model, e)
+            return UNKNOWN
+        now = seconds + micros / 1_000_000
+        return OPEN if now - float(opened_at) < self.recovery_timeout else HALF_OPEN
+
+
+def _file_digest(path: Any) -> Optional[str]:
+    """SHA-256 of a file's content, or None if it cannot be read."""
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except (OSError, TypeError):
+        return None
+
+
+def content_inputs(model: str, args: tuple) -> Optional[tuple]:
+    """
+    The inputs that determine a task's result, for cache keys.
+
+    Per-job arguments (job ids, record names, per-job structure paths) are
+    dropped and structure files are replaced by the digest of their content,
+    so the same inputs hit the cache from any workflow. Returns None when a
+    structure cannot be read, in which case the result is not cached.
+    """
+    if model == "esmfold":  # (job_id, sequence)
+        return tuple(args[1:2])
+    if model in ("clean_ec", "temberture"):  # (sequence, [seq_name])
+        return tuple(args[:1])
+    if model == "deepenzyme":  # (sequence, pdb_file_path, smiles)
+        if len(args) < 3:
+            return None
+        pdb_digest = _file_digest(args[1])
+        return (args[0], args[2], pdb_digest) if pdb_digest else None
+    if model == "fpocket":  # (pdb_file_path, [pdb_data, output_dir, num_pockets])
+        pdb_data = args[1] if len(args) > 1 else None
+        pdb_digest = hashlib.sha256(pdb_data.encode()).hexdigest() if pdb_data else _file_digest(args[0])
+        return (pdb_digest, args[3] if len(args) > 3 else None) if pdb_digest else None
+    return tuple(args)
+
+
+class ResultCache:
+    """Last successful result per model and inputs, for the "cache" fallback."""
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        ttl: int = CircuitBreakerSettings.CACHE_TTL,
+        prefix: str = "synde:gpu_results",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_client: Optional Redis client (defaults to the checkpoint DB)
+            ttl: Seconds a result is kept
+            prefix: Key prefix
+        """
+        self.redis = redis_client or _client()
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, model: str, args: tuple) -> Optional[str]:
+        inputs = content_inputs(model, args)
+        if inputs is None:
+            return None
+        return f"{self.prefix}:{model}:{input_hash(model, inputs)}"
+
+    def put(self, model: str, args: tuple, result: Any) -> None:
+        """Store a successful result; failures are logged, not raised."""
+        key = self._key(model, args)
+        if key is None:
+            return
+        try:
+            self.redis.set(key, json.dumps(result, default=str), ex=self.ttl)
+        except (RedisError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache {model} result: {e}")
+
+    def get(self, model: str, args: tuple) -> Optional[Any]:
+        """Cached result for these inputs, or None."""
+        key = self._key(model, args)
+        if key is None:
+            return None
+        try:
+            raw = self.redis.get(key)
+        except RedisError as e:
+            logger.warning(f"Could not read cached {model} result: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+
+def fallback_mode(model: str, spec: str = CircuitBreakerSettings.FALLBACK) -> str:
+    """Fallback of a model when its calls fail: "cache" or "skip"."""
+    mode = parse_mapping(spec).get(model, FALLBACK_SKIP)
+    return mode if mode in (FALLBACK_CACHE, FALLBACK_SKIP) else FALLBACK_SKIP
+
+
+# =============================================================================
+# Global Instances
+# =============================================================================
+
+_breaker: Optional[CircuitBreaker] = None
+_cache: Optional[ResultCache] = None
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    """Get the process-wide breaker, or None when GPU_CIRCUIT_BREAKER is disabled."""
+    global _breaker
+    if not CircuitBreakerSettings.ENABLED:
+        return None
+    if _breaker is None:
+        _breaker = CircuitBreaker()
+    return _breaker
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get the process-wide result cache, or None when GPU_CIRCUIT_BREAKER is disabled."""
+    global _cache
+    if not CircuitBreakerSettings.ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResultCache()
+    return _cache
+
+
+def circuit_states(models: Optional[List[str]] = None) -> Dict[str, str]:
+    """State of each model's circuit (default: every GPU model); see CircuitBreaker.state."""
+    breaker = get_circuit_breaker()
+    models = models or sorted(set(TASK_MODELS.values()))
+    if breaker is None:
+        return {model: CLOSED for model in models}
+    return {model: breaker.state(model) for model in models}
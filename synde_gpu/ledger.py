@@ -0,0 +1,179 @@
+"""
+Durable ledger of GPU tasks submitted by a workflow.
+
+A workflow that dies while waiting on a GPU task (worker crash, Celery
+retry) used to resubmit it from scratch while the original job kept
+running. Each submission is now recorded in Redis *before* it is sent,
+keyed by workflow job id, model and a hash of the task inputs. When the
+workflow runs again, the same call finds its entry and reattaches to the
+still-running task, or harvests its finished result, instead of
+submitting a second job.
+
+Entries have the shape of ``GpuTaskStatus`` (plus ``model`` and
+``input_hash``) so they can be copied into ``state["active_gpu_tasks"]``.
+
+Concurrent runs of one workflow take the entry's state lock
+(``lock_name``) around lookup and submission, and record under its
+fencing token: a write fenced lower than the entry's is from a run whose
+lock expired and is dropped, as in ``update_gpu_task``.
+
+Usage:
+    ledger = get_task_ledger()
+    with get_state_lock().for_job(ledger.lock_name(job_id, task_name, args)) as lock:
+        entry = ledger.lookup(job_id, task_name, args)
+        if entry is None:
+            ledger.record(job_id, task_name, args, task_id, fence=lock.fence)
+            ...send with task_id...
+            ledger.record(job_id, task_name, args, task_id, status=STATUS_PENDING, fence=lock.fence)
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+
+from synde_graph.config import LANGGRAPH_CHECKPOINT_DB, GpuLedgerSettings, get_redis_url
+from synde_gpu.scheduling import TASK_MODELS
+
+# Entry statuses: recorded but possibly never sent, and sent to the broker
+STATUS_SUBMITTING = "submitting"
+STATUS_PENDING = "pending"
+
+# KEYS: ledger hash. ARGV: field, entry JSON, fence ('' = unfenced), ttl.
+# Returns 0 without writing if the stored entry has a higher fence.
+RECORD_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current and ARGV[3] ~= '' then
+    local written = cjson.decode(current)['fence']
+    if type(written) == 'number' and tonumber(ARGV[3]) < written then
+        return 0
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+
+def input_hash(task_name: str, args: tuple) -> str:
+    """Stable hash of a task's name and positional arguments."""
+    payload = json.dumps([task_name, list(args)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class GpuTaskLedger:
+    """
+    Per-workflow record of submitted GPU tasks, stored as one Redis hash.
+
+    Fields are ``<model>:<input hash>``, values the JSON entry. The hash
+    expires ``ttl`` seconds after the workflow's last submission.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        ttl: int = GpuLedgerSettings.TTL,
+        prefix: str = "synde:gpu_ledger",
+    ):
+        """
+        Initialize the ledger.
+
+        Args:
+            redis_client: Optional Redis client (defaults to the checkpoint DB)
+            ttl: Seconds entries are kept after the last submission
+            prefix: Key prefix
+        """
+        self.redis = redis_client or redis.Redis.from_url(
+            get_redis_url(LANGGRAPH_CHECKPOINT_DB),
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+            retry=Retry(NoBackoff(), 0),
+        )
+        self.ttl = ttl
+        self.prefix = prefix
+        self._record = self.redis.register_script(RECORD_SCRIPT)
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    @staticmethod
+    def _field(task_name: str, args: tuple) -> str:
+        return f"{TASK_MODELS.get(task_name, task_name)}:{input_hash(task_name, args)}"
+
+    def lock_name(self, job_id: str, task_name: str, args: tuple) -> str:
+        """Name of the state lock guarding one entry (see StateUpdateLock.for_job)."""
+        return f"{job_id}:{self._field(task_name, args)}"
+
+    def record(
+        self,
+        job_id: str,
+        task_name: str,
+        args: tuple,
+        task_id: str,
+        status: str = STATUS_SUBMITTING,
+        fence: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record a submission: before it is sent, then again once sent.
+
+        Args:
+            fence: Fencing token of the entry's state lock held while
+                recording; a lower fence than the stored entry's loses
+
+        Returns:
+            The stored entry, or None if a newer lock holder wrote it
+        """
+        entry = {
+            "task_id": task_id,
+            "task_name": task_name,
+            "model": TASK_MODELS.get(task_name, task_name),
+            "input_hash": input_hash(task_name, args),
+            "status": status,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if fence is not None:
+            entry["fence"] = fence
+        field = self._field(task_name, args)
+        written = self._record(
+            keys=[self._key(job_id)],
+            args=[field, json.dumps(entry), "" if fence is None else fence, self.ttl],
+        )
+        if not written:
+            return None
+        return entry
+
+    def lookup(self, job_id: str, task_name: str, args: tuple) -> Optional[Dict[str, Any]]:
+        """Entry for an identical earlier submission by this workflow, if any."""
+        raw = self.redis.hget(self._key(job_id), self._field(task_name, args))
+        return json.loads(raw) if raw else None
+
+    def forget(self, job_id: str, task_name: str, args: tuple) -> None:
+        """Drop one entry (its task failed or can no longer be found)."""
+        self.redis.hdel(self._key(job_id), self._field(task_name, args))
+
+    def entries(self, job_id: str) -> List[Dict[str, Any]]:
+        """All entries for a workflow, oldest submission first."""
+        values = self.redis.hvals(self._key(job_id))
+        return sorted((json.loads(v) for v in values), key=lambda e: e["submitted_at"])
+
+    def clear(self, job_id: str) -> None:
+        """Drop a finished workflow's ledger."""
+        self.redis.delete(self._key(job_id))
+
+
+_ledger: Optional[GpuTaskLedger] = None
+
+
+def get_task_ledger() -> Optional[GpuTaskLedger]:
+    """Get the process-wide ledger, or None when GPU_LEDGER is disabled."""
+    global _ledger
+    if not GpuLedgerSettings.ENABLED:
+        return None
+    if _ledger is None:
+        _ledger = GpuTaskLedger()
+    return _ledger
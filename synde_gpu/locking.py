@@ -2,16 +2,69 @@
 Distributed locking for GPU task state management.
 
 FIX: Prevents race conditions on state["active_gpu_tasks"] updates
-when multiple tasks complete concurrently.
+when multiple tasks complete concurrently. Waiters are woken by release
+rather than polling, and each acquisition carries a fencing token.
+
+Also provides GpuSemaphore, a counting semaphore over GPU slots with
+per-resource capacity, FIFO waiting, renewable leases and crash-safe
+expiry.
 """
 
+import threading
 import time
-from typing import Optional, Any
-from contextlib import contextmanager
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Optional, Any
+from contextlib import asynccontextmanager, contextmanager
 
 import redis
 
-from synde_graph.config import REDIS_HOST, REDIS_PORT, LockSettings
+from synde_graph.config import REDIS_HOST, REDIS_PORT, GpuSlotSettings, LockSettings
+
+
+# =============================================================================
+# Distributed Lock
+# =============================================================================
+
+# Keys per lock: the lock itself (holder token), a fence counter and a
+# signal list that release pushes one wake-up token onto.
+
+# KEYS: lock, fence. ARGV: holder token, ttl ms.
+# Returns {fence, 0} when acquired, {0, pttl ms of the current holder} when not.
+LOCK_ACQUIRE_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    local fence = redis.call('INCR', KEYS[2])
+    redis.call('PEXPIRE', KEYS[2], 86400000)
+    return {fence, 0}
+end
+return {0, redis.call('PTTL', KEYS[1])}
+"""
+
+# KEYS: lock, signal. ARGV: holder token.
+# Releases only our own lock and leaves exactly one wake-up token.
+LOCK_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('DEL', KEYS[2])
+redis.call('LPUSH', KEYS[2], '1')
+redis.call('PEXPIRE', KEYS[2], 10000)
+return 1
+"""
+
+# Longest single BLPOP; bounds the delay if a wake-up token is lost
+MAX_WAIT_SLICE = 1.0
+
+
+@dataclass
+class LockHandle:
+    """A held distributed lock."""
+    name: str
+    key: str
+    token: str
+    fence: int  # Increases with every acquisition of this lock name
+    timeout: int
 
 
 class DistributedLock:
@@ -20,6 +73,16 @@ class DistributedLock:
 
     FIX: Prevents race condition where multiple GPU tasks completing
     simultaneously could corrupt state["active_gpu_tasks"].
+
+    Waiters block on the lock's signal list (BLPOP) instead of sleeping
+    between retries: release pushes one token, waking the next waiter at
+    once. A waiter also wakes when the holder's ttl runs out, so a crashed
+    holder delays others by at most its remaining ttl.
+
+    Every acquisition returns a fencing token (``handle.fence``) that
+    increases monotonically per lock name; writes guarded by the lock
+    carry it so a holder whose lock expired cannot overwrite newer data
+    (see ``check_fence`` and ``update_gpu_task``).
     """
 
     def __init__(
@@ -40,15 +103,20 @@ class DistributedLock:
             decode_responses=True,
         )
         self.prefix = prefix
+        self._acquire = self.redis.register_script(LOCK_ACQUIRE_SCRIPT)
+        self._release = self.redis.register_script(LOCK_RELEASE_SCRIPT)
+
+    def _keys(self, lock_name: str):
+        key = f"{self.prefix}:{lock_name}"
+        return key, f"{key}:fence", f"{key}:signal"
 
     def acquire(
         self,
         lock_name: str,
         timeout: int = LockSettings.DEFAULT_TIMEOUT,
         blocking: bool = True,
-        retry_interval: float = LockSettings.RETRY_INTERVAL,
-        max_retries: int = LockSettings.MAX_RETRIES,
-    ) -> Optional[Any]:
+        wait_timeout: float = LockSettings.WAIT_TIMEOUT,
+    ) -> Optional[LockHandle]:
         """
         Acquire a distributed lock.
 
@@ -56,44 +124,51 @@ class DistributedLock:
             lock_name: Name of the lock (e.g., job_id)
             timeout: Lock timeout in seconds (auto-release)
             blocking: Whether to wait for lock
-            retry_interval: Seconds between retry attempts
-            max_retries: Maximum retry attempts if blocking
+            wait_timeout: Seconds to wait if blocking
 
         Returns:
-            Lock object if acquired, None if not
+            LockHandle if acquired, None if not
         """
-        lock_key = f"{self.prefix}:{lock_name}"
-        lock = self.redis.lock(lock_key, timeout=timeout)
+        key, fence_key, signal_key = self._keys(lock_name)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + (wait_timeout if blocking else 0)
 
-        if blocking:
-            retries = 0
-            while retries < max_retries:
-                if lock.acquire(blocking=False):
-                    return lock
-                time.sleep(retry_interval)
-                retries += 1
-            return None
-        else:
-            if lock.acquire(blocking=False):
-                return lock
-            return None
+        while True:
+            fence, holder_pttl = self._acquire(keys=[key, fence_key], args=[token, int(timeout * 1000)])
+            if fence:
+                return LockHandle(lock_name, key, token, int(fence), timeout)
 
-    def release(self, lock: Any) -> bool:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            wait = _wait_slice(remaining, holder_pttl)
+            if wait > 0:
+                self.redis.blpop([signal_key], timeout=wait)
+
+    def release(self, lock: LockHandle) -> bool:
         """
-        Release a distributed lock.
+        Release a distributed lock and wake the next waiter.
 
         Args:
-            lock: Lock object from acquire()
+            lock: LockHandle from acquire()
 
         Returns:
-            True if released successfully
+            True if released, False if the lock had expired (and may now
+            belong to someone else)
         """
         try:
-            lock.release()
-            return True
-        except Exception:
+            _, _, signal_key = self._keys(lock.name)
+            return bool(self._release(keys=[lock.key, signal_key], args=[lock.token]))
+        except redis.RedisError:
             return False
 
+    def check_fence(self, lock_name: str, fence: int) -> bool:
+        """True if no one has acquired ``lock_name`` since ``fence`` was issued."""
+        _, fence_key, _ = self._keys(lock_name)
+        current = self.redis.get(fence_key)
+        return current is not None and int(current) == fence
+
     @contextmanager
     def locked(
         self,
@@ -104,9 +179,9 @@ class DistributedLock:
         Context manager for acquiring and releasing a lock.
 
         Usage:
-            with lock.locked("job-123"):
+            with lock.locked("job-123") as handle:
                 # Critical section
-                update_state()
+                update_state(fence=handle.fence)
 
         Args:
             lock_name: Name of the lock
@@ -123,8 +198,110 @@ class DistributedLock:
 
     def is_locked(self, lock_name: str) -> bool:
         """Check if a lock is currently held."""
-        lock_key = f"{self.prefix}:{lock_name}"
-        return self.redis.exists(lock_key) > 0
+        key, _, _ = self._keys(lock_name)
+        return self.redis.exists(key) > 0
+
+
+class AsyncDistributedLock:
+    """
+    asyncio variant of DistributedLock.
+
+    Uses the same keys and scripts, so sync and async holders exclude
+    each other. Nothing in the tree takes it yet: GPU submissions from
+    the async path go through the sync task proxies and their lock.
+
+    Usage:
+        lock = AsyncDistributedLock()
+        async with lock.locked("job-123") as handle:
+            ...
+    """
+
+    def __init__(self, redis_client=None, prefix: str = "synde:lock"):
+        """
+        Initialize the lock.
+
+        Args:
+            redis_client: Optional redis.asyncio.Redis client
+            prefix: Key prefix for lock keys
+        """
+        import redis.asyncio as aioredis
+
+        self.redis = redis_client or aioredis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            decode_responses=True,
+        )
+        self.prefix = prefix
+        self._acquire = self.redis.register_script(LOCK_ACQUIRE_SCRIPT)
+        self._release = self.redis.register_script(LOCK_RELEASE_SCRIPT)
+
+    _keys = DistributedLock._keys
+
+    async def acquire(
+        self,
+        lock_name: str,
+        timeout: int = LockSettings.DEFAULT_TIMEOUT,
+        blocking: bool = True,
+        wait_timeout: float = LockSettings.WAIT_TIMEOUT,
+    ) -> Optional[LockHandle]:
+        """Acquire the lock; see DistributedLock.acquire."""
+        key, fence_key, signal_key = self._keys(lock_name)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + (wait_timeout if blocking else 0)
+
+        while True:
+            fence, holder_pttl = await self._acquire(keys=[key, fence_key], args=[token, int(timeout * 1000)])
+            if fence:
+                return LockHandle(lock_name, key, token, int(fence), timeout)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            wait = _wait_slice(remaining, holder_pttl)
+            if wait > 0:
+                await self.redis.blpop([signal_key], timeout=wait)
+
+    async def release(self, lock: LockHandle) -> bool:
+        """Release the lock and wake the next waiter; see DistributedLock.release."""
+        try:
+            _, _, signal_key = self._keys(lock.name)
+            return bool(await self._release(keys=[lock.key, signal_key], args=[lock.token]))
+        except redis.RedisError:
+            return False
+
+    async def check_fence(self, lock_name: str, fence: int) -> bool:
+        """True if no one has acquired ``lock_name`` since ``fence`` was issued."""
+        _, fence_key, _ = self._keys(lock_name)
+        current = await self.redis.get(fence_key)
+        return current is not None and int(current) == fence
+
+    @asynccontextmanager
+    async def locked(self, lock_name: str, timeout: int = LockSettings.DEFAULT_TIMEOUT):
+        """Async context manager for acquiring and releasing a lock."""
+        lock = await self.acquire(lock_name, timeout=timeout)
+        if lock is None:
+            raise LockAcquisitionError(f"Failed to acquire lock: {lock_name}")
+
+        try:
+            yield lock
+        finally:
+            await self.release(lock)
+
+
+def _wait_slice(remaining: float, holder_pttl: int) -> float:
+    """
+    How long one BLPOP may block.
+
+    Never past the caller's deadline, never much past the holder's expiry
+    (a crashed holder sends no wake-up) and never more than MAX_WAIT_SLICE.
+    """
+    wait = min(remaining, MAX_WAIT_SLICE)
+    if holder_pttl > 0:
+        wait = min(wait, holder_pttl / 1000 + 0.01)
+    elif holder_pttl == -2:
+        return 0.0  # Released between SET and PTTL; retry at once
+    return wait
 
 
 class LockAcquisitionError(Exception):
@@ -147,43 +324,315 @@ class StateUpdateLock:
         """
         Acquire lock for updating a specific job's state.
 
+        Yields the LockHandle; pass ``handle.fence`` to update_gpu_task or
+        GpuTaskLedger.record so a holder whose lock expired cannot
+        overwrite newer task status.
+
         Args:
             job_id: The workflow job ID
             timeout: Lock timeout
         """
-        with self.lock.locked(job_id, timeout=timeout):
-            yield
+        with self.lock.locked(job_id, timeout=timeout) as handle:
+            yield handle
+
+
+# =============================================================================
+# GPU Slot Semaphore
+# =============================================================================
+
+# Keys per resource: holders (zset lease -> expiry), queue (zset lease ->
+# ticket), alive (zset waiting lease -> heartbeat expiry), ticket (counter)
+
+# KEYS: holders, queue, alive, ticket
+# ARGV: lease id, capacity, lease ttl, waiter ttl
+ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+-- Crash-safe expiry: drop lapsed leases and waiters that stopped polling
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local dead = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)
+for _, lease in ipairs(dead) do
+    redis.call('ZREM', KEYS[2], lease)
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+
+-- Take a ticket on the first attempt, keep the waiter alive on every one
+if not redis.call('ZSCORE', KEYS[2], ARGV[1]) then
+    redis.call('ZADD', KEYS[2], redis.call('INCR', KEYS[4]), ARGV[1])
+end
+redis.call('ZADD', KEYS[3], now + tonumber(ARGV[4]), ARGV[1])
+
+-- FIFO: only the first (capacity - held) waiters may take a slot
+local free = tonumber(ARGV[2]) - redis.call('ZCARD', KEYS[1])
+if redis.call('ZRANK', KEYS[2], ARGV[1]) < free then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    redis.call('ZREM', KEYS[3], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# KEYS: holders. ARGV: lease id, lease ttl. Extends a live lease only.
+RENEW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local expiry = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not expiry or tonumber(expiry) <= now then
+    redis.call('ZREM', KEYS[1], ARGV[1])
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+return 1
+"""
+
+# KEYS: holders, queue, alive. ARGV: lease id.
+RELEASE_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+return redis.call('ZREM', KEYS[1], ARGV[1])
+"""
+
+# KEYS: holders, queue per resource (pairs). Returns live holders and
+# waiters per resource in one round trip.
+UTILIZATION_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local out = {}
+for i = 1, #KEYS, 2 do
+    table.insert(out, redis.call('ZCOUNT', KEYS[i], '(' .. now, '+inf'))
+    table.insert(out, redis.call('ZCARD', KEYS[i + 1]))
+end
+return out
+"""
+
+
+def parse_mapping(spec: str) -> Dict[str, str]:
+    """Parse "a=1,b=2" into {"a": "1", "b": "2"} (blank entries ignored)."""
+    mapping = {}
+    for item in spec.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            mapping[key.strip()] = value.strip()
+    return mapping
+
+
+@dataclass
+class Lease:
+    """A held GPU slot."""
+    resource: str
+    lease_id: str
+    ttl: int
+
+
+class GpuSemaphore:
+    """
+    Redis-backed counting semaphore over GPU resources.
+
+    Each resource (a card, a node, ...) has a capacity; models map onto
+    resources, so models that share a card share its slots. Waiters are
+    served in arrival order. A lease expires unless renewed, so slots held
+    by a crashed worker free themselves after ``lease_ttl``.
+
+    Usage:
+        semaphore = GpuSemaphore(capacities={"card0": 2}, model_resources={"esmfold": "card0"})
+        with semaphore.slot("esmfold"):
+            run_model()
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        capacities: Optional[Dict[str, int]] = None,
+        model_resources: Optional[Dict[str, str]] = None,
+        lease_ttl: int = GpuSlotSettings.LEASE_TTL,
+        prefix: str = "synde:gpu_slots",
+    ):
+        """
+        Initialize the semaphore.
+
+        Args:
+            redis_client: Optional Redis client (creates one if not provided)
+            capacities: Slots per resource (default: GPU_SLOT_CAPACITY)
+            model_resources: Resource per model (default: GPU_MODEL_RESOURCES);
+                unlisted models use the first resource
+            lease_ttl: Seconds a lease lives without renewal
+            prefix: Key prefix
+        """
+        self.redis = redis_client or redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            decode_responses=True,
+        )
+        if capacities is None:
+            capacities = {k: int(v) for k, v in parse_mapping(GpuSlotSettings.CAPACITY).items()}
+        if model_resources is None:
+            model_resources = parse_mapping(GpuSlotSettings.MODEL_RESOURCES)
+        if not capacities:
+            raise ValueError("GpuSemaphore needs at least one resource")
+
+        self.capacities = dict(capacities)
+        self.model_resources = dict(model_resources)
+        self.default_resource = next(iter(self.capacities))
+        self.lease_ttl = lease_ttl
+        self.prefix = prefix
+
+        self._acquire = self.redis.register_script(ACQUIRE_SCRIPT)
+        self._renew = self.redis.register_script(RENEW_SCRIPT)
+        self._release = self.redis.register_script(RELEASE_SCRIPT)
+        self._utilization = self.redis.register_script(UTILIZATION_SCRIPT)
+
+    def _keys(self, resource: str):
+        base = f"{self.prefix}:{{{resource}}}"
+        return [f"{base}:holders", f"{base}:queue", f"{base}:alive", f"{base}:ticket"]
+
+    def resource_for(self, model: str) -> str:
+        """Resource a model's slots are counted against."""
+        return self.model_resources.get(model, self.default_resource)
+
+    def acquire(
+        self,
+        resource: str,
+        timeout: Optional[float] = None,
+        lease_ttl: Optional[int] = None,
+        retry_interval: float = LockSettings.RETRY_INTERVAL,
+    ) -> Optional[Lease]:
+        """
+        Take one slot of ``resource``, waiting in FIFO order.
+
+        Args:
+            resource: Resource name
+            timeout: Seconds to wait (None waits forever, 0 tries once)
+            lease_ttl: Lease lifetime without renewal
+            retry_interval: Seconds between attempts while queued
+
+        Returns:
+            Lease if acquired, None on timeout
+        """
+        if resource not in self.capacities:
+            raise ValueError(f"Unknown GPU resource: {resource}")
+
+        lease = Lease(resource, uuid.uuid4().hex, lease_ttl or self.lease_ttl)
+        keys = self._keys(resource)
+        # A waiter that stops polling loses its place after a few intervals
+        waiter_ttl = max(1.0, retry_interval * 4)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            args = [lease.lease_id, self.capacities[resource], lease.ttl, waiter_ttl]
+            if self._acquire(keys=keys, args=args):
+                return lease
+            if deadline is not None and time.monotonic() >= deadline:
+                self._release(keys=keys[:3], args=[lease.lease_id])  # Leave the queue
+                return None
+            time.sleep(retry_interval if deadline is None
+                       else max(0.0, min(retry_interval, deadline - time.monotonic())))
+
+    def renew(self, lease: Lease) -> bool:
+        """Extend a lease by its ttl; False if it already expired."""
+        return bool(self._renew(keys=self._keys(lease.resource)[:1], args=[lease.lease_id, lease.ttl]))
+
+    def release(self, lease: Lease) -> bool:
+        """Give the slot back; False if the lease had expired."""
+        return bool(self._release(keys=self._keys(lease.resource)[:3], args=[lease.lease_id]))
+
+    @contextmanager
+    def slot(
+        self,
+        model: str,
+        timeout: Optional[float] = None,
+        lease_ttl: Optional[int] = None,
+        auto_renew: bool = True,
+    ):
+        """
+        Hold one slot of the model's resource for the duration of the block.
+
+        With ``auto_renew`` a background thread renews the lease every
+        third of its ttl, so long jobs keep their slot while the process
+        is alive and lose it ``lease_ttl`` seconds after it dies.
+
+        Raises:
+            LockAcquisitionError: No slot within ``timeout``
+        """
+        resource = self.resource_for(model)
+        lease = self.acquire(resource, timeout=timeout, lease_ttl=lease_ttl)
+        if lease is None:
+            raise LockAcquisitionError(f"No free GPU slot on {resource} for {model}")
+
+        stop = threading.Event()
+        renewer = None
+        if auto_renew:
+            def _renew_loop():
+                while not stop.wait(lease.ttl / 3):
+                    if not self.renew(lease):
+                        return
+
+            renewer = threading.Thread(target=_renew_loop, name=f"gpu-lease-{resource}", daemon=True)
+            renewer.start()
+
+        try:
+            yield lease
+        finally:
+            stop.set()
+            if renewer is not None:
+                renewer.join()
+            self.release(lease)
+
+    def utilization(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Live slot usage per resource, in a single round trip.
+
+        Returns:
+            {resource: {"used", "capacity", "waiting", "utilization"}}
+        """
+        keys = []
+        for resource in self.capacities:
+            keys.extend(self._keys(resource)[:2])
+        counts = self._utilization(keys=keys)
+
+        usage = {}
+        for index, (resource, capacity) in enumerate(self.capacities.items()):
+            used, waiting = counts[2 * index], counts[2 * index + 1]
+            usage[resource] = {
+                "used": used,
+                "capacity": capacity,
+                "waiting": waiting,
+                "utilization": used / capacity if capacity else 0.0,
+            }
+        return usage
 
 
 class GpuTaskLock:
     """
-    Lock for GPU task operations.
+    Slot reservation for GPU task operations.
 
-    Prevents multiple tasks from running simultaneously on the same GPU
-    (useful for single-GPU setups).
+    Counts running tasks against each GPU resource's capacity (see
+    GpuSemaphore); with the default single one-slot resource this
+    serializes all GPU work, as on a single-GPU setup.
     """
 
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
-        self.lock = DistributedLock(redis_client, prefix="synde:gpu")
+    def __init__(self, redis_client: Optional[redis.Redis] = None, semaphore: Optional[GpuSemaphore] = None):
+        self.semaphore = semaphore or GpuSemaphore(redis_client)
 
     @contextmanager
     def for_task(self, task_name: str, timeout: int = 1800):
         """
-        Acquire lock for a GPU task.
+        Hold a GPU slot for a task.
 
         Args:
-            task_name: Name of the GPU task
-            timeout: Lock timeout (should be >= task timeout)
-        """
-        with self.lock.locked(task_name, timeout=timeout):
-            yield
-
-    def is_gpu_busy(self) -> bool:
-        """Check if any GPU task is currently running."""
-        return self.lock.is_locked("esmfold") or \
-               self.lock.is_locked("clean_ec") or \
-               self.lock.is_locked("deepenzyme") or \
-               self.lock.is_locked("temberture")
+            task_name: Model name of the GPU task (e.g. "esmfold")
+            timeout: Seconds to wait for a slot
+        """
+        with self.semaphore.slot(task_name, timeout=timeout) as lease:
+            yield lease
+
+    def is_gpu_busy(self) -> Dict[str, float]:
+        """Utilization (held / capacity) per GPU resource."""
+        return {
+            resource: usage["utilization"]
+            for resource, usage in self.semaphore.utilization().items()
+        }
 
 
 # =============================================================================
@@ -6,6 +6,12 @@ Provides async-aware GPU task execution with:
 - Pre-submission checkpointing to prevent orphan tasks
 - Proper task cancellation with terminate=True
 - Distributed locking for state updates
+- Queue-depth inspection and admission control (see synde_gpu.scheduling)
+- Adaptive polling and completion-detection lag metrics (see synde_gpu.polling)
+- Per-request timeouts and ETAs from runtime history (see synde_gpu.runtime_stats)
+- Cooperative cancellation of the calling workflow (see synde_graph.utils.cancellation)
+- Per-model circuit breakers with cached or degraded fallbacks (see synde_gpu.circuit)
+- Trace recording and replay of task results (see synde_graph.utils.trace)
 """
 
 import asyncio
@@ -15,10 +21,52 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 
+from celery import states
 from celery.result import AsyncResult
 
 from synde_graph.config import GpuTimeouts
+from synde_graph.utils.cancellation import is_cancelled
+from synde_graph.utils.live_logger import get_current_job_id
+from synde_graph.utils.trace import (
+    KIND_GPU,
+    TraceEvent,
+    get_trace_recorder,
+    get_trace_replay,
+    replayed_output,
+    untraced,
+)
+from synde_gpu.circuit import (
+    FALLBACK_CACHE,
+    circuit_states,
+    fallback_mode,
+    get_circuit_breaker,
+    get_result_cache,
+)
 from synde_gpu.mocks import is_mock_mode
+from synde_gpu.polling import (
+    FixedInterval,
+    PollingStrategy,
+    default_strategy,
+    detection_lag_summary,
+    record_detection_lag,
+)
+from synde_gpu.runtime_stats import predict_runtime, record_runtime, runtime_timeout
+from synde_gpu.scheduling import (
+    PRIORITIES,
+    TASK_MODELS,
+    GpuAdmissionRejected,
+    get_admission_controller,
+    get_priority_class,
+    queue_depth,
+    queue_depths,
+    queue_for,
+)
+from synde_gpu.simulator import SIMULATED_TASKS, SimulatedAsyncResult
+
+
+# Celery states of a task not yet picked up by a worker
+QUEUED_STATES = frozenset({states.PENDING, states.RECEIVED})
+READY_STATES = states.READY_STATES
 
 
 class TaskStatus(Enum):
@@ -29,6 +77,9 @@ class TaskStatus(Enum):
     FAILURE = "failure"
     TIMEOUT = "timeout"
     REVOKED = "revoked"
+    REJECTED = "rejected"  # Refused by admission control, never submitted
+    CANCELLED = "cancelled"  # The calling workflow was cancelled
+    UNAVAILABLE = "unavailable"  # Circuit open and no fallback result, never submitted
 
 
 @dataclass
@@ -39,6 +90,8 @@ class GpuTaskResult:
     error: Optional[str] = None
     task_id: Optional[str] = None
     elapsed_seconds: float = 0.0
+    detection_lag: Optional[float] = None  # Seconds from completion to detection
+    fallback: Optional[str] = None  # "cache" when the result came from the fallback cache
 
 
 class GpuTaskManager:
@@ -55,8 +108,8 @@ class GpuTaskManager:
     def __init__(
         self,
         task_name: str,
-        timeout: int = GpuTimeouts.ESMFOLD,
-        poll_interval: float = GpuTimeouts.POLL_INTERVAL,
+        timeout: Optional[int] = None,
+        poll_interval: Optional[float] = None,
         checkpoint_interval: float = GpuTimeouts.CHECKPOINT_INTERVAL,
     ):
         """
@@ -64,8 +117,10 @@ class GpuTaskManager:
 
         Args:
             task_name: Human-readable task name for logging
-            timeout: Maximum wait time in seconds
-            poll_interval: Seconds between status checks
+            timeout: Maximum wait time in seconds; by default derived per
+                request from runtime history, falling back to GpuTimeouts
+            poll_interval: Fixed seconds between status checks; by default
+                the interval adapts to the model (GPU_POLL_STRATEGY)
             checkpoint_interval: Seconds between checkpoint updates
         """
         self.task_name = task_name
@@ -98,6 +153,31 @@ class GpuTaskManager:
         Returns:
             GpuTaskResult with status and result/error
         """
+        replay = get_trace_replay()
+        if replay is not None:
+            event = replay.take(KIND_GPU, self.model, args, kwargs)
+            seconds = replay.delay(event)
+            await asyncio.sleep(seconds)
+            return self._replayed(event, seconds)
+
+        recorder = get_trace_recorder()
+        start = time.perf_counter()
+        with untraced():
+            result = await self._execute_async(task_func, args, kwargs, on_checkpoint, checkpointer, state)
+        if recorder is not None:
+            recorder.record(KIND_GPU, self.model, args, kwargs, _trace_output(result), time.perf_counter() - start)
+        return result
+
+    async def _execute_async(
+        self,
+        task_func: Callable,
+        args: tuple,
+        kwargs: Optional[Dict],
+        on_checkpoint: Optional[Callable],
+        checkpointer: Optional[Any],
+        state: Optional[Dict],
+    ) -> GpuTaskResult:
+        """execute_async() without trace recording and replay."""
         kwargs = kwargs or {}
         start_time = time.time()
         last_checkpoint_time = start_time
@@ -120,11 +200,32 @@ class GpuTaskManager:
                 elapsed_seconds=time.time() - start_time,
             )
 
-        # Submit task
-        async_result = task_func(*args, **kwargs)
+        # Don't start GPU work for a workflow that is already cancelled
+        job_id = get_current_job_id()
+        if is_cancelled(job_id):
+            return self._cancelled(None, start_time)
+
+        # Fail fast while the model's circuit is open
+        breaker = get_circuit_breaker()
+        if breaker is not None and not breaker.allow(self.model):
+            return self._fallback(args, GpuTaskResult(
+                status=TaskStatus.UNAVAILABLE,
+                error=f"{self.task_name} is temporarily unavailable",
+                elapsed_seconds=time.time() - start_time,
+            ))
+
+        # Timeout first: nothing may fail between submission and polling
+        timeout = self.timeout_for(args)
+
+        # Submit task off the event loop: admission control may defer it
+        # for minutes, and the ledger lock may block
+        try:
+            async_result = await asyncio.to_thread(task_func, *args, **kwargs)
+        except GpuAdmissionRejected as e:
+            return self._rejected(e, start_time)
 
         # Handle case where proxy returns result directly (mock mode)
-        if not isinstance(async_result, AsyncResult):
+        if not isinstance(async_result, (AsyncResult, SimulatedAsyncResult)):
             return GpuTaskResult(
                 status=TaskStatus.SUCCESS,
                 result=async_result,
@@ -133,25 +234,36 @@ class GpuTaskManager:
             )
 
         task_id = async_result.id
+        clock = _RunClock(start_time, timeout, self.queue_wait)
+        polling = self._polling_strategy(args)
 
         try:
             # Async polling loop
             while True:
-                elapsed = time.time() - start_time
+                now = time.time()
+                elapsed = now - start_time
+                state = async_result.state
+                clock.observe(state, now)
 
                 # Check timeout
-                if elapsed > self.timeout:
+                expired = clock.expired(now)
+                if expired:
                     # FIX: Proper cancellation with terminate=True
                     await self._cancel_task(async_result)
-                    return GpuTaskResult(
+                    return self._settle(args, GpuTaskResult(
                         status=TaskStatus.TIMEOUT,
-                        error=f"Task timed out after {self.timeout}s",
+                        error=expired,
                         task_id=task_id,
                         elapsed_seconds=elapsed,
-                    )
+                    ))
+
+                # Free the GPU as soon as the workflow is cancelled
+                if is_cancelled(job_id):
+                    await self._cancel_task(async_result)
+                    return self._cancelled(task_id, start_time)
 
                 # Check if task is complete
-                if async_result.ready():
+                if state in READY_STATES:
                     break
 
                 # Checkpoint callback during long waits
@@ -160,35 +272,18 @@ class GpuTaskManager:
                     last_checkpoint_time = time.time()
 
                 # Async sleep instead of blocking
-                await asyncio.sleep(self.poll_interval)
-
-            # Get result
-            elapsed = time.time() - start_time
+                await asyncio.sleep(polling.next_interval(elapsed))
 
-            if async_result.successful():
-                return GpuTaskResult(
-                    status=TaskStatus.SUCCESS,
-                    result=async_result.result,
-                    task_id=task_id,
-                    elapsed_seconds=elapsed,
-                )
-            else:
-                error_msg = str(async_result.result) if async_result.result else "Unknown error"
-                return GpuTaskResult(
-                    status=TaskStatus.FAILURE,
-                    error=error_msg,
-                    task_id=task_id,
-                    elapsed_seconds=elapsed,
-                )
+            return self._settle(args, self._finished(async_result, start_time, args, clock))
 
         except Exception as e:
             elapsed = time.time() - start_time
-            return GpuTaskResult(
+            return self._settle(args, GpuTaskResult(
                 status=TaskStatus.FAILURE,
                 error=str(e),
                 task_id=task_id,
                 elapsed_seconds=elapsed,
-            )
+            ))
 
     def execute_sync(
         self,
@@ -210,6 +305,23 @@ class GpuTaskManager:
         Returns:
             GpuTaskResult with status and result/error
         """
+        replay = get_trace_replay()
+        if replay is not None:
+            event = replay.take(KIND_GPU, self.model, args, kwargs)
+            seconds = replay.delay(event)
+            time.sleep(seconds)
+            return self._replayed(event, seconds)
+
+        recorder = get_trace_recorder()
+        start = time.perf_counter()
+        with untraced():
+            result = self._execute_sync(task_func, args, kwargs)
+        if recorder is not None:
+            recorder.record(KIND_GPU, self.model, args, kwargs, _trace_output(result), time.perf_counter() - start)
+        return result
+
+    def _execute_sync(self, task_func: Callable, args: tuple, kwargs: Optional[Dict]) -> GpuTaskResult:
+        """execute_sync() without trace recording and replay."""
         kwargs = kwargs or {}
         start_time = time.time()
 
@@ -223,11 +335,31 @@ class GpuTaskManager:
                 elapsed_seconds=time.time() - start_time,
             )
 
+        # Don't start GPU work for a workflow that is already cancelled
+        job_id = get_current_job_id()
+        if is_cancelled(job_id):
+            return self._cancelled(None, start_time)
+
+        # Fail fast while the model's circuit is open
+        breaker = get_circuit_breaker()
+        if breaker is not None and not breaker.allow(self.model):
+            return self._fallback(args, GpuTaskResult(
+                status=TaskStatus.UNAVAILABLE,
+                error=f"{self.task_name} is temporarily unavailable",
+                elapsed_seconds=time.time() - start_time,
+            ))
+
+        # Timeout first: nothing may fail between submission and polling
+        timeout = self.timeout_for(args)
+
         # Submit task
-        async_result = task_func(*args, **kwargs)
+        try:
+            async_result = task_func(*args, **kwargs)
+        except GpuAdmissionRejected as e:
+            return self._rejected(e, start_time)
 
         # Handle direct result (mock mode)
-        if not isinstance(async_result, AsyncResult):
+        if not isinstance(async_result, (AsyncResult, SimulatedAsyncResult)):
             return GpuTaskResult(
                 status=TaskStatus.SUCCESS,
                 result=async_result,
@@ -236,52 +368,215 @@ class GpuTaskManager:
             )
 
         task_id = async_result.id
+        clock = _RunClock(start_time, timeout, self.queue_wait)
+        polling = self._polling_strategy(args)
 
         try:
             # Polling loop
             while True:
-                elapsed = time.time() - start_time
+                now = time.time()
+                elapsed = now - start_time
+                state = async_result.state
+                clock.observe(state, now)
 
-                if elapsed > self.timeout:
+                expired = clock.expired(now)
+                if expired:
                     self._cancel_task_sync(async_result)
-                    return GpuTaskResult(
+                    return self._settle(args, GpuTaskResult(
                         status=TaskStatus.TIMEOUT,
-                        error=f"Task timed out after {self.timeout}s",
+                        error=expired,
                         task_id=task_id,
                         elapsed_seconds=elapsed,
-                    )
+                    ))
 
-                if async_result.ready():
-                    break
+                if is_cancelled(job_id):
+                    self._cancel_task_sync(async_result)
+                    return self._cancelled(task_id, start_time)
 
-                time.sleep(self.poll_interval)
+                if state in READY_STATES:
+                    break
 
-            elapsed = time.time() - start_time
+                time.sleep(polling.next_interval(elapsed))
 
-            if async_result.successful():
-                return GpuTaskResult(
-                    status=TaskStatus.SUCCESS,
-                    result=async_result.result,
-                    task_id=task_id,
-                    elapsed_seconds=elapsed,
-                )
-            else:
-                error_msg = str(async_result.result) if async_result.result else "Unknown error"
-                return GpuTaskResult(
-                    status=TaskStatus.FAILURE,
-                    error=error_msg,
-                    task_id=task_id,
-                    elapsed_seconds=elapsed,
-                )
+            return self._settle(args, self._finished(async_result, start_time, args, clock))
 
         except Exception as e:
             elapsed = time.time() - start_time
-            return GpuTaskResult(
+            return self._settle(args, GpuTaskResult(
                 status=TaskStatus.FAILURE,
                 error=str(e),
                 task_id=task_id,
                 elapsed_seconds=elapsed,
+            ))
+
+    @property
+    def model(self) -> str:
+        """Model key of this manager's task ("ESMFold" -> "esmfold")."""
+        return self.task_name.lower()
+
+    def timeout_for(self, args: tuple) -> int:
+        """
+        Run-time limit for one task: the configured one, else derived from
+        history. It counts from the task's STARTED transition, so time spent
+        in the broker queue is not included (see _RunClock).
+        """
+        if self.timeout is not None:
+            return self.timeout
+        default = getattr(GpuTimeouts, self.model.upper(), GpuTimeouts.ESMFOLD)
+        return runtime_timeout(self.model, _sequence_length(self.model, args), default)
+
+    def queue_wait(self) -> float:
+        """Current estimated queue wait of a new task at the caller's priority (0 if unknown)."""
+        task = next((name for name, model in TASK_MODELS.items() if model == self.model), None)
+        if task is None:
+            return 0.0
+        try:
+            _, wait = get_admission_controller().estimate_wait(task, PRIORITIES[get_priority_class()])
+        except Exception:
+            return 0.0  # Unreadable queue depth: no extra allowance
+        return wait
+
+    def estimate(self, args: tuple = ()) -> Optional[float]:
+        """Expected seconds for a task with these arguments, from runtime history."""
+        return predict_runtime(self.model, _sequence_length(self.model, args))
+
+    def _polling_strategy(self, args: tuple) -> PollingStrategy:
+        """Polling schedule for one task: fixed if configured, else per model."""
+        if self.poll_interval is not None:
+            return FixedInterval(self.poll_interval)
+        return default_strategy(self.model, _sequence_length(self.model, args))
+
+    def _finished(
+        self, async_result: AsyncResult, start_time: float, args: tuple, clock: "_RunClock"
+    ) -> GpuTaskResult:
+        """Result for a task whose completion was just detected."""
+        now = time.time()
+        elapsed = now - start_time
+        lag = _detection_lag(async_result)
+        if lag is not None:
+            record_detection_lag(self.model, lag)
+
+        if async_result.successful():
+            if isinstance(async_result, AsyncResult):
+                # Simulated runtimes must not skew the real history; queue
+                # time must not either, so only the run time is recorded
+                record_runtime(self.model, _sequence_length(self.model, args), clock.runtime(now))
+            return GpuTaskResult(
+                status=TaskStatus.SUCCESS,
+                result=async_result.result,
+                task_id=async_result.id,
+                elapsed_seconds=elapsed,
+                detection_lag=lag,
+            )
+        error_msg = str(async_result.result) if async_result.result else "Unknown error"
+        return GpuTaskResult(
+            status=TaskStatus.FAILURE,
+            error=error_msg,
+            task_id=async_result.id,
+            elapsed_seconds=elapsed,
+            detection_lag=lag,
+        )
+
+    def _replayed(self, event: Optional[TraceEvent], elapsed: float) -> GpuTaskResult:
+        """Result served from a replayed trace; a call missing from it is unavailable."""
+        if event is None:
+            return GpuTaskResult(
+                status=TaskStatus.UNAVAILABLE,
+                error=f"{self.task_name} call not found in the replayed trace",
             )
+        recorded = replayed_output(event)
+        return GpuTaskResult(
+            status=TaskStatus(recorded["status"]),
+            result=recorded.get("result"),
+            error=recorded.get("error"),
+            task_id=recorded.get("task_id"),
+            elapsed_seconds=elapsed,
+            detection_lag=recorded.get("detection_lag"),
+            fallback=recorded.get("fallback"),
+        )
+
+    def _rejected(self, error: GpuAdmissionRejected, start_time: float) -> GpuTaskResult:
+        """Result for a submission refused by admission control."""
+        return GpuTaskResult(
+            status=TaskStatus.REJECTED,
+            error=str(error),
+            elapsed_seconds=time.time() - start_time,
+        )
+
+    def _settle(self, args: tuple, result: GpuTaskResult) -> GpuTaskResult:
+        """
+        Report a submitted task's outcome to the circuit breaker.
+
+        Successes close the circuit and, for "cache" fallback models, are
+        cached; failures and timeouts count towards opening it and fall back.
+        """
+        breaker = get_circuit_breaker()
+        if breaker is None:
+            return result
+        if result.status == TaskStatus.SUCCESS:
+            breaker.record_success(self.model)
+            if fallback_mode(self.model) == FALLBACK_CACHE:
+                get_result_cache().put(self.model, args, result.result)
+            return result
+        breaker.record_failure(self.model)
+        return self._fallback(args, result)
+
+    def _fallback(self, args: tuple, result: GpuTaskResult) -> GpuTaskResult:
+        """The cached result for these inputs if the model falls back to it, else ``result``."""
+        if fallback_mode(self.model) != FALLBACK_CACHE:
+            return result
+        cached = get_result_cache().get(self.model, args)
+        if cached is None:
+            return result
+        return GpuTaskResult(
+            status=TaskStatus.SUCCESS,
+            result=cached,
+            error=result.error,
+            task_id=result.task_id,
+            elapsed_seconds=result.elapsed_seconds,
+            fallback=FALLBACK_CACHE,
+        )
+
+    def _cancelled(self, task_id: Optional[str], start_time: float) -> GpuTaskResult:
+        """Result for a task abandoned because its workflow was cancelled."""
+        return GpuTaskResult(
+            status=TaskStatus.CANCELLED,
+            error="Workflow cancelled",
+            task_id=task_id,
+            elapsed_seconds=time.time() - start_time,
+        )
+
+    # -------------------------------------------------------------------------
+    # Queue inspection
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def queue_depths() -> Dict[str, int]:
+        """Queued tasks per GPU queue (e.g. {"gpu.esmfold": 3, ...})."""
+        return queue_depths()
+
+    @staticmethod
+    def queue_depth(task: str, max_priority: Optional[int] = None) -> int:
+        """
+        Queued tasks ahead of a new submission.
+
+        Args:
+            task: Model name ("esmfold") or Celery task name
+            max_priority: Only count messages at this priority or higher
+        """
+        if task in TASK_MODELS.values():
+            task = next(name for name, model in TASK_MODELS.items() if model == task)
+        return queue_depth(queue_for(task), max_priority)
+
+    @staticmethod
+    def circuit_states() -> Dict[str, str]:
+        """Circuit state per model ("closed", "open", "half_open" or "unknown")."""
+        return circuit_states()
+
+    @staticmethod
+    def detection_lag() -> Dict[str, Dict[str, float]]:
+        """Completion detection lag per model (count, mean, p50, p95, max seconds)."""
+        return detection_lag_summary()
 
     async def _cancel_task(self, async_result: AsyncResult) -> None:
         """
@@ -303,6 +598,90 @@ class GpuTaskManager:
             pass
 
 
+class _RunClock:
+    """
+    Splits a submitted task's wait into broker queue time and run time.
+
+    The timeout bounds the run time, counted from the STARTED transition
+    (task_track_started). A task still queued when the timeout has passed
+    since submission gets the current estimated queue wait on top, once,
+    before it is given up; a task seen finished without being seen STARTED
+    ran at most since the last poll that saw it queued.
+    """
+
+    def __init__(self, submitted: float, timeout: float, queue_wait: Callable[[], float]):
+        self.submitted = submitted
+        self.timeout = timeout
+        self.queue_wait = queue_wait
+        self.queued_until = submitted  # Last poll that saw the task queued
+        self.started: Optional[float] = None
+        self.queue_deadline: Optional[float] = None
+
+    def observe(self, state: str, now: float) -> None:
+        """Update from the task state polled at ``now``."""
+        if self.started is not None:
+            return
+        if state in QUEUED_STATES:
+            self.queued_until = now
+        elif state == "STARTED":
+            self.started = now
+        else:
+            self.started = self.queued_until
+
+    def runtime(self, now: float) -> float:
+        """Seconds the task has been running (or ran, if finished) at ``now``."""
+        return now - (self.started if self.started is not None else self.queued_until)
+
+    def expired(self, now: float) -> Optional[str]:
+        """Why the task should be given up at ``now``, or None."""
+        if self.started is not None:
+            if now - self.started > self.timeout:
+                return f"Task timed out after {self.timeout}s"
+            return None
+        if now - self.submitted <= self.timeout:
+            return None
+        if self.queue_deadline is None:
+            self.queue_deadline = self.submitted + self.timeout + self.queue_wait()
+        if now > self.queue_deadline:
+            return f"Task timed out after {now - self.submitted:.0f}s in the queue"
+        return None
+
+
+def _trace_output(result: GpuTaskResult) -> Dict[str, Any]:
+    """A task result as recorded in a workflow trace."""
+    return {
+        "status": result.status.value,
+        "result": result.result,
+        "error": result.error,
+        "task_id": result.task_id,
+        "detection_lag": result.detection_lag,
+        "fallback": result.fallback,
+    }
+
+
+def _sequence_length(model: str, args: tuple) -> int:
+    """Length of the protein sequence among a task's arguments, 0 if none."""
+    for mock_name, seq_index, _ in SIMULATED_TASKS.values():
+        if mock_name == model and seq_index is not None and len(args) > seq_index:
+            return len(args[seq_index]) if isinstance(args[seq_index], str) else 0
+    return 0
+
+
+def _detection_lag(async_result: AsyncResult) -> Optional[float]:
+    """Seconds between the task finishing and now, if the backend recorded it."""
+    try:
+        done = async_result.date_done
+        if isinstance(done, str):
+            done = datetime.fromisoformat(done)
+        if not isinstance(done, datetime):
+            return None
+        if done.tzinfo is None:
+            done = done.replace(tzinfo=timezone.utc)  # Celery stores UTC
+        return max(0.0, (datetime.now(timezone.utc) - done).total_seconds())
+    except Exception:
+        return None  # Metrics must never fail a task
+
+
 # =============================================================================
 # Convenience Functions
 # =============================================================================
@@ -323,16 +702,16 @@ async def execute_gpu_task(
         task_func: Celery task function
         args: Task arguments
         kwargs: Task keyword arguments
-        timeout: Optional custom timeout
-        poll_interval: Optional custom poll interval
+        timeout: Optional fixed timeout (default: from runtime history)
+        poll_interval: Optional fixed poll interval (default: adaptive)
 
     Returns:
         GpuTaskResult
     """
     manager = GpuTaskManager(
         task_name=task_name,
-        timeout=timeout or GpuTimeouts.ESMFOLD,
-        poll_interval=poll_interval or GpuTimeouts.POLL_INTERVAL,
+        timeout=timeout,
+        poll_interval=poll_interval,
     )
 
     return await manager.execute_async(task_func, args, kwargs)
@@ -353,14 +732,14 @@ def execute_gpu_task_sync(
         task_func: Celery task function
         args: Task arguments
         kwargs: Task keyword arguments
-        timeout: Optional custom timeout
+        timeout: Optional fixed timeout (default: from runtime history)
 
     Returns:
         GpuTaskResult
     """
     manager = GpuTaskManager(
         task_name=task_name,
-        timeout=timeout or GpuTimeouts.ESMFOLD,
+        timeout=timeout,
     )
 
     return manager.execute_sync(task_func, args, kwargs)
@@ -372,40 +751,24 @@ def execute_gpu_task_sync(
 
 def create_esmfold_manager() -> GpuTaskManager:
     """Create manager for ESMFold tasks."""
-    return GpuTaskManager(
-        task_name="ESMFold",
-        timeout=GpuTimeouts.ESMFOLD,
-    )
+    return GpuTaskManager(task_name="ESMFold")
 
 
 def create_clean_ec_manager() -> GpuTaskManager:
     """Create manager for CLEAN EC tasks."""
-    return GpuTaskManager(
-        task_name="CLEAN_EC",
-        timeout=GpuTimeouts.CLEAN_EC,
-    )
+    return GpuTaskManager(task_name="CLEAN_EC")
 
 
 def create_deepenzyme_manager() -> GpuTaskManager:
     """Create manager for DeepEnzyme tasks."""
-    return GpuTaskManager(
-        task_name="DeepEnzyme",
-        timeout=GpuTimeouts.DEEPENZYME,
-    )
+    return GpuTaskManager(task_name="DeepEnzyme")
 
 
 def create_temberture_manager() -> GpuTaskManager:
     """Create manager for TemBERTure tasks."""
-    return GpuTaskManager(
-        task_name="TemBERTure",
-        timeout=GpuTimeouts.TEMBERTURE,
-    )
+    return GpuTaskManager(task_name="TemBERTure")
 
 
 def create_flan_manager() -> GpuTaskManager:
     """Create manager for FLAN extraction tasks."""
-    return GpuTaskManager(
-        task_name="FLAN_Extractor",
-        timeout=GpuTimeouts.FLAN_EXTRACTOR,
-        poll_interval=2,
-    )
+    return GpuTaskManager(task_name="FLAN_Extractor")
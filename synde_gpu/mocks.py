@@ -13,11 +13,25 @@ from datetime import datetime
 from synde_graph.config import MOCK_GPU
 
 
+# Shared RNG for mock payloads; reseed with seed_mock_responses() for repeatable runs
+_rng = random.Random()
+
+
 def is_mock_mode() -> bool:
     """Check if mock mode is enabled."""
     return MOCK_GPU or os.getenv("MOCK_GPU", "false").lower() in ("true", "1", "yes")
 
 
+def seed_mock_responses(seed: Optional[int]) -> None:
+    """
+    Seed the RNG used for mock payloads.
+
+    Args:
+        seed: Seed value, or None to reseed from system entropy
+    """
+    _rng.seed(seed)
+
+
 class MockGpuResponses:
     """Mock responses for GPU tasks."""
 
@@ -41,7 +55,7 @@ END
     def esmfold(job_id: str, sequence: str) -> Dict[str, Any]:
         """Mock ESMFold response."""
         # Generate realistic pLDDT based on sequence length
-        avg_plddt = 75.0 + random.uniform(-10, 15)
+        avg_plddt = 75.0 + _rng.uniform(-10, 15)
         avg_plddt = min(95.0, max(50.0, avg_plddt))
 
         return {
@@ -49,7 +63,7 @@ END
             "pdb_path": f"/mock/esmfold/{job_id}.pdb",
             "pdb_data": MockGpuResponses.SAMPLE_PDB,
             "avg_plddt": round(avg_plddt, 2),
-            "runtime_sec": round(random.uniform(5, 30), 1),
+            "runtime_sec": round(_rng.uniform(5, 30), 1),
         }
 
     @staticmethod
@@ -64,35 +78,35 @@ END
             "2.6.1.1",   # Aspartate aminotransferase
             "4.2.1.1",   # Carbonic anhydrase
         ]
-        ec = random.choice(ec_numbers)
-        prob = 0.85 + random.uniform(0, 0.14)
+        ec = _rng.choice(ec_numbers)
+        prob = 0.85 + _rng.uniform(0, 0.14)
 
         return {
             "status": "success",
             "ec_number": ec,
             "probability": round(prob, 4),
-            "runtime_sec": round(random.uniform(2, 10), 1),
+            "runtime_sec": round(_rng.uniform(2, 10), 1),
         }
 
     @staticmethod
     def deepenzyme(sequence: str, pdb_path: str, smiles: str) -> Dict[str, Any]:
         """Mock DeepEnzyme kcat prediction response."""
         # kcat values typically range from 0.1 to 10000 s^-1
-        log_kcat = random.uniform(-1, 4)  # log10(kcat)
+        log_kcat = _rng.uniform(-1, 4)  # log10(kcat)
         kcat = round(10 ** log_kcat, 2)
 
         return {
             "status": "success",
             "kcat": kcat,
             "log_kcat": round(log_kcat, 3),
-            "runtime_sec": round(random.uniform(5, 20), 1),
+            "runtime_sec": round(_rng.uniform(5, 20), 1),
         }
 
     @staticmethod
     def temberture(sequence: str) -> Dict[str, Any]:
         """Mock TemBERTure melting temperature prediction response."""
         # Tm values typically range from 30 to 90 C
-        tm = 55.0 + random.uniform(-20, 30)
+        tm = 55.0 + _rng.uniform(-20, 30)
 
         # Classify thermophilicity
         if tm > 70:
@@ -106,7 +120,7 @@ END
             "status": "success",
             "melting_temperature": round(tm, 2),
             "thermo_class": thermo_class,
-            "runtime_sec": round(random.uniform(2, 8), 1),
+            "runtime_sec": round(_rng.uniform(2, 8), 1),
         }
 
     @staticmethod
@@ -175,20 +189,20 @@ END
         pocket_residues = {}
 
         for i in range(num_pockets):
-            score = 0.8 - (i * 0.1) + random.uniform(-0.05, 0.05)
+            score = 0.8 - (i * 0.1) + _rng.uniform(-0.05, 0.05)
             score = max(0.1, min(1.0, score))
 
             pocket = {
                 "pocket_id": i + 1,
                 "score": round(score, 3),
                 "druggability_score": round(score * 0.9, 3),
-                "volume": round(random.uniform(100, 500), 1),
+                "volume": round(_rng.uniform(100, 500), 1),
             }
             pockets.append(pocket)
 
             # Generate mock residues
-            start_res = random.randint(10, 200)
-            residues = [f"A:{start_res + j}" for j in range(random.randint(5, 15))]
+            start_res = _rng.randint(10, 200)
+            residues = [f"A:{start_res + j}" for j in range(_rng.randint(5, 15))]
             pocket_residues[i + 1] = residues
 
         return {
@@ -196,7 +210,7 @@ END
             "pockets_dir": f"{output_dir}/pockets",
             "pocket_scores": pockets,
             "pocket_residues": pocket_residues,
-            "runtime_sec": round(random.uniform(5, 30), 1),
+            "runtime_sec": round(_rng.uniform(5, 30), 1),
         }
 
 
@@ -0,0 +1,218 @@
+"""
+Polling strategies for waiting on GPU task results.
+
+A single fixed interval either overshoots short tasks (a 1.5 s FLAN call
+polled every 5 s) or over-polls long ones. Strategies decide the next
+sleep from the time already waited:
+
+- FixedInterval: the old behaviour
+- ExponentialBackoff: start short, grow by ``factor`` up to a cap, with
+  jitter so many waiters don't poll in lockstep
+- EtaSchedule: sleep until the model's typical fast completion (p10),
+  poll densely until its typical slow completion (p90), then back off;
+  the percentiles come from recorded runtimes when available
+
+The gap between a task finishing and the poll that notices it is the
+"completion detection lag"; GpuTaskManager records it per model with
+``record_detection_lag`` (see ``detection_lag_summary``).
+
+Usage:
+    strategy = default_strategy("esmfold", seq_len=240)
+    while not async_result.ready():
+        time.sleep(strategy.next_interval(elapsed))
+"""
+
+import math
+import random
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from synde_graph.config import GpuTimeouts
+from synde_gpu.runtime_stats import predict
+from synde_gpu.simulator import DEFAULT_PROFILE, get_simulator, is_simulated_mode
+
+# Standard normal quantile of the 90th percentile
+Z90 = 1.2816
+
+
+class PollingStrategy:
+    """Decides how long to sleep before the next status check."""
+
+    def next_interval(self, elapsed: float) -> float:
+        """Seconds to sleep, given the seconds waited so far."""
+        raise NotImplementedError
+
+
+class FixedInterval(PollingStrategy):
+    """Poll every ``interval`` seconds."""
+
+    def __init__(self, interval: float = GpuTimeouts.POLL_INTERVAL):
+        self.interval = interval
+
+    def next_interval(self, elapsed: float) -> float:
+        return self.interval
+
+
+class ExponentialBackoff(PollingStrategy):
+    """
+    Poll after ``initial`` seconds, then ``factor`` times longer each time.
+
+    Each interval is spread by +/- ``jitter`` (a fraction) and capped at
+    ``max_interval``.
+    """
+
+    def __init__(
+        self,
+        initial: float = GpuTimeouts.POLL_MIN_INTERVAL,
+        factor: float = 1.5,
+        max_interval: float = GpuTimeouts.POLL_MAX_INTERVAL,
+        jitter: float = 0.1,
+        rng: Optional[random.Random] = None,
+    ):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+        self._next = initial
+
+    def next_interval(self, elapsed: float) -> float:
+        interval = min(self._next, self.max_interval)
+        self._next = interval * self.factor
+        spread = interval * self.jitter
+        return max(0.0, interval + self._rng.uniform(-spread, spread))
+
+
+class EtaSchedule(PollingStrategy):
+    """
+    Poll around a task's expected completion window.
+
+    Before ``p10`` nothing is expected to finish, so the waiter sleeps
+    until then (in steps of at most ``max_interval``). Between ``p10`` and
+    ``p90`` it polls ``polls_in_window`` times, evenly spaced. A task
+    still running after ``p90`` is overdue and is polled with exponential
+    backoff from ``min_interval``.
+    """
+
+    def __init__(
+        self,
+        p10: float,
+        p90: float,
+        polls_in_window: int = 8,
+        min_interval: float = GpuTimeouts.POLL_MIN_INTERVAL,
+        max_interval: float = GpuTimeouts.POLL_MAX_INTERVAL,
+        rng: Optional[random.Random] = None,
+    ):
+        self.p10 = p10
+        self.p90 = max(p90, p10)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.window_step = (self.p90 - self.p10) / max(1, polls_in_window)
+        self._overdue = ExponentialBackoff(min_interval, max_interval=max_interval, rng=rng)
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def next_interval(self, elapsed: float) -> float:
+        if elapsed < self.p10:
+            return self._clamp(self.p10 - elapsed)
+        if elapsed < self.p90:
+            return self._clamp(min(self.window_step, self.p90 - elapsed))
+        return self._overdue.next_interval(elapsed)
+
+
+# =============================================================================
+# Runtime Percentiles
+# =============================================================================
+
+def runtime_percentiles(model: str, seq_len: int = 0) -> Optional[Tuple[float, float]]:
+    """
+    Expected (p10, p90) runtime in seconds of one task.
+
+    Taken from the model's recorded runtimes when there are enough (see
+    synde_gpu.runtime_stats), else derived from its latency distribution
+    in the simulator profile: the active profile in simulated mode, the
+    production-like defaults otherwise. Returns None for unknown models.
+    """
+    if is_simulated_mode():
+        sim = get_simulator()
+        spec, scale = sim.profile["models"].get(model), sim.time_scale
+    else:
+        history = predict(model, seq_len)
+        if history is not None:
+            return history.p10, history.p90
+        spec, scale = DEFAULT_PROFILE["models"].get(model), 1.0
+    if not spec:
+        return None
+
+    dist = spec.get("distribution", "constant")
+    if dist == "lognormal":
+        median, sigma = spec.get("median", 1.0), spec.get("sigma", 0.0)
+        low, high = median * math.exp(-Z90 * sigma), median * math.exp(Z90 * sigma)
+    elif dist == "normal":
+        mean, stddev = spec.get("mean", 1.0), spec.get("stddev", 0.0)
+        low, high = max(0.0, mean - Z90 * stddev), mean + Z90 * stddev
+    elif dist == "uniform":
+        lo, hi = spec.get("low", 0.0), spec.get("high", 1.0)
+        low, high = lo + 0.1 * (hi - lo), lo + 0.9 * (hi - lo)
+    else:
+        low = high = float(spec.get("value", 0.0))
+
+    extra = spec.get("per_residue", 0.0) * seq_len
+    return (low + extra) * scale, (high + extra) * scale
+
+
+def default_strategy(model: Optional[str] = None, seq_len: int = 0) -> PollingStrategy:
+    """
+    Polling strategy selected by GPU_POLL_STRATEGY ("eta", "backoff", "fixed").
+
+    "eta" falls back to backoff for models without runtime percentiles.
+    """
+    name = GpuTimeouts.POLL_STRATEGY.lower()
+    if name == "fixed":
+        return FixedInterval()
+    if name == "eta" and model:
+        percentiles = runtime_percentiles(model, seq_len)
+        if percentiles is not None:
+            return EtaSchedule(*percentiles)
+    return ExponentialBackoff()
+
+
+# =============================================================================
+# Completion Detection Lag
+# =============================================================================
+
+# Samples kept per model; older ones are dropped
+MAX_LAG_SAMPLES = 1000
+
+_lags: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=MAX_LAG_SAMPLES))
+_lags_lock = threading.Lock()
+
+
+def record_detection_lag(model: str, lag: float) -> None:
+    """Record the seconds between a task finishing and its waiter noticing."""
+    with _lags_lock:
+        _lags[model].append(max(0.0, lag))
+
+
+def detection_lag_summary() -> Dict[str, Dict[str, float]]:
+    """Per model: count, mean, p50, p95 and max detection lag in seconds."""
+    summary = {}
+    with _lags_lock:
+        for model, samples in _lags.items():
+            ordered = sorted(samples)
+            summary[model] = {
+                "count": len(ordered),
+                "mean": sum(ordered) / len(ordered),
+                "p50": ordered[int(0.50 * (len(ordered) - 1))],
+                "p95": ordered[int(0.95 * (len(ordered) - 1))],
+                "max": ordered[-1],
+            }
+    return summary
+
+
+def reset_detection_lag() -> None:
+    """Forget recorded detection lags."""
+    with _lags_lock:
+        _lags.clear()
@@ -0,0 +1,290 @@
+"""
+Historical runtimes of GPU tasks.
+
+Every successful GPU task records its elapsed time with the model and
+input sequence length. From the recent samples of a model we fit a
+length-aware latency model, ``elapsed = intercept + slope x seq_len``,
+and use its residuals for the spread. That gives:
+
+- ``predict_runtime(model, seq_len)``: expected seconds, for user-facing ETAs
+- ``typical_runtime(model)``: expected seconds at the model's mean input
+  length, for GPU admission control when the input is not known
+- ``runtime_timeout(model, seq_len, default)``: a per-request timeout
+  (GPU_TIMEOUT_FACTOR x predicted p90) instead of one flat constant
+- percentiles for the ETA polling schedule (see synde_gpu.polling)
+
+Samples are kept in a local SQLite database (GPU_RUNTIME_STATS_DB), so
+``synde runtime-report`` can summarize them offline.
+"""
+
+import logging
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from synde_graph.config import RuntimeStatsSettings
+
+logger = logging.getLogger(__name__)
+
+# Seconds a fitted model is reused before re-reading the samples
+FIT_CACHE_SECONDS = 60.0
+
+
+@dataclass
+class RuntimeFit:
+    """Least-squares latency model of one GPU model."""
+    model: str
+    intercept: float
+    slope: float  # seconds per residue
+    residuals: List[float]  # sorted
+    samples: int
+    mean_len: float = 0.0  # Mean sequence length of the samples
+
+    def predict(self, seq_len: int) -> float:
+        return max(0.0, self.intercept + self.slope * seq_len)
+
+    def residual_quantile(self, q: float) -> float:
+        return self.residuals[min(len(self.residuals) - 1, int(q * len(self.residuals)))]
+
+
+@dataclass
+class RuntimePrediction:
+    """Predicted runtime of one task."""
+    model: str
+    seq_len: int
+    expected: float
+    p10: float
+    p90: float
+    samples: int
+
+
+def fit_runtime(model: str, samples: List[Tuple[int, float]]) -> Optional[RuntimeFit]:
+    """
+    Fit ``elapsed = intercept + slope x seq_len`` by least squares.
+
+    With a single distinct length (or a negative fitted slope) the slope
+    is 0 and the intercept is the mean runtime.
+    """
+    if not samples:
+        return None
+    n = len(samples)
+    mean_x = sum(x for x, _ in samples) / n
+    mean_y = sum(y for _, y in samples) / n
+    sxx = sum((x - mean_x) ** 2 for x, _ in samples)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in samples)
+
+    slope = max(0.0, sxy / sxx) if sxx else 0.0
+    intercept = mean_y - slope * mean_x
+    residuals = sorted(y - (intercept + slope * x) for x, y in samples)
+    return RuntimeFit(model, intercept, slope, residuals, n, mean_x)
+
+
+class RuntimeStatsStore:
+    """
+    SQLite store of GPU task runtimes.
+
+    Usage:
+        store = RuntimeStatsStore("runtime.db")
+        store.record("esmfold", 240, 19.5)
+        store.predict("esmfold", 300)  # RuntimePrediction or None
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = RuntimeStatsSettings.DB_PATH,
+        max_samples: int = RuntimeStatsSettings.MAX_SAMPLES,
+        min_samples: int = RuntimeStatsSettings.MIN_SAMPLES,
+        bucket_size: int = RuntimeStatsSettings.BUCKET_SIZE,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite database file
+            max_samples: Most recent samples kept per model
+            min_samples: Samples needed before predicting
+            bucket_size: Residues per sequence-length bucket in reports
+        """
+        self.db_path = Path(db_path)
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self.bucket_size = bucket_size
+        self._fits: Dict[str, Tuple[float, Optional[RuntimeFit]]] = {}
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS runtime_samples (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model TEXT NOT NULL,
+                    seq_len INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    elapsed REAL NOT NULL,
+                    recorded_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_runtime_model
+                ON runtime_samples(model, id)
+            """)
+            conn.commit()
+
+    def record(self, model: str, seq_len: int, elapsed: float) -> None:
+        """Record one successful task's elapsed seconds."""
+        bucket = seq_len // self.bucket_size * self.bucket_size
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                INSERT INTO runtime_samples (model, seq_len, bucket, elapsed, recorded_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (model, seq_len, bucket, elapsed, datetime.now(timezone.utc).isoformat()))
+            # Keep only the most recent max_samples per model
+            conn.execute("""
+                DELETE FROM runtime_samples
+                WHERE model = ? AND id <= (
+                    SELECT id FROM runtime_samples WHERE model = ?
+                    ORDER BY id DESC LIMIT 1 OFFSET ?
+                )
+            """, (model, model, self.max_samples))
+            conn.commit()
+
+    def samples(self, model: str) -> List[Tuple[int, float]]:
+        """(seq_len, elapsed) of a model's kept samples."""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT seq_len, elapsed FROM runtime_samples WHERE model = ?", (model,)
+            ).fetchall()
+
+    def fit(self, model: str) -> Optional[RuntimeFit]:
+        """Latency model of ``model``, or None with fewer than min_samples."""
+        with self._lock:
+            cached = self._fits.get(model)
+            if cached and time.monotonic() - cached[0] < FIT_CACHE_SECONDS:
+                return cached[1]
+
+        samples = self.samples(model)
+        fit = fit_runtime(model, samples) if len(samples) >= self.min_samples else None
+        with self._lock:
+            self._fits[model] = (time.monotonic(), fit)
+        return fit
+
+    def predict(self, model: str, seq_len: int = 0) -> Optional[RuntimePrediction]:
+        """Expected runtime with its p10/p90 spread, or None without enough history."""
+        fit = self.fit(model)
+        if fit is None:
+            return None
+        expected = fit.predict(seq_len)
+        return RuntimePrediction(
+            model=model,
+            seq_len=seq_len,
+            expected=expected,
+            p10=max(0.0, expected + fit.residual_quantile(0.1)),
+            p90=max(expected, expected + fit.residual_quantile(0.9)),
+            samples=fit.samples,
+        )
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per model and length bucket: count, mean, p50, p90 and max seconds."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("""
+                SELECT model, bucket, elapsed FROM runtime_samples
+                ORDER BY model, bucket, elapsed
+            """).fetchall()
+
+        groups: Dict[Tuple[str, int], List[float]] = {}
+        for model, bucket, elapsed in rows:
+            groups.setdefault((model, bucket), []).append(elapsed)
+
+        report = []
+        for (model, bucket), values in groups.items():
+            report.append({
+                "model": model,
+                "bucket": f"{bucket}-{bucket + self.bucket_size - 1}",
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": values[int(0.5 * (len(values) - 1))],
+                "p90": values[int(0.9 * (len(values) - 1))],
+                "max": values[-1],
+            })
+        return report
+
+
+# =============================================================================
+# Global Store
+# =============================================================================
+
+_store: Optional[RuntimeStatsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_runtime_stats() -> Optional[RuntimeStatsStore]:
+    """Get the process-wide store, or None when GPU_RUNTIME_STATS is disabled."""
+    global _store
+    with _store_lock:
+        if _store is None and RuntimeStatsSettings.ENABLED:
+            _store = RuntimeStatsStore()
+        return _store
+
+
+def set_runtime_stats(store: Optional[RuntimeStatsStore]) -> None:
+    """Replace (or clear) the process-wide store."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def record_runtime(model: str, seq_len: int, elapsed: float) -> None:
+    """Record a runtime in the global store; failures are logged, not raised."""
+    try:
+        store = get_runtime_stats()
+        if store is not None:
+            store.record(model, seq_len, elapsed)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not record {model} runtime: {e}")
+
+
+def predict(model: str, seq_len: int = 0) -> Optional[RuntimePrediction]:
+    """Prediction from the global store, or None without enough history."""
+    try:
+        store = get_runtime_stats()
+        return store.predict(model, seq_len) if store is not None else None
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not read {model} runtime history: {e}")
+        return None
+
+
+def predict_runtime(model: str, seq_len: int = 0) -> Optional[float]:
+    """Expected seconds for one ``model`` task on a ``seq_len`` sequence, if known."""
+    prediction = predict(model, seq_len)
+    return prediction.expected if prediction is not None else None
+
+
+def typical_runtime(model: str) -> Optional[float]:
+    """Expected seconds for one ``model`` task of the mean recorded length, if known."""
+    try:
+        store = get_runtime_stats()
+        fit = store.fit(model) if store is not None else None
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not read {model} runtime history: {e}")
+        return None
+    return fit.predict(round(fit.mean_len)) if fit is not None else None
+
+
+def runtime_timeout(model: str, seq_len: int, default: int) -> int:
+    """
+    Timeout for one task: GPU_TIMEOUT_FACTOR x predicted p90, clamped to
+    [GPU_TIMEOUT_MIN, GPU_TIMEOUT_MAX]; ``default`` without history.
+    """
+    prediction = predict(model, seq_len)
+    if prediction is None:
+        return default
+    timeout = math.ceil(RuntimeStatsSettings.TIMEOUT_FACTOR * prediction.p90)
+    return min(RuntimeStatsSettings.TIMEOUT_MAX, max(RuntimeStatsSettings.TIMEOUT_MIN, timeout))
@@ -0,0 +1,324 @@
+"""
+Scheduling for GPU task submissions.
+
+Three pieces sit between the task proxies and the broker:
+- Routing: with GPU_PER_MODEL_QUEUES, each model gets its own queue
+  ("gpu.esmfold", "gpu.clean_ec", ...) so a short CLEAN call never waits
+  behind a long structure prediction; by default all share "gpu"
+- Priorities: the caller's priority class (interactive chat, batch
+  screening, background) becomes a Celery message priority. It is held in
+  a context variable so nodes don't need to know who is running them
+- Admission control: before submitting, the estimated wait (tasks ahead
+  in the queue x estimated runtime / workers) is compared with the
+  class's latency budget; interactive work over budget is rejected,
+  batch and background work is deferred until the queue drains
+
+Usage:
+    with priority_class(PRIORITY_BATCH):
+        result = call_esmfold(job_id, sequence)  # routed, prioritized, admitted
+"""
+
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from synde_graph.config import CELERY_BROKER_URL, GpuScheduling
+from synde_gpu.runtime_stats import typical_runtime
+from synde_gpu.simulator import DEFAULT_PROFILE, get_simulator, is_simulated_mode
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Routing
+# =============================================================================
+
+# Celery task name -> model name (also the simulator profile's model key)
+TASK_MODELS: Dict[str, str] = {
+    "home.tasks.run_esmfold_job": "esmfold",
+    "home.tasks.run_clean_ec_job": "clean_ec",
+    "home.tasks.run_deepenzyme_kcat_job": "deepenzyme",
+    "home.tasks.run_temperture_job": "temberture",
+    "home.tasks.run_flan_extractor": "flan_extractor",
+    "home.tasks.run_fpocket_job": "fpocket",
+    "home.tasks.run_progen2_job": "progen2",
+    "home.tasks.run_zymctrl_job": "zymctrl",
+}
+
+
+def queue_for(task_name: str) -> str:
+    """Broker queue a GPU task is routed to."""
+    model = TASK_MODELS.get(task_name)
+    if not GpuScheduling.PER_MODEL_QUEUES or model is None:
+        return GpuScheduling.SHARED_QUEUE
+    return f"{GpuScheduling.SHARED_QUEUE}.{model}"
+
+
+def gpu_task_routes() -> Dict[str, Dict[str, str]]:
+    """Celery ``task_routes`` entries for every GPU task."""
+    return {task_name: {"queue": queue_for(task_name)} for task_name in TASK_MODELS}
+
+
+# Message priorities on Redis. 0 is the highest priority; each step is a
+# separate list named "<queue><sep><step>" (step 0 uses the bare queue name)
+# and a message goes to the highest step not above its priority. These are
+# kombu's defaults, so workers read every step without extra configuration;
+# a worker that overrides them would miss messages.
+PRIORITY_STEPS = [0, 3, 6, 9]
+PRIORITY_SEP = "\x06\x16"
+BROKER_TRANSPORT_OPTIONS = {
+    "queue_order_strategy": "priority",
+    "priority_steps": PRIORITY_STEPS,
+    "sep": PRIORITY_SEP,
+}
+
+
+# =============================================================================
+# Priority Classes
+# =============================================================================
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_BACKGROUND = "background"
+
+# Priority class -> Celery message priority (lower runs first on Redis);
+# each one is a step of PRIORITY_STEPS
+PRIORITIES: Dict[str, int] = {
+    PRIORITY_INTERACTIVE: 0,
+    PRIORITY_BATCH: 6,
+    PRIORITY_BACKGROUND: 9,
+}
+
+_priority_class = contextvars.ContextVar("gpu_priority_class", default=PRIORITY_INTERACTIVE)
+
+
+def get_priority_class() -> str:
+    """Priority class of GPU work submitted from the current context."""
+    return _priority_class.get()
+
+
+def set_priority_class(name: str):
+    """Set the priority class for GPU work submitted from the current context."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown GPU priority class: {name}")
+    return _priority_class.set(name)
+
+
+@contextmanager
+def priority_class(name: str):
+    """Submit GPU work inside the block with the given priority class."""
+    token = set_priority_class(name)
+    try:
+        yield
+    finally:
+        _priority_class.reset(token)
+
+
+# =============================================================================
+# Queue Depth
+# =============================================================================
+
+_broker_client = None
+
+
+def _broker():
+    global _broker_client
+    if _broker_client is None:
+        import redis
+        _broker_client = redis.Redis.from_url(
+            CELERY_BROKER_URL, socket_connect_timeout=1, socket_timeout=1
+        )
+    return _broker_client
+
+
+def queue_depth(queue: str, max_priority: Optional[int] = None) -> int:
+    """
+    Tasks waiting in a broker queue.
+
+    Args:
+        queue: Queue name (e.g. "gpu.esmfold")
+        max_priority: Only count messages at this priority or higher (i.e.
+            numerically lower or equal), which are the ones a new message
+            at this priority would wait behind
+
+    Returns:
+        Number of queued messages (running tasks are not included)
+    """
+    if is_simulated_mode():
+        return get_simulator().queue_depth(queue, max_priority)
+
+    steps = [p for p in PRIORITY_STEPS if max_priority is None or p <= max_priority]
+    pipe = _broker().pipeline(transaction=False)
+    for step in steps:
+        pipe.llen(queue if step == 0 else f"{queue}{PRIORITY_SEP}{step}")
+    return sum(pipe.execute())
+
+
+def queue_depths() -> Dict[str, int]:
+    """Queued tasks per GPU queue, at all priorities."""
+    return {queue: queue_depth(queue) for queue in sorted(set(map(queue_for, TASK_MODELS)))}
+
+
+# =============================================================================
+# Admission Control
+# =============================================================================
+
+class GpuAdmissionRejected(Exception):
+    """Raised when a GPU task's estimated queue wait exceeds its latency budget."""
+
+    def __init__(self, task_name: str, estimated_wait: float, budget: float):
+        self.task_name = task_name
+        self.estimated_wait = estimated_wait
+        self.budget = budget
+        super().__init__(
+            f"GPU queue for {TASK_MODELS.get(task_name, task_name)} is busy "
+            f"(estimated wait {estimated_wait:.0f}s, budget {budget:.0f}s)"
+        )
+
+
+@dataclass
+class AdmissionDecision:
+    """Outcome of an admission check for one submission."""
+    action: str  # "admit" | "defer" | "reject"
+    queue: str
+    priority: int
+    depth: int = 0
+    estimated_wait: float = 0.0
+    budget: float = 0.0
+
+
+def estimate_runtime(task_name: str) -> float:
+    """
+    Estimated seconds one task occupies a GPU worker.
+
+    In simulated mode, the active profile's median latency. Otherwise the
+    measured runtime history (see synde_gpu.runtime_stats), falling back
+    to the simulator's production-like default medians until a model has
+    enough samples.
+    """
+    model = TASK_MODELS.get(task_name)
+    if is_simulated_mode():
+        sim = get_simulator()
+        spec = sim.profile["models"].get(model, {})
+        return spec.get("median", spec.get("mean", spec.get("value", 1.0))) * sim.time_scale
+    measured = typical_runtime(model) if model else None
+    if measured is not None:
+        return measured
+    return DEFAULT_PROFILE["models"].get(model, {}).get("median", 10.0)
+
+
+class AdmissionController:
+    """
+    Admits, defers or rejects GPU submissions against per-class latency budgets.
+
+    Usage:
+        controller = AdmissionController()
+        decision = controller.admit("home.tasks.run_clean_ec_job")
+        task_signature.apply_async(args, queue=decision.queue, priority=decision.priority)
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, float]] = None,
+        workers_per_queue: int = GpuScheduling.WORKERS_PER_QUEUE,
+        max_defer: float = GpuScheduling.MAX_DEFER,
+        defer_poll: float = GpuScheduling.DEFER_POLL,
+        depth_fn: Callable[[str, Optional[int]], int] = None,
+        runtime_fn: Callable[[str], float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            budgets: Latency budget (seconds) per priority class; 0 disables
+            workers_per_queue: GPU workers consuming each queue
+            max_defer: Longest a deferred submission waits before going anyway
+            defer_poll: Seconds between re-checks while deferred
+            depth_fn: Queue depth lookup (default: broker or simulator)
+            runtime_fn: Runtime estimate per task (default: estimate_runtime)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.budgets = budgets or {
+            PRIORITY_INTERACTIVE: GpuScheduling.BUDGET_INTERACTIVE,
+            PRIORITY_BATCH: GpuScheduling.BUDGET_BATCH,
+            PRIORITY_BACKGROUND: GpuScheduling.BUDGET_BACKGROUND,
+        }
+        self.workers_per_queue = max(1, workers_per_queue)
+        self.max_defer = max_defer
+        self.defer_poll = defer_poll
+        self.depth_fn = depth_fn or queue_depth
+        self.runtime_fn = runtime_fn or estimate_runtime
+        self.sleep = sleep
+
+    def decide(self, task_name: str, priority_class_name: Optional[str] = None) -> AdmissionDecision:
+        """Check one submission without waiting."""
+        name = priority_class_name or get_priority_class()
+        queue = queue_for(task_name)
+        priority = PRIORITIES[name]
+        budget = self.budgets.get(name, 0)
+        decision = AdmissionDecision("admit", queue, priority, budget=budget)
+
+        if not budget:
+            return decision
+
+        try:
+            decision.depth, decision.estimated_wait = self.estimate_wait(task_name, priority)
+        except Exception as e:
+            # An unreadable queue depth must not block GPU work
+            logger.warning(f"Could not read depth of {queue}, admitting: {e}")
+            return decision
+
+        if decision.estimated_wait > budget:
+            decision.action = "reject" if name == PRIORITY_INTERACTIVE else "defer"
+        return decision
+
+    def estimate_wait(self, task_name: str, priority: int) -> Tuple[int, float]:
+        """
+        Tasks queued ahead of a submission at ``priority``, and its estimated
+        wait: those tasks plus this one, spread over the queue's workers.
+        """
+        depth = self.depth_fn(queue_for(task_name), priority)
+        return depth, (depth + 1) * self.runtime_fn(task_name) / self.workers_per_queue
+
+    def admit(self, task_name: str, priority_class_name: Optional[str] = None) -> AdmissionDecision:
+        """
+        Wait until a submission may go ahead.
+
+        Deferred work re-checks every ``defer_poll`` seconds and is submitted
+        anyway after ``max_defer`` so batches always make progress.
+
+        Raises:
+            GpuAdmissionRejected: Interactive work over its budget
+        """
+        waited = 0.0
+        while True:
+            decision = self.decide(task_name, priority_class_name)
+            if decision.action == "reject":
+                raise GpuAdmissionRejected(task_name, decision.estimated_wait, decision.budget)
+            if decision.action == "admit":
+                return decision
+            if waited >= self.max_defer:
+                logger.warning(
+                    f"Submitting {task_name} after deferring {waited:.0f}s "
+                    f"(estimated wait {decision.estimated_wait:.0f}s)"
+                )
+                return decision
+
+            delay = min(self.defer_poll, self.max_defer - waited)
+            self.sleep(delay)
+            waited += delay
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
@@ -0,0 +1,447 @@
+"""
+Simulated GPU backend for load testing.
+
+Serves the ``home.tasks.*`` signatures in-process with production-like
+timing instead of returning mock results instantly. The simulator models:
+- Per-model latency distributions (optionally sequence-length aware)
+- A fixed number of GPU slots shared by all models
+- A bounded queue that rejects work when full, served in priority order
+- Failure and timeout (hang until revoked) injection
+
+Every random decision is drawn from a seeded RNG at submission time, so a
+given profile, seed and submission order always produce the same latencies,
+failures and payloads.
+"""
+
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from synde_graph.config import SimulatorSettings
+from synde_gpu.mocks import get_mock_response, seed_mock_responses
+
+
+def is_simulated_mode() -> bool:
+    """Check if GPU tasks should be served by the in-process simulator."""
+    backend = os.getenv("GPU_BACKEND", SimulatorSettings.BACKEND)
+    return backend.lower() in ("simulated", "sim", "simulator")
+
+
+# =============================================================================
+# Served Tasks
+# =============================================================================
+
+def _drop_pdb_data(args: tuple) -> tuple:
+    """Adapt fpocket's (path, pdb_data, out_dir, n) signature to the mock's (path, out_dir, n)."""
+    return (args[0],) + tuple(args[2:])
+
+
+# task name -> (mock response name, index of the sequence argument, arg adapter)
+SIMULATED_TASKS: Dict[str, Tuple[str, Optional[int], Optional[Callable[[tuple], tuple]]]] = {
+    "home.tasks.run_esmfold_job": ("esmfold", 1, None),
+    "home.tasks.run_clean_ec_job": ("clean_ec", 0, None),
+    "home.tasks.run_deepenzyme_kcat_job": ("deepenzyme", 0, None),
+    "home.tasks.run_temperture_job": ("temberture", 0, None),
+    "home.tasks.run_flan_extractor": ("flan_extractor", None, None),
+    "home.tasks.run_fpocket_job": ("fpocket", None, _drop_pdb_data),
+}
+
+
+# =============================================================================
+# Profiles
+# =============================================================================
+
+# Latencies in seconds, roughly matching the production GPU worker
+DEFAULT_PROFILE: Dict[str, Any] = {
+    "seed": None,
+    "time_scale": 1.0,
+    "gpu_slots": 1,
+    "queue_capacity": 64,
+    "models": {
+        "esmfold": {"distribution": "lognormal", "median": 12.0, "sigma": 0.35, "per_residue": 0.03},
+        "clean_ec": {"distribution": "lognormal", "median": 5.0, "sigma": 0.25},
+        "deepenzyme": {"distribution": "lognormal", "median": 8.0, "sigma": 0.3},
+        "temberture": {"distribution": "lognormal", "median": 3.5, "sigma": 0.2},
+        "flan_extractor": {"distribution": "lognormal", "median": 1.5, "sigma": 0.2},
+        "fpocket": {"distribution": "lognormal", "median": 15.0, "sigma": 0.3},
+    },
+}
+
+
+def load_profile(path: str) -> Dict[str, Any]:
+    """
+    Load a simulator profile from YAML or JSON.
+
+    Values in the file are merged over DEFAULT_PROFILE; per-model entries
+    are merged key by key so a profile only needs to list what it changes.
+
+    Args:
+        path: Path to a .yaml/.yml or .json profile
+
+    Returns:
+        Merged profile dict
+    """
+    profile_path = Path(path)
+    text = profile_path.read_text()
+
+    if profile_path.suffix.lower() == ".json":
+        data = json.loads(text)
+    else:
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError(
+                "PyYAML is required to load YAML simulator profiles: pip install pyyaml"
+            ) from e
+        data = yaml.safe_load(text) or {}
+
+    return merge_profile(data)
+
+
+def merge_profile(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge profile overrides over DEFAULT_PROFILE."""
+    profile = {k: v for k, v in DEFAULT_PROFILE.items() if k != "models"}
+    models = {name: dict(spec) for name, spec in DEFAULT_PROFILE["models"].items()}
+
+    for key, value in (overrides or {}).items():
+        if key == "models":
+            for name, spec in (value or {}).items():
+                models.setdefault(name, {}).update(spec or {})
+        else:
+            profile[key] = value
+
+    profile["models"] = models
+    return profile
+
+
+def sample_latency(spec: Dict[str, Any], rng: random.Random, seq_len: int = 0) -> float:
+    """
+    Draw one latency (seconds) from a model's distribution.
+
+    Supported distributions: lognormal (median, sigma), normal (mean, stddev),
+    uniform (low, high) and constant (value). ``per_residue`` adds a
+    length-proportional term.
+    """
+    dist = spec.get("distribution", "constant")
+
+    if dist == "lognormal":
+        latency = rng.lognormvariate(math.log(spec.get("median", 1.0)), spec.get("sigma", 0.0))
+    elif dist == "normal":
+        latency = rng.gauss(spec.get("mean", 1.0), spec.get("stddev", 0.0))
+    elif dist == "uniform":
+        latency = rng.uniform(spec.get("low", 0.0), spec.get("high", 1.0))
+    elif dist == "constant":
+        latency = float(spec.get("value", 0.0))
+    else:
+        raise ValueError(f"Unknown latency distribution: {dist}")
+
+    latency += spec.get("per_residue", 0.0) * seq_len
+    return max(0.0, latency)
+
+
+# =============================================================================
+# Simulated Results
+# =============================================================================
+
+class SimulatedTaskError(Exception):
+    """Raised (as the task result) when the simulator injects a failure."""
+    pass
+
+
+class SimulatedAsyncResult:
+    """
+    AsyncResult look-alike returned by the simulator.
+
+    Implements the subset of celery.result.AsyncResult used by
+    GpuTaskManager: id, state, ready(), successful(), result, revoke().
+    """
+
+    def __init__(self, task_id: str, task_name: str):
+        self.id = task_id
+        self.task_id = task_id
+        self.task_name = task_name
+        self.state = "PENDING"
+        self.date_done: Optional[datetime] = None
+        self._result: Any = None
+        self._done = threading.Event()
+        self._revoked = threading.Event()
+
+    @property
+    def result(self) -> Any:
+        return self._result
+
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def successful(self) -> bool:
+        return self.state == "SUCCESS"
+
+    def failed(self) -> bool:
+        return self.state in ("FAILURE", "REVOKED")
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Block until the task finishes; raises the task error on failure."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Simulated task {self.id} not ready after {timeout}s")
+        if self.state != "SUCCESS":
+            raise self._result if isinstance(self._result, Exception) else SimulatedTaskError(str(self._result))
+        return self._result
+
+    def revoke(self, terminate: bool = False, signal: Optional[str] = None) -> None:
+        """Cancel the task; a running task is interrupted when terminate=True."""
+        if self.state == "PENDING" or terminate:
+            self._revoked.set()
+
+    def _finish(self, state: str, result: Any) -> None:
+        self.state = state
+        self._result = result
+        self.date_done = datetime.now(timezone.utc)
+        self._done.set()
+
+
+class _SimJob:
+    """A submitted task with its pre-drawn outcome."""
+
+    def __init__(self, handle: SimulatedAsyncResult, latency: float, outcome: str, payload: Any,
+                 priority: int = 0):
+        self.handle = handle
+        self.latency = latency
+        self.outcome = outcome  # "success" | "failure" | "timeout"
+        self.payload = payload
+        self.priority = priority  # Celery priority, 0 runs first
+
+
+# =============================================================================
+# Simulator
+# =============================================================================
+
+# Handles kept for get_result(); older ones are forgotten
+MAX_TRACKED_HANDLES = 4096
+
+
+class GpuSimulator:
+    """
+    In-process GPU worker pool serving the home.tasks.* signatures.
+
+    Usage:
+        sim = GpuSimulator(profile=load_profile("laptop.yaml"), seed=7)
+        handle = sim.submit("home.tasks.run_esmfold_job", ("job-1", "MKTV..."))
+        handle.get(timeout=60)
+    """
+
+    def __init__(self, profile: Optional[Dict[str, Any]] = None, seed: Optional[int] = None):
+        """
+        Initialize the simulator.
+
+        Args:
+            profile: Profile dict (merged over DEFAULT_PROFILE)
+            seed: RNG seed; overrides the profile's seed when given
+        """
+        self.profile = merge_profile(profile)
+        self.seed = seed if seed is not None else self.profile.get("seed")
+        self.time_scale = float(self.profile.get("time_scale", 1.0))
+        self.gpu_slots = int(self.profile.get("gpu_slots", 1))
+        self.queue_capacity = int(self.profile.get("queue_capacity", 64))
+
+        self._rng = random.Random(self.seed)
+        seed_mock_responses(self.seed)
+
+        # Heap of (priority, submission order, job): FIFO within a priority
+        self._queue: list = []
+        self._order = itertools.count()
+        self._running = 0
+        self._cond = threading.Condition()
+        self._workers = []
+        self._stopped = False
+        # Recent handles by task id, for reattaching after a workflow retry
+        self._handles: "OrderedDict[str, SimulatedAsyncResult]" = OrderedDict()
+
+    # -------------------------------------------------------------------------
+    # Submission
+    # -------------------------------------------------------------------------
+
+    def submit(self, task_name: str, args: tuple = (), priority: int = 0) -> SimulatedAsyncResult:
+        """
+        Submit a task by its Celery name.
+
+        Latency, outcome and payload are drawn immediately so results depend
+        only on the seed and submission order, not on thread scheduling.
+
+        Args:
+            task_name: Celery task name (e.g. "home.tasks.run_esmfold_job")
+            args: Positional task arguments as sent to the real worker
+            priority: Celery message priority (0 highest, as on Redis)
+
+        Returns:
+            SimulatedAsyncResult handle
+        """
+        if task_name not in SIMULATED_TASKS:
+            raise ValueError(f"Simulator does not serve task: {task_name}")
+
+        mock_name, seq_index, adapt = SIMULATED_TASKS[task_name]
+        spec = self.profile["models"].get(mock_name, {})
+
+        with self._cond:
+            task_id = str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+            handle = SimulatedAsyncResult(task_id, task_name)
+
+            if len(self._queue) + self._running >= self.queue_capacity:
+                handle._finish("FAILURE", SimulatedTaskError("Simulated GPU queue is full"))
+                return handle
+
+            seq_len = 0
+            if seq_index is not None and len(args) > seq_index and isinstance(args[seq_index], str):
+                seq_len = len(args[seq_index])
+
+            latency = sample_latency(spec, self._rng, seq_len) * self.time_scale
+            roll = self._rng.random()
+            failure_rate = spec.get("failure_rate", 0.0)
+            timeout_rate = spec.get("timeout_rate", 0.0)
+
+            if roll < failure_rate:
+                outcome, payload = "failure", SimulatedTaskError(f"Injected failure in {mock_name}")
+            elif roll < failure_rate + timeout_rate:
+                outcome, payload = "timeout", None
+            else:
+                mock_args = adapt(tuple(args)) if adapt else tuple(args)
+                outcome, payload = "success", get_mock_response(mock_name, *mock_args)
+
+            self._handles[task_id] = handle
+            if len(self._handles) > MAX_TRACKED_HANDLES:
+                self._handles.popitem(last=False)
+            job = _SimJob(handle, latency, outcome, payload, priority)
+            heapq.heappush(self._queue, (priority, next(self._order), job))
+            self._ensure_workers()
+            self._cond.notify()
+
+        return handle
+
+    def get_result(self, task_id: str) -> Optional[SimulatedAsyncResult]:
+        """Handle of a task submitted earlier, like ``AsyncResult(task_id)``."""
+        with self._cond:
+            return self._handles.get(task_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Current queue depth and slot usage."""
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "running": self._running,
+                "gpu_slots": self.gpu_slots,
+                "queue_capacity": self.queue_capacity,
+            }
+
+    def queue_depth(self, queue: str, max_priority: Optional[int] = None) -> int:
+        """
+        Tasks waiting for ``queue`` (as routed by synde_gpu.scheduling).
+
+        Args:
+            queue: Queue name (e.g. "gpu.esmfold")
+            max_priority: Only count tasks at this priority or higher
+        """
+        from synde_gpu.scheduling import queue_for
+
+        with self._cond:
+            return sum(
+                1 for priority, _, job in self._queue
+                if queue_for(job.handle.task_name) == queue
+                and (max_priority is None or priority <= max_priority)
+            )
+
+    def shutdown(self) -> None:
+        """Stop worker threads and revoke anything still queued."""
+        with self._cond:
+            self._stopped = True
+            while self._queue:
+                _, _, job = heapq.heappop(self._queue)
+                job.handle._finish("REVOKED", SimulatedTaskError("Simulator shut down"))
+            self._cond.notify_all()
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        """Start one worker thread per GPU slot (called with the lock held)."""
+        while len(self._workers) < self.gpu_slots:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"gpu-sim-{len(self._workers)}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                _, _, job = heapq.heappop(self._queue)
+                if job.handle._revoked.is_set():
+                    job.handle._finish("REVOKED", SimulatedTaskError("Task revoked"))
+                    continue
+                self._running += 1
+
+            try:
+                self._run(job)
+            finally:
+                with self._cond:
+                    self._running -= 1
+
+    def _run(self, job: _SimJob) -> None:
+        handle = job.handle
+        handle.state = "STARTED"
+
+        if job.outcome == "timeout":
+            # Hang until revoked, like a stuck GPU job
+            handle._revoked.wait()
+            handle._finish("REVOKED", SimulatedTaskError("Task revoked"))
+            return
+
+        if handle._revoked.wait(job.latency):
+            handle._finish("REVOKED", SimulatedTaskError("Task revoked"))
+        elif job.outcome == "failure":
+            handle._finish("FAILURE", job.payload)
+        else:
+            handle._finish("SUCCESS", job.payload)
+
+
+# =============================================================================
+# Global instance
+# =============================================================================
+
+_simulator: Optional[GpuSimulator] = None
+_simulator_lock = threading.Lock()
+
+
+def get_simulator() -> GpuSimulator:
+    """Get the global simulator, built from SIM_GPU_PROFILE / SIM_GPU_SEED."""
+    global _simulator
+    with _simulator_lock:
+        if _simulator is None:
+            profile_path = os.getenv("SIM_GPU_PROFILE", SimulatorSettings.PROFILE or "")
+            seed = os.getenv("SIM_GPU_SEED", SimulatorSettings.SEED or "")
+            profile = load_profile(profile_path) if profile_path else None
+            _simulator = GpuSimulator(profile=profile, seed=int(seed) if seed else None)
+        return _simulator
+
+
+def reset_simulator(simulator: Optional[GpuSimulator] = None) -> None:
+    """Replace (or clear) the global simulator, shutting down the old one."""
+    global _simulator
+    with _simulator_lock:
+        if _simulator is not None:
+            _simulator.shutdown()
+        _simulator = simulator
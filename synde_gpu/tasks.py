@@ -5,51 +5,279 @@ These proxies call the actual Celery tasks running on the GPU worker,
 providing a clean interface for the LangGraph workflow.
 """
 
-from typing import Any, Optional
-from celery import signature, Celery
+import functools
+import logging
+import threading
+import uuid
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, List, Optional
+from redis.exceptions import RedisError
 
 from synde_graph.config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND
+from synde_graph.utils.cancellation import get_cancel_tokens
+from synde_graph.utils.live_logger import get_current_job_id
+from synde_graph.utils.trace import KIND_GPU_CALL, traced_call
+from synde_gpu.ledger import STATUS_PENDING, STATUS_SUBMITTING, GpuTaskLedger, get_task_ledger
+from synde_gpu.locking import LockAcquisitionError, get_state_lock
 from synde_gpu.mocks import is_mock_mode, get_mock_response
+from synde_gpu.scheduling import (
+    AdmissionDecision,
+    BROKER_TRANSPORT_OPTIONS,
+    get_admission_controller,
+    gpu_task_routes,
+    queue_for,
+)
+from synde_gpu.simulator import is_simulated_mode, get_simulator
 
+logger = logging.getLogger(__name__)
 
-# Create Celery app for task signatures
-# This connects to the same broker as synde-minimal
-celery_app = Celery(
-    "synde_langgraph",
-    broker=CELERY_BROKER_URL,
-    backend=CELERY_RESULT_BACKEND,
-)
 
-# Configure Celery
-celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
-    timezone="UTC",
-    enable_utc=True,
-    task_track_started=True,
-    task_acks_late=True,
-    worker_prefetch_multiplier=1,
-)
+# =============================================================================
+# Celery App
+# =============================================================================
+
+_celery_app = None
+_celery_lock = threading.Lock()
+
+
+def get_celery_app():
+    """
+    The Celery app GPU tasks are sent through, created on first use.
+
+    It connects to the same broker as synde-minimal. Importing Celery
+    takes longer than the rest of this module, and mock and simulated runs
+    never need it.
+    """
+    global _celery_app
+    with _celery_lock:
+        if _celery_app is None:
+            from celery import Celery
+
+            app = Celery(
+                "synde_langgraph",
+                broker=CELERY_BROKER_URL,
+                backend=CELERY_RESULT_BACKEND,
+            )
+            app.conf.update(
+                task_serializer="json",
+                accept_content=["json"],
+                result_serializer="json",
+                timezone="UTC",
+                enable_utc=True,
+                task_track_started=True,
+                task_acks_late=True,
+                worker_prefetch_multiplier=1,
+                broker_transport_options=BROKER_TRANSPORT_OPTIONS,
+            )
+            _celery_app = app
+        return _celery_app
+
+
+def __getattr__(name: str) -> Any:
+    # ``celery_app`` was a module attribute before the app became lazy
+    if name == "celery_app":
+        return get_celery_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # =============================================================================
-# Task Signatures (pointing to synde-minimal tasks)
+# Task Names (synde-minimal tasks)
 # =============================================================================
 
-# These signatures reference tasks defined in synde-minimal/home/tasks_gpu.py
-_esmfold_task = signature("home.tasks.run_esmfold_job", queue="gpu")
-_clean_ec_task = signature("home.tasks.run_clean_ec_job", queue="gpu")
-_deepenzyme_task = signature("home.tasks.run_deepenzyme_kcat_job", queue="gpu")
-_temberture_task = signature("home.tasks.run_temperture_job", queue="gpu")
-_flan_extractor_task = signature("home.tasks.run_flan_extractor", queue="gpu")
-_fpocket_task = signature("home.tasks.run_fpocket_job", queue="gpu")
+# These reference tasks defined in synde-minimal/home/tasks_gpu.py
+_esmfold_task = "home.tasks.run_esmfold_job"
+_clean_ec_task = "home.tasks.run_clean_ec_job"
+_deepenzyme_task = "home.tasks.run_deepenzyme_kcat_job"
+_temberture_task = "home.tasks.run_temperture_job"
+_flan_extractor_task = "home.tasks.run_flan_extractor"
+_fpocket_task = "home.tasks.run_fpocket_job"
+
+
+def _submit(task_name: str, *args) -> Any:
+    """
+    Send a task to the GPU worker, or to the in-process simulator if enabled.
+
+    The admission controller may defer the submission or raise
+    GpuAdmissionRejected; the message priority comes from the caller's
+    priority class (see synde_gpu.scheduling).
+
+    Inside a workflow, the submission is recorded in the GPU task ledger
+    before it is sent. A retried workflow making the same call reattaches
+    to that task (still queued, running or already finished) instead of
+    submitting it again. The task id is also tracked for cancellation
+    (see revoke_workflow_tasks).
+
+    Lookup and submission run under the entry's state lock, so two runs
+    of the workflow cannot both submit the task, and ledger writes carry
+    the lock's fencing token so a run whose lock expired cannot overwrite
+    a newer entry. Admission may wait far longer than the lock lives, so
+    it runs between two locked steps: the ledger is checked again before
+    sending.
+    """
+    job_id = get_current_job_id()
+    ledger = get_task_ledger() if job_id else None
+
+    with _ledger_entry(ledger, job_id, task_name, args) as entry:
+        if entry.handle is not None:
+            return entry.handle
+
+    decision = get_admission_controller().admit(task_name)
+
+    with _ledger_entry(ledger, job_id, task_name, args) as entry:
+        # Another run of the workflow may have submitted it meanwhile
+        if entry.handle is not None:
+            return entry.handle
+        return _send(task_name, args, decision, job_id, entry.ledger, entry.fence)
+
+
+@dataclass
+class _LedgerEntry:
+    """A locked ledger entry: its ledger (None if unavailable), fence and reusable handle."""
+    ledger: Optional[GpuTaskLedger] = None
+    fence: Optional[int] = None
+    handle: Any = None
+
+
+@contextmanager
+def _ledger_entry(ledger: Optional[GpuTaskLedger], job_id: str, task_name: str, args: tuple):
+    """Hold the state lock of a ledger entry and look for an earlier submission to reuse."""
+    if ledger is None:
+        yield _LedgerEntry()
+        return
+
+    with ExitStack() as stack:
+        try:
+            lock = stack.enter_context(get_state_lock().for_job(ledger.lock_name(job_id, task_name, args)))
+            entry = _LedgerEntry(ledger, lock.fence, _reattach(ledger, job_id, task_name, args))
+        except (RedisError, LockAcquisitionError) as e:
+            # The ledger is an optimization; GPU work goes ahead without it
+            logger.warning(f"GPU task ledger unavailable, submitting without it: {e}")
+            entry = _LedgerEntry()
+        yield entry
+
+
+def _send(task_name: str, args: tuple, decision: AdmissionDecision, job_id: Optional[str],
+          ledger: Optional[GpuTaskLedger], fence: Optional[int]) -> Any:
+    """Submit an admitted task, recording it in the ledger and for cancellation."""
+    if is_simulated_mode():
+        handle = get_simulator().submit(task_name, args, priority=decision.priority)
+        _record(ledger, job_id, task_name, args, handle.id, STATUS_PENDING, fence)
+        _track(job_id, handle.id)
+        return handle
+
+    task_id = str(uuid.uuid4())
+    _record(ledger, job_id, task_name, args, task_id, STATUS_SUBMITTING, fence)
+    _track(job_id, task_id)
+    from celery import signature
+
+    task_signature = signature(task_name, queue=queue_for(task_name), app=get_celery_app())
+    handle = task_signature.apply_async(
+        args, queue=decision.queue, priority=decision.priority, task_id=task_id
+    )
+    _record(ledger, job_id, task_name, args, task_id, STATUS_PENDING, fence)
+    return handle
+
+
+def _reattach(ledger: GpuTaskLedger, job_id: str, task_name: str, args: tuple) -> Any:
+    """Result handle of an earlier identical submission that can be reused, or None."""
+    entry = ledger.lookup(job_id, task_name, args)
+    if entry is None:
+        return None
+
+    if is_simulated_mode():
+        handle = get_simulator().get_result(entry["task_id"])
+        usable = handle is not None and handle.state not in ("FAILURE", "REVOKED")
+    else:
+        handle = get_celery_app().AsyncResult(entry["task_id"])
+        # An unknown id also reads PENDING, so only trust PENDING once the
+        # broker accepted the message
+        usable = handle.state not in ("FAILURE", "REVOKED") and not (
+            handle.state == "PENDING" and entry["status"] == STATUS_SUBMITTING
+        )
+
+    if not usable:
+        ledger.forget(job_id, task_name, args)
+        return None
+
+    logger.info(f"Reattached to {task_name} task {entry['task_id']} for workflow {job_id}")
+    return handle
+
+
+def _record(ledger: Optional[GpuTaskLedger], job_id: str, task_name: str, args: tuple,
+            task_id: str, status: str, fence: Optional[int] = None) -> None:
+    """Write a submission to the ledger; failures only cost the ability to reattach."""
+    if ledger is None:
+        return
+    try:
+        if ledger.record(job_id, task_name, args, task_id, status=status, fence=fence) is None:
+            logger.warning(f"Ledger entry for {task_name} task {task_id} was taken over by a newer run")
+    except RedisError as e:
+        logger.warning(f"Could not record {task_name} task {task_id} in the ledger: {e}")
+
+
+def _track(job_id: Optional[str], task_id: str) -> None:
+    """Remember a workflow's GPU task so cancelling the workflow can revoke it."""
+    if not job_id:
+        return
+    try:
+        get_cancel_tokens().track_task(job_id, task_id)
+    except RedisError as e:
+        logger.warning(f"Could not track task {task_id} for cancellation: {e}")
+
+
+def revoke_workflow_tasks(job_id: str) -> List[str]:
+    """
+    Revoke every GPU task a workflow submitted, terminating running ones.
+
+    Task ids come from the cancellation tracker and the GPU task ledger.
+    Revoking a task that already finished has no effect.
+
+    Returns:
+        The revoked task ids
+    """
+    task_ids = set(get_cancel_tokens().tasks(job_id))
+    ledger = get_task_ledger()
+    if ledger is not None:
+        try:
+            task_ids.update(entry["task_id"] for entry in ledger.entries(job_id))
+        except RedisError as e:
+            logger.warning(f"GPU task ledger unavailable, revoking tracked tasks only: {e}")
+    if not task_ids:
+        return []
+
+    task_ids = sorted(task_ids)
+    if is_simulated_mode():
+        simulator = get_simulator()
+        for task_id in task_ids:
+            handle = simulator.get_result(task_id)
+            if handle is not None:
+                handle.revoke(terminate=True)
+    else:
+        # terminate=True sends SIGKILL to actually stop the GPU computation
+        get_celery_app().control.revoke(task_ids, terminate=True, signal="SIGKILL")
+    logger.info(f"Revoked {len(task_ids)} GPU tasks of cancelled workflow {job_id}")
+    return task_ids
 
 
 # =============================================================================
 # Task Proxy Functions
 # =============================================================================
 
+def _traced(proxy):
+    """
+    Record or replay calls of a task proxy (see synde_graph.utils.trace).
+
+    Calls made by GpuTaskManager are traced by the manager, with the
+    task result rather than the submission handle.
+    """
+    @functools.wraps(proxy)
+    def wrapper(*args, **kwargs):
+        return traced_call(KIND_GPU_CALL, proxy.__name__, proxy, *args, **kwargs)
+    return wrapper
+
+
+@_traced
 def call_esmfold(job_id: str, sequence: str) -> Any:
     """
     Call ESMFold structure prediction task.
@@ -64,9 +292,10 @@ def call_esmfold(job_id: str, sequence: str) -> Any:
     if is_mock_mode():
         return get_mock_response("esmfold", job_id, sequence)
 
-    return _esmfold_task.delay(job_id, sequence)
+    return _submit(_esmfold_task, job_id, sequence)
 
 
+@_traced
 def call_clean_ec(sequence: str, seq_name: str = "Input_Seq") -> Any:
     """
     Call CLEAN EC number prediction task.
@@ -81,9 +310,10 @@ def call_clean_ec(sequence: str, seq_name: str = "Input_Seq") -> Any:
     if is_mock_mode():
         return get_mock_response("clean_ec", sequence, seq_name)
 
-    return _clean_ec_task.delay(sequence, seq_name)
+    return _submit(_clean_ec_task, sequence, seq_name)
 
 
+@_traced
 def call_deepenzyme(sequence: str, pdb_file_path: str, smiles: str) -> Any:
     """
     Call DeepEnzyme kcat prediction task.
@@ -99,9 +329,10 @@ def call_deepenzyme(sequence: str, pdb_file_path: str, smiles: str) -> Any:
     if is_mock_mode():
         return get_mock_response("deepenzyme", sequence, pdb_file_path, smiles)
 
-    return _deepenzyme_task.delay(sequence, pdb_file_path, smiles)
+    return _submit(_deepenzyme_task, sequence, pdb_file_path, smiles)
 
 
+@_traced
 def call_temberture(sequence: str) -> Any:
     """
     Call TemBERTure melting temperature prediction task.
@@ -115,9 +346,10 @@ def call_temberture(sequence: str) -> Any:
     if is_mock_mode():
         return get_mock_response("temberture", sequence)
 
-    return _temberture_task.delay(sequence)
+    return _submit(_temberture_task, sequence)
 
 
+@_traced
 def call_flan_extractor(query: str) -> Any:
     """
     Call FLAN NLP extraction task.
@@ -131,9 +363,10 @@ def call_flan_extractor(query: str) -> Any:
     if is_mock_mode():
         return get_mock_response("flan_extractor", query)
 
-    return _flan_extractor_task.delay(query)
+    return _submit(_flan_extractor_task, query)
 
 
+@_traced
 def call_fpocket(
     pdb_file_path: str,
     pdb_data: Optional[str] = None,
@@ -155,7 +388,7 @@ def call_fpocket(
     if is_mock_mode():
         return get_mock_response("fpocket", pdb_file_path, output_dir, num_pockets)
 
-    return _fpocket_task.delay(pdb_file_path, pdb_data, output_dir, num_pockets)
+    return _submit(_fpocket_task, pdb_file_path, pdb_data, output_dir, num_pockets)
 
 
 # =============================================================================
@@ -163,13 +396,9 @@ def call_fpocket(
 # =============================================================================
 
 TASK_ROUTES = {
-    # GPU tasks defined in synde-minimal
-    "home.tasks.run_esmfold_job": {"queue": "gpu"},
-    "home.tasks.run_clean_ec_job": {"queue": "gpu"},
-    "home.tasks.run_deepenzyme_kcat_job": {"queue": "gpu"},
-    "home.tasks.run_temperture_job": {"queue": "gpu"},
-    "home.tasks.run_flan_extractor": {"queue": "gpu"},
-    "home.tasks.run_fpocket_job": {"queue": "gpu"},
+    # GPU tasks defined in synde-minimal: the shared gpu queue, or one queue
+    # per model with GPU_PER_MODEL_QUEUES (see synde_gpu.scheduling)
+    **gpu_task_routes(),
 
     # Workflow task (runs on CPU)
     "synde_langgraph.tasks.run_workflow": {"queue": "default"},
@@ -6,11 +6,19 @@ This package provides the LangGraph-based workflow system for:
 - Structure prediction (ESMFold, AlphaFold)
 - Property prediction (EC number, kcat, Tm, stability)
 - Sequence generation (ProGen2, ZymCTRL)
+
+Exports load on first access, so importing a submodule such as
+``synde_graph.config`` does not build the graph.
 """
 
-from synde_graph.graph import create_synde_graph, run_workflow
-from synde_graph.state.schema import SynDeGraphState
-from synde_graph.state.factory import create_initial_state
+from typing import TYPE_CHECKING
+
+from synde_graph._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from synde_graph.graph import create_synde_graph, run_workflow
+    from synde_graph.state.schema import SynDeGraphState
+    from synde_graph.state.factory import create_initial_state
 
 __version__ = "0.1.0"
 
@@ -20,3 +28,9 @@ __all__ = [
     "SynDeGraphState",
     "create_initial_state",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "synde_graph.graph": ["create_synde_graph", "run_workflow"],
+    "synde_graph.state.schema": ["SynDeGraphState"],
+    "synde_graph.state.factory": ["create_initial_state"],
+})
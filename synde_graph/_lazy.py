@@ -0,0 +1,49 @@
+"""
+Lazy package exports (PEP 562).
+
+Package ``__init__`` modules used to import every submodule they
+re-export, so ``import synde_graph.config`` loaded LangGraph, every node
+and Celery. ``lazy_exports`` gives a package a module-level
+``__getattr__`` that imports the defining submodule on first access, so
+importing a package costs nothing until one of its exports is used.
+
+Usage (in a package ``__init__``):
+    __getattr__, __dir__ = lazy_exports(__name__, {
+        "synde_graph.graph": ["create_synde_graph", "run_workflow"],
+    })
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str,
+    exports: Dict[str, List[str]],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Module ``__getattr__`` and ``__dir__`` for lazily loaded exports.
+
+    Args:
+        package: Name of the package (``__name__``)
+        exports: Submodule -> names it defines that the package re-exports
+
+    Returns:
+        (__getattr__, __dir__) to assign at package level
+    """
+    origin = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        module = origin.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        # Cache on the package so later lookups skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(origin))
+
+    return __getattr__, __dir__
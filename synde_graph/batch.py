@@ -0,0 +1,312 @@
+"""
+Batch screening of multi-sequence FASTA libraries.
+
+Runs the prediction subgraph over every record of a library with bounded
+concurrency, yielding one flat result row per record as it finishes. All
+records share one compiled subgraph and one pool of in-flight GPU
+submissions; identical sequences are predicted once and the result is
+reused for every record that carries them. GPU work is submitted at batch
+priority, behind interactive chat.
+
+Records are read lazily, a few ahead of the screens in flight, so a
+library streamed from a file is never held in memory as a whole.
+
+Usage:
+    with open("library.fasta") as f:
+        for row in iter_batch_screen(iter_fasta(f), properties=["ec_number", "tm"]):
+            print(row.record_id, row.tm)
+"""
+
+import csv
+import hashlib
+import io
+import time
+import uuid
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from synde_graph.config import SequenceLimits
+from synde_graph.state.factory import create_initial_state
+from synde_graph.utils.live_logger import report
+from synde_gpu.scheduling import PRIORITY_BATCH, priority_class
+
+
+DEFAULT_BATCH_PROPERTIES = ["ec_number", "tm"]
+DEFAULT_BATCH_CONCURRENCY = 4
+
+
+# =============================================================================
+# Result Rows
+# =============================================================================
+
+@dataclass
+class BatchRecordResult:
+    """Flat per-record result of a batch screen (one table row)."""
+    record_id: str
+    sequence_length: int
+    status: str  # "success" | "failed" | "skipped"
+    avg_plddt: Optional[float] = None
+    pocket_count: Optional[int] = None
+    ec_number: Optional[str] = None
+    ec_probability: Optional[float] = None
+    tm: Optional[float] = None
+    thermo_class: Optional[str] = None
+    kcat: Optional[float] = None
+    stability_ddg: Optional[float] = None
+    topt: Optional[float] = None
+    duplicate_of: Optional[str] = None
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    def to_row(self) -> Dict[str, Any]:
+        """Convert to a plain dict (JSON/CSV friendly)."""
+        return asdict(self)
+
+
+BATCH_COLUMNS = [f.name for f in fields(BatchRecordResult)]
+
+
+def _result_from_state(record_id: str, sequence: str, state: Dict[str, Any], elapsed: float) -> BatchRecordResult:
+    """Flatten a finished prediction subgraph state into a result row."""
+    protein = state.get("protein", {})
+    structure = state.get("structure", {})
+    predictions = state.get("predictions", {})
+    errors = [e for e in state.get("errors", []) if not e.get("recoverable", True)]
+
+    ec = predictions.get("ec_number", {})
+    tm = predictions.get("tm", {})
+
+    return BatchRecordResult(
+        record_id=record_id,
+        sequence_length=len(sequence),
+        status="failed" if errors else "success",
+        avg_plddt=protein.get("avg_plddt"),
+        pocket_count=len(structure.get("pocket_scores") or []) or None,
+        ec_number=ec.get("ec_number"),
+        ec_probability=ec.get("probability"),
+        tm=tm.get("melting_temperature"),
+        thermo_class=tm.get("thermo_class"),
+        kcat=predictions.get("kcat", {}).get("kcat"),
+        stability_ddg=predictions.get("stability", {}).get("ddg"),
+        topt=predictions.get("topt", {}).get("topt"),
+        error="; ".join(e.get("message", "") for e in errors) or None,
+        elapsed_seconds=round(elapsed, 3),
+    )
+
+
+def _check_sequence(sequence: str) -> Optional[str]:
+    """Return why a sequence cannot be screened, or None if it can."""
+    if len(sequence) < SequenceLimits.MIN_SEQUENCE:
+        return f"Sequence too short (minimum {SequenceLimits.MIN_SEQUENCE} residues)"
+    if len(sequence) > SequenceLimits.MAX_SEQUENCE:
+        return f"Sequence too long (maximum {SequenceLimits.MAX_SEQUENCE} residues)"
+    return None
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def iter_batch_screen(
+    records: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+    properties: Optional[List[str]] = None,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    job_id: Optional[str] = None,
+    ligand_smiles: Optional[str] = None,
+    total: Optional[int] = None,
+) -> Iterator[BatchRecordResult]:
+    """
+    Screen a sequence library, yielding results as records complete.
+
+    Args:
+        records: Sequences keyed by record ID, or (record ID, sequence)
+            pairs such as ``iter_fasta(f)``, consumed lazily
+        properties: Properties to predict (default: EC number and Tm)
+        concurrency: Maximum records in flight (bounds concurrent GPU submissions)
+        job_id: Batch job ID; progress goes to the live logger under this ID
+            when given (per-record job IDs are derived from it either way)
+        ligand_smiles: Optional substrate SMILES (enables kcat prediction)
+        total: Number of records, for progress messages (default: len(records)
+            when it has one)
+
+    Yields:
+        BatchRecordResult per record, in completion order
+    """
+    from synde_graph.subgraphs.prediction import create_simple_prediction_graph
+
+    properties = properties or DEFAULT_BATCH_PROPERTIES
+    log_job_id = job_id
+    job_id = job_id or f"batch-{uuid.uuid4().hex[:8]}"
+    if total is None and hasattr(records, "__len__"):
+        total = len(records)
+    pairs = records.items() if isinstance(records, Mapping) else records
+    done = 0
+
+    def _progress(msg: str) -> None:
+        if log_job_id:
+            report(log_job_id, msg)
+
+    def _count() -> str:
+        return f"{done}/{total}" if total is not None else str(done)
+
+    _progress(
+        f"🧪 Batch screen started: {total if total is not None else 'streamed'} records, "
+        f"properties: {', '.join(properties)}"
+    )
+
+    compiled = create_simple_prediction_graph().compile()
+
+    def _screen(index: int, record_id: str, sequence: str) -> BatchRecordResult:
+        state = create_initial_state(job_id=f"{job_id}-{index}", user_query=f"Batch screen {record_id}")
+        state["protein"] = {"sequence": sequence, "sequence_length": len(sequence)}
+        state["parsed_input"] = {"task": "prediction", "properties": list(properties)}
+        if ligand_smiles:
+            state["ligand"] = {"ligand_input": ligand_smiles, "ligand_smiles": ligand_smiles}
+
+        start = time.time()
+        try:
+            # Worker threads start with a fresh context; mark their GPU work as batch
+            with priority_class(PRIORITY_BATCH):
+                result = compiled.invoke(state)
+        except Exception as e:
+            return BatchRecordResult(
+                record_id, len(sequence), "failed",
+                error=f"{type(e).__name__}: {e}",
+                elapsed_seconds=round(time.time() - start, 3),
+            )
+        return _result_from_state(record_id, sequence, result, time.time() - start)
+
+    # One screen per distinct sequence (keyed by digest, so sequences are not
+    # kept); duplicates reuse the first record's result once it is in
+    screened: Dict[str, Optional[BatchRecordResult]] = {}  # digest -> result, None while in flight
+    waiting: Dict[str, List[str]] = {}  # digest -> duplicate record IDs
+    in_flight: Dict[Any, str] = {}  # future -> digest
+    max_in_flight = max(1, concurrency) * 2
+    index = 0
+
+    def _duplicate(record_id: str, result: BatchRecordResult) -> BatchRecordResult:
+        return replace(result, record_id=record_id, duplicate_of=result.record_id, elapsed_seconds=0.0)
+
+    def _finished(futures) -> Iterator[BatchRecordResult]:
+        nonlocal done
+        for future in futures:
+            digest = in_flight.pop(future)
+            result = screened[digest] = future.result()
+            done += 1
+            icon = "✅" if result.status == "success" else "❌"
+            _progress(f"{icon} [{_count()}] {result.record_id} ({result.elapsed_seconds:.1f}s)")
+            yield result
+
+            for duplicate_id in waiting.pop(digest, []):
+                done += 1
+                _progress(f"♻️ [{_count()}] {duplicate_id} same sequence as {result.record_id}")
+                yield _duplicate(duplicate_id, result)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for record_id, sequence in pairs:
+            problem = _check_sequence(sequence)
+            if problem:
+                done += 1
+                _progress(f"⚠️ [{_count()}] {record_id} skipped: {problem}")
+                yield BatchRecordResult(record_id, len(sequence), "skipped", error=problem)
+                continue
+
+            digest = hashlib.sha1(sequence.encode()).hexdigest()
+            if digest in screened:
+                first = screened[digest]
+                if first is None:
+                    waiting.setdefault(digest, []).append(record_id)
+                else:
+                    done += 1
+                    _progress(f"♻️ [{_count()}] {record_id} same sequence as {first.record_id}")
+                    yield _duplicate(record_id, first)
+                continue
+
+            screened[digest] = None
+            in_flight[pool.submit(_screen, index, record_id, sequence)] = digest
+            index += 1
+
+            # Read ahead only as far as the pool can use
+            while len(in_flight) >= max_in_flight:
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                yield from _finished(finished)
+
+        while in_flight:
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            yield from _finished(finished)
+
+    _progress(f"🏁 Batch screen finished: {done} records")
+
+
+def run_batch_screen(
+    records: Dict[str, str],
+    properties: Optional[List[str]] = None,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    job_id: Optional[str] = None,
+    ligand_smiles: Optional[str] = None,
+    on_result: Optional[Callable[[BatchRecordResult], None]] = None,
+) -> List[BatchRecordResult]:
+    """
+    Screen a sequence library and return all results in input order.
+
+    Args:
+        records: Sequences keyed by record ID
+        properties: Properties to predict
+        concurrency: Maximum records in flight
+        job_id: Batch job ID for progress reporting
+        ligand_smiles: Optional substrate SMILES
+        on_result: Optional callback invoked as each record completes
+
+    Returns:
+        List of BatchRecordResult in the order of ``records``
+    """
+    by_id = {}
+    for result in iter_batch_screen(records, properties, concurrency, job_id, ligand_smiles):
+        by_id[result.record_id] = result
+        if on_result:
+            on_result(result)
+    return [by_id[record_id] for record_id in records if record_id in by_id]
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+def results_to_csv(results: List[BatchRecordResult]) -> str:
+    """Render results as CSV text with a header row."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=BATCH_COLUMNS)
+    writer.writeheader()
+    for result in results:
+        writer.writerow(result.to_row())
+    return buffer.getvalue()
+
+
+def results_to_parquet(results: List[BatchRecordResult]) -> bytes:
+    """
+    Render results as Parquet bytes.
+
+    Requires pandas with pyarrow: pip install -e ".[batch]"
+    """
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError("Parquet export requires pandas and pyarrow: pip install pandas pyarrow") from e
+
+    frame = pd.DataFrame([r.to_row() for r in results], columns=BATCH_COLUMNS)
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def write_results(results: List[BatchRecordResult], path: str) -> None:
+    """Write results to ``path`` as Parquet (.parquet) or CSV (anything else)."""
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if out.suffix.lower() == ".parquet":
+        out.write_bytes(results_to_parquet(results))
+    else:
+        out.write_text(results_to_csv(results), newline="")
@@ -9,10 +9,24 @@ import os
 from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+
+def _find_dotenv() -> Optional[Path]:
+    """The nearest .env above this module, where python-dotenv would look."""
+    for directory in Path(__file__).resolve().parents:
+        candidate = directory / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+# Load environment variables (importing python-dotenv is most of this
+# module's import time, so only when there is a file to load)
+_dotenv_path = _find_dotenv()
+if _dotenv_path is not None:
+    from dotenv import load_dotenv
+
+    load_dotenv(_dotenv_path)
 
 
 # =============================================================================
@@ -50,8 +64,11 @@ class GpuTimeouts:
     FLAN_EXTRACTOR = int(os.getenv("TIMEOUT_FLAN", "180"))  # 3 minutes
     FPOCKET = int(os.getenv("TIMEOUT_FPOCKET", "180"))  # 3 minutes
 
-    # Polling intervals
-    POLL_INTERVAL = int(os.getenv("GPU_POLL_INTERVAL", "5"))  # seconds
+    # Polling: "eta" (from model runtime percentiles), "backoff" or "fixed"
+    POLL_STRATEGY = os.getenv("GPU_POLL_STRATEGY", "eta")
+    POLL_INTERVAL = int(os.getenv("GPU_POLL_INTERVAL", "5"))  # seconds, "fixed" only
+    POLL_MIN_INTERVAL = float(os.getenv("GPU_POLL_MIN_INTERVAL", "0.25"))  # seconds
+    POLL_MAX_INTERVAL = float(os.getenv("GPU_POLL_MAX_INTERVAL", "30"))  # seconds
     CHECKPOINT_INTERVAL = int(os.getenv("CHECKPOINT_INTERVAL", "30"))  # seconds
 
 
@@ -95,6 +112,31 @@ class SequenceLimits:
     MAX_SEQUENCE = 2000  # Maximum supported sequence
 
 
+# =============================================================================
+# Structure Registry
+# =============================================================================
+
+class StructureRegistrySettings:
+    """Settings for the registry of predicted structures shared across workflows."""
+
+    ENABLED = os.getenv("STRUCTURE_CACHE", "true").lower() in ("true", "1", "yes")
+    DIR = Path(os.getenv("STRUCTURE_CACHE_DIR", str(OUTPUT_DIR / "structures")))
+    MAX_BYTES = int(os.getenv("STRUCTURE_CACHE_MB", "1024")) * 1024 * 1024  # LRU-evicted above
+
+
+# =============================================================================
+# Mutation Targeting
+# =============================================================================
+
+class MutationTargeting:
+    """Which positions generation may mutate."""
+
+    # Residues predicted with lower pLDDT (disordered, low confidence) are skipped
+    MIN_PLDDT = float(os.getenv("MUTATION_MIN_PLDDT", "70"))
+    # Only residues whose CA is this close (Angstrom) to a pocket residue's CA
+    POCKET_RADIUS = float(os.getenv("MUTATION_POCKET_RADIUS", "10"))
+
+
 # =============================================================================
 # Mock Mode
 # =============================================================================
@@ -102,6 +144,42 @@ class SequenceLimits:
 MOCK_GPU = os.getenv("MOCK_GPU", "false").lower() in ("true", "1", "yes")
 
 
+# =============================================================================
+# Simulated GPU Backend
+# =============================================================================
+
+class SimulatorSettings:
+    """Settings for the in-process simulated GPU backend (load testing)."""
+
+    # "celery" sends tasks to the real GPU worker, "simulated" serves them in-process
+    BACKEND = os.getenv("GPU_BACKEND", "celery")
+    PROFILE = os.getenv("SIM_GPU_PROFILE")  # Optional YAML/JSON profile path
+    SEED = os.getenv("SIM_GPU_SEED")  # Optional integer seed
+
+
+# =============================================================================
+# GPU Scheduling
+# =============================================================================
+
+class GpuScheduling:
+    """Per-model GPU queues, caller priorities and admission control."""
+
+    # Route each model to its own queue ("gpu.<model>") instead of the shared
+    # one; opt-in, since GPU workers must then consume those queues
+    PER_MODEL_QUEUES = os.getenv("GPU_PER_MODEL_QUEUES", "false").lower() in ("true", "1", "yes")
+    SHARED_QUEUE = os.getenv("GPU_SHARED_QUEUE", "gpu")
+
+    # Maximum estimated queue wait (seconds) before work is rejected
+    # (interactive) or deferred (batch, background); 0 disables the check
+    BUDGET_INTERACTIVE = float(os.getenv("GPU_BUDGET_INTERACTIVE", "120"))
+    BUDGET_BATCH = float(os.getenv("GPU_BUDGET_BATCH", "1800"))
+    BUDGET_BACKGROUND = float(os.getenv("GPU_BUDGET_BACKGROUND", "300"))
+
+    MAX_DEFER = float(os.getenv("GPU_MAX_DEFER", "600"))  # seconds, then submit anyway
+    DEFER_POLL = float(os.getenv("GPU_DEFER_POLL", "5"))  # seconds between re-checks
+    WORKERS_PER_QUEUE = int(os.getenv("GPU_WORKERS_PER_QUEUE", "1"))
+
+
 # =============================================================================
 # LLM Configuration
 # =============================================================================
@@ -120,6 +198,73 @@ class LockSettings:
     DEFAULT_TIMEOUT = int(os.getenv("LOCK_TIMEOUT", "30"))  # seconds
     RETRY_INTERVAL = float(os.getenv("LOCK_RETRY_INTERVAL", "0.5"))  # seconds
     MAX_RETRIES = int(os.getenv("LOCK_MAX_RETRIES", "10"))
+    # Longest a blocking acquire waits (waiters are woken on release, not polled)
+    WAIT_TIMEOUT = float(os.getenv("LOCK_WAIT_TIMEOUT", str(RETRY_INTERVAL * MAX_RETRIES)))
+
+
+class GpuSlotSettings:
+    """Settings for the GPU slot semaphore."""
+
+    # Slots per GPU resource: "resource=capacity,..." (e.g. "card0=1,card1=2")
+    CAPACITY = os.getenv("GPU_SLOT_CAPACITY", "gpu=1")
+    # Resource each model runs on: "model=resource,..."; unlisted models use
+    # the first resource in CAPACITY
+    MODEL_RESOURCES = os.getenv("GPU_MODEL_RESOURCES", "")
+    LEASE_TTL = int(os.getenv("GPU_LEASE_TTL", "60"))  # seconds, renewed while held
+
+
+# =============================================================================
+# GPU Task History
+# =============================================================================
+
+class RuntimeStatsSettings:
+    """Settings for the historical GPU runtime store."""
+
+    ENABLED = os.getenv("GPU_RUNTIME_STATS", "true").lower() in ("true", "1", "yes")
+    DB_PATH = Path(os.getenv("GPU_RUNTIME_STATS_DB", str(OUTPUT_DIR / "gpu_runtime_stats.db")))
+    BUCKET_SIZE = int(os.getenv("GPU_RUNTIME_BUCKET", "100"))  # residues per report bucket
+    MAX_SAMPLES = int(os.getenv("GPU_RUNTIME_MAX_SAMPLES", "2000"))  # kept per model
+    MIN_SAMPLES = int(os.getenv("GPU_RUNTIME_MIN_SAMPLES", "20"))  # before predicting
+
+    # Derived timeout: TIMEOUT_FACTOR x predicted p90, within [TIMEOUT_MIN, TIMEOUT_MAX]
+    TIMEOUT_FACTOR = float(os.getenv("GPU_TIMEOUT_FACTOR", "3"))
+    TIMEOUT_MIN = int(os.getenv("GPU_TIMEOUT_MIN", "30"))  # seconds
+    TIMEOUT_MAX = int(os.getenv("GPU_TIMEOUT_MAX", "3600"))  # seconds
+
+
+class CircuitBreakerSettings:
+    """Settings for per-model GPU circuit breakers and their fallbacks."""
+
+    # Fail fast while a model keeps failing instead of waiting out every timeout
+    ENABLED = os.getenv("GPU_CIRCUIT_BREAKER", "true").lower() in ("true", "1", "yes")
+    FAILURE_THRESHOLD = int(os.getenv("GPU_CIRCUIT_FAILURES", "3"))  # consecutive, to trip
+    RECOVERY_TIMEOUT = int(os.getenv("GPU_CIRCUIT_RECOVERY", "60"))  # seconds open before a probe
+    RESET_AFTER = int(os.getenv("GPU_CIRCUIT_RESET", "900"))  # seconds until idle failures are forgotten
+
+    # Per model "model=cache|skip": "cache" answers from the last result for
+    # the same inputs, "skip" (the default) returns UNAVAILABLE at once
+    FALLBACK = os.getenv("GPU_FALLBACK", "clean_ec=cache,deepenzyme=cache,temberture=cache")
+    CACHE_TTL = int(os.getenv("GPU_RESULT_CACHE_TTL", "604800"))  # seconds
+
+
+class GpuLedgerSettings:
+    """Settings for the durable ledger of submitted GPU tasks."""
+
+    # Reattach to a workflow's earlier submissions on retry instead of resubmitting
+    ENABLED = os.getenv("GPU_LEDGER", "true").lower() in ("true", "1", "yes")
+    TTL = int(os.getenv("GPU_LEDGER_TTL", "86400"))  # seconds after the last submission
+
+
+# =============================================================================
+# Workflow Cancellation
+# =============================================================================
+
+class CancellationSettings:
+    """Settings for cooperative workflow cancellation."""
+
+    TTL = int(os.getenv("WORKFLOW_CANCEL_TTL", "86400"))  # seconds a cancel token is kept
+    # After Redis fails, seconds before cancellation is checked again
+    RECHECK_AFTER_ERROR = float(os.getenv("WORKFLOW_CANCEL_RECHECK", "30"))
 
 
 def get_redis_url(db: Optional[int] = None) -> str:
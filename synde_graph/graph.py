@@ -5,7 +5,7 @@ Provides the main graph that orchestrates the complete protein
 engineering workflow from user query to final response.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import uuid
 
 from langgraph.graph import StateGraph, END
@@ -174,6 +174,7 @@ def run_workflow(
     uploaded_pdb_content: Optional[str] = None,
     session_data: Optional[Dict[str, Any]] = None,
     job_id: Optional[str] = None,
+    callbacks: Optional[List[Any]] = None,
 ) -> Dict[str, Any]:
     """
     Run the complete SynDe workflow.
@@ -185,6 +186,7 @@ def run_workflow(
         uploaded_pdb_content: Optional PDB file content
         session_data: Optional session context
         job_id: Optional job ID (generated if not provided)
+        callbacks: Optional LangChain callback handlers (e.g. NodeTimer)
 
     Returns:
         Final workflow state with response
@@ -205,7 +207,8 @@ def run_workflow(
 
     # Compile and run graph
     graph = compile_graph(use_simple_mode=True)
-    result = graph.invoke(initial_state)
+    config = {"callbacks": callbacks} if callbacks else None
+    result = graph.invoke(initial_state, config=config)
 
     return result
 
@@ -217,6 +220,7 @@ async def run_workflow_async(
     uploaded_pdb_content: Optional[str] = None,
     session_data: Optional[Dict[str, Any]] = None,
     job_id: Optional[str] = None,
+    callbacks: Optional[List[Any]] = None,
 ) -> Dict[str, Any]:
     """
     Run the complete SynDe workflow asynchronously.
@@ -228,6 +232,7 @@ async def run_workflow_async(
         uploaded_pdb_content: Optional PDB file content
         session_data: Optional session context
         job_id: Optional job ID (generated if not provided)
+        callbacks: Optional LangChain callback handlers (e.g. NodeTimer)
 
     Returns:
         Final workflow state with response
@@ -248,7 +253,8 @@ async def run_workflow_async(
 
     # Compile and run graph
     graph = compile_graph(use_simple_mode=True)
-    result = await graph.ainvoke(initial_state)
+    config = {"callbacks": callbacks} if callbacks else None
+    result = await graph.ainvoke(initial_state, config=config)
 
     return result
 
@@ -10,49 +10,54 @@ Provides all node functions for the workflow including:
 - Response formatting
 """
 
-from synde_graph.nodes.intent import (
-    intent_router_node,
-    get_intent_type,
-    has_mutations,
-)
+from typing import TYPE_CHECKING
 
-from synde_graph.nodes.input import (
-    input_parser_node,
-    get_task_type,
-    get_properties,
-    has_protein_sequence,
-    has_pdb_structure,
-    has_ligand,
-)
+from synde_graph._lazy import lazy_exports
 
-from synde_graph.nodes.prediction import (
-    check_structure_node,
-    run_esmfold_node,
-    run_alphafold_node,
-    run_fpocket_node,
-    run_foldx_node,
-    run_tomer_node,
-    run_clean_ec_node,
-    run_deepenzyme_node,
-    run_temberture_node,
-    aggregate_prediction_results_node,
-)
+if TYPE_CHECKING:
+    from synde_graph.nodes.intent import (
+        intent_router_node,
+        get_intent_type,
+        has_mutations,
+    )
 
-from synde_graph.nodes.generation import (
-    prepare_wt_metrics_node,
-    run_progen2_node,
-    run_zymctrl_node,
-    validate_mutants_node,
-    evaluate_mutants_node,
-    sort_mutants_node,
-    end_generation_node,
-)
+    from synde_graph.nodes.input import (
+        input_parser_node,
+        get_task_type,
+        get_properties,
+        has_protein_sequence,
+        has_pdb_structure,
+        has_ligand,
+    )
 
-from synde_graph.nodes.response import (
-    response_formatter_node,
-    fallback_response_node,
-    error_response_node,
-)
+    from synde_graph.nodes.prediction import (
+        check_structure_node,
+        run_esmfold_node,
+        run_alphafold_node,
+        run_fpocket_node,
+        run_foldx_node,
+        run_tomer_node,
+        run_clean_ec_node,
+        run_deepenzyme_node,
+        run_temberture_node,
+        aggregate_prediction_results_node,
+    )
+
+    from synde_graph.nodes.generation import (
+        prepare_wt_metrics_node,
+        run_progen2_node,
+        run_zymctrl_node,
+        validate_mutants_node,
+        evaluate_mutants_node,
+        sort_mutants_node,
+        end_generation_node,
+    )
+
+    from synde_graph.nodes.response import (
+        response_formatter_node,
+        fallback_response_node,
+        error_response_node,
+    )
 
 __all__ = [
     # Intent
@@ -90,3 +95,37 @@ __all__ = [
     "fallback_response_node",
     "error_response_node",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "synde_graph.nodes.intent": ["intent_router_node", "get_intent_type", "has_mutations"],
+    "synde_graph.nodes.input": [
+        "input_parser_node",
+        "get_task_type",
+        "get_properties",
+        "has_protein_sequence",
+        "has_pdb_structure",
+        "has_ligand",
+    ],
+    "synde_graph.nodes.prediction": [
+        "check_structure_node",
+        "run_esmfold_node",
+        "run_alphafold_node",
+        "run_fpocket_node",
+        "run_foldx_node",
+        "run_tomer_node",
+        "run_clean_ec_node",
+        "run_deepenzyme_node",
+        "run_temberture_node",
+        "aggregate_prediction_results_node",
+    ],
+    "synde_graph.nodes.generation": [
+        "prepare_wt_metrics_node",
+        "run_progen2_node",
+        "run_zymctrl_node",
+        "validate_mutants_node",
+        "evaluate_mutants_node",
+        "sort_mutants_node",
+        "end_generation_node",
+    ],
+    "synde_graph.nodes.response": ["response_formatter_node", "fallback_response_node", "error_response_node"],
+})
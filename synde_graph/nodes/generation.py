@@ -18,6 +18,11 @@ from synde_graph.config import OutputPaths, SequenceLimits
 from synde_gpu.tasks import call_esmfold, call_clean_ec, call_fpocket
 from synde_gpu.manager import GpuTaskManager, TaskStatus
 from synde_gpu.mocks import is_mock_mode
+from synde_graph.utils.live_logger import report
+from synde_graph.utils.mutation_targets import candidate_positions, mutant_pocket_distance
+from synde_graph.utils.pocket_index import get_pocket_index
+from synde_graph.utils.structure import residue_plddt_from_pdb
+from synde_graph.utils.structure_registry import lookup_structure, register_structure
 
 
 # =============================================================================
@@ -66,7 +71,13 @@ def prepare_wt_metrics_node(state: SynDeGraphState) -> Dict[str, Any]:
             **update_node_history(state, "prepare_wt_metrics"),
         }
 
-    # Get or predict structure
+    # Get or predict structure, reusing one predicted earlier for this sequence
+    if not pdb_file_path:
+        record = lookup_structure(sequence, state.get("job_id", "unknown"))
+        if record is not None:
+            protein = {**protein, **record.protein_fields()}
+            pdb_file_path, pdb_data = record.pdb_path, record.pdb_data
+
     if not pdb_file_path:
         try:
             job_id = state.get("job_id", "wt_structure")
@@ -79,12 +90,14 @@ def prepare_wt_metrics_node(state: SynDeGraphState) -> Dict[str, Any]:
                     pdb_file_path = fold_res.get("pdb_path")
                     pdb_data = fold_res.get("pdb_data")
                     avg_plddt = fold_res.get("avg_plddt")
+                    register_structure(sequence, pdb_data, pdb_file_path, avg_plddt, source="esmfold")
 
                     protein = {
                         **protein,
                         "pdb_file_path": pdb_file_path,
                         "pdb_data": pdb_data,
                         "avg_plddt": avg_plddt,
+                        "residue_plddt": residue_plddt_from_pdb(pdb_data),
                         "structure_source": "esmfold",
                     }
 
@@ -113,6 +126,11 @@ def prepare_wt_metrics_node(state: SynDeGraphState) -> Dict[str, Any]:
     except Exception:
         pass  # Pocket detection is optional
 
+    # Index the pockets once; generation and ranking reuse it
+    pocket_index = get_pocket_index(pdb_data, sequence, wt_pocket_residues)
+    if pocket_index is not None:
+        report(f"Indexed {len(pocket_index.pockets)} pocket(s) over {len(pocket_index)} residues")
+
     # Initialize mutant data
     mutant_data = MutantData(
         wild_type_sequence=sequence,
@@ -154,6 +172,7 @@ def run_progen2_node(state: SynDeGraphState) -> Dict[str, Any]:
     protein = state.get("protein", {})
     parsed_input = state.get("parsed_input", {})
     mutant = state.get("mutant", {})
+    structure = state.get("structure", {})
 
     sequence = protein.get("sequence")
     properties = parsed_input.get("properties", [])
@@ -161,12 +180,24 @@ def run_progen2_node(state: SynDeGraphState) -> Dict[str, Any]:
     if not sequence:
         return update_node_history(state, "run_progen2")
 
+    # Only mutate confidently predicted residues near the pockets
+    positions = candidate_positions(
+        sequence,
+        protein.get("residue_plddt"),
+        protein.get("pdb_data"),
+        structure.get("pocket_residues"),
+    )
+    if len(positions) < len(sequence):
+        report(f"Restricting mutations to {len(positions)} of {len(sequence)} positions by pLDDT and pocket proximity")
+
+    session_data = state.get("session_data", {})
+    session_data["candidate_positions"] = positions
+
     # ProGen2 requires synde-minimal integration
     if is_mock_mode():
         # Generate mock mutants
-        mock_mutants = _generate_mock_mutants(sequence, properties, num_mutants=3)
+        mock_mutants = _generate_mock_mutants(sequence, properties, num_mutants=3, positions=positions)
 
-        session_data = state.get("session_data", {})
         session_data["progen2_mutants"] = mock_mutants
 
         return {
@@ -175,25 +206,34 @@ def run_progen2_node(state: SynDeGraphState) -> Dict[str, Any]:
             **update_node_history(state, "run_progen2"),
         }
 
-    return update_node_history(state, "run_progen2")
+    return {
+        "session_data": session_data,
+        **update_node_history(state, "run_progen2"),
+    }
 
 
-def _generate_mock_mutants(sequence: str, properties: List[str], num_mutants: int = 3) -> List[Dict]:
-    """Generate mock mutant sequences for testing."""
+def _generate_mock_mutants(
+    sequence: str,
+    properties: List[str],
+    num_mutants: int = 3,
+    positions: Optional[List[int]] = None,
+) -> List[Dict]:
+    """Generate mock mutant sequences for testing, mutating only ``positions`` (default: any)."""
     import random
 
     amino_acids = "ACDEFGHIKLMNPQRSTVWY"
+    candidates = positions or range(len(sequence))
     mutants = []
 
     for i in range(num_mutants):
         # Pick 1-3 random positions to mutate
-        num_mutations = random.randint(1, 3)
-        positions = random.sample(range(len(sequence)), num_mutations)
+        num_mutations = min(random.randint(1, 3), len(candidates))
+        chosen = random.sample(candidates, num_mutations)
 
         mutant_seq = list(sequence)
         mutations = []
 
-        for pos in positions:
+        for pos in chosen:
             original = sequence[pos]
             new_aa = random.choice([aa for aa in amino_acids if aa != original])
             mutant_seq[pos] = new_aa
@@ -357,11 +397,22 @@ def sort_mutants_node(state: SynDeGraphState) -> Dict[str, Any]:
             **update_node_history(state, "sort_mutants"),
         }
 
-    # Sort by composite score
+    # Distance of each mutant's mutations to the active site
+    pocket_index = get_pocket_index(
+        protein.get("pdb_data"), protein.get("sequence"), structure.get("pocket_residues")
+    )
+    for m in all_validated:
+        m["pocket_distance"] = mutant_pocket_distance(pocket_index, m.get("mutations", []))
+
+    # Sort by composite score; ties go to mutations closer to a pocket
     def score_mutant(m):
         stability = m.get("stability_score", 0)
         activity = m.get("activity_score", 1)
-        return -stability + activity  # Lower stability (more negative DDG) is better
+        distance = m["pocket_distance"]
+        return (
+            -stability + activity,  # Lower stability (more negative DDG) is better
+            -distance if distance is not None else float("-inf"),
+        )
 
     sorted_mutants = sorted(all_validated, key=score_mutant, reverse=True)
     best_mutant = sorted_mutants[0]
@@ -377,6 +428,7 @@ def sort_mutants_node(state: SynDeGraphState) -> Dict[str, Any]:
             mutations=m.get("mutations", []),
             source=m.get("source", "unknown"),
             stability=m.get("stability_score"),
+            pocket_distance=m.get("pocket_distance"),
         )
         for m in sorted_mutants
     ]
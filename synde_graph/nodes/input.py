@@ -25,6 +25,8 @@ from synde_gpu.mocks import is_mock_mode
 from synde_graph.config import GpuTimeouts
 from synde_graph.utils.live_logger import report, report_node_start, report_node_complete
 from synde_graph.utils.smiles_fetcher import get_smiles
+from synde_graph.utils.pdb import extract_sequence_from_pdb
+from synde_graph.utils.structure import parse_structure
 
 
 # SMILES character set for validation
@@ -332,33 +334,11 @@ def _extract_sequence_from_pdb(pdb_content: str) -> Optional[str]:
     Returns:
         Amino acid sequence or None
     """
-    # Three-letter to one-letter code mapping
-    aa_map = {
-        'ALA': 'A', 'CYS': 'C', 'ASP': 'D', 'GLU': 'E', 'PHE': 'F',
-        'GLY': 'G', 'HIS': 'H', 'ILE': 'I', 'LYS': 'K', 'LEU': 'L',
-        'MET': 'M', 'ASN': 'N', 'PRO': 'P', 'GLN': 'Q', 'ARG': 'R',
-        'SER': 'S', 'THR': 'T', 'VAL': 'V', 'TRP': 'W', 'TYR': 'Y',
-    }
-
-    residues = []
-    seen_residues = set()
-
-    for line in pdb_content.split('\n'):
-        if line.startswith('ATOM') and line[12:16].strip() == 'CA':
-            res_name = line[17:20].strip()
-            res_num = line[22:26].strip()
-            chain = line[21]
-
-            key = (chain, res_num)
-            if key not in seen_residues and res_name in aa_map:
-                seen_residues.add(key)
-                residues.append((int(res_num), aa_map[res_name]))
-
-    if residues:
-        residues.sort(key=lambda x: x[0])
-        return ''.join(r[1] for r in residues)
-
-    return None
+    try:
+        return parse_structure(pdb_content).sequence()
+    except ValueError:
+        # Malformed coordinates: fall back to the tolerant line scanner
+        return extract_sequence_from_pdb(pdb_content)
 
 
 # =============================================================================
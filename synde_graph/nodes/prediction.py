@@ -20,9 +20,40 @@ from synde_gpu.tasks import (
     call_temberture,
     call_fpocket,
 )
-from synde_gpu.manager import GpuTaskManager, TaskStatus
+from synde_gpu.manager import GpuTaskManager, GpuTaskResult, TaskStatus
 from synde_gpu.mocks import is_mock_mode
 from synde_graph.utils.live_logger import report, report_gpu_task
+from synde_graph.utils.structure import residue_plddt_from_pdb
+from synde_graph.utils.structure_registry import lookup_structure, register_structure
+
+
+# =============================================================================
+# Degraded Results
+# =============================================================================
+
+def _skip_unavailable_model(state: SynDeGraphState, node_name: str, label: str) -> Dict[str, Any]:
+    """
+    State update for a model skipped because its circuit is open.
+
+    The workflow continues without the prediction; the response tells the
+    user it was skipped.
+    """
+    report_gpu_task(label, "Skipped: model temporarily unavailable")
+
+    response = state.get("response", {})
+    response_html = response.get("response_html", "")
+    response_html += f"<strong>{label}:</strong> Skipped — the model is temporarily unavailable.<br>"
+
+    return {
+        "response": {**response, "response_html": response_html},
+        **update_node_history(state, node_name),
+    }
+
+
+def _report_fallback(label: str, result: GpuTaskResult) -> None:
+    """Tell the user when a GPU result came from the fallback cache."""
+    if result.fallback:
+        report_gpu_task(label, "Model unavailable, using cached result")
 
 
 # =============================================================================
@@ -35,6 +66,7 @@ def check_structure_node(state: SynDeGraphState) -> Dict[str, Any]:
 
     Determines whether to run ESMFold or AlphaFold based on:
     - Existing PDB availability
+    - A structure of the same sequence in the structure registry
     - Sequence length (ESMFold < 400 AA, AlphaFold > 400 AA)
 
     Returns:
@@ -58,6 +90,16 @@ def check_structure_node(state: SynDeGraphState) -> Dict[str, Any]:
             ),
         }
 
+    # Reuse a structure predicted earlier for this sequence
+    record = lookup_structure(sequence, state.get("job_id", "unknown"))
+    if record is not None:
+        plddt = f", pLDDT {record.avg_plddt:.1f}" if record.avg_plddt else ""
+        report(f"Reusing the {record.source} structure predicted earlier for this sequence{plddt}")
+        return {
+            "protein": {**protein, **record.protein_fields()},
+            **update_node_history(state, "check_structure"),
+        }
+
     return update_node_history(state, "check_structure")
 
 
@@ -84,8 +126,13 @@ def run_esmfold_node(state: SynDeGraphState) -> Dict[str, Any]:
         }
 
     try:
-        report_gpu_task("ESMFold", f"Predicting structure ({len(sequence)} aa)")
         manager = GpuTaskManager(task_name="ESMFold")
+        eta = manager.estimate((job_id, sequence))
+        report_gpu_task(
+            "ESMFold",
+            f"Predicting structure ({len(sequence)} aa, ~{eta:.0f}s)" if eta
+            else f"Predicting structure ({len(sequence)} aa)",
+        )
         result = manager.execute_sync(call_esmfold, args=(job_id, sequence))
 
         if result.status == TaskStatus.SUCCESS:
@@ -96,6 +143,7 @@ def run_esmfold_node(state: SynDeGraphState) -> Dict[str, Any]:
                 avg_plddt = fold_res.get("avg_plddt")
 
                 report_gpu_task("ESMFold", f"Complete (pLDDT: {avg_plddt:.1f})" if avg_plddt else "Complete")
+                register_structure(sequence, pdb_data, pdb_file_path, avg_plddt, source="esmfold")
 
                 return {
                     "protein": {
@@ -103,6 +151,7 @@ def run_esmfold_node(state: SynDeGraphState) -> Dict[str, Any]:
                         "pdb_file_path": pdb_file_path,
                         "pdb_data": pdb_data,
                         "avg_plddt": avg_plddt,
+                        "residue_plddt": residue_plddt_from_pdb(pdb_data),
                         "structure_source": "esmfold",
                     },
                     **update_node_history(state, "run_esmfold"),
@@ -152,6 +201,7 @@ def run_alphafold_node(state: SynDeGraphState) -> Dict[str, Any]:
                 "pdb_file_path": mock_result.get("pdb_path"),
                 "pdb_data": mock_result.get("pdb_data"),
                 "avg_plddt": mock_result.get("avg_plddt"),
+                "residue_plddt": residue_plddt_from_pdb(mock_result.get("pdb_data")),
                 "structure_source": "alphafold",
             },
             **update_node_history(state, "run_alphafold"),
@@ -248,6 +298,7 @@ def run_foldx_node(state: SynDeGraphState) -> Dict[str, Any]:
 
         return {
             "response": {**response, "response_html": response_html},
+            "predictions": {**state.get("predictions", {}), "stability": {"ddg": stability}},
             **update_node_history(state, "run_foldx"),
         }
 
@@ -281,6 +332,7 @@ def run_tomer_node(state: SynDeGraphState) -> Dict[str, Any]:
 
         return {
             "response": {**response, "response_html": response_html},
+            "predictions": {**state.get("predictions", {}), "topt": {"topt": topt, "stderr": stderr}},
             **update_node_history(state, "run_tomer"),
         }
 
@@ -307,6 +359,9 @@ def run_clean_ec_node(state: SynDeGraphState) -> Dict[str, Any]:
         report_gpu_task("CLEAN EC", "Predicting enzyme class")
         manager = GpuTaskManager(task_name="CLEAN_EC")
         result = manager.execute_sync(call_clean_ec, args=(sequence, "Input_Seq"))
+        if result.status == TaskStatus.UNAVAILABLE:
+            return _skip_unavailable_model(state, "run_clean_ec", "CLEAN EC")
+        _report_fallback("CLEAN EC", result)
 
         logger.info(f"CLEAN EC result status: {result.status}")
         logger.info(f"CLEAN EC result data: {result.result}")
@@ -343,10 +398,9 @@ def run_clean_ec_node(state: SynDeGraphState) -> Dict[str, Any]:
                 )
 
                 # Also add to predictions dict for structured access
-                predictions = state.get("predictions", {})
-                predictions["ec_number"] = {
-                    "ec_number": ec_number,
-                    "probability": probability,
+                predictions = {
+                    **state.get("predictions", {}),
+                    "ec_number": {"ec_number": ec_number, "probability": probability},
                 }
 
                 report_gpu_task("CLEAN EC", f"Complete: {ec_number} (prob: {prob_str})")
@@ -435,6 +489,9 @@ def run_deepenzyme_node(state: SynDeGraphState) -> Dict[str, Any]:
             call_deepenzyme,
             args=(sequence, pdb_file_path, ligand_smiles)
         )
+        if result.status == TaskStatus.UNAVAILABLE:
+            return _skip_unavailable_model(state, "run_deepenzyme", "DeepEnzyme kcat")
+        _report_fallback("DeepEnzyme", result)
 
         if result.status == TaskStatus.SUCCESS:
             de_result = result.result
@@ -449,6 +506,7 @@ def run_deepenzyme_node(state: SynDeGraphState) -> Dict[str, Any]:
 
                 return {
                     "response": {**response, "response_html": response_html},
+                    "predictions": {**state.get("predictions", {}), "kcat": {"kcat": kcat}},
                     **update_node_history(state, "run_deepenzyme"),
                 }
 
@@ -475,6 +533,9 @@ def run_temberture_node(state: SynDeGraphState) -> Dict[str, Any]:
         report_gpu_task("TemBERTure", "Predicting melting temperature")
         manager = GpuTaskManager(task_name="TemBERTure")
         result = manager.execute_sync(call_temberture, args=(sequence,))
+        if result.status == TaskStatus.UNAVAILABLE:
+            return _skip_unavailable_model(state, "run_temberture", "TemBERTure")
+        _report_fallback("TemBERTure", result)
 
         if result.status == TaskStatus.SUCCESS:
             temp_result = result.result
@@ -493,6 +554,10 @@ def run_temberture_node(state: SynDeGraphState) -> Dict[str, Any]:
 
                 return {
                     "response": {**response, "response_html": response_html},
+                    "predictions": {
+                        **state.get("predictions", {}),
+                        "tm": {"melting_temperature": tm, "thermo_class": thermo_class},
+                    },
                     **update_node_history(state, "run_temberture"),
                 }
 
@@ -113,7 +113,8 @@ def route_structure_prediction(state: SynDeGraphState) -> str:
     Returns:
         'run_esmfold' for sequences <= 400 AA
         'run_alphafold' for sequences > 400 AA
-        'run_fpocket' if structure already exists
+        'run_fpocket' if structure already exists (uploaded, or reused
+        from the structure registry by check_structure)
     """
     protein = state.get("protein", {})
     pdb_file_path = protein.get("pdb_file_path")
@@ -66,6 +66,7 @@ def create_initial_state(
         # Analysis (empty initially)
         structure=StructureAnalysis(),
         mutant=MutantData(),
+        predictions={},
 
         # GPU tasks
         active_gpu_tasks=[],
@@ -143,10 +144,15 @@ def update_gpu_task(
     status: str,
     result: Optional[Any] = None,
     error: Optional[str] = None,
+    fence: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Update or add a GPU task status in the state.
 
+    When the caller holds a DistributedLock it passes the lock's fencing
+    token; an update fenced lower than the one that last wrote the task
+    comes from a holder whose lock expired and is dropped.
+
     Args:
         state: Current workflow state
         task_id: Celery task ID
@@ -154,9 +160,10 @@ def update_gpu_task(
         status: Task status (pending, started, success, failure, etc.)
         result: Task result if successful
         error: Error message if failed
+        fence: Fencing token of the lock held while updating
 
     Returns:
-        State update dict with updated active_gpu_tasks
+        State update dict with updated active_gpu_tasks (empty if stale)
     """
     active_tasks = list(state.get("active_gpu_tasks", []))
 
@@ -164,7 +171,9 @@ def update_gpu_task(
     task_status = None
     for i, task in enumerate(active_tasks):
         if task.get("task_id") == task_id:
-            task_status = active_tasks.pop(i)
+            if _is_stale(fence, task):
+                return {}
+            task_status = dict(active_tasks.pop(i))
             break
 
     if task_status is None:
@@ -186,11 +195,20 @@ def update_gpu_task(
     if error is not None:
         task_status["error"] = error
 
+    if fence is not None:
+        task_status["fence"] = fence
+
     active_tasks.append(task_status)
 
     return {"active_gpu_tasks": active_tasks}
 
 
+def _is_stale(fence: Optional[int], task: Dict[str, Any]) -> bool:
+    """True if an update fenced with ``fence`` must not overwrite ``task``."""
+    written = task.get("fence")
+    return fence is not None and written is not None and fence < written
+
+
 def merge_state_updates(*updates: Dict[str, Any]) -> Dict[str, Any]:
     """
     Merge multiple state update dicts into one.
@@ -215,10 +233,12 @@ def merge_state_updates(*updates: Dict[str, Any]) -> Dict[str, Any]:
                 # Concatenate history lists
                 merged[key] = merged[key] + value
             elif key == "active_gpu_tasks" and key in merged:
-                # Merge by task_id
+                # Merge by task_id; lower-fenced (stale) updates lose
                 existing = {t["task_id"]: t for t in merged[key]}
                 for task in value:
-                    existing[task["task_id"]] = task
+                    current = existing.get(task["task_id"])
+                    if current is None or not _is_stale(task.get("fence"), current):
+                        existing[task["task_id"]] = task
                 merged[key] = list(existing.values())
             elif isinstance(value, dict) and key in merged and isinstance(merged[key], dict):
                 # Deep merge dicts
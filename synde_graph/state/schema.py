@@ -52,6 +52,7 @@ class ProteinData(TypedDict, total=False):
     pdb_file_path: Optional[str]  # Path to PDB file on disk
     structure_source: Literal["uploaded", "uniprot", "esmfold", "alphafold", "session", "none"]
     avg_plddt: Optional[float]  # Structure confidence score
+    residue_plddt: Optional[str]  # Per-residue pLDDT, see utils.structure.encode_plddt
     ptm_score: Optional[float]  # AlphaFold PTM score
 
 
@@ -107,6 +108,7 @@ class MutantInfo(TypedDict, total=False):
     topt: Optional[float]  # Optimal temperature
     tm: Optional[float]  # Melting temperature
     plddt: Optional[float]  # Structure confidence
+    pocket_distance: Optional[float]  # CA distance (A) of the closest mutation to a pocket
 
     # Comparison metrics
     stability_improvement: Optional[float]
@@ -134,11 +136,14 @@ class GpuTaskStatus(TypedDict, total=False):
     """Status of a GPU Celery task for checkpointing."""
     task_id: str
     task_name: str  # e.g., "run_esmfold_job", "run_clean_ec_job"
-    status: Literal["pending", "started", "success", "failure", "revoked", "timeout"]
+    status: Literal["submitting", "pending", "started", "success", "failure", "revoked", "timeout"]
     submitted_at: str  # ISO format timestamp
+    model: Optional[str]  # e.g., "esmfold" (GPU task ledger entries)
+    input_hash: Optional[str]  # Hash of the task inputs (GPU task ledger entries)
     completed_at: Optional[str]
     result: Optional[Any]
     error: Optional[str]
+    fence: Optional[int]  # Fencing token of the lock held by the last writer
 
 
 # =============================================================================
@@ -228,6 +233,7 @@ class SynDeGraphState(TypedDict, total=False):
     # -------------------------
     structure: StructureAnalysis
     mutant: MutantData
+    predictions: Dict[str, Dict[str, Any]]  # property -> structured values (e.g. "tm": {...})
 
     # -------------------------
     # GPU Task Tracking
@@ -1,19 +1,36 @@
 """Utility modules for synde_graph."""
 
-from synde_graph.utils.live_logger import (
-    report,
-    set_current_job_id,
-    get_current_job_id,
-    get_logs,
-    clear_logs,
-    report_node_start,
-    report_node_complete,
-    report_node_error,
-    report_gpu_task,
-    report_info,
-    report_warning,
-)
-from synde_graph.utils.smiles_fetcher import get_smiles
+from typing import TYPE_CHECKING
+
+from synde_graph._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from synde_graph.utils.live_logger import (
+        report,
+        set_current_job_id,
+        get_current_job_id,
+        get_logs,
+        clear_logs,
+        report_node_start,
+        report_node_complete,
+        report_node_error,
+        report_gpu_task,
+        report_info,
+        report_warning,
+    )
+    from synde_graph.utils.smiles_fetcher import get_smiles
+    from synde_graph.utils.instrumentation import NodeProgress, NodeTimer
+    from synde_graph.utils.cancellation import (
+        CancellationCheck,
+        WorkflowCancelled,
+        check_cancelled,
+        is_cancelled,
+    )
+    from synde_graph.utils.structure_registry import (
+        StructureRegistry,
+        lookup_structure,
+        register_structure,
+    )
 
 __all__ = [
     "report",
@@ -28,4 +45,38 @@ __all__ = [
     "report_info",
     "report_warning",
     "get_smiles",
+    "NodeTimer",
+    "NodeProgress",
+    "CancellationCheck",
+    "WorkflowCancelled",
+    "check_cancelled",
+    "is_cancelled",
+    "StructureRegistry",
+    "lookup_structure",
+    "register_structure",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "synde_graph.utils.live_logger": [
+        "report",
+        "set_current_job_id",
+        "get_current_job_id",
+        "get_logs",
+        "clear_logs",
+        "report_node_start",
+        "report_node_complete",
+        "report_node_error",
+        "report_gpu_task",
+        "report_info",
+        "report_warning",
+    ],
+    "synde_graph.utils.smiles_fetcher": ["get_smiles"],
+    "synde_graph.utils.instrumentation": ["NodeProgress", "NodeTimer"],
+    "synde_graph.utils.cancellation": [
+        "CancellationCheck",
+        "WorkflowCancelled",
+        "check_cancelled",
+        "is_cancelled",
+    ],
+    "synde_graph.utils.structure_registry": ["StructureRegistry", "lookup_structure", "register_structure"],
+})
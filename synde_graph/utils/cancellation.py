@@ -0,0 +1,185 @@
+"""
+Cooperative cancellation of running workflows.
+
+Cancelling a workflow (``POST /api/workflow/<id>/cancel/``) sets a cancel
+token in Redis. The running workflow observes it in two places:
+
+- between nodes: ``CancellationCheck`` raises ``WorkflowCancelled`` when
+  the next node starts, which aborts the graph run
+- while waiting on a GPU task: ``GpuTaskManager`` checks the token on
+  every poll and revokes its task with ``terminate=True``
+
+GPU task ids submitted by a workflow are tracked next to its token, so
+the cancel endpoint can also revoke them directly instead of waiting for
+the workflow to notice.
+
+Usage:
+    tokens = get_cancel_tokens()
+    tokens.cancel(job_id)
+    ...
+    check_cancelled(job_id)  # raises WorkflowCancelled
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import redis
+from redis.backoff import NoBackoff
+from redis.exceptions import RedisError
+from redis.retry import Retry
+from langchain_core.callbacks import BaseCallbackHandler
+
+from synde_graph.config import LANGGRAPH_CHECKPOINT_DB, CancellationSettings, get_redis_url
+from synde_graph.utils.instrumentation import node_name_from_callback
+from synde_graph.utils.live_logger import get_current_job_id
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowCancelled(Exception):
+    """Raised inside a workflow whose cancel token is set."""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"Workflow {job_id} was cancelled")
+        self.job_id = job_id
+
+
+class CancelTokens:
+    """
+    Cancel tokens and in-flight GPU task ids of workflows, stored in Redis.
+
+    ``<prefix>:<job_id>`` holds the token, ``<prefix>:<job_id>:tasks`` the
+    set of GPU task ids; both expire after ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        ttl: int = CancellationSettings.TTL,
+        prefix: str = "synde:cancel",
+    ):
+        """
+        Initialize the token store.
+
+        Args:
+            redis_client: Optional Redis client (defaults to the checkpoint DB)
+            ttl: Seconds tokens and task sets are kept
+            prefix: Key prefix
+        """
+        self.redis = redis_client or redis.Redis.from_url(
+            get_redis_url(LANGGRAPH_CHECKPOINT_DB),
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+            retry=Retry(NoBackoff(), 0),
+        )
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    def cancel(self, job_id: str) -> bool:
+        """Set a workflow's cancel token; False if it was already set."""
+        return bool(self.redis.set(self._key(job_id), time.time(), nx=True, ex=self.ttl))
+
+    def is_cancelled(self, job_id: str) -> bool:
+        """Whether a workflow's cancel token is set."""
+        return bool(self.redis.exists(self._key(job_id)))
+
+    def track_task(self, job_id: str, task_id: str) -> None:
+        """Remember a GPU task submitted by a workflow."""
+        key = f"{self._key(job_id)}:tasks"
+        pipe = self.redis.pipeline()
+        pipe.sadd(key, task_id)
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def tasks(self, job_id: str) -> List[str]:
+        """GPU task ids submitted by a workflow."""
+        return sorted(self.redis.smembers(f"{self._key(job_id)}:tasks"))
+
+    def clear(self, job_id: str) -> None:
+        """Drop a finished workflow's token and task ids."""
+        self.redis.delete(self._key(job_id), f"{self._key(job_id)}:tasks")
+
+
+_tokens: Optional[CancelTokens] = None
+
+# Monotonic time before which checks are skipped after a Redis error
+_unavailable_until = 0.0
+
+
+def get_cancel_tokens() -> CancelTokens:
+    """Get the process-wide token store."""
+    global _tokens
+    if _tokens is None:
+        _tokens = CancelTokens()
+    return _tokens
+
+
+def set_cancel_tokens(tokens: Optional[CancelTokens]) -> None:
+    """Replace (or reset) the process-wide token store."""
+    global _tokens, _unavailable_until
+    _tokens = tokens
+    _unavailable_until = 0.0
+
+
+def is_cancelled(job_id: Optional[str] = None) -> bool:
+    """
+    Whether a workflow (default: the current one) has been cancelled.
+
+    Never raises: without a job id, or while Redis is unreachable, the
+    workflow is treated as not cancelled. After a Redis error the check is
+    skipped for WORKFLOW_CANCEL_RECHECK seconds so poll loops don't stall
+    on connection timeouts.
+    """
+    global _unavailable_until
+    job_id = job_id or get_current_job_id()
+    if not job_id or time.monotonic() < _unavailable_until:
+        return False
+    try:
+        return get_cancel_tokens().is_cancelled(job_id)
+    except RedisError as e:
+        logger.warning(f"Could not check cancellation of {job_id}: {e}")
+        _unavailable_until = time.monotonic() + CancellationSettings.RECHECK_AFTER_ERROR
+        return False
+
+
+def check_cancelled(job_id: Optional[str] = None) -> None:
+    """Raise WorkflowCancelled if the workflow (default: the current one) was cancelled."""
+    job_id = job_id or get_current_job_id()
+    if is_cancelled(job_id):
+        raise WorkflowCancelled(job_id)
+
+
+class CancellationCheck(BaseCallbackHandler):
+    """
+    Callback handler that stops a workflow at the next node once cancelled.
+
+    ``raise_error`` makes LangChain propagate the ``WorkflowCancelled``
+    raised in ``on_chain_start`` instead of logging it, so the graph run
+    aborts before the node executes.
+
+    Usage:
+        run_workflow(query, job_id=job_id, callbacks=[CancellationCheck(job_id)])
+    """
+
+    raise_error = True
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        if node_name_from_callback(kwargs.get("name"), metadata):
+            check_cancelled(self.job_id)
@@ -0,0 +1,78 @@
+"""
+FASTA parsing shared by the CLI, batch screening and the web upload view.
+
+``iter_fasta`` consumes lines lazily (a file handle, or
+``synde_graph.utils.streams.iter_lines`` over upload chunks), so only one
+record is held in memory at a time.
+"""
+
+import io
+import re
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Anything that is not one of the 20 standard amino acids
+_NON_AMINO_ACID = re.compile(r"[^ACDEFGHIKLMNPQRSTVWY]")
+
+
+def iter_fasta(lines: Iterable[str], max_length: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (header, sequence) records from FASTA lines.
+
+    Headers are reduced to their first word; residues outside the 20
+    standard amino acids are dropped. Lines before the first header and
+    records with an empty header are ignored.
+
+    Args:
+        lines: Iterable of text lines (line endings optional)
+        max_length: Stop accumulating a record's residues once it is longer
+            than this, so an oversized record can be rejected by a length
+            check without buffering all of it
+
+    Yields:
+        (header, sequence) tuples in file order
+    """
+    header = None
+    parts = []
+    length = 0
+    has_sequence_lines = False
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith(">"):
+            # Emit previous record
+            if header and has_sequence_lines:
+                yield header, "".join(parts)
+
+            # Start new record
+            words = line[1:].split()
+            header = words[0] if words else None
+            parts = []
+            length = 0
+            has_sequence_lines = False
+        else:
+            has_sequence_lines = True
+            if max_length is None or length <= max_length:
+                # Add to current sequence (remove non-amino acid chars)
+                residues = _NON_AMINO_ACID.sub("", line.upper())
+                parts.append(residues)
+                length += len(residues)
+
+    # Emit last record
+    if header and has_sequence_lines:
+        yield header, "".join(parts)
+
+
+def parse_fasta(content: str) -> Dict[str, str]:
+    """
+    Parse FASTA file content.
+
+    Args:
+        content: FASTA text (one or many records)
+
+    Returns:
+        Dict with sequences keyed by header, in file order
+    """
+    return dict(iter_fasta(io.StringIO(content)))
@@ -0,0 +1,140 @@
+"""
+Node-level instrumentation for workflow runs.
+
+Uses LangChain callbacks, which LangGraph propagates into nested subgraph
+invocations, so every node (including those inside the prediction and
+generation subgraphs) is observed without changing node code.
+
+Usage:
+    timer = NodeTimer()
+    run_workflow("Predict EC number", callbacks=[timer])
+    timer.summary()
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+def node_name_from_callback(name: Optional[str], metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Return the node name for a chain callback, or None if it is not a node run.
+
+    LangGraph also emits chain events for the graph itself, routing functions
+    and internal runnables; those carry a different run name than the
+    ``langgraph_node`` metadata and are ignored.
+    """
+    node = (metadata or {}).get("langgraph_node")
+    if node and name == node:
+        return node
+    return None
+
+
+class NodeTimer(BaseCallbackHandler):
+    """
+    Callback handler collecting wall-clock time per node.
+
+    Thread-safe, so one timer can be shared by concurrent workflow runs.
+    Times are inclusive: a subgraph node's time includes its child nodes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running: Dict[UUID, tuple] = {}
+        self.durations: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = node_name_from_callback(kwargs.get("name"), metadata)
+        if node:
+            with self._lock:
+                self._running[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error=False)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error=True)
+
+    def _finish(self, run_id: UUID, error: bool) -> None:
+        with self._lock:
+            started = self._running.pop(run_id, None)
+            if started is None:
+                return
+            node, start = started
+            self.durations.setdefault(node, []).append(time.perf_counter() - start)
+            if error:
+                self.errors[node] = self.errors.get(node, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-node totals.
+
+        Returns:
+            Dict of node name -> {"calls", "total_s", "mean_s", "max_s", "errors"}
+        """
+        with self._lock:
+            return {
+                node: {
+                    "calls": len(times),
+                    "total_s": sum(times),
+                    "mean_s": sum(times) / len(times),
+                    "max_s": max(times),
+                    "errors": self.errors.get(node, 0),
+                }
+                for node, times in self.durations.items()
+            }
+
+
+class NodeProgress(BaseCallbackHandler):
+    """
+    Callback handler that reports every finished node to a sink.
+
+    ``on_node`` is called with the node name after each node (including
+    nodes inside subgraphs) completes successfully. It is called from the
+    thread running the node, so it should return quickly; sinks that
+    persist progress are expected to coalesce writes.
+
+    Usage:
+        run_workflow("Predict Tm", callbacks=[NodeProgress(sink.node_finished)])
+    """
+
+    def __init__(self, on_node: Callable[[str], None]):
+        self._on_node = on_node
+        self._lock = threading.Lock()
+        self._running: Dict[UUID, str] = {}
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = node_name_from_callback(kwargs.get("name"), metadata)
+        if node:
+            with self._lock:
+                self._running[run_id] = node
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            node = self._running.pop(run_id, None)
+        if node:
+            self._on_node(node)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._running.pop(run_id, None)
@@ -0,0 +1,101 @@
+"""
+Choice of positions for generated mutations.
+
+Mutations in disordered or low-confidence regions, or far from the active
+site, rarely make the top of the ranking, yet each one costs a full GPU
+evaluation. ``candidate_positions`` narrows the positions generation may
+mutate to residues that are
+
+- confidently predicted: per-residue pLDDT >= MUTATION_MIN_PLDDT
+- near a pocket: CA within MUTATION_POCKET_RADIUS Angstrom of the CA of
+  an fpocket pocket residue
+
+Each filter applies only when its input is available and matches the
+sequence; a filter that would leave no position is dropped. Pocket
+distances come from the structure's cached ``PocketIndex``.
+
+Usage:
+    positions = candidate_positions(sequence, protein.get("residue_plddt"),
+                                    protein.get("pdb_data"), structure.get("pocket_residues"))
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from synde_graph.config import MutationTargeting
+from synde_graph.utils.pocket_index import PocketIndex, get_pocket_index
+from synde_graph.utils.structure import decode_plddt
+
+
+def pocket_distances(pdb_data: Optional[str], sequence: str, pocket_residues: Optional[Dict]) -> Optional[np.ndarray]:
+    """
+    Distance (Angstrom) from each sequence position's CA to the nearest
+    pocket residue's CA, or None without a structure matching ``sequence``
+    or without pocket residues found in it.
+    """
+    index = get_pocket_index(pdb_data, sequence, pocket_residues)
+    return index.nearest_pocket_distances() if index is not None else None
+
+
+def mutant_pocket_distance(index: Optional[PocketIndex], mutations: List[str]) -> Optional[float]:
+    """
+    Distance from the closest mutated position of a mutant to a pocket.
+
+    Args:
+        index: Pocket index of the wild-type structure
+        mutations: Mutation labels ("P148T", 1-based positions)
+
+    Returns:
+        Distance in Angstrom, or None without index or valid positions
+    """
+    if index is None:
+        return None
+    distances = []
+    for mutation in mutations:
+        try:
+            position = int(mutation[1:-1]) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= position < len(index):
+            distances.append(index.nearest_pocket_distance(position))
+    return min(distances) if distances else None
+
+
+def candidate_positions(
+    sequence: str,
+    residue_plddt: Optional[str] = None,
+    pdb_data: Optional[str] = None,
+    pocket_residues: Optional[Dict] = None,
+    min_plddt: float = MutationTargeting.MIN_PLDDT,
+    pocket_radius: float = MutationTargeting.POCKET_RADIUS,
+) -> List[int]:
+    """
+    0-based sequence positions generation may mutate.
+
+    Args:
+        sequence: Wild-type sequence
+        residue_plddt: Encoded per-residue pLDDT (ProteinData.residue_plddt)
+        pdb_data: Wild-type structure, for pocket distances
+        pocket_residues: fpocket pocket id -> residue labels ("A:45")
+        min_plddt: Lowest pLDDT of a candidate position
+        pocket_radius: Largest CA distance of a candidate to a pocket residue
+
+    Returns:
+        Sorted positions; every position when no filter applies
+    """
+    keep = np.ones(len(sequence), dtype=bool)
+
+    plddt = decode_plddt(residue_plddt)
+    if plddt is not None and len(plddt) == len(sequence):
+        confident = keep & (plddt >= min_plddt)
+        if confident.any():
+            keep = confident
+
+    distances = pocket_distances(pdb_data, sequence, pocket_residues)
+    if distances is not None:
+        near = keep & (distances <= pocket_radius)
+        if near.any():
+            keep = near
+
+    return np.flatnonzero(keep).tolist()
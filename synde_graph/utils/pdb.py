@@ -0,0 +1,99 @@
+"""
+Streaming PDB scanning.
+
+``PdbScan`` is fed one line at a time and keeps only per-residue state, so
+validating a large multi-model PDB or extracting its sequence needs memory
+proportional to the number of residues, not the file size.
+"""
+
+import io
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Three-letter to one-letter code mapping
+THREE_TO_ONE = {
+    "ALA": "A", "CYS": "C", "ASP": "D", "GLU": "E", "PHE": "F",
+    "GLY": "G", "HIS": "H", "ILE": "I", "LYS": "K", "LEU": "L",
+    "MET": "M", "ASN": "N", "PRO": "P", "GLN": "Q", "ARG": "R",
+    "SER": "S", "THR": "T", "VAL": "V", "TRP": "W", "TYR": "Y",
+}
+
+
+@dataclass
+class PdbScan:
+    """Incremental summary of PDB coordinate records."""
+    atom_count: int = 0
+    hetatm_count: int = 0
+    model_count: int = 0
+    chains: Set[str] = field(default_factory=set)
+    residue_numbers: Set[str] = field(default_factory=set)
+    # (chain, residue number) -> (residue number, one-letter code), first CA seen
+    _ca_residues: Dict[Tuple[str, str], Tuple[int, str]] = field(default_factory=dict)
+
+    def feed(self, line: str) -> None:
+        """Consume one PDB line."""
+        line = line.rstrip("\r\n")
+        record = line[:6]
+        if record.startswith("ATOM"):
+            self.atom_count += 1
+        elif record == "HETATM":
+            self.hetatm_count += 1
+        elif record.startswith("MODEL"):
+            self.model_count += 1
+            return
+        else:
+            return
+
+        if len(line) >= 22:
+            self.chains.add(line[21])
+        if len(line) >= 26:
+            self.residue_numbers.add(line[22:26].strip())
+
+        if record.startswith("ATOM") and line[12:16].strip() == "CA":
+            key = (line[21], line[22:26].strip())
+            res_name = line[17:20].strip()
+            if key not in self._ca_residues and res_name in THREE_TO_ONE:
+                self._ca_residues[key] = (int(key[1]), THREE_TO_ONE[res_name])
+
+    @property
+    def sequence(self) -> Optional[str]:
+        """One-letter sequence from CA atoms, ordered by chain, then residue number."""
+        if not self._ca_residues:
+            return None
+        chain_rank: Dict[str, int] = {}
+        for chain, _ in self._ca_residues:
+            chain_rank.setdefault(chain, len(chain_rank))
+        residues = sorted(
+            self._ca_residues.items(), key=lambda item: (chain_rank[item[0][0]], item[1][0])
+        )
+        return "".join(code for _, (_, code) in residues)
+
+    def metadata(self) -> dict:
+        """Upload metadata (atom count, chains, residue count)."""
+        return {
+            "atom_count": self.atom_count,
+            "chains": sorted(self.chains),
+            "residue_count": len(self.residue_numbers),
+            "model_count": max(self.model_count, 1),
+        }
+
+
+def scan_pdb(lines: Iterable[str]) -> PdbScan:
+    """Scan PDB lines (a file handle, list or line iterator)."""
+    scan = PdbScan()
+    for line in lines:
+        scan.feed(line)
+    return scan
+
+
+def extract_sequence_from_pdb(pdb_content: str) -> Optional[str]:
+    """
+    Extract the amino acid sequence from PDB content.
+
+    Args:
+        pdb_content: PDB file content
+
+    Returns:
+        Amino acid sequence or None
+    """
+    return scan_pdb(io.StringIO(pdb_content)).sequence
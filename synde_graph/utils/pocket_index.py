@@ -0,0 +1,195 @@
+"""
+Spatial index of residues around fpocket pockets.
+
+fpocket results reach the state as residue labels per pocket
+(``StructureAnalysis.pocket_residues``: ``{1: ["A:45", ...]}``). Pocket-aware
+mutation logic needs distances, not labels, so ``PocketIndex`` resolves the
+labels once per structure and hashes CA coordinates into a uniform grid:
+
+- ``within(pocket_id, radius)``: residues within ``radius`` Angstrom of a
+  pocket, visiting only the grid cells around its residues
+- ``nearest_pocket_distance(i)``: distance from position ``i`` to the
+  nearest pocket residue, precomputed at build time (O(1) per query)
+
+Indexes are cached by structure content and pockets, so the generation
+nodes and the ranking stage of one workflow share a single build.
+
+Usage:
+    index = get_pocket_index(pdb_data, sequence, structure["pocket_residues"])
+    if index is not None:
+        index.within(1, 8.0)
+        index.nearest_pocket_distance(44)
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from synde_graph.utils.structure import Structure, parse_structure
+
+# Grid cell edge (Angstrom); radius queries up to this size visit 27 cells
+CELL_SIZE = 8.0
+
+# Indexes kept by structure and pockets
+MAX_CACHED_INDEXES = 32
+
+
+def parse_pocket_residue(residue: str) -> Optional[Tuple[str, int]]:
+    """Chain and residue number of an fpocket residue label ("A:45")."""
+    chain, _, number = str(residue).rpartition(":")
+    try:
+        return chain, int(number)
+    except ValueError:
+        return None
+
+
+class PocketIndex:
+    """
+    Uniform grid over the CA atoms of one structure, with its pockets.
+
+    Positions are 0-based indices into the structure's sequence.
+    """
+
+    def __init__(self, coords: np.ndarray, pockets: Dict[int, np.ndarray], cell_size: float = CELL_SIZE):
+        """
+        Build the index.
+
+        Args:
+            coords: (L, 3) CA coordinates in sequence order
+            pockets: Pocket id -> positions of its residues
+            cell_size: Grid cell edge in Angstrom
+        """
+        self.coords = np.asarray(coords, dtype=np.float32)
+        self.cell_size = cell_size
+        self.pockets = {pocket_id: np.asarray(positions, dtype=np.int64) for pocket_id, positions in pockets.items()}
+
+        # Bucket positions by grid cell
+        cells = np.floor(self.coords / cell_size).astype(np.int64)
+        keys, cell_of = np.unique(cells, axis=0, return_inverse=True)
+        order = np.argsort(cell_of.ravel(), kind="stable")
+        bounds = np.searchsorted(cell_of.ravel()[order], np.arange(len(keys) + 1))
+        self._grid = {
+            tuple(int(c) for c in key): order[bounds[i]:bounds[i + 1]]
+            for i, key in enumerate(keys)
+        }
+
+        # Nearest pocket residue of every position
+        members = np.unique(np.concatenate(list(self.pockets.values()) or [np.empty(0, np.int64)]))
+        self._nearest = np.full(len(self.coords), np.inf, dtype=np.float32)
+        if len(members):
+            for start in range(0, len(self.coords), 1024):
+                block = self.coords[start:start + 1024, None, :] - self.coords[None, members, :]
+                self._nearest[start:start + 1024] = np.sqrt(np.einsum("ijk,ijk->ij", block, block)).min(axis=1)
+
+    @classmethod
+    def from_structure(cls, structure: Structure, pocket_residues: Dict) -> Optional["PocketIndex"]:
+        """
+        Index of a parsed structure and its fpocket residue labels.
+
+        Labels that name no residue of the structure are ignored; returns
+        None when no pocket has a known residue.
+        """
+        ca = structure.ca_indices()
+        residues = structure.residue_index[ca]
+        position_of = {
+            (str(chain), int(number)): i
+            for i, (chain, number) in enumerate(zip(structure.res_chains[residues], structure.res_seq[residues]))
+        }
+
+        pockets = {}
+        for pocket_id, labels in (pocket_residues or {}).items():
+            positions = sorted({
+                position_of[key] for key in map(parse_pocket_residue, labels) if key in position_of
+            })
+            if positions:
+                pockets[int(pocket_id)] = np.array(positions)
+        if not pockets:
+            return None
+        return cls(structure.coords[ca], pockets)
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def neighbors(self, point: np.ndarray, radius: float) -> np.ndarray:
+        """Sorted positions whose CA lies within ``radius`` of ``point``."""
+        center = np.floor(np.asarray(point) / self.cell_size).astype(np.int64)
+        reach = int(np.ceil(radius / self.cell_size))
+        span = range(-reach, reach + 1)
+        buckets = [
+            self._grid[key]
+            for key in (
+                (int(center[0]) + dx, int(center[1]) + dy, int(center[2]) + dz)
+                for dx in span for dy in span for dz in span
+            )
+            if key in self._grid
+        ]
+        if not buckets:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.concatenate(buckets)
+        diff = self.coords[candidates] - np.asarray(point, dtype=np.float32)
+        close = candidates[np.einsum("ij,ij->i", diff, diff) <= radius * radius]
+        return np.sort(close)
+
+    def within(self, pocket_id: int, radius: float) -> List[int]:
+        """Positions within ``radius`` Angstrom of any residue of a pocket (including its own)."""
+        members = self.pockets.get(int(pocket_id))
+        if members is None:
+            return []
+        found = [self.neighbors(self.coords[i], radius) for i in members]
+        return np.unique(np.concatenate(found)).tolist()
+
+    def nearest_pocket_distance(self, position: int) -> float:
+        """Distance (Angstrom) from a position's CA to the nearest pocket residue's CA."""
+        return float(self._nearest[position])
+
+    def nearest_pocket_distances(self) -> np.ndarray:
+        """(L,) nearest-pocket distances of every position."""
+        return self._nearest
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+_cache: "OrderedDict[str, Optional[PocketIndex]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_pocket_index(
+    pdb_data: Optional[str],
+    sequence: Optional[str],
+    pocket_residues: Optional[Dict],
+) -> Optional[PocketIndex]:
+    """
+    Cached index of a structure's pockets.
+
+    Returns None without a structure whose sequence is ``sequence`` (so
+    positions line up), or without pocket residues found in it.
+    """
+    if not pdb_data or not sequence or not pocket_residues:
+        return None
+
+    digest = hashlib.sha1(pdb_data.encode("utf-8", "replace"))
+    digest.update(sequence.encode("utf-8", "replace"))
+    digest.update(json.dumps(pocket_residues, sort_keys=True, default=str).encode())
+    key = digest.hexdigest()
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    try:
+        structure = parse_structure(pdb_data)
+    except ValueError:
+        return None
+    index = PocketIndex.from_structure(structure, pocket_residues) if structure.sequence() == sequence else None
+
+    with _cache_lock:
+        _cache[key] = index
+        if len(_cache) > MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    return index
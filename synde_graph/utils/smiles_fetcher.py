@@ -5,6 +5,7 @@ from urllib.parse import quote
 from typing import Optional
 
 from synde_graph.utils.live_logger import report
+from synde_graph.utils.trace import KIND_SMILES, traced_call
 
 
 def get_smiles(substrate) -> Optional[str]:
@@ -32,7 +33,12 @@ def get_smiles(substrate) -> Optional[str]:
     if smiles:
         return smiles
 
-    # PubChem API lookup
+    # Recorded or replayed in workflow traces (see synde_graph.utils.trace)
+    return traced_call(KIND_SMILES, "pubchem", _fetch_pubchem_smiles, substrate)
+
+
+def _fetch_pubchem_smiles(substrate: str) -> Optional[str]:
+    """PubChem PUG REST name-to-SMILES lookup; None if it fails."""
     encoded = quote(substrate)
     url = (
         "https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound"
@@ -0,0 +1,84 @@
+"""
+Line streaming helpers for large uploads.
+
+Turn an iterable of byte chunks (Django's ``UploadedFile.chunks()``, or
+``iter(lambda: f.read(n), b"")``) into decoded text lines without ever
+holding the whole file, optionally writing the raw bytes to disk in the
+same pass.
+"""
+
+import codecs
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Union
+
+# Longest single line accepted before the stream is rejected (bytes/chars)
+MAX_LINE_LENGTH = 1024 * 1024
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(handle: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a binary file handle in fixed-size chunks."""
+    return iter(lambda: handle.read(chunk_size), b"")
+
+
+def tee_to_file(
+    chunks: Iterable[bytes],
+    path: Union[str, Path],
+    digest: Optional[Any] = None,
+) -> Iterator[bytes]:
+    """
+    Yield chunks unchanged while writing them to ``path``.
+
+    The file is complete once the generator is exhausted.
+
+    Args:
+        chunks: Iterable of raw byte chunks
+        path: Destination file
+        digest: Optional ``hashlib`` object updated with every chunk, so a
+            content address is available without a second read
+    """
+    with open(path, "wb") as out:
+        for chunk in chunks:
+            out.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            yield chunk
+
+
+def iter_lines(
+    chunks: Iterable[bytes],
+    encoding: str = "utf-8",
+    max_line_length: int = MAX_LINE_LENGTH,
+) -> Iterator[str]:
+    """
+    Decode byte chunks into lines (without line endings).
+
+    Multi-byte characters split across chunk boundaries are handled by an
+    incremental decoder, so memory use is bounded by the chunk size plus
+    the longest line.
+
+    Args:
+        chunks: Iterable of raw byte chunks
+        encoding: Text encoding
+        max_line_length: Reject lines longer than this
+
+    Raises:
+        UnicodeDecodeError: If the stream is not valid ``encoding``
+        ValueError: If a line exceeds ``max_line_length``
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        if len(pending) > max_line_length:
+            raise ValueError(f"Line longer than {max_line_length} characters")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
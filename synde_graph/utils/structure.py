@@ -0,0 +1,296 @@
+"""
+Parsed PDB structures backed by NumPy arrays.
+
+``parse_structure`` reads the ATOM/HETATM records of the first model once,
+slicing the fixed PDB columns of all atoms at a time rather than line by
+line, into a compact ``Structure``: float32 coordinates with a per-atom
+residue index, chain id and B-factor (the pLDDT of predicted structures).
+Sequence extraction, per-residue pLDDT and CA distance queries then run
+on the arrays.
+
+Parsed structures are cached by content hash, so the input node and the
+CLI handling the same PDB text parse it once. Cached arrays are read-only.
+
+Uploads too large to hold in memory are validated with the streaming
+``synde_graph.utils.pdb.scan_pdb`` instead.
+
+Usage:
+    structure = parse_structure(pdb_content)
+    structure.sequence()        # "MKTV..."
+    structure.residue_plddt()   # one value per sequence position
+    structure.ca_distances()    # (L, L) float32
+
+Per-residue pLDDT travels in workflow state as ``ProteinData.residue_plddt``:
+one byte per residue (rounded 0-100), base64 encoded.
+"""
+
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from synde_graph.utils.pdb import THREE_TO_ONE
+
+# Parsed structures kept by content hash
+MAX_CACHED_STRUCTURES = 32
+
+# PDB lines are 80 columns; coordinates end at column 54
+LINE_WIDTH = 80
+MIN_COORD_WIDTH = 54
+
+
+@dataclass(frozen=True)
+class Structure:
+    """Atoms of one PDB model as parallel arrays."""
+    coords: np.ndarray         # (N, 3) float32
+    atom_names: np.ndarray     # (N,) bytes, e.g. b"CA"
+    residue_index: np.ndarray  # (N,) int32, into the residue arrays
+    chain_ids: np.ndarray      # (N,) bytes
+    b_factors: np.ndarray      # (N,) float32, pLDDT for predicted structures
+    hetatm: np.ndarray         # (N,) bool
+    res_names: np.ndarray      # (R,) str
+    res_seq: np.ndarray        # (R,) int32, residue numbers
+    res_chains: np.ndarray     # (R,) str
+    model_count: int = 1
+
+    @property
+    def atom_count(self) -> int:
+        """ATOM records (HETATM excluded)."""
+        return int(np.count_nonzero(~self.hetatm))
+
+    @property
+    def residue_count(self) -> int:
+        return len(self.res_names)
+
+    @property
+    def chains(self) -> List[str]:
+        """Chain ids in order of appearance."""
+        _, first = np.unique(self.res_chains, return_index=True)
+        return [str(self.res_chains[i]) for i in sorted(first)]
+
+    def ca_indices(self, chain: Optional[str] = None) -> np.ndarray:
+        """
+        Atom indices of one CA per amino-acid residue, in sequence order.
+
+        Residues are ordered by chain (in order of appearance), then by
+        residue number; alternate locations after the first are ignored.
+        """
+        mask = ~self.hetatm & (self.atom_names == b"CA")
+        if chain is not None:
+            mask &= self.chain_ids == chain.encode()
+        atoms = np.flatnonzero(mask)
+        # First CA of each residue, of standard amino acids only
+        residues, first = np.unique(self.residue_index[atoms], return_index=True)
+        atoms = atoms[first]
+        known = np.isin(self.res_names[residues], list(THREE_TO_ONE))
+        atoms, residues = atoms[known], residues[known]
+
+        _, first, chain_of = np.unique(self.res_chains, return_index=True, return_inverse=True)
+        chain_rank = np.argsort(np.argsort(first))[chain_of]
+        return atoms[np.lexsort((self.res_seq[residues], chain_rank[residues]))]
+
+    def sequence(self, chain: Optional[str] = None) -> Optional[str]:
+        """One-letter sequence of one chain (default: all chains, concatenated)."""
+        atoms = self.ca_indices(chain)
+        if not len(atoms):
+            return None
+        names, residue_name = np.unique(self.res_names[self.residue_index[atoms]], return_inverse=True)
+        codes = np.array([THREE_TO_ONE[name].encode() for name in names], dtype="S1")
+        return codes[residue_name].tobytes().decode()
+
+    def residue_plddt(self, chain: Optional[str] = None) -> np.ndarray:
+        """Mean B-factor (pLDDT) of each residue's atoms, aligned with ``sequence()``."""
+        counts = np.bincount(self.residue_index, minlength=self.residue_count)
+        totals = np.bincount(self.residue_index, weights=self.b_factors, minlength=self.residue_count)
+        residues = self.residue_index[self.ca_indices(chain)]
+        return (totals[residues] / counts[residues]).astype(np.float32)
+
+    def ca_coords(self, chain: Optional[str] = None) -> np.ndarray:
+        """(L, 3) CA coordinates, aligned with ``sequence()``."""
+        return self.coords[self.ca_indices(chain)]
+
+    def ca_distances(self, chain: Optional[str] = None) -> np.ndarray:
+        """(L, L) CA-CA distances in Angstrom, aligned with ``sequence()``."""
+        ca = self.ca_coords(chain)
+        diff = ca[:, None, :] - ca[None, :, :]
+        return np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+
+    def summary(self) -> dict:
+        """Atom, residue and chain counts (as in upload metadata)."""
+        return {
+            "atom_count": self.atom_count,
+            "chains": sorted(self.chains),
+            "residue_count": self.residue_count,
+            "model_count": self.model_count,
+        }
+
+
+def _column(chars: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Fixed-width column ``[start, end)`` of every line, as bytes."""
+    return np.ascontiguousarray(chars[:, start:end]).view(f"S{end - start}").ravel()
+
+
+def _decimal(chars: np.ndarray, start: int, end: int) -> np.ndarray:
+    """
+    Numbers in column ``[start, end)`` of every line, as float64.
+
+    Fixed-point columns (the decimal point, if any, in the same place on
+    every line, as the PDB format prescribes) are decoded with one matrix
+    product of digits and powers of ten instead of one float() per value;
+    blanks are 0. Other columns fall back to NumPy's string conversion.
+    """
+    block = np.ascontiguousarray(chars[:, start:end]).view(np.uint8)
+    is_digit = (block >= ord("0")) & (block <= ord("9"))
+    dot = block == ord(".")
+    minus = block == ord("-")
+    dot_columns = np.flatnonzero(dot.any(axis=0))
+    fixed = len(dot_columns) == 0 or (len(dot_columns) == 1 and dot[:, dot_columns[0]].all())
+    plain = is_digit | dot | minus | (block == ord(" ")) | (block == 0)
+
+    if not (fixed and plain.all()):
+        column = np.char.strip(_column(chars, start, end))
+        return np.where(column == b"", b"0", column).astype(np.float64)
+
+    # Power of ten of each position relative to the decimal point
+    point = dot_columns[0] if len(dot_columns) else block.shape[1]
+    positions = np.arange(block.shape[1])
+    weights = np.where(positions < point, 10.0 ** (point - 1 - positions), 10.0 ** (point - positions))
+    weights[positions == point] = 0.0
+    values = np.where(is_digit, block - ord("0"), 0).astype(np.float64) @ weights
+    return np.where(minus.any(axis=1), -values, values)
+
+
+def _parse(pdb_content: str) -> Structure:
+    data = pdb_content.encode("ascii", "replace")
+    model_count = data.count(b"\nMODEL ") + data.startswith(b"MODEL ")
+    # Coordinates of the first model only
+    end = data.find(b"\nENDMDL")
+    if end >= 0:
+        data = data[:end]
+
+    lines = np.array(data.split(b"\n"), dtype=f"S{LINE_WIDTH}")
+    chars = lines.view("S1").reshape(len(lines), LINE_WIDTH)
+    record = _column(chars, 0, 6)
+    keep = (record == b"ATOM  ") | (record == b"HETATM")
+    keep &= np.char.str_len(np.char.rstrip(lines)) >= MIN_COORD_WIDTH
+    chars = chars[keep]
+
+    coords = np.stack([_decimal(chars, col, col + 8) for col in (30, 38, 46)], axis=1)
+    chain_ids = _column(chars, 21, 22)
+    res_seq = _decimal(chars, 22, 26).astype(np.int32)
+    insertion = _column(chars, 26, 27)
+    res_names = np.char.strip(_column(chars, 17, 20))
+
+    # A new residue starts wherever chain, number, insertion code or name changes
+    starts = np.ones(len(chars), dtype=bool)
+    starts[1:] = (
+        (chain_ids[1:] != chain_ids[:-1])
+        | (res_seq[1:] != res_seq[:-1])
+        | (insertion[1:] != insertion[:-1])
+        | (res_names[1:] != res_names[:-1])
+    )
+    residue_index = (np.cumsum(starts) - 1).astype(np.int32)
+
+    return Structure(
+        coords=coords.astype(np.float32),
+        atom_names=np.char.strip(_column(chars, 12, 16)),
+        residue_index=residue_index,
+        chain_ids=chain_ids,
+        b_factors=_decimal(chars, 60, 66).astype(np.float32),
+        hetatm=record[keep] == b"HETATM",
+        res_names=res_names[starts].astype("U3"),
+        res_seq=res_seq[starts],
+        res_chains=chain_ids[starts].astype("U1"),
+        model_count=max(model_count, 1),
+    )
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+_cache: "OrderedDict[str, Structure]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def parse_structure(pdb_content: str, cache: bool = True) -> Structure:
+    """
+    Parse PDB content into a Structure.
+
+    Args:
+        pdb_content: PDB file content
+        cache: Reuse (and keep) the structure parsed from identical content
+
+    Returns:
+        Structure of the first model
+
+    Raises:
+        ValueError: If a coordinate record has non-numeric coordinates
+    """
+    if not cache:
+        return _parse(pdb_content)
+
+    key = hashlib.sha1(pdb_content.encode("utf-8", "replace")).hexdigest()
+    with _cache_lock:
+        structure = _cache.get(key)
+        if structure is not None:
+            _cache.move_to_end(key)
+            return structure
+
+    structure = _parse(pdb_content)
+    for array in vars(structure).values():
+        if isinstance(array, np.ndarray):
+            array.setflags(write=False)
+
+    with _cache_lock:
+        _cache[key] = structure
+        if len(_cache) > MAX_CACHED_STRUCTURES:
+            _cache.popitem(last=False)
+    return structure
+
+
+def clear_structure_cache() -> None:
+    """Drop all cached structures."""
+    with _cache_lock:
+        _cache.clear()
+
+
+# =============================================================================
+# Per-residue pLDDT in state
+# =============================================================================
+
+def encode_plddt(plddt: np.ndarray) -> str:
+    """Pack per-residue pLDDT (0-100) as base64, one byte per residue."""
+    values = np.clip(np.rint(np.asarray(plddt, dtype=np.float32)), 0, 100).astype(np.uint8)
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def decode_plddt(encoded: Optional[str]) -> Optional[np.ndarray]:
+    """Unpack ``encode_plddt`` output into a float32 array (None if absent)."""
+    if not encoded:
+        return None
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.uint8).astype(np.float32)
+
+
+def residue_plddt_from_pdb(pdb_data: Optional[str]) -> Optional[str]:
+    """
+    Encoded per-residue pLDDT of a predicted structure, from its B-factors.
+
+    pLDDT written on a 0-1 scale is rescaled to 0-100. Returns None without
+    parsable coordinates.
+    """
+    if not pdb_data:
+        return None
+    try:
+        plddt = parse_structure(pdb_data).residue_plddt()
+    except ValueError:
+        return None
+    if not len(plddt):
+        return None
+    if plddt.max() <= 1.0:
+        plddt = plddt * 100
+    return encode_plddt(plddt)
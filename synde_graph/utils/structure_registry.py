@@ -0,0 +1,339 @@
+"""
+Registry of predicted structures, shared across workflows.
+
+An ESMFold structure used to live only in the state of the workflow that
+folded it, so a follow-up on the same protein ("now predict kcat") folded
+it again. The registry keeps a copy of every predicted structure, keyed
+by the hash of its sequence, with its average pLDDT and source model:
+
+- ``check_structure_node`` and ``prepare_wt_metrics_node`` look the
+  sequence up before any structure prediction runs
+- ``run_esmfold_node`` and ``prepare_wt_metrics_node`` register what
+  they fold
+
+PDB files live in STRUCTURE_CACHE_DIR and are evicted least recently used
+first once they exceed STRUCTURE_CACHE_MB. The index is a SQLite database
+next to them, so every worker on the host shares it. A lookup for a job
+copies the PDB into the job's output directory, so eviction never removes
+a file a running workflow holds in its state.
+
+Structures from mock and simulated GPU backends are placeholders; they
+are registered in a namespace of their own and never served to real runs.
+
+Usage:
+    record = lookup_structure(sequence, job_id)
+    if record is None:
+        ...fold...
+        register_structure(sequence, pdb_data=pdb_data, avg_plddt=plddt)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from synde_graph.config import OutputPaths, StructureRegistrySettings
+from synde_graph.utils.structure import residue_plddt_from_pdb
+
+logger = logging.getLogger(__name__)
+
+
+def sequence_hash(sequence: str, namespace: Optional[str] = None) -> str:
+    """
+    Registry key of a sequence (whitespace and case are ignored).
+
+    Args:
+        sequence: Protein sequence
+        namespace: Prefix keeping placeholder structures apart ("mock", ...)
+    """
+    normalized = "".join(sequence.split()).upper()
+    digest = hashlib.sha256(normalized.encode()).hexdigest()
+    return f"{namespace}-{digest}" if namespace else digest
+
+
+@dataclass
+class StructureRecord:
+    """A registered structure."""
+    sequence_hash: str
+    pdb_path: str
+    pdb_data: str
+    avg_plddt: Optional[float]
+    source: str
+
+    def protein_fields(self) -> Dict[str, Any]:
+        """The structure as ProteinData fields."""
+        return {
+            "pdb_file_path": self.pdb_path,
+            "pdb_data": self.pdb_data,
+            "avg_plddt": self.avg_plddt,
+            "residue_plddt": residue_plddt_from_pdb(self.pdb_data),
+            "structure_source": self.source,
+        }
+
+
+class StructureRegistry:
+    """
+    Predicted structures on disk, indexed by sequence hash.
+
+    Usage:
+        registry = StructureRegistry("synde_outputs/structures")
+        registry.register(sequence, pdb_data=pdb, avg_plddt=82.4)
+        registry.lookup(sequence)  # StructureRecord or None
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path] = StructureRegistrySettings.DIR,
+        max_bytes: int = StructureRegistrySettings.MAX_BYTES,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            root: Directory holding the PDB files and the index
+            max_bytes: Total size of PDB files kept before evicting
+        """
+        self.root = Path(root)
+        self.db_path = self.root / "registry.db"
+        self.max_bytes = max_bytes
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self):
+        """Initialize database schema."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS structures (
+                    sequence_hash TEXT PRIMARY KEY,
+                    pdb_path TEXT NOT NULL,
+                    avg_plddt REAL,
+                    source TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_structures_last_used
+                ON structures(last_used)
+            """)
+            conn.commit()
+
+    def lookup(
+        self,
+        sequence: str,
+        namespace: Optional[str] = None,
+        copy_to: Optional[Union[str, Path]] = None,
+    ) -> Optional[StructureRecord]:
+        """
+        Registered structure of a sequence, or None; marks it as recently used.
+
+        Args:
+            sequence: Protein sequence
+            namespace: Namespace the structure was registered in
+            copy_to: Write the PDB here and return this path instead of
+                the registry's own file, which eviction may delete
+        """
+        key = sequence_hash(sequence, namespace)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT pdb_path, avg_plddt, source FROM structures WHERE sequence_hash = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            pdb_path, avg_plddt, source = row
+            try:
+                pdb_data = Path(pdb_path).read_text()
+            except OSError:
+                # Removed behind our back: forget it
+                conn.execute("DELETE FROM structures WHERE sequence_hash = ?", (key,))
+                return None
+
+            conn.execute(
+                "UPDATE structures SET last_used = ? WHERE sequence_hash = ?", (time.time(), key)
+            )
+
+        if copy_to is not None:
+            pdb_path = str(_write_atomic(Path(copy_to), pdb_data))
+        return StructureRecord(key, pdb_path, pdb_data, avg_plddt, source)
+
+    def register(
+        self,
+        sequence: str,
+        pdb_data: Optional[str] = None,
+        pdb_path: Optional[str] = None,
+        avg_plddt: Optional[float] = None,
+        source: str = "esmfold",
+        namespace: Optional[str] = None,
+    ) -> Optional[StructureRecord]:
+        """
+        Keep a copy of a predicted structure.
+
+        Args:
+            sequence: Protein sequence the structure was predicted from
+            pdb_data: PDB contents (read from ``pdb_path`` if not given)
+            pdb_path: PDB file of the prediction
+            avg_plddt: Average pLDDT of the prediction
+            source: Model that predicted it
+            namespace: Namespace to register it in (see sequence_hash)
+
+        Returns:
+            The new record, or None without PDB contents
+        """
+        if not pdb_data and pdb_path and os.path.exists(pdb_path):
+            pdb_data = Path(pdb_path).read_text()
+        if not pdb_data:
+            return None
+
+        key = sequence_hash(sequence, namespace)
+        path = _write_atomic(self.root / f"{key}.pdb", pdb_data)
+
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO structures
+                    (sequence_hash, pdb_path, avg_plddt, source, size_bytes, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                key, str(path), avg_plddt, source, path.stat().st_size,
+                datetime.now(timezone.utc).isoformat(), time.time(),
+            ))
+        self.evict(keep=key)
+        return StructureRecord(key, str(path), pdb_data, avg_plddt, source)
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """
+        Delete least recently used structures until the files fit in max_bytes.
+
+        Args:
+            keep: Sequence hash that is never evicted (the one just registered)
+
+        Returns:
+            Sequence hashes of the evicted structures
+        """
+        evicted = []
+        with self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM structures").fetchone()[0]
+            if total <= self.max_bytes:
+                return evicted
+
+            rows = conn.execute(
+                "SELECT sequence_hash, pdb_path, size_bytes FROM structures ORDER BY last_used"
+            ).fetchall()
+            for key, pdb_path, size_bytes in rows:
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                Path(pdb_path).unlink(missing_ok=True)
+                conn.execute("DELETE FROM structures WHERE sequence_hash = ?", (key,))
+                total -= size_bytes
+                evicted.append(key)
+
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} structure(s) from the registry")
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        """Number of registered structures and their total size."""
+        with self._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM structures"
+            ).fetchone()
+        return {"structures": count, "bytes": total, "max_bytes": self.max_bytes}
+
+
+def _write_atomic(path: Path, data: str) -> Path:
+    """Write under a temporary name first, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    partial.write_text(data)
+    os.replace(partial, path)
+    return path
+
+
+# =============================================================================
+# Global Registry
+# =============================================================================
+
+_registry: Optional[StructureRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_structure_registry() -> Optional[StructureRegistry]:
+    """Get the process-wide registry, or None when STRUCTURE_CACHE is disabled."""
+    global _registry
+    with _registry_lock:
+        if _registry is None and StructureRegistrySettings.ENABLED:
+            _registry = StructureRegistry()
+        return _registry
+
+
+def set_structure_registry(registry: Optional[StructureRegistry]) -> None:
+    """Replace (or clear) the process-wide registry."""
+    global _registry
+    with _registry_lock:
+        _registry = registry
+
+
+def _gpu_namespace() -> Optional[str]:
+    """Namespace of the running GPU backend: None for real predictions."""
+    from synde_gpu.mocks import is_mock_mode
+    from synde_gpu.simulator import is_simulated_mode
+
+    if is_mock_mode():
+        return "mock"
+    if is_simulated_mode():
+        return "simulated"
+    return None
+
+
+def lookup_structure(sequence: Optional[str], job_id: Optional[str] = None) -> Optional[StructureRecord]:
+    """
+    Registered structure of a sequence; failures are logged, not raised.
+
+    With a ``job_id``, the PDB is copied into the job's ESMFold output
+    directory and the record points at the copy.
+    """
+    if not sequence:
+        return None
+    try:
+        registry = get_structure_registry()
+        if registry is None:
+            return None
+        namespace = _gpu_namespace()
+        copy_to = None
+        if job_id:
+            copy_to = OutputPaths.ESMFOLD / f"{job_id}_{sequence_hash(sequence, namespace)[:16]}.pdb"
+        return registry.lookup(sequence, namespace, copy_to=copy_to)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not read the structure registry: {e}")
+        return None
+
+
+def register_structure(
+    sequence: Optional[str],
+    pdb_data: Optional[str] = None,
+    pdb_path: Optional[str] = None,
+    avg_plddt: Optional[float] = None,
+    source: str = "esmfold",
+) -> None:
+    """Register a predicted structure; failures are logged, not raised."""
+    if not sequence:
+        return
+    try:
+        registry = get_structure_registry()
+        if registry is not None:
+            registry.register(sequence, pdb_data, pdb_path, avg_plddt, source, namespace=_gpu_namespace())
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not register {source} structure: {e}")
@@ -0,0 +1,389 @@
+"""
+Trace recording and deterministic replay of external calls.
+
+While a TraceRecorder is installed (set_trace_recorder), every call that
+leaves the process - GPU tasks run through GpuTaskManager, GPU task
+proxies called directly, PubChem SMILES lookups - is appended to the
+trace with its arguments digest, output and wall-clock latency. The
+trace is saved as gzip-compressed JSON lines: a header with the
+workflow inputs, then one event per call.
+
+While a TraceReplay is installed (set_trace_replay), those calls are not
+made: each one is served the recorded output after sleeping the recorded
+latency times ``scale`` (0 for no delay). A call is matched to the first
+unconsumed event with the same kind, name and arguments digest, falling
+back to the next unconsumed event of the same kind and name, so per-run
+identifiers such as job ids in the arguments do not break the replay.
+Calls with no event left are counted as misses.
+
+Usage:
+    recorder = TraceRecorder(meta={"query": query})
+    set_trace_recorder(recorder)
+    try:
+        run_workflow(query)
+    finally:
+        set_trace_recorder(None)
+    recorder.trace().save("trace.bin")
+
+    set_trace_replay(TraceReplay(WorkflowTrace.load("trace.bin"), scale=0.5))
+"""
+
+import contextvars
+import gzip
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+TRACE_FORMAT = "synde-trace"
+TRACE_VERSION = 1
+
+# Event kinds
+KIND_GPU = "gpu"  # GpuTaskManager.execute_sync / execute_async, by model
+KIND_GPU_CALL = "gpu_call"  # Task proxy called outside a manager, by proxy name
+KIND_SMILES = "smiles"  # PubChem name-to-SMILES lookup
+
+
+class RecordedCallError(RuntimeError):
+    """Raised on replay where the recorded call raised."""
+
+
+@dataclass
+class TraceEvent:
+    """One external call: what was asked, what came back and how long it took."""
+    seq: int
+    kind: str
+    name: str
+    key: str  # Digest of the call arguments
+    output: Any  # Encoded, see _encode
+    latency: float  # Seconds
+    offset: float  # Seconds from the start of the recording
+    error: Optional[str] = None  # "ExceptionType: message" when the call raised
+
+
+@dataclass
+class WorkflowTrace:
+    """A recorded workflow run: its inputs and external calls."""
+    meta: Dict[str, Any] = field(default_factory=dict)
+    events: List[TraceEvent] = field(default_factory=list)
+
+    @property
+    def recorded_latency(self) -> float:
+        """Seconds spent in external calls while recording."""
+        return sum(event.latency for event in self.events)
+
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Number of events per (kind, name)."""
+        counts: Dict[Tuple[str, str], int] = {}
+        for event in self.events:
+            counts[(event.kind, event.name)] = counts.get((event.kind, event.name), 0) + 1
+        return counts
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the trace as gzip-compressed JSON lines."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"format": TRACE_FORMAT, "version": TRACE_VERSION, "meta": self.meta}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header, separators=(",", ":"), default=str) + "\n")
+            for event in self.events:
+                f.write(json.dumps(asdict(event), separators=(",", ":")) + "\n")
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "WorkflowTrace":
+        """
+        Read a trace written by save().
+
+        Raises:
+            ValueError: If the file is not a trace of a supported version
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                lines = [line for line in f if line.strip()]
+            header = json.loads(lines[0]) if lines else {}
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"{path} is not a workflow trace: {e}") from e
+
+        if header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path} is not a workflow trace")
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {header.get('version')} in {path}")
+
+        return cls(
+            meta=header.get("meta", {}),
+            events=[TraceEvent(**json.loads(line)) for line in lines[1:]],
+        )
+
+
+# =============================================================================
+# Encoding
+# =============================================================================
+
+def _encode(value: Any) -> Any:
+    """
+    JSON form of a call argument or output.
+
+    Tuples and dicts with non-string keys (fpocket pocket ids) are tagged
+    so replay returns the same types; other objects, such as the result
+    handles of submitted tasks, are recorded as opaque placeholders.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value):
+            return {k: _encode(v) for k, v in value.items()}
+        return {"__items__": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    return {"__opaque__": type(value).__name__}
+
+
+def _decode(value: Any) -> Any:
+    """Inverse of _encode; opaque placeholders become PendingHandle."""
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__tuple__" in value:
+        return tuple(_decode(v) for v in value["__tuple__"])
+    if "__items__" in value:
+        return {_decode(k): _decode(v) for k, v in value["__items__"]}
+    if "__opaque__" in value:
+        return PendingHandle(value["__opaque__"])
+    return {k: _decode(v) for k, v in value.items()}
+
+
+def call_key(args: tuple = (), kwargs: Optional[Dict] = None) -> str:
+    """Digest of call arguments, used to match replayed calls to events."""
+    payload = json.dumps([_encode(args), _encode(kwargs or {})], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+class PendingHandle:
+    """
+    Stand-in for a task result handle nobody waited on while recording.
+
+    Node code that submits a task without polling it sees a handle that
+    never becomes ready, as it did against the real worker.
+    """
+
+    state = "PENDING"
+
+    def __init__(self, type_name: str = "AsyncResult"):
+        self.type_name = type_name
+        self.id = self.task_id = "replayed-pending"
+
+    def ready(self) -> bool:
+        return False
+
+    def successful(self) -> bool:
+        return False
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        raise TimeoutError("Replayed task was never waited on while recording")
+
+    def revoke(self, terminate: bool = False, signal: Optional[str] = None) -> None:
+        pass
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+class TraceRecorder:
+    """Collects external calls into a WorkflowTrace; safe to share across threads."""
+
+    def __init__(self, meta: Optional[Dict[str, Any]] = None):
+        self.meta = dict(meta or {})
+        self._events: List[TraceEvent] = []
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        args: tuple,
+        kwargs: Optional[Dict],
+        output: Any,
+        latency: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Append one call."""
+        key = call_key(args, kwargs)
+        encoded = _encode(output)
+        offset = max(time.perf_counter() - self._start - latency, 0.0)
+        with self._lock:
+            self._events.append(TraceEvent(
+                seq=len(self._events),
+                kind=kind,
+                name=name,
+                key=key,
+                output=encoded,
+                latency=round(latency, 6),
+                offset=round(offset, 6),
+                error=f"{type(error).__name__}: {error}" if error is not None else None,
+            ))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def trace(self) -> WorkflowTrace:
+        """The calls recorded so far."""
+        with self._lock:
+            return WorkflowTrace(meta=dict(self.meta), events=list(self._events))
+
+
+# =============================================================================
+# Replay
+# =============================================================================
+
+class TraceReplay:
+    """Serves recorded outputs in place of external calls."""
+
+    def __init__(self, trace: WorkflowTrace, scale: float = 1.0):
+        """
+        Args:
+            trace: The recorded run
+            scale: Factor applied to recorded latencies (0 = no delay)
+        """
+        if scale < 0:
+            raise ValueError("Latency scale must be >= 0")
+        self.trace = trace
+        self.scale = scale
+        self.served = 0
+        self.misses: List[Tuple[str, str]] = []
+        self.delayed = 0.0  # Seconds slept in place of the calls
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], List[TraceEvent]] = {}
+        for event in trace.events:
+            self._pending.setdefault((event.kind, event.name), []).append(event)
+
+    def take(self, kind: str, name: str, args: tuple = (), kwargs: Optional[Dict] = None) -> Optional[TraceEvent]:
+        """
+        The event answering a call, or None (a miss).
+
+        Prefers an event with the same arguments digest, then the next
+        event of the same kind and name in recorded order. Each event is
+        served once.
+        """
+        key = call_key(args, kwargs)
+        with self._lock:
+            pending = self._pending.get((kind, name), [])
+            match = next((i for i, event in enumerate(pending) if event.key == key), 0 if pending else None)
+            if match is None:
+                self.misses.append((kind, name))
+                return None
+            self.served += 1
+            return pending.pop(match)
+
+    def delay(self, event: Optional[TraceEvent]) -> float:
+        """Seconds to wait before serving ``event``."""
+        seconds = event.latency * self.scale if event is not None else 0.0
+        with self._lock:
+            self.delayed += seconds
+        return seconds
+
+    @property
+    def remaining(self) -> int:
+        """Recorded events not served (yet)."""
+        with self._lock:
+            return sum(len(events) for events in self._pending.values())
+
+
+def replayed_output(event: TraceEvent) -> Any:
+    """
+    The recorded output of ``event``.
+
+    Raises:
+        RecordedCallError: If the recorded call raised
+    """
+    if event.error is not None:
+        raise RecordedCallError(event.error)
+    return _decode(event.output)
+
+
+# =============================================================================
+# Active recorder / replay
+# =============================================================================
+
+_recorder: Optional[TraceRecorder] = None
+_replay: Optional[TraceReplay] = None
+_state_lock = threading.Lock()
+
+# Set while a call is already traced as a whole (a GpuTaskManager call
+# around its task proxy), so the inner call is not recorded again
+_untraced: contextvars.ContextVar[bool] = contextvars.ContextVar("synde_untraced", default=False)
+
+
+def get_trace_recorder() -> Optional[TraceRecorder]:
+    """The recorder external calls are written to, or None."""
+    return _recorder
+
+
+def set_trace_recorder(recorder: Optional[TraceRecorder]) -> None:
+    """Install (or with None, remove) the trace recorder."""
+    global _recorder
+    with _state_lock:
+        _recorder = recorder
+
+
+def get_trace_replay() -> Optional[TraceReplay]:
+    """The replay serving external calls, or None."""
+    return _replay
+
+
+def set_trace_replay(replay: Optional[TraceReplay]) -> None:
+    """Install (or with None, remove) the trace replay."""
+    global _replay
+    with _state_lock:
+        _replay = replay
+
+
+@contextmanager
+def untraced() -> Iterator[None]:
+    """Don't record the external calls made inside the block."""
+    token = _untraced.set(True)
+    try:
+        yield
+    finally:
+        _untraced.reset(token)
+
+
+def traced_call(kind: str, name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Call ``func(*args, **kwargs)`` as an external call of the trace.
+
+    Under replay the call is not made and the recorded output is returned
+    (None on a miss); while recording, the call and its latency are
+    appended to the trace. Otherwise this is a plain call.
+    """
+    replay = _replay
+    if replay is not None:
+        event = replay.take(kind, name, args, kwargs)
+        if event is None:
+            return None
+        seconds = replay.delay(event)
+        if seconds > 0:
+            time.sleep(seconds)
+        return replayed_output(event)
+
+    recorder = _recorder
+    if recorder is None or _untraced.get():
+        return func(*args, **kwargs)
+
+    start = time.perf_counter()
+    try:
+        output = func(*args, **kwargs)
+    except Exception as e:
+        recorder.record(kind, name, args, kwargs, None, time.perf_counter() - start, error=e)
+        raise
+    recorder.record(kind, name, args, kwargs, output, time.perf_counter() - start)
+    return output
@@ -12,5 +12,5 @@ class SyndeWebConfig(AppConfig):
 
     def ready(self):
         """Initialize app when Django starts."""
-        # Import signals if needed
-        pass
+        # Release upload references when messages/batches are deleted
+        from synde_web import signals  # noqa: F401
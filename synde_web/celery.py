@@ -3,6 +3,8 @@
 import os
 from celery import Celery
 
+from synde_gpu.scheduling import BROKER_TRANSPORT_OPTIONS, gpu_task_routes
+
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'synde_web.settings')
 
@@ -14,21 +16,21 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Auto-discover tasks in all installed apps
 app.autodiscover_tasks()
 
+# Message priorities, 0 highest (kombu's default steps and separator)
+app.conf.broker_transport_options = BROKER_TRANSPORT_OPTIONS
+
 # Task routing
 app.conf.task_routes = {
-    # GPU tasks (defined in synde-minimal, called from synde-langgraph)
-    'home.tasks.run_esmfold_job': {'queue': 'gpu'},
-    'home.tasks.run_clean_ec_job': {'queue': 'gpu'},
-    'home.tasks.run_deepenzyme_kcat_job': {'queue': 'gpu'},
-    'home.tasks.run_temperture_job': {'queue': 'gpu'},
-    'home.tasks.run_flan_extractor': {'queue': 'gpu'},
-    'home.tasks.run_fpocket_job': {'queue': 'gpu'},
-    'home.tasks.run_progen2_job': {'queue': 'gpu'},
-    'home.tasks.run_zymctrl_job': {'queue': 'gpu'},
+    # GPU tasks (defined in synde-minimal, called from synde-langgraph):
+    # the shared "gpu" queue, or one per model with GPU_PER_MODEL_QUEUES
+    **gpu_task_routes(),
 
     # Workflow task (default celery queue)
     'synde_web.tasks.run_workflow': {'queue': 'celery'},
+    'synde_web.tasks.run_batch_screen': {'queue': 'celery'},
     'synde_web.tasks.cleanup_expired_checkpoints': {'queue': 'celery'},
+    'synde_web.tasks.cleanup_unreferenced_uploads': {'queue': 'celery'},
+    'synde_web.tasks.flush_usage_counters': {'queue': 'celery'},
 }
 
 # Beat schedule for periodic tasks
@@ -38,6 +40,15 @@ app.conf.beat_schedule = {
         'schedule': 3600.0,  # Every hour
         'args': (7,),  # Delete checkpoints older than 7 days
     },
+    'cleanup-unreferenced-uploads': {
+        'task': 'synde_web.tasks.cleanup_unreferenced_uploads',
+        'schedule': 3600.0,  # Every hour
+        'args': (24,),  # Delete unattached uploads idle for 24 hours
+    },
+    'flush-usage-counters': {
+        'task': 'synde_web.tasks.flush_usage_counters',
+        'schedule': 60.0,  # Every minute
+    },
 }
 
 
@@ -0,0 +1,118 @@
+"""
+Batched bulk maintenance for large tables.
+
+Deletes and updates walk the matching rows in primary-key order and touch
+at most ``batch_size`` rows per transaction, so locks are short-lived and
+memory stays flat however many rows qualify.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.deletion import Collector
+
+logger = logging.getLogger(__name__)
+
+CLEANUP_BATCH_SIZE = getattr(settings, 'SYNDE_CLEANUP_BATCH_SIZE', 5000)
+
+
+def _next_window(queryset, lower: Optional[int], batch_size: int):
+    """
+    The next pk window of at most ``batch_size`` matching rows.
+
+    Returns:
+        (window queryset, upper pk) - upper is None for the final window
+    """
+    window = queryset if lower is None else queryset.filter(pk__gt=lower)
+    upper = (
+        window.order_by('pk')
+        .values_list('pk', flat=True)[batch_size - 1:batch_size]
+        .first()
+    )
+    if upper is not None:
+        window = window.filter(pk__lte=upper)
+    return window, upper
+
+
+def delete_in_batches(queryset, batch_size: int = CLEANUP_BATCH_SIZE, label: str = '') -> dict:
+    """
+    Delete every row of ``queryset`` in pk-ordered batches.
+
+    When nothing cascades from the model and no delete signals are
+    connected, each batch is a single ``DELETE ... WHERE`` with no rows
+    loaded into Python (Django's fast-delete path); otherwise each batch
+    goes through the collector, which loads at most ``batch_size`` rows.
+
+    Returns:
+        Metrics dict: deleted, batches, fast_path, seconds, max_batch_seconds
+    """
+    using = queryset.db
+    fast_path = Collector(using=using).can_fast_delete(queryset)
+    stats = {'deleted': 0, 'batches': 0, 'fast_path': fast_path,
+             'seconds': 0.0, 'max_batch_seconds': 0.0}
+    started = time.perf_counter()
+    lower = None
+
+    while True:
+        window, upper = _next_window(queryset, lower, batch_size)
+
+        batch_started = time.perf_counter()
+        with transaction.atomic(using=using):
+            deleted, _ = window.delete()
+        batch_seconds = time.perf_counter() - batch_started
+
+        if deleted:
+            stats['deleted'] += deleted
+            stats['batches'] += 1
+            stats['max_batch_seconds'] = max(stats['max_batch_seconds'], batch_seconds)
+            logger.info(
+                f"{label or queryset.model.__name__}: deleted batch {stats['batches']} "
+                f"({deleted} rows, {stats['deleted']} total, {batch_seconds:.2f}s)"
+            )
+
+        if upper is None:
+            break
+        lower = upper
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def update_in_batches(queryset, batch_size: int = CLEANUP_BATCH_SIZE, label: str = '', **values) -> dict:
+    """
+    Apply ``queryset.update(**values)`` in pk-ordered batches.
+
+    Returns:
+        Metrics dict: updated, batches, seconds, max_batch_seconds
+    """
+    using = queryset.db
+    stats = {'updated': 0, 'batches': 0, 'seconds': 0.0, 'max_batch_seconds': 0.0}
+    started = time.perf_counter()
+    lower = None
+
+    while True:
+        window, upper = _next_window(queryset, lower, batch_size)
+
+        batch_started = time.perf_counter()
+        with transaction.atomic(using=using):
+            updated = window.update(**values)
+        batch_seconds = time.perf_counter() - batch_started
+
+        if updated:
+            stats['updated'] += updated
+            stats['batches'] += 1
+            stats['max_batch_seconds'] = max(stats['max_batch_seconds'], batch_seconds)
+            logger.info(
+                f"{label or queryset.model.__name__}: updated batch {stats['batches']} "
+                f"({updated} rows, {stats['updated']} total, {batch_seconds:.2f}s)"
+            )
+
+        if upper is None:
+            break
+        lower = upper
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('synde_web', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchScreen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.CharField(max_length=100, unique=True)),
+                ('file_id', models.CharField(max_length=100)),
+                ('filename', models.CharField(blank=True, max_length=255)),
+                ('properties', models.JSONField(default=list)),
+                ('ligand_smiles', models.TextField(blank=True)),
+                ('concurrency', models.IntegerField(default=4)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('total', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('results', models.JSONField(blank=True, default=list, help_text='Per-record result rows')),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_screens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Batch Screen',
+                'verbose_name_plural': 'Batch Screens',
+                'db_table': 'synde_batch_screens',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'status'], name='synde_batch_user_id_c15fee_idx')],
+            },
+        ),
+    ]
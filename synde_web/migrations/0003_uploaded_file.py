@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:22
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('synde_web', '0002_batch_screen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadedFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(help_text='SHA-256 of the file content', max_length=64, unique=True)),
+                ('file_type', models.CharField(choices=[('pdb', 'PDB'), ('fasta', 'FASTA')], max_length=10)),
+                ('size', models.BigIntegerField(default=0)),
+                ('filename', models.CharField(blank=True, help_text='Name of the first upload', max_length=255)),
+                ('summary', models.JSONField(blank=True, default=dict)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Uploaded File',
+                'verbose_name_plural': 'Uploaded Files',
+                'db_table': 'synde_uploaded_files',
+                'indexes': [models.Index(fields=['ref_count', 'last_used_at'], name='synde_uploa_ref_cou_d0c5bb_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('synde_web', '0003_uploaded_file'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'created_at', 'id'], name='synde_messa_convers_594efe_idx'),
+        ),
+    ]
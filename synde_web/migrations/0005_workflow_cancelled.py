@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('synde_web', '0004_message_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='message',
+            name='workflow_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], max_length=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='workflowcheckpoint',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], default='active', max_length=20),
+        ),
+    ]
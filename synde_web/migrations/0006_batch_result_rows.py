@@ -0,0 +1,102 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_batch_results(apps, schema_editor):
+    """Move the per-batch JSON result lists into BatchScreenResult rows."""
+    BatchScreen = apps.get_model('synde_web', 'BatchScreen')
+    BatchScreenResult = apps.get_model('synde_web', 'BatchScreenResult')
+    for batch_id, rows in BatchScreen.objects.values_list('id', 'legacy_results').iterator():
+        BatchScreenResult.objects.bulk_create(
+            [BatchScreenResult(batch_id=batch_id, index=i, row=row) for i, row in enumerate(rows or [])],
+            batch_size=500,
+        )
+
+
+def record_upload_owners(apps, schema_editor):
+    """Give existing uploads the owners of the batches and messages that attach them, with their references."""
+    UploadedFile = apps.get_model('synde_web', 'UploadedFile')
+    BatchScreen = apps.get_model('synde_web', 'BatchScreen')
+    Message = apps.get_model('synde_web', 'Message')
+    uploads = dict(UploadedFile.objects.values_list('digest', 'id'))
+    UploadOwner = apps.get_model('synde_web', 'UploadOwner')
+    owners = set()
+
+    for file_id, user_id in BatchScreen.objects.values_list('file_id', 'user_id').iterator():
+        if file_id in uploads:
+            owners.add((uploads[file_id], user_id))
+    for protein_data, user_id in Message.objects.exclude(protein_data=None).values_list(
+        'protein_data', 'conversation__user_id'
+    ).iterator():
+        file_id = (protein_data or {}).get('file_id')
+        if file_id in uploads:
+            owners.add((uploads[file_id], user_id))
+
+    UploadOwner.objects.bulk_create(
+        [UploadOwner(upload_id=upload_id, user_id=user_id) for upload_id, user_id in owners],
+        batch_size=500,
+    )
+    # Each owner holds a reference
+    for upload_id in {upload_id for upload_id, _ in owners}:
+        UploadedFile.objects.filter(id=upload_id).update(
+            ref_count=F('ref_count') + UploadOwner.objects.filter(upload_id=upload_id).count()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('synde_web', '0005_workflow_cancelled'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='batchscreen',
+            old_name='results',
+            new_name='legacy_results',
+        ),
+        migrations.CreateModel(
+            name='BatchScreenResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.IntegerField(help_text='Position in completion order')),
+                ('row', models.JSONField(default=dict)),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='synde_web.batchscreen')),
+            ],
+            options={
+                'verbose_name': 'Batch Screen Result',
+                'verbose_name_plural': 'Batch Screen Results',
+                'db_table': 'synde_batch_screen_results',
+                'ordering': ['batch', 'index'],
+                'constraints': [models.UniqueConstraint(fields=('batch', 'index'), name='unique_batch_result_index')],
+            },
+        ),
+        migrations.RunPython(copy_batch_results, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='batchscreen',
+            name='legacy_results',
+        ),
+        migrations.CreateModel(
+            name='UploadOwner',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ownerships', to='synde_web.uploadedfile')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_ownerships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'synde_upload_owners',
+                'constraints': [models.UniqueConstraint(fields=('upload', 'user'), name='unique_upload_owner')],
+            },
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='owners',
+            field=models.ManyToManyField(blank=True, help_text='Users who uploaded this content', related_name='uploaded_files', through='synde_web.UploadOwner', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(record_upload_owners, migrations.RunPython.noop),
+    ]
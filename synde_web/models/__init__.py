@@ -5,6 +5,8 @@ from synde_web.models.project import Project
 from synde_web.models.conversation import Conversation
 from synde_web.models.message import Message
 from synde_web.models.workflow import WorkflowCheckpoint
+from synde_web.models.batch import BatchScreen, BatchScreenResult
+from synde_web.models.upload import UploadedFile, UploadOwner
 
 __all__ = [
     'User',
@@ -12,4 +14,8 @@ __all__ = [
     'Conversation',
     'Message',
     'WorkflowCheckpoint',
+    'BatchScreen',
+    'BatchScreenResult',
+    'UploadedFile',
+    'UploadOwner',
 ]
@@ -0,0 +1,122 @@
+"""Batch screening job model."""
+
+from django.db import models, transaction
+from django.db.models import F
+from django.conf import settings
+from django.utils import timezone
+
+
+class BatchScreen(models.Model):
+    """
+    A multi-sequence FASTA screening job.
+
+    Per-record results are stored as BatchScreenResult rows as they finish,
+    numbered in completion order, so the client can poll for new rows
+    while the batch is still running.
+    """
+
+    job_id = models.CharField(max_length=100, unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='batch_screens'
+    )
+
+    # Input
+    file_id = models.CharField(max_length=100)
+    filename = models.CharField(max_length=255, blank=True)
+    properties = models.JSONField(default=list)
+    ligand_smiles = models.TextField(blank=True)
+    concurrency = models.IntegerField(default=4)
+
+    # Progress
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('pending', 'Pending'),
+            ('running', 'Running'),
+            ('completed', 'Completed'),
+            ('failed', 'Failed'),
+        ],
+        default='pending'
+    )
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'synde_batch_screens'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'status']),
+        ]
+        verbose_name = 'Batch Screen'
+        verbose_name_plural = 'Batch Screens'
+
+    def __str__(self):
+        return f"Batch {self.job_id} ({self.completed}/{self.total}, {self.status})"
+
+    @property
+    def progress(self) -> float:
+        """Fraction of records finished (0-1)."""
+        return self.completed / self.total if self.total else 0.0
+
+    def add_result(self, row: dict):
+        """Store one record's result row and bump the counters."""
+        failed = row.get('status') != 'success'
+        with transaction.atomic():
+            BatchScreenResult.objects.create(batch=self, index=self.completed, row=row)
+            BatchScreen.objects.filter(pk=self.pk).update(
+                completed=F('completed') + 1,
+                failed=F('failed') + int(failed),
+                updated_at=timezone.now(),
+            )
+        self.completed += 1
+        self.failed += int(failed)
+
+    def result_rows(self, since: int = 0):
+        """Result rows from index ``since`` onwards, as (index, row) pairs in order."""
+        return self.results.filter(index__gte=since).values_list('index', 'row')
+
+    def mark_completed(self):
+        """Mark the batch as completed."""
+        self.status = 'completed'
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'finished_at', 'updated_at'])
+
+    def mark_failed(self, error: str):
+        """Mark the batch as failed."""
+        self.status = 'failed'
+        self.last_error = error
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'last_error', 'finished_at', 'updated_at'])
+
+
+class BatchScreenResult(models.Model):
+    """One record's result row of a batch screen."""
+
+    batch = models.ForeignKey(
+        BatchScreen,
+        on_delete=models.CASCADE,
+        related_name='results'
+    )
+    index = models.IntegerField(help_text='Position in completion order')
+    row = models.JSONField(default=dict)
+
+    class Meta:
+        db_table = 'synde_batch_screen_results'
+        ordering = ['batch', 'index']
+        constraints = [
+            models.UniqueConstraint(fields=['batch', 'index'], name='unique_batch_result_index'),
+        ]
+        verbose_name = 'Batch Screen Result'
+        verbose_name_plural = 'Batch Screen Results'
+
+    def __str__(self):
+        return f"Batch {self.batch_id} result {self.index}"
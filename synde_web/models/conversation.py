@@ -1,8 +1,43 @@
 """Conversation model for chat threads."""
 
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Substr
 from django.conf import settings
 
+# Characters of the last message carried by listing annotations
+LAST_MESSAGE_PREVIEW_LENGTH = 100
+
+
+class ConversationQuerySet(models.QuerySet):
+    """Queryset helpers for conversation listings."""
+
+    def with_message_stats(self):
+        """
+        Annotate message count and last-message preview.
+
+        Listings built on this queryset read ``message_count`` and
+        ``last_message_preview`` from the row itself instead of issuing
+        one query per conversation.
+        """
+        from synde_web.models.message import Message
+
+        latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-created_at')
+        return self.annotate(
+            num_messages=Count('messages'),
+            last_message_role=Subquery(latest.values('role')[:1]),
+            last_message_content=Subquery(
+                latest.annotate(
+                    preview=Substr('content', 1, LAST_MESSAGE_PREVIEW_LENGTH)
+                ).values('preview')[:1]
+            ),
+            last_message_at=Subquery(latest.values('created_at')[:1]),
+        )
+
+    def for_sidebar(self):
+        """Load only the columns the sidebar renders."""
+        return self.only('id', 'title', 'project_id', 'is_pinned', 'is_archived', 'updated_at')
+
 
 class Conversation(models.Model):
     """
@@ -44,6 +79,8 @@ class Conversation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ConversationQuerySet.as_manager()
+
     class Meta:
         db_table = 'synde_conversations'
         ordering = ['-is_pinned', '-updated_at']
@@ -56,6 +93,8 @@ class Conversation(models.Model):
     @property
     def message_count(self):
         """Get number of messages in conversation."""
+        if hasattr(self, 'num_messages'):
+            return self.num_messages
         return self.messages.count()
 
     @property
@@ -63,6 +102,31 @@ class Conversation(models.Model):
         """Get the most recent message."""
         return self.messages.order_by('-created_at').first()
 
+    @property
+    def last_message_preview(self):
+        """
+        Role, truncated content and time of the most recent message.
+
+        Read from ``with_message_stats()`` annotations when present.
+        """
+        if not hasattr(self, 'last_message_at'):
+            message = self.last_message
+            if message is None:
+                return None
+            return {
+                'role': message.role,
+                'content': message.content[:LAST_MESSAGE_PREVIEW_LENGTH],
+                'created_at': message.created_at.isoformat(),
+            }
+
+        if self.last_message_at is None:
+            return None
+        return {
+            'role': self.last_message_role,
+            'content': self.last_message_content,
+            'created_at': self.last_message_at.isoformat(),
+        }
+
     def generate_title(self):
         """Auto-generate title from first user message."""
         first_msg = self.messages.filter(role='user').first()
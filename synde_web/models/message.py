@@ -1,6 +1,44 @@
 """Message model for individual chat messages."""
 
 from django.db import models
+from django.db.models import BooleanField, ExpressionWrapper, Q
+
+# JSON columns that can run to megabytes (inline PDB, mutant lists)
+PAYLOAD_FIELDS = ('protein_data', 'structure_data', 'prediction_data', 'generation_data')
+
+
+class MessageQuerySet(models.QuerySet):
+    """Queryset helpers for message listings."""
+
+    def with_payload_flags(self):
+        """
+        Annotate has_structure/has_predictions/has_mutants in SQL.
+
+        Lets listings defer the payload columns while still reporting
+        which payloads a message has.
+        """
+        return self.annotate(
+            structure_available=ExpressionWrapper(
+                Q(structure_data__pdb_data__isnull=False)
+                & ~Q(structure_data__pdb_data=None)
+                & ~Q(structure_data__pdb_data=''),
+                output_field=BooleanField(),
+            ),
+            predictions_available=ExpressionWrapper(
+                Q(prediction_data__isnull=False) & ~Q(prediction_data={}),
+                output_field=BooleanField(),
+            ),
+            mutants_available=ExpressionWrapper(
+                Q(generation_data__validated_mutants__isnull=False)
+                & ~Q(generation_data__validated_mutants=None)
+                & ~Q(generation_data__validated_mutants=[]),
+                output_field=BooleanField(),
+            ),
+        )
+
+    def without_payloads(self, keep=()):
+        """Defer the heavy JSON columns, except those named in ``keep``."""
+        return self.defer(*[f for f in PAYLOAD_FIELDS if f not in keep])
 
 
 class Message(models.Model):
@@ -34,6 +72,7 @@ class Message(models.Model):
             ('running', 'Running'),
             ('completed', 'Completed'),
             ('failed', 'Failed'),
+            ('cancelled', 'Cancelled'),
         ],
         null=True,
         blank=True
@@ -68,9 +107,15 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = MessageQuerySet.as_manager()
+
     class Meta:
         db_table = 'synde_messages'
         ordering = ['created_at']
+        indexes = [
+            # Keyset pagination on (created_at, id) within a conversation
+            models.Index(fields=['conversation', 'created_at', 'id']),
+        ]
         verbose_name = 'Message'
         verbose_name_plural = 'Messages'
 
@@ -83,6 +128,8 @@ class Message(models.Model):
     @property
     def has_structure(self):
         """Check if message has viewable structure."""
+        if hasattr(self, 'structure_available'):
+            return bool(self.structure_available)
         if not self.structure_data:
             return False
         return bool(self.structure_data.get('pdb_data'))
@@ -90,11 +137,15 @@ class Message(models.Model):
     @property
     def has_predictions(self):
         """Check if message has prediction results."""
+        if hasattr(self, 'predictions_available'):
+            return bool(self.predictions_available)
         return bool(self.prediction_data)
 
     @property
     def has_mutants(self):
         """Check if message has generated mutants."""
+        if hasattr(self, 'mutants_available'):
+            return bool(self.mutants_available)
         if not self.generation_data:
             return False
         return bool(self.generation_data.get('validated_mutants'))
@@ -132,6 +183,7 @@ class Message(models.Model):
             self.prediction_data = {
                 'response_html': response.get('response_html'),
                 'natural_reply': response.get('natural_reply'),
+                'values': result.get('predictions') or {},
             }
 
         # Extract generation data
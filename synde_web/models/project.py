@@ -51,6 +51,8 @@ class Project(models.Model):
     @property
     def conversation_count(self):
         """Get number of conversations in project."""
+        if hasattr(self, 'num_conversations'):
+            return self.num_conversations
         return self.conversations.count()
 
     @property
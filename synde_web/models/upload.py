@@ -0,0 +1,142 @@
+"""Content-addressed store for uploaded PDB and FASTA files."""
+
+import os
+import re
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# File ids are lowercase hex SHA-256 digests
+DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadedFile(models.Model):
+    """
+    An uploaded file stored once under its SHA-256 digest.
+
+    The digest is the public file id, so identical uploads from any
+    conversation share one file on disk and one parse summary. References
+    are counted per message or batch that attaches the file; unreferenced
+    blobs are removed by ``cleanup_unreferenced_uploads``. Every user who
+    uploaded the content is recorded in ``owners`` and holds a reference
+    too; only owners may attach the file.
+    """
+
+    FILE_TYPE_CHOICES = [
+        ('pdb', 'PDB'),
+        ('fasta', 'FASTA'),
+    ]
+
+    digest = models.CharField(max_length=64, unique=True, help_text='SHA-256 of the file content')
+    file_type = models.CharField(max_length=10, choices=FILE_TYPE_CHOICES)
+    size = models.BigIntegerField(default=0)
+    filename = models.CharField(max_length=255, blank=True, help_text='Name of the first upload')
+
+    # Parse results, so repeat lookups do not re-read the file
+    summary = models.JSONField(default=dict, blank=True)
+
+    owners = models.ManyToManyField(
+        settings.AUTH_USER_MODEL,
+        through='UploadOwner',
+        related_name='uploaded_files',
+        blank=True,
+        help_text='Users who uploaded this content'
+    )
+
+    # Reference counting
+    ref_count = models.IntegerField(default=0)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'synde_uploaded_files'
+        indexes = [
+            models.Index(fields=['ref_count', 'last_used_at']),
+        ]
+        verbose_name = 'Uploaded File'
+        verbose_name_plural = 'Uploaded Files'
+
+    def __str__(self):
+        return f"{self.file_type} {self.digest[:12]} ({self.ref_count} refs)"
+
+    @staticmethod
+    def blob_path(digest: str, file_type: str) -> str:
+        """Path of the stored file for a digest."""
+        return os.path.join(settings.MEDIA_ROOT, 'uploads', file_type, f'{digest}.{file_type}')
+
+    @property
+    def path(self) -> str:
+        return self.blob_path(self.digest, self.file_type)
+
+    @classmethod
+    def owned(cls, file_id, user, file_type: str = None):
+        """
+        The upload ``file_id`` names, if it is a well-formed digest uploaded by ``user``.
+
+        Returns None otherwise, so ids from requests never reach the filesystem
+        unchecked.
+        """
+        if not isinstance(file_id, str) or not DIGEST_RE.match(file_id):
+            return None
+        uploads = cls.objects.filter(digest=file_id, owners=user)
+        if file_type:
+            uploads = uploads.filter(file_type=file_type)
+        return uploads.first()
+
+    @classmethod
+    def acquire(cls, digest: str) -> bool:
+        """Add a reference to an upload. Returns False if it does not exist."""
+        return bool(cls.objects.filter(digest=digest).update(
+            ref_count=F('ref_count') + 1,
+            last_used_at=timezone.now(),
+        ))
+
+    @classmethod
+    def release(cls, digest: str):
+        """Drop a reference to an upload (the blob is removed later by cleanup)."""
+        cls.objects.filter(digest=digest, ref_count__gt=0).update(
+            ref_count=F('ref_count') - 1,
+            last_used_at=timezone.now(),
+        )
+
+    def delete_blob(self) -> bool:
+        """
+        Remove this row and the stored file, unless it is referenced again.
+
+        Returns:
+            True if the upload was removed
+        """
+        with transaction.atomic():
+            deleted, _ = UploadedFile.objects.filter(pk=self.pk, ref_count=0).delete()
+        if not deleted:
+            return False
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        return True
+
+
+class UploadOwner(models.Model):
+    """A user who uploaded a file; holds one reference to it while it exists."""
+
+    upload = models.ForeignKey(UploadedFile, on_delete=models.CASCADE, related_name='ownerships')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_ownerships'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'synde_upload_owners'
+        constraints = [
+            models.UniqueConstraint(fields=['upload', 'user'], name='unique_upload_owner'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} owns {self.upload_id}"
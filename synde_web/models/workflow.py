@@ -1,6 +1,7 @@
 """Workflow checkpoint model for persistence."""
 
 from django.db import models
+from django.utils import timezone
 from django.conf import settings
 
 
@@ -54,6 +55,7 @@ class WorkflowCheckpoint(models.Model):
             ('active', 'Active'),
             ('completed', 'Completed'),
             ('failed', 'Failed'),
+            ('cancelled', 'Cancelled'),
             ('expired', 'Expired'),
         ],
         default='active'
@@ -119,10 +121,43 @@ class WorkflowCheckpoint(models.Model):
 
         self.save()
 
-    def mark_completed(self):
-        """Mark workflow as completed."""
+    def update_progress(self, current_node: str, node_history: list) -> bool:
+        """
+        Record node progress without rewriting ``checkpoint_data``.
+
+        Called (coalesced) after every node while the workflow runs; the
+        full state is only written by ``mark_completed``. Only an active
+        workflow is updated, and its status is left alone, so a flush that
+        races ``mark_cancelled`` (or completion) cannot flip it back.
+
+        Returns:
+            Whether the row was still active and got updated
+        """
+        self.current_node = current_node
+        self.node_history = node_history
+        updated = type(self).objects.filter(pk=self.pk, status='active').update(
+            current_node=current_node,
+            node_history=node_history,
+            updated_at=timezone.now(),
+        )
+        return updated > 0
+
+    def mark_completed(self, state: dict = None):
+        """
+        Mark workflow as completed.
+
+        Args:
+            state: Final workflow state; written together with the status
+                in a single save
+        """
         self.status = 'completed'
-        self.save(update_fields=['status', 'updated_at'])
+        update_fields = ['status', 'updated_at']
+        if state is not None:
+            self.current_node = state.get('current_node', 'response_formatter')
+            self.node_history = state.get('node_history', [])
+            self.checkpoint_data = state
+            update_fields += ['current_node', 'node_history', 'checkpoint_data']
+        self.save(update_fields=update_fields)
 
     def mark_failed(self, error: str):
         """Mark workflow as failed."""
@@ -130,3 +165,8 @@ class WorkflowCheckpoint(models.Model):
         self.last_error = error
         self.error_count += 1
         self.save(update_fields=['status', 'last_error', 'error_count', 'updated_at'])
+
+    def mark_cancelled(self):
+        """Mark workflow as cancelled by its user."""
+        self.status = 'cancelled'
+        self.save(update_fields=['status', 'updated_at'])
@@ -0,0 +1,99 @@
+"""
+Coalesced per-node progress for running workflows.
+
+``CheckpointProgressSink`` receives a call after every graph node (via
+``synde_graph.utils.NodeProgress``) and persists ``current_node`` /
+``node_history`` to the workflow's checkpoint, so SSE clients see progress
+while the workflow runs. Writes are coalesced: at most one UPDATE per
+``min_interval`` seconds, touching only the progress columns. The full
+state is written once, on completion.
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FLUSH_INTERVAL = getattr(settings, 'SYNDE_PROGRESS_FLUSH_INTERVAL', 0.5)
+
+
+class CheckpointProgressSink:
+    """
+    Write-coalescing progress writer for one ``WorkflowCheckpoint``.
+
+    The first update is written immediately; updates arriving within
+    ``min_interval`` of the last write are buffered and written by a
+    trailing timer, so the stored progress is never more than
+    ``min_interval`` stale. ``close()`` flushes anything still pending.
+    """
+
+    def __init__(self, checkpoint, min_interval: float = PROGRESS_FLUSH_INTERVAL):
+        self.checkpoint = checkpoint
+        self.min_interval = min_interval
+        self.writes = 0
+
+        self._lock = threading.Lock()
+        self._history: List[str] = list(checkpoint.node_history or [])
+        self._current: Optional[str] = checkpoint.current_node or None
+        self._dirty = False
+        self._last_write = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+    def node_finished(self, node: str):
+        """Record that ``node`` finished; write now or schedule a trailing write."""
+        with self._lock:
+            if self._closed:
+                return
+            self._current = node
+            self._history.append(node)
+            self._dirty = True
+
+            wait = self.min_interval - (time.monotonic() - self._last_write)
+            if wait <= 0:
+                self._write_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(wait, self._trailing_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write pending progress now."""
+        with self._lock:
+            self._write_locked()
+
+    def close(self):
+        """Flush pending progress and stop accepting updates."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._write_locked()
+
+    def _trailing_flush(self):
+        # Runs on the timer thread, which needs its own DB connection
+        try:
+            with self._lock:
+                self._timer = None
+                if not self._closed:
+                    self._write_locked()
+        finally:
+            connection.close()
+
+    def _write_locked(self):
+        if not self._dirty:
+            return
+        try:
+            self.checkpoint.update_progress(self._current or '', list(self._history))
+            self.writes += 1
+        except Exception as e:
+            # Progress is best-effort; the final state is written on completion
+            logger.warning(f"Progress write failed for {self.checkpoint.job_id}: {e}")
+        self._dirty = False
+        self._last_write = time.monotonic()
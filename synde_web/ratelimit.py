@@ -0,0 +1,364 @@
+"""
+Redis-backed admission control for workflow submissions.
+
+One Lua script decides, atomically and in a single round trip, whether a
+user may start another workflow:
+
+1. Monthly quota - a Redis counter mirroring ``User.current_usage``
+   (seeded from the DB row, re-seeded when it expires). The key names the
+   billing month, so a new month starts from a fresh seed
+2. Concurrency - a sorted set of the user's running workflow ids, scored
+   by expiry so slots leaked by crashed workers free themselves
+3. Rate - a token bucket (``burst`` tokens, refilled continuously); off
+   when ``per_minute`` is 0
+
+Admitted submissions increment the quota counter and the user's pending
+usage counter; ``flush_usage_counters`` moves pending usage to the DB in
+bulk instead of one row write per workflow.
+
+Every key the script touches carries the user's ``{id}`` hash tag, so a
+user's keys share one Redis Cluster slot.
+
+If Redis is unreachable, ``admit`` falls back to the DB quota check.
+"""
+
+import logging
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Lua scripts
+# =============================================================================
+
+# KEYS: quota counter, token bucket, running set, pending usage counter
+# ARGV: quota limit, quota seed, quota ttl, burst, refill/s (0 = no rate
+#       limit), slot id ('' = no concurrency slot), max concurrent, slot ttl
+ADMIT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+-- Monthly quota
+redis.call('SET', KEYS[1], ARGV[2], 'NX', 'EX', ARGV[3])
+local used = tonumber(redis.call('GET', KEYS[1]))
+if used >= tonumber(ARGV[1]) then
+    return {'quota', '0'}
+end
+
+-- Concurrent workflows (expired slots are dropped first)
+local slot = ARGV[6]
+if slot ~= '' then
+    redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+    if redis.call('ZCARD', KEYS[3]) >= tonumber(ARGV[7]) then
+        return {'concurrency', '0'}
+    end
+end
+
+-- Token bucket (-1 tokens reported when there is no rate limit)
+local rate = tonumber(ARGV[5])
+local tokens = -1
+if rate > 0 then
+    local burst = tonumber(ARGV[4])
+    local bucket = redis.call('HMGET', KEYS[2], 'tokens', 'ts')
+    tokens = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local bucket_ttl = math.ceil(burst / rate) + 1
+
+    if tokens < 1 then
+        redis.call('HSET', KEYS[2], 'tokens', tostring(tokens), 'ts', tostring(now))
+        redis.call('EXPIRE', KEYS[2], bucket_ttl)
+        return {'rate', tostring((1 - tokens) / rate)}
+    end
+
+    tokens = tokens - 1
+    redis.call('HSET', KEYS[2], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[2], bucket_ttl)
+end
+
+-- Commit
+if slot ~= '' then
+    redis.call('ZADD', KEYS[3], now + tonumber(ARGV[8]), slot)
+    redis.call('EXPIRE', KEYS[3], ARGV[8])
+end
+redis.call('INCR', KEYS[1])
+redis.call('INCR', KEYS[4])
+return {'ok', tostring(math.floor(tokens))}
+"""
+
+# KEYS: pending usage counter. Returns its value and deletes it atomically.
+DRAIN_SCRIPT = """
+local pending = redis.call('GET', KEYS[1])
+redis.call('DEL', KEYS[1])
+return pending
+"""
+
+
+def billing_period(now: Optional[datetime] = None) -> str:
+    """The billing month of ``now`` (default: the current time), as UTC YYYY-MM."""
+    return (now or datetime.now(timezone.utc)).astimezone(timezone.utc).strftime('%Y-%m')
+
+
+def _seconds_left_in_period(now: datetime) -> int:
+    """Whole seconds from ``now`` until the next UTC month starts."""
+    now = now.astimezone(timezone.utc)
+    year, month = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+    next_period = datetime(year, month, 1, tzinfo=timezone.utc)
+    return max(1, math.ceil((next_period - now).total_seconds()))
+
+
+# =============================================================================
+# Limiter
+# =============================================================================
+
+@dataclass
+class Admission:
+    """Outcome of an admission check."""
+    allowed: bool
+    reason: Optional[str] = None  # 'quota', 'rate' or 'concurrency' when refused
+    retry_after: Optional[float] = None  # Seconds until a token is available
+    tokens_remaining: Optional[int] = None  # None when there is no rate limit
+    fallback: bool = False  # Decided by the DB because Redis was unavailable
+
+
+class RateLimiter:
+    """
+    Per-user quota, token-bucket and concurrency limiter.
+
+    Usage:
+        limiter = get_rate_limiter()
+        admission = limiter.admit(user, slot_id=workflow_id)
+        if not admission.allowed:
+            ...  # 429
+        ...
+        limiter.release(user.id, workflow_id)  # when the workflow finishes
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        burst: int = 10,
+        per_minute: float = 12,
+        max_concurrent: int = 3,
+        slot_ttl: int = 3600,
+        quota_ttl: int = 86400,
+        prefix: str = 'synde:limits',
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            redis_client: Redis client (decode_responses=True)
+            burst: Token bucket capacity (submissions allowed back to back)
+            per_minute: Sustained submissions per minute (0 = no rate limit)
+            max_concurrent: Running workflows allowed per user
+            slot_ttl: Seconds before an unreleased concurrency slot expires
+            quota_ttl: Seconds before the quota mirror is re-seeded from the DB
+                (capped at the end of the billing month)
+            prefix: Key prefix
+
+        Raises:
+            ValueError: If ``per_minute`` is negative
+        """
+        if per_minute < 0:
+            raise ValueError('per_minute must be >= 0 (0 = no rate limit)')
+        self.redis = redis_client or redis.Redis(decode_responses=True)
+        self.burst = burst
+        self.refill_per_second = per_minute / 60.0
+        self.max_concurrent = max_concurrent
+        self.slot_ttl = slot_ttl
+        self.quota_ttl = quota_ttl
+        self.prefix = prefix
+
+        self._admit = self.redis.register_script(ADMIT_SCRIPT)
+        self._drain = self.redis.register_script(DRAIN_SCRIPT)
+
+    # -- keys -----------------------------------------------------------------
+
+    def _user_keys(self, user_id: int, period: Optional[str] = None):
+        """Quota, bucket, running and pending keys, all in the user's slot."""
+        base = f'{self.prefix}:user:{{{user_id}}}'
+        return [
+            f'{base}:quota:{period or billing_period()}',
+            f'{base}:bucket',
+            f'{base}:running',
+            f'{base}:pending',
+        ]
+
+    def _user_id(self, pending_key: str) -> int:
+        """User id from a pending usage key."""
+        return int(pending_key.split('{', 1)[1].split('}', 1)[0])
+
+    # -- admission ------------------------------------------------------------
+
+    def admit(self, user, slot_id: Optional[str] = None) -> Admission:
+        """
+        Decide whether ``user`` may submit a workflow, and record it if so.
+
+        Args:
+            user: Object with ``id``, ``monthly_quota`` and ``current_usage``
+            slot_id: Workflow id holding a concurrency slot until
+                ``release``; None to skip the concurrency check
+
+        Returns:
+            Admission
+        """
+        now = datetime.now(timezone.utc)
+        keys = self._user_keys(user.id, billing_period(now))
+        args = [
+            user.monthly_quota,
+            user.current_usage,
+            min(self.quota_ttl, _seconds_left_in_period(now)),
+            self.burst,
+            self.refill_per_second,
+            slot_id or '',
+            self.max_concurrent,
+            self.slot_ttl,
+        ]
+
+        try:
+            outcome, value = self._admit(keys=keys, args=args)
+        except redis.RedisError as e:
+            logger.warning(f'Rate limiter unavailable, using DB quota check: {e}')
+            return self._admit_from_db(user)
+
+        if outcome == 'ok':
+            tokens = int(value)
+            return Admission(allowed=True, tokens_remaining=tokens if tokens >= 0 else None)
+        if outcome == 'rate':
+            return Admission(allowed=False, reason='rate', retry_after=float(value))
+        return Admission(allowed=False, reason=outcome)
+
+    def _admit_from_db(self, user) -> Admission:
+        """Legacy path: quota from the user row, one row write per admission."""
+        if not user.has_quota_remaining():
+            return Admission(allowed=False, reason='quota', fallback=True)
+        user.increment_usage()
+        return Admission(allowed=True, fallback=True)
+
+    def release(self, user_id: int, slot_id: str):
+        """Free a concurrency slot (best effort; slots also expire)."""
+        try:
+            self.redis.zrem(self._user_keys(user_id)[2], slot_id)
+        except redis.RedisError as e:
+            logger.warning(f'Failed to release workflow slot {slot_id}: {e}')
+
+    def running(self, user_id: int) -> int:
+        """Number of concurrency slots the user currently holds."""
+        return self.redis.zcard(self._user_keys(user_id)[2])
+
+    # -- usage flushing -------------------------------------------------------
+
+    def drain_pending_usage(self) -> Dict[int, int]:
+        """
+        Take the usage recorded since the last drain.
+
+        Each user's counter is read and deleted atomically, so usage
+        admitted while draining is kept for the next drain.
+        """
+        usage = {}
+        for key in self.redis.scan_iter(match=f'{self.prefix}:user:*:pending', count=1000):
+            count = self._drain(keys=[key])
+            if count:
+                usage[self._user_id(key)] = int(count)
+        return usage
+
+    def restore_pending_usage(self, usage: Dict[int, int]):
+        """Put drained usage back (e.g. after a failed DB write)."""
+        if not usage:
+            return
+        pipe = self.redis.pipeline()
+        for user_id, count in usage.items():
+            pipe.incrby(self._user_keys(user_id)[3], count)
+        pipe.execute()
+
+
+REFUSAL_MESSAGES = {
+    'quota': 'Monthly quota exceeded. Please upgrade your plan.',
+    'rate': 'Too many requests. Please slow down.',
+    'concurrency': 'Too many workflows running. Wait for one to finish.',
+}
+
+
+def refusal_response(admission: Admission) -> JsonResponse:
+    """429 response for a refused admission, with Retry-After when known."""
+    response = JsonResponse({
+        'error': REFUSAL_MESSAGES[admission.reason],
+        'reason': admission.reason,
+        'retry_after': admission.retry_after,
+    }, status=429)
+    if admission.retry_after is not None:
+        response['Retry-After'] = str(max(1, math.ceil(admission.retry_after)))
+    return response
+
+
+def flush_usage(limiter: RateLimiter) -> dict:
+    """
+    Add usage recorded in Redis to ``User.current_usage``.
+
+    Users with the same pending count share one ``UPDATE ... WHERE id IN``,
+    so a flush costs one statement per distinct count rather than one row
+    write per workflow. Drained usage is put back if the update fails.
+
+    Returns:
+        Metrics dict: users, runs, statements
+    """
+    from django.db import transaction
+    from django.db.models import F
+    from synde_web.models import User
+
+    usage = limiter.drain_pending_usage()
+    by_count = defaultdict(list)
+    for user_id, count in usage.items():
+        by_count[count].append(user_id)
+
+    try:
+        with transaction.atomic():
+            for count, user_ids in by_count.items():
+                User.objects.filter(id__in=user_ids).update(
+                    current_usage=F('current_usage') + count
+                )
+    except Exception:
+        limiter.restore_pending_usage(usage)
+        raise
+
+    return {'users': len(usage), 'runs': sum(usage.values()), 'statements': len(by_count)}
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide limiter configured from Django settings."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        from django.conf import settings
+
+        client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.SYNDE_RATE_LIMIT_REDIS_DB,
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+            # Fail over to the DB check at once rather than retrying
+            retry=Retry(NoBackoff(), 0),
+        )
+        _rate_limiter = RateLimiter(
+            client,
+            burst=settings.SYNDE_RATE_LIMIT_BURST,
+            per_minute=settings.SYNDE_RATE_LIMIT_PER_MINUTE,
+            max_concurrent=settings.SYNDE_MAX_CONCURRENT_WORKFLOWS,
+            slot_ttl=settings.SYNDE_WORKFLOW_SLOT_TTL,
+        )
+    return _rate_limiter
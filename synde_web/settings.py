@@ -92,11 +92,27 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are parsed as a stream, so the size limit is not bound by memory
+SYNDE_MAX_UPLOAD_SIZE = int(os.getenv('MAX_UPLOAD_SIZE', str(200 * 1024 * 1024)))
+
+# Rows per transaction for periodic bulk cleanup
+SYNDE_CLEANUP_BATCH_SIZE = int(os.getenv('CLEANUP_BATCH_SIZE', '5000'))
+
+# Minimum seconds between per-node progress writes to a workflow checkpoint
+SYNDE_PROGRESS_FLUSH_INTERVAL = float(os.getenv('PROGRESS_FLUSH_INTERVAL', '0.5'))
+
 # Redis (shared with synde-minimal)
 REDIS_HOST = os.getenv('REDIS_HOST', '172.31.19.34')
 REDIS_PORT = int(os.getenv('REDIS_PORT', '6379'))
 REDIS_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}'
 
+# Per-user admission control for workflow submissions (synde_web.ratelimit)
+SYNDE_RATE_LIMIT_REDIS_DB = int(os.getenv('RATE_LIMIT_REDIS_DB', '4'))
+SYNDE_RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '10'))
+SYNDE_RATE_LIMIT_PER_MINUTE = float(os.getenv('RATE_LIMIT_PER_MINUTE', '12'))
+SYNDE_MAX_CONCURRENT_WORKFLOWS = int(os.getenv('MAX_CONCURRENT_WORKFLOWS', '3'))
+SYNDE_WORKFLOW_SLOT_TTL = int(os.getenv('WORKFLOW_SLOT_TTL', '3600'))
+
 # Celery
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', f'{REDIS_URL}/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', f'{REDIS_URL}/1')
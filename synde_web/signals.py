@@ -0,0 +1,29 @@
+"""Signal handlers for synde_web models."""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from synde_web.models import BatchScreen, Message, UploadedFile, UploadOwner
+
+
+@receiver(post_delete, sender=Message)
+def release_message_upload(sender, instance, **kwargs):
+    """Drop the upload reference held by a deleted message."""
+    file_id = (instance.protein_data or {}).get('file_id')
+    if file_id:
+        UploadedFile.release(file_id)
+
+
+@receiver(post_delete, sender=BatchScreen)
+def release_batch_upload(sender, instance, **kwargs):
+    """Drop the upload reference held by a deleted batch screen."""
+    if instance.file_id:
+        UploadedFile.release(instance.file_id)
+
+
+@receiver(post_delete, sender=UploadOwner)
+def release_owner_upload(sender, instance, **kwargs):
+    """Drop the upload reference held by an owner (removed, or account deleted)."""
+    digest = UploadedFile.objects.filter(pk=instance.upload_id).values_list('digest', flat=True).first()
+    if digest:
+        UploadedFile.release(digest)
@@ -11,6 +11,9 @@ from synde_graph.utils.live_logger import (
 
 logger = logging.getLogger(__name__)
 
+# Assistant message content of a cancelled workflow
+CANCELLED_CONTENT = 'Workflow cancelled.'
+
 
 @shared_task(bind=True, max_retries=3)
 def run_workflow(
@@ -23,7 +26,8 @@ def run_workflow(
     uploaded_pdb_path: str = None,
     uploaded_pdb_content: str = None,
     uploaded_sequence: str = None,
-    use_mock: bool = True
+    use_mock: bool = True,
+    user_id: int = None
 ):
     """
     Run LangGraph workflow as a Celery task.
@@ -38,11 +42,16 @@ def run_workflow(
         uploaded_pdb_content: Content of uploaded PDB file
         uploaded_sequence: Uploaded protein sequence
         use_mock: Whether to use mock GPU responses
+        user_id: Submitting user, whose concurrency slot is released once
+            the workflow completes or exhausts its retries
     """
     import os
     from django.db import transaction
     from synde_web.models import Message, Conversation, WorkflowCheckpoint
+    from synde_web.progress import CheckpointProgressSink
     from synde_graph.graph import run_workflow as execute_graph
+    from synde_graph.utils.cancellation import CancellationCheck, WorkflowCancelled, check_cancelled
+    from synde_graph.utils.instrumentation import NodeProgress
 
     # Set mock mode environment variable
     os.environ['MOCK_GPU'] = 'true' if use_mock else 'false'
@@ -60,6 +69,9 @@ def run_workflow(
         checkpoint = WorkflowCheckpoint.objects.get(job_id=workflow_id)
         message = Message.objects.get(id=message_id)
 
+        # Cancelled while still queued
+        check_cancelled(workflow_id)
+
         # Update status
         checkpoint.status = 'active'
         checkpoint.save(update_fields=['status', 'updated_at'])
@@ -78,22 +90,23 @@ def run_workflow(
 
         report("🔄 Running workflow graph...")
 
-        # Run the workflow
-        result = execute_graph(
-            user_query=user_query,
-            job_id=workflow_id,
-            uploaded_pdb_path=uploaded_pdb_path,
-            uploaded_pdb_content=uploaded_pdb_content,
-            session_data=session_data
-        )
+        # Run the workflow, recording (coalesced) per-node progress and
+        # stopping at the next node once it is cancelled
+        progress = CheckpointProgressSink(checkpoint)
+        try:
+            result = execute_graph(
+                user_query=user_query,
+                job_id=workflow_id,
+                uploaded_pdb_path=uploaded_pdb_path,
+                uploaded_pdb_content=uploaded_pdb_content,
+                session_data=session_data,
+                callbacks=[NodeProgress(progress.node_finished), CancellationCheck(workflow_id)],
+            )
+        finally:
+            progress.close()
 
-        # Update checkpoint with final state
-        checkpoint.current_node = result.get('current_node', 'response_formatter')
-        checkpoint.node_history = result.get('node_history', [])
-        checkpoint.checkpoint_data = dict(result)
-        checkpoint.save(update_fields=[
-            'current_node', 'node_history', 'checkpoint_data', 'updated_at'
-        ])
+        # Cancelled during the last node
+        check_cancelled(workflow_id)
 
         # Update message with results
         with transaction.atomic():
@@ -107,11 +120,22 @@ def run_workflow(
                 last_workflow_id=workflow_id
             )
 
-            # Mark checkpoint completed
-            checkpoint.mark_completed()
+            # Write the final state and mark checkpoint completed
+            checkpoint.mark_completed(state=dict(result))
 
         report("✅ Workflow completed successfully")
         logger.info(f"Workflow {workflow_id} completed successfully")
+        _release_workflow_slot(user_id, workflow_id)
+        if not use_mock:
+            _clear_gpu_ledger(workflow_id)
+
+    except WorkflowCancelled:
+        report("🛑 Workflow cancelled")
+        logger.info(f"Workflow {workflow_id} cancelled")
+        _finish_cancelled(workflow_id, message_id)
+        _release_workflow_slot(user_id, workflow_id)
+        if not use_mock:
+            _clear_gpu_ledger(workflow_id)
 
     except Exception as e:
         report(f"❌ Workflow failed: {str(e)}")
@@ -134,36 +158,213 @@ def run_workflow(
         if self.request.retries < self.max_retries:
             raise self.retry(exc=e, countdown=5 * (self.request.retries + 1))
 
+        _release_workflow_slot(user_id, workflow_id)
+        if not use_mock:
+            _clear_gpu_ledger(workflow_id)
+        raise
+
+
+def _release_workflow_slot(user_id: int, workflow_id: str):
+    """Free the rate limiter's concurrency slot held by a workflow."""
+    if user_id is None:
+        return
+    from synde_web.ratelimit import get_rate_limiter
+    get_rate_limiter().release(user_id, workflow_id)
+
+
+def _finish_cancelled(workflow_id: str, message_id: int):
+    """
+    Record a cancelled workflow and revoke GPU tasks it may have left behind.
+
+    The cancel endpoint already marks the rows and revokes tasks; this
+    covers tasks submitted after that and clears the cancel token.
+    """
+    from django.utils import timezone
+    from synde_web.models import Message, WorkflowCheckpoint
+    from synde_graph.utils.cancellation import get_cancel_tokens
+    from synde_gpu.tasks import revoke_workflow_tasks
+
+    checkpoint = WorkflowCheckpoint.objects.get(job_id=workflow_id)
+    if checkpoint.status != 'cancelled':
+        checkpoint.mark_cancelled()
+    Message.objects.filter(id=message_id).exclude(workflow_status='cancelled').update(
+        workflow_status='cancelled', content=CANCELLED_CONTENT, updated_at=timezone.now()
+    )
+
+    try:
+        revoke_workflow_tasks(workflow_id)
+        get_cancel_tokens().clear(workflow_id)
+    except Exception as e:
+        # Best effort: the token and task ids expire on their own (WORKFLOW_CANCEL_TTL)
+        logger.warning(f"Could not clean up cancelled workflow {workflow_id}: {e}")
+
+
+def _clear_gpu_ledger(workflow_id: str):
+    """
+    Drop the workflow's GPU task ledger once it can no longer be retried.
+
+    Retries keep the ledger so they reattach to GPU tasks submitted by the
+    failed attempt instead of resubmitting them.
+    """
+    from redis.exceptions import RedisError
+    from synde_gpu.ledger import get_task_ledger
+
+    ledger = get_task_ledger()
+    if ledger is None:
+        return
+    try:
+        ledger.clear(workflow_id)
+    except RedisError as e:
+        # Entries expire on their own (GPU_LEDGER_TTL)
+        logger.warning(f"Could not clear GPU task ledger for {workflow_id}: {e}")
+
+
+@shared_task(bind=True)
+def run_batch_screen(self, batch_id: str, fasta_path: str, use_mock: bool = True):
+    """
+    Screen every record of an uploaded multi-FASTA file.
+
+    Results are stored as BatchScreenResult rows as each record finishes;
+    progress is reported through the live logger under the batch job ID.
+
+    Args:
+        batch_id: BatchScreen job ID
+        fasta_path: Path to the uploaded FASTA file
+        use_mock: Whether to use mock GPU responses
+    """
+    import os
+    from synde_web.models import BatchScreen
+    from synde_graph.batch import iter_batch_screen
+    from synde_graph.utils.fasta import iter_fasta
+
+    os.environ['MOCK_GPU'] = 'true' if use_mock else 'false'
+
+    clear_logs(batch_id)
+    batch = BatchScreen.objects.get(job_id=batch_id)
+
+    try:
+        batch.status = 'running'
+        batch.save(update_fields=['status', 'updated_at'])
+
+        # Records are read from the file as the screen goes; batch.total was
+        # counted by the view
+        with open(fasta_path, 'r') as f:
+            for result in iter_batch_screen(
+                iter_fasta(f),
+                properties=batch.properties or None,
+                concurrency=batch.concurrency,
+                job_id=batch_id,
+                ligand_smiles=batch.ligand_smiles or None,
+                total=batch.total,
+            ):
+                batch.add_result(result.to_row())
+
+        batch.mark_completed()
+        logger.info(f"Batch {batch_id} completed: {batch.completed} records, {batch.failed} failed")
+
+    except Exception as e:
+        report(batch_id, f"❌ Batch screen failed: {str(e)}")
+        logger.exception(f"Batch {batch_id} failed: {e}")
+        batch.mark_failed(str(e))
         raise
 
 
 @shared_task
-def cleanup_expired_checkpoints(days: int = 7):
+def cleanup_expired_checkpoints(days: int = 7, batch_size: int = None):
     """
     Clean up old workflow checkpoints.
 
+    Deletion and expiry run in primary-key batches, each in its own short
+    transaction, so a large backlog never holds a long lock or loads the
+    checkpoint payloads into memory.
+
     Args:
         days: Delete checkpoints older than this many days
+        batch_size: Rows per transaction (default: SYNDE_CLEANUP_BATCH_SIZE)
+
+    Returns:
+        Progress metrics for the deletion and expiry passes
     """
     from datetime import timedelta
     from django.utils import timezone
+    from synde_web.cleanup import CLEANUP_BATCH_SIZE, delete_in_batches, update_in_batches
     from synde_web.models import WorkflowCheckpoint
 
+    batch_size = batch_size or CLEANUP_BATCH_SIZE
     cutoff = timezone.now() - timedelta(days=days)
 
     # Delete completed/failed checkpoints older than cutoff
-    deleted, _ = WorkflowCheckpoint.objects.filter(
-        status__in=['completed', 'failed', 'expired'],
-        updated_at__lt=cutoff
-    ).delete()
-
-    logger.info(f"Deleted {deleted} expired workflow checkpoints")
+    deleted = delete_in_batches(
+        WorkflowCheckpoint.objects.filter(
+            status__in=['completed', 'failed', 'cancelled', 'expired'],
+            updated_at__lt=cutoff
+        ),
+        batch_size=batch_size,
+        label='expired checkpoints',
+    )
+
+    logger.info(
+        f"Deleted {deleted['deleted']} expired workflow checkpoints in "
+        f"{deleted['batches']} batches ({deleted['seconds']:.2f}s, "
+        f"fast path: {deleted['fast_path']})"
+    )
 
     # Mark stale active checkpoints as expired
     stale_cutoff = timezone.now() - timedelta(hours=2)
-    expired = WorkflowCheckpoint.objects.filter(
-        status='active',
-        updated_at__lt=stale_cutoff
-    ).update(status='expired')
+    expired = update_in_batches(
+        WorkflowCheckpoint.objects.filter(
+            status='active',
+            updated_at__lt=stale_cutoff
+        ),
+        batch_size=batch_size,
+        label='stale checkpoints',
+        status='expired',
+    )
+
+    logger.info(
+        f"Marked {expired['updated']} stale checkpoints as expired in "
+        f"{expired['batches']} batches ({expired['seconds']:.2f}s)"
+    )
+
+    return {'deleted': deleted, 'expired': expired}
+
+
+@shared_task
+def cleanup_unreferenced_uploads(hours: int = 24):
+    """
+    Delete stored uploads that nothing references any more.
+
+    Args:
+        hours: Only delete uploads unused for at least this many hours
+    """
+    from datetime import timedelta
+    from django.utils import timezone
+    from synde_web.models import UploadedFile
+
+    cutoff = timezone.now() - timedelta(hours=hours)
+
+    deleted = 0
+    for upload in UploadedFile.objects.filter(ref_count=0, last_used_at__lt=cutoff):
+        # Skipped if a message, batch or new owner took a reference meanwhile
+        deleted += upload.delete_blob()
 
-    logger.info(f"Marked {expired} stale checkpoints as expired")
+    logger.info(f"Deleted {deleted} unreferenced uploads")
+
+
+@shared_task
+def flush_usage_counters():
+    """
+    Move workflow usage recorded by the rate limiter into User.current_usage.
+
+    Runs every minute; admissions only touch Redis, so the DB sees one
+    bulk update per flush instead of one row write per workflow.
+    """
+    from synde_web.ratelimit import flush_usage, get_rate_limiter
+
+    stats = flush_usage(get_rate_limiter())
+    if stats['runs']:
+        logger.info(
+            f"Flushed {stats['runs']} workflow runs for {stats['users']} users "
+            f"in {stats['statements']} statements"
+        )
+    return stats
@@ -5,7 +5,7 @@ from django.urls import path
 from django.conf import settings
 from django.conf.urls.static import static
 
-from synde_web.views import main, auth, api, sse, upload
+from synde_web.views import main, auth, api, sse, upload, batch
 
 urlpatterns = [
     # Admin
@@ -30,9 +30,11 @@ urlpatterns = [
     path('api/conversations/<int:conversation_id>/', api.ConversationViewSet.as_view(), name='api_conversation_detail'),
 
     # API - Messages
-    path('api/conversations/<int:conversation_id>/messages/', api.send_message, name='api_messages'),
+    path('api/conversations/<int:conversation_id>/messages/', api.conversation_messages, name='api_messages'),
     path('api/conversations/<int:conversation_id>/messages/<int:message_id>/',
          api.MessageViewSet.as_view(), name='api_message_detail'),
+    path('api/conversations/<int:conversation_id>/messages/<int:message_id>/payload/',
+         api.message_payload, name='api_message_payload'),
 
     # API - Suggestions
     path('api/suggestions/', api.get_suggestions, name='api_suggestions'),
@@ -41,6 +43,11 @@ urlpatterns = [
     path('api/upload/', upload.upload_file, name='api_upload'),
     path('api/upload/<str:file_id>/', upload.get_uploaded_file, name='api_upload_detail'),
 
+    # API - Batch screening (multi-FASTA)
+    path('api/batch/', batch.start_batch, name='api_batch'),
+    path('api/batch/<str:job_id>/', batch.batch_status, name='api_batch_detail'),
+    path('api/batch/<str:job_id>/download/', batch.batch_download, name='api_batch_download'),
+
     # SSE streaming
     path('api/conversations/<int:conversation_id>/stream/<str:workflow_id>/',
          sse.workflow_stream, name='workflow_stream'),
@@ -50,6 +57,9 @@ urlpatterns = [
 
     # Workflow logs
     path('api/workflow/<str:workflow_id>/logs/', api.workflow_logs, name='workflow_logs'),
+
+    # Workflow cancellation
+    path('api/workflow/<str:workflow_id>/cancel/', api.cancel_workflow, name='workflow_cancel'),
 ]
 
 if settings.DEBUG:
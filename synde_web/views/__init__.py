@@ -6,9 +6,10 @@ from synde_web.views.auth import (
 )
 from synde_web.views.api import (
     ProjectViewSet, ConversationViewSet, MessageViewSet,
-    send_message, get_suggestions
+    send_message, conversation_messages, message_payload, get_suggestions
 )
 from synde_web.views.sse import workflow_stream
+from synde_web.views.batch import start_batch, batch_status, batch_download
 
 __all__ = [
     # Main views
@@ -24,7 +25,13 @@ __all__ = [
     'ConversationViewSet',
     'MessageViewSet',
     'send_message',
+    'conversation_messages',
+    'message_payload',
     'get_suggestions',
     # SSE
     'workflow_stream',
+    # Batch screening
+    'start_batch',
+    'batch_status',
+    'batch_download',
 ]
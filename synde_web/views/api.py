@@ -2,6 +2,8 @@
 
 import json
 import uuid
+from django.db import transaction
+from django.db.models import Count
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
@@ -11,7 +13,11 @@ from django.utils import timezone
 from django.views import View
 from django.utils.decorators import method_decorator
 
-from synde_web.models import Project, Conversation, Message, WorkflowCheckpoint
+from synde_web.models import Project, Conversation, Message, WorkflowCheckpoint, UploadedFile
+from synde_web.ratelimit import get_rate_limiter, refusal_response
+from synde_web.views.pagination import (
+    MESSAGE_FIELDS, PaginationError, keyset_page, parse_fields, parse_page_size
+)
 
 
 class APIView(View):
@@ -34,20 +40,35 @@ class APIView(View):
             return {}
 
 
+def message_queryset(conversation, fields=MESSAGE_FIELDS):
+    """Messages of a conversation, deferring payload columns not in ``fields``."""
+    return conversation.messages.with_payload_flags().without_payloads(keep=fields)
+
+
+def serialize_message(message, fields=MESSAGE_FIELDS) -> dict:
+    """Serialize a message, limited to ``fields``."""
+    data = {}
+    for field in fields:
+        value = getattr(message, field)
+        data[field] = value.isoformat() if field == 'created_at' else value
+    return data
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ProjectViewSet(APIView):
     """CRUD operations for projects."""
 
     def get(self, request, project_id=None):
         """List projects or get single project."""
+        projects = Project.objects.filter(user=request.user).annotate(
+            num_conversations=Count('conversations')
+        )
+
         if project_id:
-            project = get_object_or_404(Project, id=project_id, user=request.user)
+            project = get_object_or_404(projects, id=project_id)
             return self.json_response(self._serialize_project(project))
 
-        projects = Project.objects.filter(
-            user=request.user,
-            is_archived=False
-        ).order_by('-is_pinned', '-updated_at')
+        projects = projects.filter(is_archived=False).order_by('-is_pinned', '-updated_at')
 
         return self.json_response({
             'projects': [self._serialize_project(p) for p in projects]
@@ -105,21 +126,37 @@ class ConversationViewSet(APIView):
     """CRUD operations for conversations."""
 
     def get(self, request, conversation_id=None):
-        """List conversations or get single conversation."""
+        """
+        List conversations or get single conversation.
+
+        A single conversation embeds the newest page of its messages
+        (light fields); older pages come from ``prev_cursor`` via the
+        message listing.
+        """
+        queryset = Conversation.objects.filter(user=request.user).with_message_stats()
+
         if conversation_id:
-            conversation = get_object_or_404(
-                Conversation, id=conversation_id, user=request.user
-            )
-            return self.json_response(self._serialize_conversation(conversation, include_messages=True))
+            conversation = get_object_or_404(queryset, id=conversation_id)
+            try:
+                fields = parse_fields(request.GET.get('fields'))
+                page = keyset_page(
+                    message_queryset(conversation, fields),
+                    limit=parse_page_size(request.GET.get('limit')),
+                    from_end=True,
+                )
+            except PaginationError as e:
+                return self.error_response(str(e))
+
+            data = self._serialize_conversation(conversation)
+            data['messages'] = [serialize_message(m, fields) for m in page['items']]
+            data['prev_cursor'] = page['prev_cursor']
+            return self.json_response(data)
 
         # Filter options
         project_id = request.GET.get('project')
         archived = request.GET.get('archived', 'false') == 'true'
 
-        queryset = Conversation.objects.filter(
-            user=request.user,
-            is_archived=archived
-        )
+        queryset = queryset.filter(is_archived=archived)
 
         if project_id:
             queryset = queryset.filter(project_id=project_id)
@@ -164,8 +201,8 @@ class ConversationViewSet(APIView):
         conversation.delete()
         return self.json_response({'deleted': True})
 
-    def _serialize_conversation(self, conversation, include_messages=False):
-        data = {
+    def _serialize_conversation(self, conversation):
+        return {
             'id': conversation.id,
             'title': conversation.title,
             'summary': conversation.summary,
@@ -173,71 +210,99 @@ class ConversationViewSet(APIView):
             'is_pinned': conversation.is_pinned,
             'is_archived': conversation.is_archived,
             'message_count': conversation.message_count,
+            'last_message': conversation.last_message_preview,
             'context': conversation.context,
             'created_at': conversation.created_at.isoformat(),
             'updated_at': conversation.updated_at.isoformat(),
         }
 
-        if include_messages:
-            messages = conversation.messages.all().order_by('created_at')
-            data['messages'] = [self._serialize_message(m) for m in messages]
-
-        return data
-
-    def _serialize_message(self, message):
-        return {
-            'id': message.id,
-            'role': message.role,
-            'content': message.content,
-            'workflow_id': message.workflow_id,
-            'workflow_status': message.workflow_status,
-            'has_structure': message.has_structure,
-            'has_predictions': message.has_predictions,
-            'has_mutants': message.has_mutants,
-            'protein_data': message.protein_data,
-            'structure_data': message.structure_data,
-            'prediction_data': message.prediction_data,
-            'generation_data': message.generation_data,
-            'created_at': message.created_at.isoformat(),
-        }
-
 
 @method_decorator(csrf_exempt, name='dispatch')
 class MessageViewSet(APIView):
-    """CRUD operations for messages."""
+    """Read operations for messages."""
 
     def get(self, request, conversation_id, message_id=None):
-        """List messages in conversation."""
+        """
+        List messages in conversation, one keyset page at a time.
+
+        Query parameters:
+        - limit: Page size (default 50, max 200)
+        - after / before: Cursor from a previous page's next_cursor / prev_cursor
+        - latest: 'true' to start from the newest page instead of the oldest
+        - fields: Comma-separated projection, or 'all'; the heavy JSON
+          payloads are omitted unless requested (single messages default to all)
+        """
         conversation = get_object_or_404(
             Conversation, id=conversation_id, user=request.user
         )
 
-        if message_id:
-            message = get_object_or_404(Message, id=message_id, conversation=conversation)
-            return self.json_response(self._serialize_message(message))
-
-        messages = conversation.messages.all().order_by('created_at')
+        try:
+            if message_id:
+                fields = parse_fields(request.GET.get('fields') or 'all')
+                message = get_object_or_404(
+                    message_queryset(conversation, fields), id=message_id
+                )
+                return self.json_response(serialize_message(message, fields))
+
+            fields = parse_fields(request.GET.get('fields'))
+            page = keyset_page(
+                message_queryset(conversation, fields),
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+                limit=parse_page_size(request.GET.get('limit')),
+                from_end=request.GET.get('latest', 'false') == 'true',
+            )
+        except PaginationError as e:
+            return self.error_response(str(e))
 
         return self.json_response({
-            'messages': [self._serialize_message(m) for m in messages]
+            'messages': [serialize_message(m, fields) for m in page['items']],
+            'next_cursor': page['next_cursor'],
+            'prev_cursor': page['prev_cursor'],
         })
 
-    def _serialize_message(self, message):
-        return {
-            'id': message.id,
-            'role': message.role,
-            'content': message.content,
-            'workflow_id': message.workflow_id,
-            'workflow_status': message.workflow_status,
-            'has_structure': message.has_structure,
-            'has_predictions': message.has_predictions,
-            'has_mutants': message.has_mutants,
-            'protein_data': message.protein_data,
-            'structure_data': message.structure_data,
-            'prediction_data': message.prediction_data,
-            'generation_data': message.generation_data,
-            'created_at': message.created_at.isoformat(),
-        }
+
+# Lazily fetched message payloads and the columns holding them
+PAYLOAD_PARTS = {
+    'structure': 'structure_data',
+    'mutants': 'generation_data',
+    'predictions': 'prediction_data',
+    'protein': 'protein_data',
+}
+
+
+@login_required
+@require_http_methods(["GET"])
+def message_payload(request, conversation_id, message_id):
+    """
+    Fetch a message's heavy payloads on demand.
+
+    Listings omit structure (inline PDB) and mutant data; clients call
+    this when the user opens a viewer. Only the requested columns are read.
+
+    Query parameters:
+    - parts: Comma-separated subset of structure, mutants, predictions,
+      protein (default: structure,mutants)
+    """
+    parts = [p.strip() for p in request.GET.get('parts', 'structure,mutants').split(',') if p.strip()]
+    unknown = sorted(set(parts) - set(PAYLOAD_PARTS))
+    if unknown or not parts:
+        return JsonResponse({
+            'error': f'Invalid parts. Allowed: {", ".join(PAYLOAD_PARTS)}'
+        }, status=400)
+
+    columns = [PAYLOAD_PARTS[p] for p in parts]
+    message = get_object_or_404(
+        Message.objects.only('id', *columns),
+        id=message_id,
+        conversation_id=conversation_id,
+        conversation__user=request.user,
+    )
+
+    data = {'id': message.id}
+    for part, column in zip(parts, columns):
+        data[part] = getattr(message, column)
+    return JsonResponse(data)
 
 
 @csrf_exempt
@@ -260,18 +325,11 @@ def send_message(request, conversation_id):
     from synde_web.tasks import run_workflow
     from synde_web.views.upload import get_uploaded_file
     import os
-    from django.conf import settings
 
     conversation = get_object_or_404(
         Conversation, id=conversation_id, user=request.user
     )
 
-    # Check quota
-    if not request.user.has_quota_remaining():
-        return JsonResponse({
-            'error': 'Monthly quota exceeded. Please upgrade your plan.'
-        }, status=429)
-
     try:
         data = json.loads(request.body) if request.body else {}
     except json.JSONDecodeError:
@@ -289,22 +347,26 @@ def send_message(request, conversation_id):
     uploaded_sequence = data.get('sequence')
 
     if file_id:
+        upload = UploadedFile.owned(file_id, request.user, file_type=file_type)
+        if upload is None:
+            return JsonResponse({'error': 'File not found'}, status=404)
+
         if file_type == 'pdb':
-            pdb_path = os.path.join(settings.MEDIA_ROOT, 'uploads', 'pdb', f'{file_id}.pdb')
+            pdb_path = upload.path
             if os.path.exists(pdb_path):
                 uploaded_pdb_path = pdb_path
                 with open(pdb_path, 'r') as f:
                     uploaded_pdb_content = f.read()
         elif file_type == 'fasta':
-            fasta_path = os.path.join(settings.MEDIA_ROOT, 'uploads', 'fasta', f'{file_id}.fasta')
+            fasta_path = upload.path
             if os.path.exists(fasta_path):
                 # Parse first sequence from FASTA
-                from synde_web.views.upload import parse_fasta
+                from synde_graph.utils.fasta import iter_fasta
                 with open(fasta_path, 'r') as f:
-                    sequences = parse_fasta(f.read())
-                if sequences:
+                    first_record = next(iter_fasta(f), None)
+                if first_record:
                     # Use first sequence
-                    uploaded_sequence = list(sequences.values())[0]
+                    uploaded_sequence = first_record[1]
 
     # Mock mode setting
     use_mock = data.get('use_mock')
@@ -319,40 +381,6 @@ def send_message(request, conversation_id):
         elif file_type == 'fasta':
             user_message_content += f"\n[Attached FASTA file: {file_id}]"
 
-    user_message = Message.objects.create(
-        conversation=conversation,
-        role='user',
-        content=user_message_content,
-        protein_data={
-            'file_id': file_id,
-            'file_type': file_type,
-            'sequence': uploaded_sequence[:100] + '...' if uploaded_sequence and len(uploaded_sequence) > 100 else uploaded_sequence,
-        } if file_id or uploaded_sequence else {}
-    )
-
-    # Generate workflow ID
-    workflow_id = str(uuid.uuid4())
-
-    # Create assistant message placeholder
-    assistant_message = Message.objects.create(
-        conversation=conversation,
-        role='assistant',
-        content='',
-        workflow_id=workflow_id,
-        workflow_status='pending'
-    )
-
-    # Create workflow checkpoint
-    WorkflowCheckpoint.objects.create(
-        job_id=workflow_id,
-        thread_id=workflow_id,
-        conversation=conversation,
-        message=assistant_message,
-        user=request.user,
-        checkpoint_data={},
-        status='active'
-    )
-
     # Build context with file info
     workflow_context = conversation.context.copy() if conversation.context else {}
     if uploaded_sequence:
@@ -362,21 +390,67 @@ def send_message(request, conversation_id):
     if uploaded_pdb_content:
         workflow_context['uploaded_pdb_content'] = uploaded_pdb_content
 
-    # Start workflow task
-    run_workflow.delay(
-        workflow_id=workflow_id,
-        user_query=content,
-        conversation_id=conversation.id,
-        message_id=assistant_message.id,
-        context=workflow_context,
-        uploaded_pdb_path=uploaded_pdb_path,
-        uploaded_pdb_content=uploaded_pdb_content,
-        uploaded_sequence=uploaded_sequence,
-        use_mock=use_mock
-    )
+    # Quota, rate and concurrency checks (records usage when admitted)
+    workflow_id = str(uuid.uuid4())
+    limiter = get_rate_limiter()
+    admission = limiter.admit(request.user, slot_id=workflow_id)
+    if not admission.allowed:
+        return refusal_response(admission)
+
+    try:
+        # The upload reference is taken with the message that holds it, so a
+        # failure in between cannot leak it (post_delete releases it again)
+        with transaction.atomic():
+            if file_id:
+                UploadedFile.acquire(file_id)
+
+            user_message = Message.objects.create(
+                conversation=conversation,
+                role='user',
+                content=user_message_content,
+                protein_data={
+                    'file_id': file_id,
+                    'file_type': file_type,
+                    'sequence': uploaded_sequence[:100] + '...' if uploaded_sequence and len(uploaded_sequence) > 100 else uploaded_sequence,
+                } if file_id or uploaded_sequence else {}
+            )
 
-    # Increment usage
-    request.user.increment_usage()
+            # Create assistant message placeholder
+            assistant_message = Message.objects.create(
+                conversation=conversation,
+                role='assistant',
+                content='',
+                workflow_id=workflow_id,
+                workflow_status='pending'
+            )
+
+            # Create workflow checkpoint
+            WorkflowCheckpoint.objects.create(
+                job_id=workflow_id,
+                thread_id=workflow_id,
+                conversation=conversation,
+                message=assistant_message,
+                user=request.user,
+                checkpoint_data={},
+                status='active'
+            )
+
+        # Start workflow task; it releases the concurrency slot when it finishes
+        run_workflow.delay(
+            workflow_id=workflow_id,
+            user_query=content,
+            conversation_id=conversation.id,
+            message_id=assistant_message.id,
+            context=workflow_context,
+            uploaded_pdb_path=uploaded_pdb_path,
+            uploaded_pdb_content=uploaded_pdb_content,
+            uploaded_sequence=uploaded_sequence,
+            use_mock=use_mock,
+            user_id=request.user.id,
+        )
+    except Exception:
+        limiter.release(request.user.id, workflow_id)
+        raise
 
     # Update conversation title if first message
     if conversation.message_count <= 2:
@@ -399,6 +473,14 @@ def send_message(request, conversation_id):
     })
 
 
+@csrf_exempt
+def conversation_messages(request, conversation_id):
+    """GET lists a conversation's messages (paginated); POST sends a message."""
+    if request.method == 'GET':
+        return MessageViewSet.as_view()(request, conversation_id=conversation_id)
+    return send_message(request, conversation_id)
+
+
 @login_required
 @require_http_methods(["GET"])
 def get_suggestions(request):
@@ -520,3 +602,64 @@ def workflow_logs(request, workflow_id):
         'next_index': next_index,
         'status': checkpoint.status,
     })
+
+
+# =============================================================================
+# Workflow Cancellation API
+# =============================================================================
+
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def cancel_workflow(request, workflow_id):
+    """
+    Cancel a running workflow.
+
+    Sets the workflow's cancel token, which the workflow observes at its
+    next node and while waiting on GPU tasks, revokes the GPU tasks it has
+    submitted so their slots free up immediately, and marks it cancelled.
+
+    Returns:
+        {
+            'workflow_id': workflow id,
+            'status': 'cancelled',
+            'revoked': revoked GPU task ids
+        }
+        409 if the workflow already finished, 503 if Redis is unavailable
+    """
+    from redis.exceptions import RedisError
+    from synde_graph.utils.cancellation import get_cancel_tokens
+    from synde_gpu.tasks import revoke_workflow_tasks
+    from synde_web.tasks import CANCELLED_CONTENT
+
+    checkpoint = get_object_or_404(
+        WorkflowCheckpoint.objects.defer('checkpoint_data'),
+        job_id=workflow_id,
+        conversation__user=request.user
+    )
+    if checkpoint.status != 'active':
+        return JsonResponse(
+            {'error': f'Workflow is {checkpoint.status}', 'status': checkpoint.status},
+            status=409
+        )
+
+    try:
+        get_cancel_tokens().cancel(workflow_id)
+    except RedisError:
+        return JsonResponse({'error': 'Cancellation is unavailable'}, status=503)
+
+    try:
+        revoked = revoke_workflow_tasks(workflow_id)
+    except Exception:
+        revoked = []  # Best effort; the workflow revokes its own task when it sees the token
+
+    checkpoint.mark_cancelled()
+    Message.objects.filter(workflow_id=workflow_id).update(
+        workflow_status='cancelled', content=CANCELLED_CONTENT, updated_at=timezone.now()
+    )
+
+    return JsonResponse({
+        'workflow_id': workflow_id,
+        'status': 'cancelled',
+        'revoked': revoked,
+    })
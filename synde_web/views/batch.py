@@ -0,0 +1,158 @@
+"""Batch screening API views for multi-sequence FASTA uploads."""
+
+import json
+import os
+import uuid
+from django.db import transaction
+from django.http import JsonResponse, HttpResponse
+from django.views.decorators.http import require_http_methods
+from django.views.decorators.csrf import csrf_exempt
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import get_object_or_404
+
+from synde_web.models import BatchScreen, UploadedFile
+from synde_web.ratelimit import get_rate_limiter, refusal_response
+
+
+MAX_BATCH_CONCURRENCY = 16
+
+
+def _serialize_batch(batch, since: int = 0) -> dict:
+    """Serialize a batch with the result rows from index ``since`` onwards."""
+    rows = list(batch.result_rows(since))
+    return {
+        'job_id': batch.job_id,
+        'status': batch.status,
+        'filename': batch.filename,
+        'properties': batch.properties,
+        'total': batch.total,
+        'completed': batch.completed,
+        'failed': batch.failed,
+        'progress': batch.progress,
+        'results': [row for _, row in rows],
+        'next_index': rows[-1][0] + 1 if rows else since,
+        'error': batch.last_error or None,
+        'created_at': batch.created_at.isoformat(),
+        'finished_at': batch.finished_at.isoformat() if batch.finished_at else None,
+    }
+
+
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def start_batch(request):
+    """
+    Start a batch screen over an uploaded multi-FASTA file.
+
+    Accepts JSON with:
+    - file_id: ID returned by the upload endpoint (FASTA)
+    - properties: Optional list of properties (default: ec_number, tm)
+    - ligand_smiles: Optional substrate SMILES (enables kcat)
+    - concurrency: Optional records in flight (1-16, default 4)
+    - use_mock: Optional override for mock mode
+    """
+    from synde_web.tasks import run_batch_screen
+    from synde_graph.batch import DEFAULT_BATCH_CONCURRENCY, DEFAULT_BATCH_PROPERTIES
+    from synde_graph.utils.fasta import iter_fasta
+
+    try:
+        data = json.loads(request.body) if request.body else {}
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+
+    file_id = data.get('file_id')
+    if not file_id:
+        return JsonResponse({'error': 'file_id required'}, status=400)
+
+    upload = UploadedFile.owned(file_id, request.user, file_type='fasta')
+    if upload is None or not os.path.exists(upload.path):
+        return JsonResponse({'error': 'FASTA file not found'}, status=404)
+    fasta_path = upload.path
+
+    with open(fasta_path, 'r') as f:
+        record_count = sum(1 for _ in iter_fasta(f))
+    if not record_count:
+        return JsonResponse({'error': 'No valid sequences found in FASTA file'}, status=400)
+
+    try:
+        concurrency = int(data.get('concurrency') or DEFAULT_BATCH_CONCURRENCY)
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'concurrency must be an integer'}, status=400)
+    concurrency = max(1, min(concurrency, MAX_BATCH_CONCURRENCY))
+
+    use_mock = data.get('use_mock')
+    if use_mock is None:
+        use_mock = os.getenv('MOCK_GPU', 'true').lower() in ('true', '1', 'yes')
+
+    # A batch counts as one run against quota and rate; it has its own
+    # record concurrency, so it holds no workflow slot
+    admission = get_rate_limiter().admit(request.user)
+    if not admission.allowed:
+        return refusal_response(admission)
+
+    # The batch and its upload reference are created together
+    with transaction.atomic():
+        batch = BatchScreen.objects.create(
+            job_id=str(uuid.uuid4()),
+            user=request.user,
+            file_id=file_id,
+            filename=data.get('filename', ''),
+            properties=data.get('properties') or DEFAULT_BATCH_PROPERTIES,
+            ligand_smiles=data.get('ligand_smiles') or '',
+            concurrency=concurrency,
+            total=record_count,
+        )
+        UploadedFile.acquire(file_id)
+
+    run_batch_screen.delay(batch_id=batch.job_id, fasta_path=fasta_path, use_mock=use_mock)
+
+    return JsonResponse(_serialize_batch(batch), status=202)
+
+
+@login_required
+@require_http_methods(["GET"])
+def batch_status(request, job_id):
+    """
+    Get batch progress and result rows.
+
+    Query params:
+        since: Index of the first result row to return (for incremental fetching)
+    """
+    batch = get_object_or_404(BatchScreen, job_id=job_id, user=request.user)
+
+    try:
+        since = max(0, int(request.GET.get('since', 0)))
+    except ValueError:
+        since = 0
+
+    return JsonResponse(_serialize_batch(batch, since))
+
+
+@login_required
+@require_http_methods(["GET"])
+def batch_download(request, job_id):
+    """
+    Download batch results as CSV (default) or Parquet.
+
+    Query params:
+        format: 'csv' or 'parquet'
+    """
+    from synde_graph.batch import BatchRecordResult, results_to_csv, results_to_parquet
+
+    batch = get_object_or_404(BatchScreen, job_id=job_id, user=request.user)
+    results = [BatchRecordResult(**row) for row in batch.results.values_list('row', flat=True).iterator()]
+    fmt = request.GET.get('format', 'csv').lower()
+
+    if fmt == 'parquet':
+        try:
+            content = results_to_parquet(results)
+        except ImportError as e:
+            return JsonResponse({'error': str(e)}, status=501)
+        response = HttpResponse(content, content_type='application/vnd.apache.parquet')
+    elif fmt == 'csv':
+        response = HttpResponse(results_to_csv(results), content_type='text/csv')
+    else:
+        return JsonResponse({'error': "format must be 'csv' or 'parquet'"}, status=400)
+
+    response['Content-Disposition'] = f'attachment; filename="batch-{batch.job_id[:8]}.{fmt}"'
+    return response
@@ -1,48 +1,61 @@
 """Main page views."""
 
+from django.db.models import Prefetch
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 
 from synde_web.models import Project, Conversation
 
 
-@login_required
-def index(request):
+def _sidebar_context(user) -> dict:
     """
-    Main chat interface.
+    Projects and conversations for the sidebar.
 
-    Displays the sidebar with projects/conversations and
-    the main chat area.
+    A fixed number of queries regardless of how many projects or
+    conversations the user has: one for projects, one prefetch for their
+    conversations, one each for pinned and recent conversations. Only the
+    columns the sidebar renders are loaded.
     """
-    user = request.user
-
     # Get user's projects
     projects = Project.objects.filter(
         user=user,
         is_archived=False
-    ).prefetch_related('conversations')
+    ).prefetch_related(
+        Prefetch('conversations', queryset=Conversation.objects.for_sidebar())
+    )
 
     # Get recent conversations (not in any project)
-    recent_conversations = Conversation.objects.filter(
+    recent_conversations = Conversation.objects.for_sidebar().filter(
         user=user,
         project__isnull=True,
         is_archived=False
     ).order_by('-updated_at')[:10]
 
     # Get pinned conversations
-    pinned_conversations = Conversation.objects.filter(
+    pinned_conversations = Conversation.objects.for_sidebar().filter(
         user=user,
         is_pinned=True,
         is_archived=False
     ).order_by('-updated_at')
 
-    context = {
+    return {
         'projects': projects,
         'recent_conversations': recent_conversations,
         'pinned_conversations': pinned_conversations,
-        'current_conversation': None,
     }
 
+
+@login_required
+def index(request):
+    """
+    Main chat interface.
+
+    Displays the sidebar with projects/conversations and
+    the main chat area.
+    """
+    context = _sidebar_context(request.user)
+    context['current_conversation'] = None
+
     return render(request, 'synde_web/index.html', context)
 
 
@@ -65,32 +78,8 @@ def chat(request, conversation_id):
     # Get messages
     messages = conversation.messages.all().order_by('created_at')
 
-    # Get user's projects for sidebar
-    projects = Project.objects.filter(
-        user=user,
-        is_archived=False
-    ).prefetch_related('conversations')
-
-    # Get recent conversations
-    recent_conversations = Conversation.objects.filter(
-        user=user,
-        project__isnull=True,
-        is_archived=False
-    ).order_by('-updated_at')[:10]
-
-    # Get pinned conversations
-    pinned_conversations = Conversation.objects.filter(
-        user=user,
-        is_pinned=True,
-        is_archived=False
-    ).order_by('-updated_at')
-
-    context = {
-        'projects': projects,
-        'recent_conversations': recent_conversations,
-        'pinned_conversations': pinned_conversations,
-        'current_conversation': conversation,
-        'messages': messages,
-    }
+    context = _sidebar_context(user)
+    context['current_conversation'] = conversation
+    context['messages'] = messages
 
     return render(request, 'synde_web/index.html', context)
@@ -0,0 +1,125 @@
+"""Keyset (cursor) pagination and field projection for message listings."""
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+from synde_web.models.message import PAYLOAD_FIELDS
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Fields every serialized message carries unless ``fields=`` narrows them
+LIGHT_FIELDS = (
+    'id', 'role', 'content', 'workflow_id', 'workflow_status',
+    'has_structure', 'has_predictions', 'has_mutants', 'created_at',
+)
+MESSAGE_FIELDS = LIGHT_FIELDS + PAYLOAD_FIELDS
+
+
+class PaginationError(ValueError):
+    """Invalid cursor, page size or field list in a listing request."""
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    """Opaque cursor for the position of one row in (created_at, id) order."""
+    raw = f'{created_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of ``encode_cursor``; raises PaginationError on bad input."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise PaginationError('Invalid cursor')
+
+
+def parse_page_size(value) -> int:
+    """Page size from a query parameter, clamped to MAX_PAGE_SIZE."""
+    if value in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('limit must be an integer')
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def parse_fields(value) -> tuple:
+    """
+    Field projection from a ``fields=`` query parameter.
+
+    ``None`` gives the light fields; ``all`` adds the payload columns;
+    otherwise a comma-separated subset of MESSAGE_FIELDS (``id`` is
+    always included).
+    """
+    if not value:
+        return LIGHT_FIELDS
+    if value == 'all':
+        return MESSAGE_FIELDS
+
+    requested = [f.strip() for f in value.split(',') if f.strip()]
+    unknown = sorted(set(requested) - set(MESSAGE_FIELDS))
+    if unknown:
+        raise PaginationError(f'Unknown fields: {", ".join(unknown)}')
+    return tuple(f for f in MESSAGE_FIELDS if f == 'id' or f in requested)
+
+
+def keyset_page(queryset, after: str = None, before: str = None,
+                limit: int = DEFAULT_PAGE_SIZE, from_end: bool = False) -> dict:
+    """
+    One page of ``queryset`` in ascending (created_at, id) order.
+
+    Pages forward from ``after``, backward from ``before``, or start at
+    the oldest row (newest when ``from_end``). Each page costs a single
+    indexed range query however deep into the listing it is.
+
+    Returns:
+        Dict with ``items`` plus ``next_cursor``/``prev_cursor`` (None when
+        that direction is known to be exhausted)
+    """
+    if after and before:
+        raise PaginationError('Use either after or before, not both')
+
+    backward = bool(before) or (from_end and not after)
+
+    if after:
+        created_at, pk = decode_cursor(after)
+        queryset = queryset.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        )
+    elif before:
+        created_at, pk = decode_cursor(before)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    if backward:
+        rows = list(queryset.order_by('-created_at', '-id')[:limit + 1])
+        has_more = len(rows) > limit
+        items = rows[:limit][::-1]
+    else:
+        rows = list(queryset.order_by('created_at', 'id')[:limit + 1])
+        has_more = len(rows) > limit
+        items = rows[:limit]
+
+    first_cursor = encode_cursor(items[0].created_at, items[0].id) if items else None
+    last_cursor = encode_cursor(items[-1].created_at, items[-1].id) if items else None
+
+    if backward:
+        prev_cursor = first_cursor if has_more else None
+        next_cursor = last_cursor if before else None
+    else:
+        next_cursor = last_cursor if has_more else None
+        prev_cursor = first_cursor if after else None
+
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor,
+    }
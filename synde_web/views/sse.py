@@ -11,6 +11,10 @@ from synde_web.models import Conversation, Message, WorkflowCheckpoint
 from synde_graph.utils.live_logger import get_logs
 
 
+# Columns the SSE loop polls; written by CheckpointProgressSink after each node
+PROGRESS_FIELDS = ['status', 'current_node', 'node_history', 'last_error', 'updated_at']
+
+
 @require_GET
 @login_required
 def workflow_stream(request, conversation_id, workflow_id):
@@ -32,7 +36,7 @@ def workflow_stream(request, conversation_id, workflow_id):
 
     # Get or check workflow exists
     try:
-        checkpoint = WorkflowCheckpoint.objects.get(
+        checkpoint = WorkflowCheckpoint.objects.defer('checkpoint_data').get(
             job_id=workflow_id,
             conversation=conversation
         )
@@ -59,8 +63,8 @@ def workflow_stream(request, conversation_id, workflow_id):
 
         while poll_count < max_polls:
             try:
-                # Refresh checkpoint from DB
-                checkpoint.refresh_from_db()
+                # Refresh progress columns only; checkpoint_data stays unloaded
+                checkpoint.refresh_from_db(fields=PROGRESS_FIELDS)
 
                 # Send new logs if any
                 logs, last_log_index = get_logs(workflow_id, last_log_index)
@@ -99,11 +103,19 @@ def workflow_stream(request, conversation_id, workflow_id):
                             'generation_data': message.generation_data,
                         }
                     except Message.DoesNotExist:
+                        checkpoint.refresh_from_db(fields=['checkpoint_data'])
                         result_data = checkpoint.checkpoint_data
 
                     yield format_sse('complete', result_data)
                     break
 
+                # Check for cancellation
+                if checkpoint.status == 'cancelled':
+                    yield format_sse('cancelled', {
+                        'workflow_id': workflow_id
+                    })
+                    break
+
                 # Check for failure
                 if checkpoint.status == 'failed':
                     yield format_sse('error', {
@@ -1,54 +1,34 @@
 """File upload views for PDB and FASTA files."""
 
+import hashlib
 import os
-import re
 import uuid
+from django.db import transaction
 from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import etag, require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
 
+from synde_graph.utils.fasta import iter_fasta
+from synde_graph.utils.pdb import scan_pdb
+from synde_graph.utils.streams import iter_lines, tee_to_file
+from synde_web.models import UploadedFile
+
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'.pdb', '.fasta', '.fa', '.faa', '.fas', '.txt'}
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
-
-
-def parse_fasta(content: str) -> dict:
-    """
-    Parse FASTA file content.
-
-    Returns:
-        Dict with sequences keyed by header
-    """
-    sequences = {}
-    current_header = None
-    current_seq = []
-
-    for line in content.strip().split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-
-        if line.startswith('>'):
-            # Save previous sequence
-            if current_header and current_seq:
-                sequences[current_header] = ''.join(current_seq)
-
-            # Start new sequence
-            current_header = line[1:].split()[0]  # First word after >
-            current_seq = []
-        else:
-            # Add to current sequence (remove non-amino acid chars)
-            clean_seq = re.sub(r'[^ACDEFGHIKLMNPQRSTVWY]', '', line.upper())
-            current_seq.append(clean_seq)
+MAX_FILE_SIZE = getattr(settings, 'SYNDE_MAX_UPLOAD_SIZE', 200 * 1024 * 1024)
 
-    # Save last sequence
-    if current_header and current_seq:
-        sequences[current_header] = ''.join(current_seq)
+# Large uploads are summarised rather than echoed back in full
+MAX_INLINE_PDB_SIZE = 5 * 1024 * 1024  # PDB content returned inline up to 5 MB
+MAX_PREVIEW_SEQUENCES = 100  # FASTA records returned in the upload response
+MAX_REPORTED_ERRORS = 100  # Per-record validation errors returned
 
-    return sequences
+# Uploads are content-addressed, so a file id always names the same bytes
+UPLOAD_CACHE_MAX_AGE = 24 * 3600
 
 
 def validate_sequence(sequence: str) -> tuple:
@@ -86,34 +66,109 @@ def validate_pdb(content: str) -> tuple:
     if not content:
         return False, "Empty file", {}
 
-    lines = content.strip().split('\n')
+    return _pdb_result(scan_pdb(content.splitlines()))
 
-    # Check for ATOM records
-    atom_count = sum(1 for line in lines if line.startswith('ATOM'))
-    if atom_count == 0:
+
+def _pdb_result(scan) -> tuple:
+    """Turn a PdbScan into (is_valid, error_message, metadata)."""
+    if scan.atom_count == 0:
         return False, "No ATOM records found in PDB file", {}
+    return True, None, scan.metadata()
 
-    # Extract metadata
-    metadata = {
-        'atom_count': atom_count,
-        'chains': set(),
-        'residues': set(),
-    }
 
-    for line in lines:
-        if line.startswith('ATOM') or line.startswith('HETATM'):
-            if len(line) >= 22:
-                chain = line[21]
-                metadata['chains'].add(chain)
-            if len(line) >= 26:
-                resnum = line[22:26].strip()
-                metadata['residues'].add(resnum)
+def _read_inline_pdb(file_path: str):
+    """Return PDB content for the JSON response, or None if the file is too large."""
+    if os.path.getsize(file_path) > MAX_INLINE_PDB_SIZE:
+        return None
+    with open(file_path, 'r') as f:
+        return f.read()
+
+
+def _discard(file_path: str):
+    """Remove a rejected upload."""
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+
+def _scan_fasta_records(records) -> dict:
+    """
+    Validate FASTA records as they stream past.
+
+    Keeps counts, a bounded preview of valid sequences and a bounded list
+    of per-record errors, so memory does not grow with the record count.
+    """
+    summary = {'record_count': 0, 'valid_count': 0, 'preview': {}, 'errors': []}
+
+    for header, seq in records:
+        summary['record_count'] += 1
+        is_valid, error = validate_sequence(seq)
+        if is_valid:
+            summary['valid_count'] += 1
+            if len(summary['preview']) < MAX_PREVIEW_SEQUENCES:
+                summary['preview'][header] = {
+                    'sequence': seq,
+                    'length': len(seq),
+                }
+        elif len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append(f'{header}: {error}')
+
+    return summary
+
+
+def _store_upload(tmp_path: str, digest: str, file_type: str, filename: str, size: int, summary: dict, user):
+    """
+    Move a validated upload to its content address and record ``user`` as an owner.
+
+    Each owner holds a reference to the file (released when the ownership
+    goes, e.g. with the account), so an upload is not cleaned up before it
+    is attached. The row is locked while the reference is taken, so a
+    concurrent cleanup cannot remove content that was just re-uploaded.
+
+    Returns:
+        (UploadedFile, created) - ``created`` is False when identical
+        content was already stored, in which case the new copy is dropped
+    """
+    with transaction.atomic():
+        upload, created = UploadedFile.objects.select_for_update().get_or_create(
+            digest=digest,
+            defaults={
+                'file_type': file_type,
+                'size': size,
+                'filename': filename,
+                'summary': summary,
+            }
+        )
+
+        if created or not os.path.exists(upload.path):
+            os.replace(tmp_path, upload.path)
+        else:
+            _discard(tmp_path)
+
+        if upload.owners.filter(pk=user.pk).exists():
+            UploadedFile.objects.filter(pk=upload.pk).update(last_used_at=timezone.now())
+        else:
+            upload.owners.add(user)
+            UploadedFile.acquire(digest)
+
+    return upload, created
 
-    metadata['chains'] = list(metadata['chains'])
-    metadata['residue_count'] = len(metadata['residues'])
-    del metadata['residues']
 
-    return True, None, metadata
+def _describe_upload(upload: UploadedFile) -> dict:
+    """JSON description of a stored upload, built from its parse summary."""
+    data = {
+        'file_id': upload.digest,
+        'file_type': upload.file_type,
+        'file_path': upload.path,
+    }
+    if upload.file_type == 'pdb':
+        data['pdb_content'] = _read_inline_pdb(upload.path)
+        data['metadata'] = upload.summary.get('metadata', {})
+    else:
+        data['sequences'] = upload.summary.get('sequences', {})
+        data['sequence_count'] = upload.summary.get('sequence_count', 0)
+    return data
 
 
 @csrf_exempt
@@ -123,12 +178,18 @@ def upload_file(request):
     """
     Handle file upload (PDB or FASTA).
 
+    The upload is decoded, validated, hashed and written to disk in a
+    single pass over its chunks, then stored under its SHA-256 digest.
+    Re-uploading identical content returns the existing file id.
+
     Returns JSON with:
-    - file_id: Unique identifier for the uploaded file
+    - file_id: SHA-256 digest of the file content
     - file_type: 'pdb' or 'fasta'
-    - sequences: Dict of parsed sequences (for FASTA)
-    - pdb_content: PDB file content (for PDB)
+    - sequences: Dict of parsed sequences (for FASTA; first 100 records)
+    - sequence_count: Number of valid sequences (for FASTA)
+    - pdb_content: PDB file content (for PDB; None above 5 MB)
     - metadata: Additional file metadata
+    - deduplicated: True if the content was already stored
     """
     if 'file' not in request.FILES:
         return JsonResponse({'error': 'No file provided'}, status=400)
@@ -150,112 +211,91 @@ def upload_file(request):
             'error': f'Invalid file type. Allowed: {", ".join(ALLOWED_EXTENSIONS)}'
         }, status=400)
 
-    # Read file content
+    file_type = 'pdb' if ext == '.pdb' else 'fasta'
+
+    upload_dir = os.path.join(settings.MEDIA_ROOT, 'uploads', file_type)
+    os.makedirs(upload_dir, exist_ok=True)
+    tmp_path = os.path.join(upload_dir, f'.incoming-{uuid.uuid4().hex}')
+
+    # Decode, parse, hash and save in one pass over the upload
+    sha256 = hashlib.sha256()
+    lines = iter_lines(tee_to_file(uploaded_file.chunks(), tmp_path, sha256))
+
     try:
-        content = uploaded_file.read().decode('utf-8')
+        if file_type == 'pdb':
+            result = _pdb_result(scan_pdb(lines))
+        else:
+            result = _scan_fasta_records(iter_fasta(lines, max_length=2000))
     except UnicodeDecodeError:
+        _discard(tmp_path)
         return JsonResponse({'error': 'Could not read file. Please ensure it is a text file.'}, status=400)
+    except ValueError as e:
+        _discard(tmp_path)
+        return JsonResponse({'error': f'Could not parse file: {e}'}, status=400)
 
-    # Generate unique file ID
-    file_id = str(uuid.uuid4())[:8]
-
-    # Process based on file type
-    if ext == '.pdb':
-        is_valid, error, metadata = validate_pdb(content)
+    # Validate based on file type
+    if file_type == 'pdb':
+        is_valid, error, metadata = result
         if not is_valid:
+            _discard(tmp_path)
             return JsonResponse({'error': error}, status=400)
-
-        # Save PDB file
-        upload_dir = os.path.join(settings.MEDIA_ROOT, 'uploads', 'pdb')
-        os.makedirs(upload_dir, exist_ok=True)
-        file_path = os.path.join(upload_dir, f'{file_id}.pdb')
-
-        with open(file_path, 'w') as f:
-            f.write(content)
-
-        return JsonResponse({
-            'file_id': file_id,
-            'file_type': 'pdb',
-            'file_path': file_path,
-            'pdb_content': content,
-            'metadata': metadata,
-            'filename': uploaded_file.name,
-        })
+        summary = {'metadata': metadata}
 
     else:  # FASTA
-        sequences = parse_fasta(content)
-
-        if not sequences:
+        if not result['record_count']:
+            _discard(tmp_path)
             return JsonResponse({'error': 'No valid sequences found in FASTA file'}, status=400)
 
-        # Validate sequences
-        validated_sequences = {}
-        errors = []
-
-        for header, seq in sequences.items():
-            is_valid, error = validate_sequence(seq)
-            if is_valid:
-                validated_sequences[header] = {
-                    'sequence': seq,
-                    'length': len(seq),
-                }
-            else:
-                errors.append(f'{header}: {error}')
-
-        if not validated_sequences:
+        if not result['valid_count']:
+            _discard(tmp_path)
             return JsonResponse({
                 'error': 'No valid sequences found',
-                'details': errors
+                'details': result['errors']
             }, status=400)
 
-        # Save FASTA file
-        upload_dir = os.path.join(settings.MEDIA_ROOT, 'uploads', 'fasta')
-        os.makedirs(upload_dir, exist_ok=True)
-        file_path = os.path.join(upload_dir, f'{file_id}.fasta')
+        summary = {
+            'sequences': result['preview'],
+            'sequence_count': result['valid_count'],
+            'warnings': result['errors'],
+        }
 
-        with open(file_path, 'w') as f:
-            f.write(content)
+    upload, created = _store_upload(
+        tmp_path, sha256.hexdigest(), file_type, uploaded_file.name, uploaded_file.size, summary,
+        request.user,
+    )
 
-        return JsonResponse({
-            'file_id': file_id,
-            'file_type': 'fasta',
-            'file_path': file_path,
-            'sequences': validated_sequences,
-            'sequence_count': len(validated_sequences),
-            'filename': uploaded_file.name,
-            'warnings': errors if errors else None,
-        })
+    data = _describe_upload(upload)
+    data['filename'] = uploaded_file.name
+    data['deduplicated'] = not created
+    if upload.file_type == 'fasta':
+        data['batch_eligible'] = data['sequence_count'] > 1
+        data['warnings'] = upload.summary.get('warnings') or None
+    return JsonResponse(data)
+
+
+def _upload_etag(request, file_id):
+    """ETag for an upload: its digest, if the requesting user uploaded it."""
+    if UploadedFile.owned(file_id, request.user) is not None:
+        return file_id
+    return None
 
 
 @login_required
 @require_http_methods(["GET"])
+@etag(_upload_etag)
 def get_uploaded_file(request, file_id):
-    """Get information about an uploaded file."""
-    # Check PDB files
-    pdb_path = os.path.join(settings.MEDIA_ROOT, 'uploads', 'pdb', f'{file_id}.pdb')
-    if os.path.exists(pdb_path):
-        with open(pdb_path, 'r') as f:
-            content = f.read()
-        is_valid, error, metadata = validate_pdb(content)
-        return JsonResponse({
-            'file_id': file_id,
-            'file_type': 'pdb',
-            'file_path': pdb_path,
-            'pdb_content': content,
-            'metadata': metadata,
-        })
-
-    # Check FASTA files
-    fasta_path = os.path.join(settings.MEDIA_ROOT, 'uploads', 'fasta', f'{file_id}.fasta')
-    if os.path.exists(fasta_path):
-        with open(fasta_path, 'r') as f:
-            content = f.read()
-        sequences = parse_fasta(content)
-        return JsonResponse({
-            'file_id': file_id,
-            'file_type': 'fasta',
-            'file_path': fasta_path,
-            'sequences': {h: {'sequence': s, 'length': len(s)} for h, s in sequences.items()},
-        })
+    """
+    Get information about an uploaded file.
+
+    Responses carry the content digest as ETag, so clients that already
+    hold the file get a 304 without the view touching the file. Ids are
+    content digests anyone can compute, so only the user's own uploads
+    are found; others get 404.
+    """
+    upload = UploadedFile.owned(file_id, request.user)
+    if upload is None or not os.path.exists(upload.path):
+        return JsonResponse({'error': 'File not found'}, status=404)
 
-    return JsonResponse({'error': 'File not found'}, status=404)
+    response = JsonResponse(_describe_upload(upload))
+    patch_cache_control(response, private=True, max_age=UPLOAD_CACHE_MAX_AGE)
+    return response
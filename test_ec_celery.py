@@ -3,6 +3,8 @@
 import os, time
 from celery import Celery, signature
 
+from synde_gpu.scheduling import queue_for
+
 celery_app = Celery("test",
     broker=os.environ.get('CELERY_BROKER_URL', 'redis://172.31.19.34:6379/0'),
     backend=os.environ.get('CELERY_RESULT_BACKEND', 'redis://172.31.19.34:6379/1'))
@@ -10,13 +12,16 @@ celery_app = Celery("test",
 sequence = "MKTVRQERLKSIVRILERSKEPVSGAQLAEYLGDGTRIGGLSLWRDVTRQLLGPKNTSEYLADVITLAEQVERILGTDEVFVNAGRGRTHGGYVGALNYQDSQLTPQQNKLFAFDM"
 print(f"Testing CLEAN EC via Celery (seq len: {len(sequence)})")
 
-result = signature("home.tasks.run_clean_ec_job", queue="gpu", app=celery_app).delay(sequence, "celery_test")
+result = signature("home.tasks.run_clean_ec_job", queue=queue_for("home.tasks.run_clean_ec_job"), app=celery_app).delay(sequence, "celery_test")
 print(f"Task ID: {result.id}")
 
+# Poll with exponential backoff (0.25 s doubling up to 5 s) instead of a fixed 5 s
 start = time.time()
+delay = 0.25
 while not result.ready() and time.time() - start < 120:
     print(f"  waiting... ({time.time()-start:.0f}s)")
-    time.sleep(5)
+    time.sleep(delay)
+    delay = min(delay * 2, 5)
 
 print(f"\nCompleted in {time.time()-start:.1f}s")
 print(f"State: {result.state}")
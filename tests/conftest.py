@@ -12,6 +12,12 @@ sys.path.insert(0, project_root)
 
 # Enable mock mode for testing
 os.environ["MOCK_GPU"] = "true"
+# Don't record or read GPU runtime history from the working tree
+os.environ["GPU_RUNTIME_STATS"] = "false"
+# Tests exercising the circuit breaker install their own
+os.environ["GPU_CIRCUIT_BREAKER"] = "false"
+# Tests exercising the structure registry install their own
+os.environ["STRUCTURE_CACHE"] = "false"
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -125,3 +131,103 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "integration: Integration tests (may use mocks)")
     config.addinivalue_line("markers", "slow: Slow tests (GPU, network calls)")
     config.addinivalue_line("markers", "requires_redis: Tests that need Redis")
+
+
+# =============================================================================
+# Django (web layer) fixtures
+# =============================================================================
+
+@pytest.fixture(scope="session")
+def django_db_setup():
+    """Configure Django against a throwaway test database."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "synde_web.settings")
+
+    import django
+    from django.test.runner import DiscoverRunner
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    django.setup()
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    yield
+    runner.teardown_databases(old_config)
+    teardown_test_environment()
+
+
+@pytest.fixture
+def db(django_db_setup):
+    """Run the test in a transaction that is rolled back afterwards."""
+    from django.db import transaction
+
+    atomic = transaction.atomic()
+    atomic.__enter__()
+    yield
+    transaction.set_rollback(True)
+    atomic.__exit__(None, None, None)
+
+
+@pytest.fixture
+def media_root(db, tmp_path):
+    """Point MEDIA_ROOT (uploads) at a temporary directory."""
+    from django.conf import settings
+
+    old = settings.MEDIA_ROOT
+    settings.MEDIA_ROOT = tmp_path
+    yield tmp_path
+    settings.MEDIA_ROOT = old
+
+
+@pytest.fixture
+def max_queries(db):
+    """
+    Assert that a block runs at most ``limit`` SQL queries.
+
+    Usage:
+        with max_queries(5):
+            client.get("/api/conversations/")
+    """
+    from contextlib import contextmanager
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    @contextmanager
+    def _max_queries(limit: int):
+        with CaptureQueriesContext(connection) as captured:
+            yield captured
+        executed = [q["sql"] for q in captured.captured_queries]
+        assert len(executed) <= limit, (
+            f"{len(executed)} queries executed, limit is {limit}:\n" + "\n".join(executed)
+        )
+
+    return _max_queries
+
+
+# =============================================================================
+# Redis fixtures
+# =============================================================================
+
+@pytest.fixture
+def redis_client():
+    """
+    Client for a scratch Redis database, flushed around each test.
+
+    Uses TEST_REDIS_URL (default redis://localhost:6379/15); tests are
+    skipped when no server is reachable.
+    """
+    import redis
+
+    client = redis.Redis.from_url(
+        os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15"),
+        decode_responses=True,
+        socket_connect_timeout=0.5,
+    )
+    try:
+        client.ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis is not reachable")
+
+    client.flushdb()
+    yield client
+    client.flushdb()
+    client.close()
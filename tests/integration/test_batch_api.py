@@ -0,0 +1,95 @@
+"""
+Integration tests for the batch screening API.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def batch_client(db, media_root):
+    """Logged-in client, a stored FASTA upload it owns and one owned by someone else."""
+    from django.test import Client
+    from synde_web.models import UploadedFile, User
+
+    user = User.objects.create_user(username="screener", email="screener@example.com", password="pw")
+    other = User.objects.create_user(username="other", email="other@example.com", password="pw")
+
+    def stored(digest, owner):
+        upload = UploadedFile.objects.create(digest=digest, file_type="fasta", ref_count=1)
+        upload.owners.add(owner)
+        path = media_root / "uploads" / "fasta" / f"{digest}.fasta"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(">a\nMKTVRQERLKSIVRILERSKEPVSGAQ\n>b\nMSDNLKQLAEEIGVSRQTVSKWLNDG\n")
+        return upload
+
+    client = Client()
+    client.force_login(user)
+    return client, user, stored("a" * 64, user), stored("b" * 64, other)
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """Capture batch tasks instead of queueing them, and admit every run."""
+    from synde_web.ratelimit import Admission
+    from synde_web.tasks import run_batch_screen
+
+    calls = []
+    monkeypatch.setattr(run_batch_screen, "delay", lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(
+        "synde_web.views.batch.get_rate_limiter",
+        lambda: type("Limiter", (), {"admit": lambda self, user: Admission(True)})(),
+    )
+    return calls
+
+
+def _start(client, file_id):
+    return client.post("/api/batch/", json.dumps({"file_id": file_id}), content_type="application/json")
+
+
+@pytest.mark.integration
+class TestStartBatch:
+    """File ids are resolved through the caller's uploads."""
+
+    def test_starts_on_own_upload(self, batch_client, started):
+        client, _, own, _ = batch_client
+        response = _start(client, own.digest)
+
+        assert response.status_code == 202
+        assert response.json()["total"] == 2
+        assert started[0]["fasta_path"] == own.path
+
+    @pytest.mark.parametrize("file_id", ["../../../etc/passwd", "A" * 64, "a" * 63, ["a" * 64]])
+    def test_rejects_malformed_ids(self, batch_client, started, file_id):
+        client, _, _, _ = batch_client
+        assert _start(client, file_id).status_code == 404
+        assert not started
+
+    def test_rejects_other_users_upload(self, batch_client, started):
+        client, _, _, foreign = batch_client
+        assert _start(client, foreign.digest).status_code == 404
+        assert not started
+
+
+@pytest.mark.integration
+class TestBatchResults:
+    """Result rows are stored one per record and fetched incrementally."""
+
+    def test_rows_since(self, batch_client, max_queries):
+        from synde_web.models import BatchScreen
+
+        client, user, own, _ = batch_client
+        batch = BatchScreen.objects.create(job_id="batch-1", user=user, file_id=own.digest, total=3)
+
+        for i, status in enumerate(["success", "failed", "success"]):
+            with max_queries(4):  # Savepoint, insert, counter update, release
+                batch.add_result({"record_id": f"r{i}", "status": status})
+
+        batch.refresh_from_db()
+        assert (batch.completed, batch.failed) == (3, 1)
+
+        data = client.get("/api/batch/batch-1/", {"since": 1}).json()
+        assert [row["record_id"] for row in data["results"]] == ["r1", "r2"]
+        assert data["next_index"] == 3
+        assert client.get("/api/batch/batch-1/", {"since": 3}).json()["results"] == []
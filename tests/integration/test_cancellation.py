@@ -0,0 +1,219 @@
+"""
+Integration tests for workflow cancellation.
+"""
+
+import pytest
+
+
+ESMFOLD = "home.tasks.run_esmfold_job"
+SEQUENCE = "MKTVRQERLKSIVRILERSKEPVSGAQ"
+SLOW_PROFILE = {
+    "time_scale": 1.0,
+    "gpu_slots": 1,
+    "models": {"esmfold": {"distribution": "constant", "value": 5.0}},
+}
+
+
+@pytest.fixture
+def tokens(redis_client):
+    """Cancel tokens in the scratch Redis, installed process-wide."""
+    from synde_graph.utils.cancellation import CancelTokens, set_cancel_tokens
+
+    tokens = CancelTokens(redis_client, ttl=60, prefix="test:cancel")
+    set_cancel_tokens(tokens)
+    yield tokens
+    set_cancel_tokens(None)
+
+
+@pytest.fixture
+def simulator(monkeypatch):
+    """Slow in-process GPU simulator as the task backend."""
+    from synde_gpu.simulator import GpuSimulator, reset_simulator
+
+    monkeypatch.setattr("synde_gpu.manager.is_mock_mode", lambda: False)
+    monkeypatch.setenv("GPU_BACKEND", "simulated")
+    sim = GpuSimulator(profile=SLOW_PROFILE, seed=0)
+    reset_simulator(sim)
+    yield sim
+    reset_simulator()
+
+
+@pytest.mark.requires_redis
+class TestCancelTokens:
+    """Tokens and tracked task ids in Redis."""
+
+    def test_cancel_is_idempotent(self, tokens, redis_client):
+        assert not tokens.is_cancelled("wf")
+        assert tokens.cancel("wf") is True
+        assert tokens.cancel("wf") is False
+        assert tokens.is_cancelled("wf")
+        assert 0 < redis_client.ttl("test:cancel:wf") <= 60
+
+    def test_track_and_clear(self, tokens):
+        tokens.track_task("wf", "task-2")
+        tokens.track_task("wf", "task-1")
+        tokens.cancel("wf")
+        assert tokens.tasks("wf") == ["task-1", "task-2"]
+
+        tokens.clear("wf")
+        assert tokens.tasks("wf") == []
+        assert not tokens.is_cancelled("wf")
+
+    def test_check_uses_current_job(self, tokens):
+        from synde_graph.utils.cancellation import WorkflowCancelled, check_cancelled
+        from synde_graph.utils.live_logger import set_current_job_id
+
+        tokens.cancel("wf")
+        set_current_job_id("wf")
+        try:
+            with pytest.raises(WorkflowCancelled):
+                check_cancelled()
+        finally:
+            set_current_job_id(None)
+        check_cancelled("other")  # Not cancelled: no error
+
+
+@pytest.mark.integration
+class TestCancellationCheck:
+    """The graph stops at the next node once cancelled."""
+
+    def test_cancelled_workflow_stops_before_next_node(self, monkeypatch):
+        from synde_graph.graph import run_workflow
+        from synde_graph.utils.cancellation import CancellationCheck, WorkflowCancelled
+        from synde_graph.utils.instrumentation import NodeTimer
+
+        started = []
+
+        def cancelled_after_first_node(job_id=None):
+            started.append(job_id)
+            return len(started) > 1
+
+        monkeypatch.setattr(
+            "synde_graph.utils.cancellation.is_cancelled", cancelled_after_first_node
+        )
+        timer = NodeTimer()
+
+        with pytest.raises(WorkflowCancelled):
+            run_workflow(
+                "Predict EC number for P00720",
+                job_id="wf-cancel",
+                callbacks=[timer, CancellationCheck("wf-cancel")],
+            )
+        assert started[0] == "wf-cancel"
+        # Only the first node ran
+        assert len(timer.durations) == 1
+
+
+@pytest.mark.integration
+class TestManagerCancellation:
+    """GpuTaskManager revokes its task when the workflow is cancelled."""
+
+    def test_running_task_is_revoked(self, simulator, monkeypatch):
+        from synde_gpu.manager import GpuTaskManager, TaskStatus
+
+        handles = []
+
+        def submit(job_id, sequence):
+            handles.append(simulator.submit(ESMFOLD, (job_id, sequence)))
+            return handles[-1]
+
+        # Cancelled once the task has been submitted
+        monkeypatch.setattr("synde_gpu.manager.is_cancelled", lambda job_id=None: bool(handles))
+
+        result = GpuTaskManager("ESMFold", timeout=30, poll_interval=0.05).execute_sync(
+            submit, ("wf", SEQUENCE)
+        )
+
+        assert result.status == TaskStatus.CANCELLED
+        assert result.task_id == handles[0].id
+        assert result.elapsed_seconds < 1
+        with pytest.raises(Exception):
+            handles[0].get(timeout=5)
+        assert handles[0].state == "REVOKED"
+
+    def test_cancelled_workflow_submits_nothing(self, simulator, monkeypatch):
+        import asyncio
+        from synde_gpu.manager import GpuTaskManager, TaskStatus
+
+        monkeypatch.setattr("synde_gpu.manager.is_cancelled", lambda job_id=None: True)
+        submitted = []
+
+        result = asyncio.run(GpuTaskManager("ESMFold").execute_async(
+            lambda *args: submitted.append(args), ("wf", SEQUENCE)
+        ))
+
+        assert result.status == TaskStatus.CANCELLED
+        assert submitted == []
+
+
+@pytest.fixture
+def workflow(db):
+    """Logged-in client and an active workflow with its assistant message."""
+    from django.test import Client
+    from synde_web.models import Conversation, Message, User, WorkflowCheckpoint
+
+    user = User.objects.create_user(username="quitter", email="quitter@example.com", password="pw")
+    conversation = Conversation.objects.create(user=user, title="Abandoned")
+    message = Message.objects.create(
+        conversation=conversation, role="assistant", content="",
+        workflow_id="wf-web", workflow_status="running",
+    )
+    checkpoint = WorkflowCheckpoint.objects.create(
+        job_id="wf-web", thread_id="wf-web", conversation=conversation,
+        message=message, user=user, checkpoint_data={}, status="active",
+    )
+
+    client = Client()
+    client.force_login(user)
+    return client, checkpoint, message
+
+
+@pytest.mark.integration
+class TestCancelEndpoint:
+    """POST /api/workflow/<id>/cancel/."""
+
+    URL = "/api/workflow/wf-web/cancel/"
+
+    @pytest.mark.requires_redis
+    def test_cancel_revokes_tasks_and_marks_rows(self, workflow, tokens, simulator, monkeypatch):
+        client, checkpoint, message = workflow
+        monkeypatch.setattr("synde_gpu.tasks.get_task_ledger", lambda: None)
+        handle = simulator.submit(ESMFOLD, ("wf-web", SEQUENCE))
+        tokens.track_task("wf-web", handle.id)
+
+        response = client.post(self.URL)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "workflow_id": "wf-web", "status": "cancelled", "revoked": [handle.id],
+        }
+        assert tokens.is_cancelled("wf-web")
+        with pytest.raises(Exception):
+            handle.get(timeout=5)
+        checkpoint.refresh_from_db()
+        message.refresh_from_db()
+        assert checkpoint.status == "cancelled"
+        assert message.workflow_status == "cancelled"
+
+    def test_finished_workflow_is_not_cancelled(self, workflow):
+        client, checkpoint, _ = workflow
+        checkpoint.mark_completed()
+
+        response = client.post(self.URL)
+
+        assert response.status_code == 409
+        assert response.json()["status"] == "completed"
+
+    def test_other_users_workflow_is_not_found(self, workflow):
+        from django.test import Client
+        from synde_web.models import User
+
+        _, checkpoint, _ = workflow
+        stranger = User.objects.create_user(username="stranger", email="s@example.com", password="pw")
+        client = Client()
+        client.force_login(stranger)
+
+        assert client.post(self.URL).status_code == 404
+        assert client.get(self.URL).status_code == 405
+        checkpoint.refresh_from_db()
+        assert checkpoint.status == "active"
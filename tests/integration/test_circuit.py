@@ -0,0 +1,206 @@
+"""
+Integration tests for GPU circuit breakers and their fallbacks.
+"""
+
+import time
+
+import pytest
+
+
+TEMBERTURE = "home.tasks.run_temperture_job"
+SEQUENCE = "MKTVRQERLKSIVRILERSKEPVSGAQ"
+
+
+@pytest.fixture
+def breaker(redis_client):
+    from synde_gpu.circuit import CircuitBreaker
+
+    return CircuitBreaker(
+        redis_client, failure_threshold=2, recovery_timeout=1, prefix="test:circuit"
+    )
+
+
+@pytest.fixture
+def guarded(breaker, redis_client, monkeypatch):
+    """GpuTaskManager using the test breaker and result cache, outside mock mode."""
+    from synde_gpu.circuit import ResultCache
+
+    cache = ResultCache(redis_client, ttl=60, prefix="test:results")
+    monkeypatch.setattr("synde_gpu.manager.is_mock_mode", lambda: False)
+    monkeypatch.setattr("synde_gpu.manager.get_circuit_breaker", lambda: breaker)
+    monkeypatch.setattr("synde_gpu.manager.get_result_cache", lambda: cache)
+    return breaker, cache
+
+
+def _simulator(value: float):
+    from synde_gpu.simulator import GpuSimulator
+
+    return GpuSimulator(profile={
+        "time_scale": 1.0,
+        "gpu_slots": 2,
+        "models": {"temberture": {"distribution": "constant", "value": value}},
+    }, seed=0)
+
+
+@pytest.mark.requires_redis
+class TestCircuitBreaker:
+    """Closed -> open -> half-open -> closed."""
+
+    def test_trips_after_consecutive_failures(self, breaker):
+        from synde_gpu.circuit import CLOSED, OPEN
+
+        assert breaker.allow("temberture")
+        assert breaker.record_failure("temberture") == 1
+        assert breaker.state("temberture") == CLOSED
+        assert breaker.record_failure("temberture") == 2
+        assert breaker.state("temberture") == OPEN
+        assert not breaker.allow("temberture")
+        # Other models are unaffected
+        assert breaker.allow("clean_ec")
+
+    def test_success_resets_the_count(self, breaker):
+        from synde_gpu.circuit import CLOSED
+
+        breaker.record_failure("temberture")
+        breaker.record_success("temberture")
+        breaker.record_failure("temberture")
+        assert breaker.state("temberture") == CLOSED
+
+    def test_half_open_lets_one_probe_through(self, breaker):
+        from synde_gpu.circuit import CLOSED, HALF_OPEN, OPEN
+
+        breaker.record_failure("temberture")
+        breaker.record_failure("temberture")
+        time.sleep(1.1)
+
+        assert breaker.state("temberture") == HALF_OPEN
+        assert breaker.allow("temberture")
+        assert not breaker.allow("temberture")  # Only one probe
+
+        # A failed probe re-opens the circuit, a successful one closes it
+        breaker.record_failure("temberture")
+        assert breaker.state("temberture") == OPEN
+        time.sleep(1.1)
+        assert breaker.allow("temberture")
+        breaker.record_success("temberture")
+        assert breaker.state("temberture") == CLOSED
+
+
+@pytest.mark.requires_redis
+class TestManagerFallback:
+    """GpuTaskManager fails fast and falls back while a circuit is open."""
+
+    def test_timeouts_open_the_circuit_and_calls_fail_fast(self, guarded):
+        from synde_gpu.manager import GpuTaskManager, TaskStatus
+
+        breaker, _ = guarded
+        sim = _simulator(value=5.0)
+        submitted = []
+
+        def submit(sequence):
+            submitted.append(sequence)
+            return sim.submit(TEMBERTURE, (sequence,))
+
+        manager = GpuTaskManager("TemBERTure", timeout=0.2, poll_interval=0.05)
+        assert manager.execute_sync(submit, ("A" * 10,)).status == TaskStatus.TIMEOUT
+        assert manager.execute_sync(submit, ("C" * 10,)).status == TaskStatus.TIMEOUT
+
+        start = time.time()
+        result = manager.execute_sync(submit, ("D" * 10,))
+        assert result.status == TaskStatus.UNAVAILABLE
+        assert time.time() - start < 0.1
+        assert len(submitted) == 2  # Never submitted while open
+        sim.shutdown()
+
+    def test_cached_result_is_served_while_open(self, guarded):
+        from synde_gpu.manager import GpuTaskManager, TaskStatus
+
+        breaker, _ = guarded
+        sim = _simulator(value=0.05)
+        manager = GpuTaskManager("TemBERTure", timeout=5, poll_interval=0.05)
+
+        def submit(sequence):
+            return sim.submit(TEMBERTURE, (sequence,))
+
+        fresh = manager.execute_sync(submit, (SEQUENCE,))
+        assert fresh.status == TaskStatus.SUCCESS and fresh.fallback is None
+
+        breaker.record_failure("temberture")
+        breaker.record_failure("temberture")
+
+        cached = manager.execute_sync(submit, (SEQUENCE,))
+        assert cached.status == TaskStatus.SUCCESS
+        assert cached.fallback == "cache"
+        assert cached.result == fresh.result
+        # No cached result for other inputs
+        assert manager.execute_sync(submit, ("MKV",)).status == TaskStatus.UNAVAILABLE
+        sim.shutdown()
+
+
+@pytest.mark.integration
+class TestDegradedNodes:
+    """Nodes skip unavailable models with a notice instead of failing."""
+
+    def test_temberture_skipped_with_notice(self, sample_state_with_protein, monkeypatch):
+        from synde_gpu.manager import GpuTaskResult, TaskStatus
+        from synde_graph.nodes import prediction
+
+        monkeypatch.setattr(
+            prediction.GpuTaskManager, "execute_sync",
+            lambda self, *args, **kwargs: GpuTaskResult(
+                status=TaskStatus.UNAVAILABLE, error="TemBERTure is temporarily unavailable"
+            ),
+        )
+
+        update = prediction.run_temberture_node(sample_state_with_protein)
+
+        assert "TemBERTure:</strong> Skipped" in update["response"]["response_html"]
+        assert "tm" not in update.get("predictions", {})
+        assert not update.get("errors")
+
+    def test_state_without_redis_is_unknown(self):
+        import redis
+        from redis.backoff import NoBackoff
+        from redis.retry import Retry
+        from synde_gpu.circuit import UNKNOWN, CircuitBreaker
+
+        client = redis.Redis(port=1, socket_connect_timeout=0.1, retry=Retry(NoBackoff(), 0),
+                             decode_responses=True)
+        breaker = CircuitBreaker(client, prefix="test:circuit")
+
+        assert breaker.state("esmfold") == UNKNOWN
+        assert breaker.allow("esmfold")
+        assert breaker.state("esmfold") == UNKNOWN  # Redis not retried yet
+
+    def test_fallback_modes(self):
+        from synde_gpu.circuit import fallback_mode
+
+        spec = "temberture=cache,clean_ec=skip,esmfold=bogus"
+        assert fallback_mode("temberture", spec) == "cache"
+        assert fallback_mode("clean_ec", spec) == "skip"
+        assert fallback_mode("esmfold", spec) == "skip"
+        assert fallback_mode("fpocket", spec) == "skip"
+
+
+@pytest.mark.integration
+class TestResultCacheKeys:
+    """Cached results are keyed by input content, not per-job arguments."""
+
+    def test_per_job_arguments_are_ignored(self, tmp_path):
+        from synde_gpu.circuit import content_inputs
+
+        first, second, mutant = tmp_path / "job-1.pdb", tmp_path / "job-2.pdb", tmp_path / "job-3.pdb"
+        first.write_text("ATOM      1  CA  MET A   1\n")
+        second.write_text("ATOM      1  CA  MET A   1\n")
+        mutant.write_text("ATOM      1  CA  VAL A   1\n")
+
+        def deepenzyme(path, smiles="CCO"):
+            return content_inputs("deepenzyme", (SEQUENCE, str(path), smiles))
+
+        assert deepenzyme(first) == deepenzyme(second)
+        assert deepenzyme(first) != deepenzyme(mutant)
+        assert deepenzyme(first) != deepenzyme(first, smiles="CCN")
+        assert deepenzyme(tmp_path / "missing.pdb") is None
+
+        assert content_inputs("esmfold", ("job-1", SEQUENCE)) == content_inputs("esmfold", ("job-2", SEQUENCE))
+        assert content_inputs("clean_ec", (SEQUENCE, "WT")) == content_inputs("clean_ec", (SEQUENCE, "M1"))
@@ -0,0 +1,67 @@
+"""
+Integration tests for batched checkpoint cleanup.
+"""
+
+from datetime import timedelta
+
+import pytest
+
+
+@pytest.fixture
+def checkpoints(db):
+    """23 old finished, 7 stale active, 4 recent checkpoints."""
+    from django.utils import timezone
+    from synde_web.models import WorkflowCheckpoint
+
+    def make(prefix, count, status, age):
+        objs = WorkflowCheckpoint.objects.bulk_create([
+            WorkflowCheckpoint(
+                job_id=f"{prefix}-{i}",
+                thread_id=f"{prefix}-{i}",
+                checkpoint_id=str(i),
+                checkpoint_data={"state": "x" * 100},
+                status=status,
+            )
+            for i in range(count)
+        ])
+        WorkflowCheckpoint.objects.filter(job_id__startswith=f"{prefix}-").update(
+            updated_at=timezone.now() - age
+        )
+        return objs
+
+    make("old", 23, "completed", timedelta(days=30))
+    make("stale", 7, "active", timedelta(hours=5))
+    make("recent", 4, "completed", timedelta(hours=1))
+    return WorkflowCheckpoint
+
+
+@pytest.mark.integration
+class TestCleanupExpiredCheckpoints:
+    """cleanup_expired_checkpoints deletes and expires in bounded batches."""
+
+    def test_batched_delete_and_expire(self, checkpoints):
+        from synde_web.tasks import cleanup_expired_checkpoints
+
+        stats = cleanup_expired_checkpoints(days=7, batch_size=5)
+
+        assert stats["deleted"]["deleted"] == 23
+        assert stats["deleted"]["batches"] == 5
+        assert stats["deleted"]["fast_path"] is True
+        assert stats["expired"]["updated"] == 7
+        assert stats["expired"]["batches"] == 2
+
+        assert not checkpoints.objects.filter(job_id__startswith="old-").exists()
+        assert checkpoints.objects.filter(status="expired").count() == 7
+        assert checkpoints.objects.filter(job_id__startswith="recent-").count() == 4
+
+    def test_batch_statements_bounded(self, checkpoints, max_queries):
+        """Query count scales with batches, not rows."""
+        from synde_web.cleanup import delete_in_batches
+
+        # Per batch: one boundary SELECT, one DELETE, savepoint + release
+        with max_queries(4 * 3 + 2):
+            stats = delete_in_batches(
+                checkpoints.objects.filter(status="completed", job_id__startswith="old-"),
+                batch_size=10,
+            )
+        assert stats["deleted"] == 23
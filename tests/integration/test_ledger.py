@@ -0,0 +1,171 @@
+"""
+Integration tests for the GPU task ledger and reattachment on retry.
+"""
+
+import pytest
+
+
+ESMFOLD = "home.tasks.run_esmfold_job"
+SEQUENCE = "MKTVRQERLKSIVRILERSKEPVSGAQ"
+FAST_PROFILE = {
+    "time_scale": 1.0,
+    "gpu_slots": 1,
+    "models": {"esmfold": {"distribution": "constant", "value": 0.05}},
+}
+
+
+@pytest.mark.requires_redis
+class TestGpuTaskLedger:
+    """Ledger entries keyed by workflow, model and inputs."""
+
+    @pytest.fixture
+    def ledger(self, redis_client):
+        from synde_gpu.ledger import GpuTaskLedger
+
+        return GpuTaskLedger(redis_client, ttl=60, prefix="test:ledger")
+
+    def test_record_and_lookup(self, ledger, redis_client):
+        from synde_gpu.ledger import STATUS_PENDING
+
+        args = ("job-1", SEQUENCE)
+        assert ledger.lookup("wf", ESMFOLD, args) is None
+
+        ledger.record("wf", ESMFOLD, args, "task-1")
+        ledger.record("wf", ESMFOLD, args, "task-1", status=STATUS_PENDING)
+
+        entry = ledger.lookup("wf", ESMFOLD, args)
+        assert entry["task_id"] == "task-1"
+        assert entry["model"] == "esmfold"
+        assert entry["status"] == STATUS_PENDING
+        # Different inputs or another workflow do not match
+        assert ledger.lookup("wf", ESMFOLD, ("job-1", SEQUENCE + "A")) is None
+        assert ledger.lookup("other", ESMFOLD, args) is None
+        assert 0 < redis_client.ttl("test:ledger:wf") <= 60
+
+    def test_entries_forget_and_clear(self, ledger):
+        ledger.record("wf", ESMFOLD, ("a", SEQUENCE), "task-1")
+        ledger.record("wf", "home.tasks.run_clean_ec_job", (SEQUENCE, "WT"), "task-2")
+        assert [e["task_id"] for e in ledger.entries("wf")] == ["task-1", "task-2"]
+
+        ledger.forget("wf", ESMFOLD, ("a", SEQUENCE))
+        assert [e["task_id"] for e in ledger.entries("wf")] == ["task-2"]
+
+        ledger.clear("wf")
+        assert ledger.entries("wf") == []
+
+    def test_lower_fence_does_not_overwrite(self, ledger):
+        from synde_gpu.ledger import STATUS_PENDING
+
+        args = ("a", SEQUENCE)
+        assert ledger.record("wf", ESMFOLD, args, "task-new", fence=8)["fence"] == 8
+        assert ledger.record("wf", ESMFOLD, args, "task-old", status=STATUS_PENDING, fence=7) is None
+        assert ledger.lookup("wf", ESMFOLD, args)["task_id"] == "task-new"
+
+        ledger.record("wf", ESMFOLD, args, "task-new", status=STATUS_PENDING, fence=8)
+        assert ledger.lookup("wf", ESMFOLD, args)["status"] == STATUS_PENDING
+
+
+@pytest.mark.requires_redis
+class TestReattach:
+    """A retried workflow reuses its earlier GPU submissions."""
+
+    @pytest.fixture
+    def simulated(self, redis_client, monkeypatch):
+        from synde_graph.utils.cancellation import CancelTokens, set_cancel_tokens
+        from synde_graph.utils.live_logger import set_current_job_id
+        from synde_gpu import tasks
+        from synde_gpu.ledger import GpuTaskLedger
+        from synde_gpu.locking import StateUpdateLock
+        from synde_gpu.simulator import GpuSimulator, reset_simulator
+
+        monkeypatch.setattr(tasks, "is_mock_mode", lambda: False)
+        monkeypatch.setenv("GPU_BACKEND", "simulated")
+        sim = GpuSimulator(profile=FAST_PROFILE, seed=0)
+        reset_simulator(sim)
+        ledger = GpuTaskLedger(redis_client, ttl=60, prefix="test:ledger")
+        monkeypatch.setattr(tasks, "get_task_ledger", lambda: ledger)
+        state_lock = StateUpdateLock(redis_client)
+        monkeypatch.setattr(tasks, "get_state_lock", lambda: state_lock)
+        set_cancel_tokens(CancelTokens(redis_client, ttl=60, prefix="test:cancel"))
+        set_current_job_id("wf-1")
+
+        yield sim, ledger
+        set_current_job_id(None)
+        set_cancel_tokens(None)
+        reset_simulator()
+
+    def test_retry_harvests_finished_task(self, simulated):
+        from synde_gpu.tasks import call_esmfold
+
+        sim, ledger = simulated
+        first = call_esmfold("wf-1", SEQUENCE)
+        first.get(timeout=5)
+
+        retried = call_esmfold("wf-1", SEQUENCE)
+        assert retried is first
+        assert sim.stats()["queued"] == 0
+        entry = ledger.lookup("wf-1", ESMFOLD, ("wf-1", SEQUENCE))
+        assert entry["task_id"] == first.id
+        assert entry["fence"] >= 1
+
+    def test_retry_reattaches_to_running_task(self, simulated):
+        from synde_gpu.tasks import call_esmfold
+
+        first = call_esmfold("wf-1", SEQUENCE)
+        retried = call_esmfold("wf-1", SEQUENCE)
+        assert retried.id == first.id
+        retried.get(timeout=5)
+
+    def test_failed_task_is_resubmitted(self, simulated):
+        from synde_gpu.tasks import call_esmfold
+
+        first = call_esmfold("wf-1", SEQUENCE)
+        first.revoke(terminate=True)
+        with pytest.raises(Exception):
+            first.get(timeout=5)
+
+        retried = call_esmfold("wf-1", SEQUENCE)
+        assert retried.id != first.id
+        assert retried.get(timeout=5)["status"] == "success"
+
+    def test_other_workflows_submit_their_own(self, simulated):
+        from synde_graph.utils.live_logger import set_current_job_id
+        from synde_gpu.tasks import call_esmfold
+
+        first = call_esmfold("wf-1", SEQUENCE)
+        set_current_job_id("wf-2")
+        second = call_esmfold("wf-1", SEQUENCE)
+        assert second.id != first.id
+
+    def test_concurrent_runs_submit_once(self, simulated):
+        import contextvars
+        from concurrent.futures import ThreadPoolExecutor
+        from synde_gpu.tasks import call_esmfold
+
+        with ThreadPoolExecutor(4) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, call_esmfold, "wf-1", SEQUENCE)
+                for _ in range(4)
+            ]
+            handles = [f.result() for f in futures]
+
+        assert len({h.id for h in handles}) == 1
+
+    def test_admission_runs_outside_the_lock(self, simulated, monkeypatch):
+        from synde_gpu import tasks
+        from synde_gpu.scheduling import AdmissionController
+
+        _, ledger = simulated
+        lock_name = ledger.lock_name("wf-1", ESMFOLD, ("wf-1", SEQUENCE))
+        held = []
+
+        class Recording(AdmissionController):
+            def admit(self, task_name, priority_class_name=None):
+                held.append(tasks.get_state_lock().lock.is_locked(lock_name))
+                return super().admit(task_name, priority_class_name)
+
+        monkeypatch.setattr(tasks, "get_admission_controller", lambda: Recording(budgets={"interactive": 0}))
+        handle = tasks.call_esmfold("wf-1", SEQUENCE)
+
+        assert held == [False]
+        assert ledger.lookup("wf-1", ESMFOLD, ("wf-1", SEQUENCE))["task_id"] == handle.id
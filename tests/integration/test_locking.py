@@ -0,0 +1,186 @@
+"""
+Integration tests for Redis-backed GPU slot and lock primitives.
+"""
+
+import threading
+import time
+
+import pytest
+
+
+def test_parse_mapping():
+    from synde_gpu.locking import parse_mapping
+
+    assert parse_mapping("card0=1, card1=2,") == {"card0": "1", "card1": "2"}
+    assert parse_mapping("") == {}
+
+
+@pytest.mark.requires_redis
+class TestGpuSemaphore:
+    """Counting semaphore semantics against a real Redis."""
+
+    @pytest.fixture
+    def semaphore(self, redis_client):
+        from synde_gpu.locking import GpuSemaphore
+
+        return GpuSemaphore(
+            redis_client,
+            capacities={"card0": 2, "card1": 1},
+            model_resources={"esmfold": "card0", "clean_ec": "card0", "fpocket": "card1"},
+            lease_ttl=30,
+        )
+
+    def test_capacity_per_resource(self, semaphore):
+        a = semaphore.acquire("card0", timeout=0)
+        b = semaphore.acquire("card0", timeout=0)
+        assert a and b
+        assert semaphore.acquire("card0", timeout=0) is None
+        # Other resources are independent
+        assert semaphore.acquire("card1", timeout=0)
+
+        semaphore.release(a)
+        assert semaphore.acquire("card0", timeout=0)
+
+    def test_models_share_a_card(self, semaphore):
+        from synde_gpu.locking import LockAcquisitionError
+
+        with semaphore.slot("esmfold"), semaphore.slot("clean_ec"):
+            with pytest.raises(LockAcquisitionError):
+                with semaphore.slot("esmfold", timeout=0):
+                    pass
+            with semaphore.slot("fpocket", timeout=0):
+                pass
+
+    def test_expired_lease_frees_slot(self, semaphore):
+        crashed = semaphore.acquire("card1", timeout=0, lease_ttl=1)
+        assert crashed
+        assert semaphore.acquire("card1", timeout=0) is None
+
+        time.sleep(1.1)
+        assert not semaphore.renew(crashed)
+        assert semaphore.acquire("card1", timeout=0)
+
+    def test_renew_keeps_slot(self, semaphore):
+        lease = semaphore.acquire("card1", timeout=0, lease_ttl=1)
+        time.sleep(0.6)
+        assert semaphore.renew(lease)
+        time.sleep(0.6)
+        assert semaphore.acquire("card1", timeout=0) is None
+
+    def test_waiters_served_in_arrival_order(self, semaphore):
+        held = semaphore.acquire("card1", timeout=0)
+        order = []
+
+        def wait(name):
+            lease = semaphore.acquire("card1", timeout=5, retry_interval=0.02)
+            order.append(name)
+            time.sleep(0.05)
+            semaphore.release(lease)
+
+        threads = []
+        for name in ["first", "second", "third"]:
+            t = threading.Thread(target=wait, args=(name,))
+            t.start()
+            threads.append(t)
+            time.sleep(0.1)  # Make arrival order unambiguous
+
+        semaphore.release(held)
+        for t in threads:
+            t.join()
+        assert order == ["first", "second", "third"]
+
+    def test_timed_out_waiter_leaves_queue(self, semaphore):
+        held = semaphore.acquire("card1", timeout=0)
+        assert semaphore.acquire("card1", timeout=0.1, retry_interval=0.02) is None
+        semaphore.release(held)
+        # The abandoned ticket does not block the next caller
+        assert semaphore.acquire("card1", timeout=0)
+
+    def test_utilization(self, semaphore):
+        semaphore.acquire("card0", timeout=0)
+        usage = semaphore.utilization()
+        assert usage["card0"] == {"used": 1, "capacity": 2, "waiting": 0, "utilization": 0.5}
+        assert usage["card1"]["used"] == 0
+
+        from synde_gpu.locking import GpuTaskLock
+
+        lock = GpuTaskLock(semaphore=semaphore)
+        assert lock.is_gpu_busy() == {"card0": 0.5, "card1": 0.0}
+
+
+@pytest.mark.requires_redis
+class TestDistributedLock:
+    """Notification-based lock acquisition and fencing."""
+
+    @pytest.fixture
+    def lock(self, redis_client):
+        from synde_gpu.locking import DistributedLock
+
+        return DistributedLock(redis_client, prefix="test:lock")
+
+    def test_exclusive_with_increasing_fence(self, lock):
+        first = lock.acquire("job", blocking=False)
+        assert first is not None
+        assert lock.acquire("job", blocking=False) is None
+        assert lock.check_fence("job", first.fence)
+
+        assert lock.release(first)
+        second = lock.acquire("job", blocking=False)
+        assert second.fence > first.fence
+        assert not lock.check_fence("job", first.fence)
+
+    def test_release_wakes_waiter_immediately(self, lock):
+        held = lock.acquire("job", timeout=30)
+        acquired = {}
+
+        def wait():
+            acquired["handle"] = lock.acquire("job", wait_timeout=5)
+            acquired["at"] = time.monotonic()
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.2)
+        released_at = time.monotonic()
+        lock.release(held)
+        waiter.join()
+
+        assert acquired["handle"] is not None
+        # Woken by the release, not by a polling interval
+        assert acquired["at"] - released_at < 0.2
+
+    def test_expired_holder_cannot_release(self, lock):
+        stale = lock.acquire("job", timeout=1)
+        time.sleep(1.1)
+        fresh = lock.acquire("job", blocking=False)
+        assert fresh is not None
+
+        assert not lock.release(stale)
+        assert lock.is_locked("job")
+        assert not lock.check_fence("job", stale.fence)
+
+    def test_waiter_gives_up(self, lock):
+        lock.acquire("job", timeout=30)
+        started = time.monotonic()
+        assert lock.acquire("job", wait_timeout=0.3) is None
+        assert time.monotonic() - started < 1.0
+
+    async def test_async_lock(self, redis_client):
+        import redis.asyncio as aioredis
+        from synde_gpu.locking import AsyncDistributedLock, DistributedLock, LockAcquisitionError
+
+        url = redis_client.connection_pool.connection_kwargs
+        client = aioredis.Redis(host=url.get("host", "localhost"), port=url.get("port", 6379),
+                                db=url.get("db", 0), decode_responses=True)
+        async_lock = AsyncDistributedLock(client, prefix="test:lock")
+        sync_lock = DistributedLock(redis_client, prefix="test:lock")
+
+        async with async_lock.locked("job") as handle:
+            assert handle.fence >= 1
+            # Sync and async holders exclude each other
+            assert sync_lock.acquire("job", blocking=False) is None
+            with pytest.raises(LockAcquisitionError):
+                async with async_lock.locked("job", timeout=1):
+                    pass
+
+        assert sync_lock.acquire("job", blocking=False) is not None
+        await client.aclose()
@@ -0,0 +1,130 @@
+"""
+Integration tests for the paginated, field-projected message API.
+"""
+
+import pytest
+
+
+PDB = "ATOM      1  CA  MET A   1      11.104  13.207   2.100  1.00 90.00           C\n" * 50
+
+
+@pytest.fixture
+def conversation_client(db):
+    """Logged-in client and a conversation with 25 messages."""
+    from django.test import Client
+    from django.utils import timezone
+    from synde_web.models import Conversation, Message, User
+
+    user = User.objects.create_user(username="pager", email="pager@example.com", password="pw")
+    conversation = Conversation.objects.create(user=user, title="Long design session")
+
+    # Several messages share a timestamp so the id tie-breaker matters
+    now = timezone.now()
+    for i in range(25):
+        message = Message.objects.create(
+            conversation=conversation,
+            role="assistant",
+            content=f"Message {i}",
+            structure_data={"pdb_data": PDB} if i % 5 == 0 else None,
+            generation_data={"validated_mutants": [{"mutations": ["A1V"]}]} if i == 24 else None,
+        )
+        Message.objects.filter(id=message.id).update(
+            created_at=now + timezone.timedelta(seconds=i // 3)
+        )
+
+    client = Client()
+    client.force_login(user)
+    return client, conversation
+
+
+def _walk(client, url, direction="after", start=None, **params):
+    """Follow cursors until exhausted, returning all message contents."""
+    contents = []
+    cursor_key = "next_cursor" if direction == "after" else "prev_cursor"
+    query = dict(params)
+    if start:
+        query.update(start)
+    while True:
+        data = client.get(url, query).json()
+        page = [m["content"] for m in data["messages"]]
+        contents = contents + page if direction == "after" else page + contents
+        cursor = data[cursor_key]
+        if not cursor:
+            return contents
+        query = dict(params, **{direction: cursor})
+
+
+@pytest.mark.integration
+class TestMessagePagination:
+    """Keyset pagination over (created_at, id)."""
+
+    def test_forward_walk_covers_every_message_once(self, conversation_client):
+        client, conversation = conversation_client
+        url = f"/api/conversations/{conversation.id}/messages/"
+        contents = _walk(client, url, limit=4)
+        assert contents == [f"Message {i}" for i in range(25)]
+
+    def test_backward_walk_from_latest(self, conversation_client):
+        client, conversation = conversation_client
+        url = f"/api/conversations/{conversation.id}/messages/"
+        contents = _walk(client, url, direction="before", start={"latest": "true"}, limit=7)
+        assert contents == [f"Message {i}" for i in range(25)]
+
+    def test_conversation_detail_embeds_newest_page(self, conversation_client):
+        client, conversation = conversation_client
+        data = client.get(f"/api/conversations/{conversation.id}/", {"limit": 5}).json()
+        assert [m["content"] for m in data["messages"]] == [f"Message {i}" for i in range(20, 25)]
+        assert data["prev_cursor"]
+        assert data["message_count"] == 25
+
+    def test_invalid_cursor_rejected(self, conversation_client):
+        client, conversation = conversation_client
+        response = client.get(f"/api/conversations/{conversation.id}/messages/", {"after": "!!"})
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestMessageProjection:
+    """Heavy JSON payloads are deferred unless requested."""
+
+    def test_default_fields_omit_payloads(self, conversation_client):
+        client, conversation = conversation_client
+        data = client.get(f"/api/conversations/{conversation.id}/messages/").json()
+        first = data["messages"][0]
+        assert "structure_data" not in first
+        assert first["has_structure"] is True
+        assert data["messages"][24]["has_mutants"] is True
+
+    def test_explicit_fields(self, conversation_client):
+        client, conversation = conversation_client
+        data = client.get(
+            f"/api/conversations/{conversation.id}/messages/", {"fields": "content,structure_data"}
+        ).json()
+        assert set(data["messages"][0]) == {"id", "content", "structure_data"}
+        assert data["messages"][0]["structure_data"]["pdb_data"] == PDB
+
+    def test_unknown_field_rejected(self, conversation_client):
+        client, conversation = conversation_client
+        response = client.get(f"/api/conversations/{conversation.id}/messages/", {"fields": "secret"})
+        assert response.status_code == 400
+
+    def test_payload_endpoint(self, conversation_client, max_queries):
+        client, conversation = conversation_client
+        message = conversation.messages.order_by("id").first()
+        url = f"/api/conversations/{conversation.id}/messages/{message.id}/payload/"
+
+        with max_queries(3):
+            data = client.get(url).json()
+        assert data["structure"]["pdb_data"] == PDB
+        assert data["mutants"] is None
+
+        assert client.get(url, {"parts": "bogus"}).status_code == 400
+
+    def test_listing_query_count_flat(self, conversation_client, max_queries):
+        """A page costs the same queries whether the payloads are loaded or not."""
+        client, conversation = conversation_client
+        url = f"/api/conversations/{conversation.id}/messages/"
+        with max_queries(4):
+            client.get(url, {"limit": 25})
+        with max_queries(4):
+            client.get(url, {"limit": 25, "fields": "all"})
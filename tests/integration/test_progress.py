@@ -0,0 +1,74 @@
+"""
+Integration tests for coalesced workflow progress writes.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def checkpoint(db):
+    from synde_web.models import WorkflowCheckpoint
+
+    return WorkflowCheckpoint.objects.create(
+        job_id="progress-job",
+        thread_id="progress-job",
+        checkpoint_id="progress-job",
+        checkpoint_data={"large": "x" * 10000},
+    )
+
+
+@pytest.mark.integration
+class TestCheckpointProgressSink:
+    """CheckpointProgressSink coalesces node updates."""
+
+    def test_coalesces_within_window(self, checkpoint, max_queries):
+        """A burst of node updates costs one immediate and one final write."""
+        from synde_web.progress import CheckpointProgressSink
+
+        sink = CheckpointProgressSink(checkpoint, min_interval=60)
+        with max_queries(2) as captured:
+            for node in ["intent_router", "input_parser", "run_esmfold", "run_fpocket"]:
+                sink.node_finished(node)
+            sink.close()
+
+        assert sink.writes == 2
+        # Only the progress columns are written, never checkpoint_data
+        assert all("checkpoint_data" not in q["sql"] for q in captured.captured_queries)
+
+        checkpoint.refresh_from_db()
+        assert checkpoint.current_node == "run_fpocket"
+        assert checkpoint.node_history == ["intent_router", "input_parser", "run_esmfold", "run_fpocket"]
+        assert checkpoint.status == "active"
+        assert checkpoint.checkpoint_data == {"large": "x" * 10000}
+
+    def test_writes_every_node_without_window(self, checkpoint):
+        from synde_web.progress import CheckpointProgressSink
+
+        sink = CheckpointProgressSink(checkpoint, min_interval=0)
+        sink.node_finished("intent_router")
+        sink.node_finished("input_parser")
+        sink.close()
+        assert sink.writes == 2
+
+    def test_flush_after_cancel_keeps_status(self, checkpoint):
+        """A trailing flush must not flip a cancelled workflow back to active."""
+        from synde_web.models import WorkflowCheckpoint
+        from synde_web.progress import CheckpointProgressSink
+
+        sink = CheckpointProgressSink(checkpoint, min_interval=60)
+        sink.node_finished("intent_router")
+        sink.node_finished("input_parser")
+
+        WorkflowCheckpoint.objects.get(pk=checkpoint.pk).mark_cancelled()
+        sink.close()
+
+        checkpoint.refresh_from_db()
+        assert checkpoint.status == "cancelled"
+        assert checkpoint.current_node == "intent_router"
+
+    def test_mark_completed_writes_final_state(self, checkpoint):
+        checkpoint.mark_completed(state={"current_node": "response_formatter", "node_history": ["a"]})
+        checkpoint.refresh_from_db()
+        assert checkpoint.status == "completed"
+        assert checkpoint.current_node == "response_formatter"
+        assert checkpoint.checkpoint_data["node_history"] == ["a"]
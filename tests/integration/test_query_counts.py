@@ -0,0 +1,101 @@
+"""
+Query-count regression tests for the listing endpoints.
+
+Each endpoint is exercised with a small and a large dataset; the number
+of SQL queries must stay under a fixed limit and must not grow with the
+number of rows (no N+1 queries).
+"""
+
+import pytest
+
+
+def _populate(user, conversations: int, messages_per_conversation: int = 3):
+    """Create projects, conversations and messages for ``user``."""
+    from synde_web.models import Conversation, Message, Project
+
+    projects = [
+        Project.objects.create(user=user, name=f"Project {i}")
+        for i in range(max(1, conversations // 5))
+    ]
+    for i in range(conversations):
+        conversation = Conversation.objects.create(
+            user=user,
+            title=f"Conversation {i}",
+            project=projects[i % len(projects)] if i % 2 else None,
+            is_pinned=(i % 7 == 0),
+        )
+        for j in range(messages_per_conversation):
+            Message.objects.create(
+                conversation=conversation,
+                role="user" if j % 2 == 0 else "assistant",
+                content=f"Message {j} of conversation {i}",
+            )
+    return Conversation.objects.filter(user=user).first()
+
+
+@pytest.fixture
+def make_client(db):
+    """Logged-in test client for a user with ``n`` conversations."""
+    from django.test import Client
+    from synde_web.models import User
+
+    def _make(n: int):
+        user = User.objects.create_user(
+            username=f"user{n}", email=f"user{n}@example.com", password="pw"
+        )
+        conversation = _populate(user, n)
+        client = Client()
+        client.force_login(user)
+        return client, conversation
+
+    return _make
+
+
+# Listing endpoints and their query budgets (session + user + the listing)
+LISTING_ENDPOINTS = [
+    ("/api/conversations/", 3),
+    ("/api/projects/", 3),
+    ("/", 6),
+]
+
+
+@pytest.mark.integration
+class TestListingQueryCounts:
+    """Listing endpoints run a fixed number of queries."""
+
+    @pytest.mark.parametrize("url,limit", LISTING_ENDPOINTS)
+    def test_listing_within_budget(self, make_client, max_queries, url, limit):
+        """Each listing stays within its budget with many rows."""
+        client, _ = make_client(40)
+        with max_queries(limit):
+            response = client.get(url)
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("url,limit", LISTING_ENDPOINTS)
+    def test_query_count_independent_of_rows(self, make_client, max_queries, url, limit):
+        """The same number of queries runs for 2 rows and for 40."""
+        small_client, _ = make_client(2)
+        large_client, _ = make_client(40)
+
+        with max_queries(limit) as small:
+            small_client.get(url)
+        with max_queries(limit) as large:
+            large_client.get(url)
+
+        assert len(small) == len(large)
+
+    def test_chat_view_within_budget(self, make_client, max_queries):
+        """The chat page adds only the conversation and its messages."""
+        client, conversation = make_client(40)
+        with max_queries(8):
+            response = client.get(f"/chat/{conversation.id}/")
+        assert response.status_code == 200
+
+    def test_conversation_listing_annotations(self, make_client):
+        """Counts and last-message previews come back from the annotated query."""
+        client, _ = make_client(5)
+        data = client.get("/api/conversations/").json()["conversations"]
+
+        assert len(data) == 5
+        assert all(c["message_count"] == 3 for c in data)
+        assert data[0]["last_message"]["content"].startswith("Message 2")
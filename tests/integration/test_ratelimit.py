@@ -0,0 +1,178 @@
+"""
+Integration tests for Redis-backed workflow admission control.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+def make_user(user_id=1, quota=1000, usage=0):
+    """Stand-in with the attributes the limiter reads from User."""
+    return SimpleNamespace(id=user_id, monthly_quota=quota, current_usage=usage)
+
+
+@pytest.mark.requires_redis
+class TestRateLimiter:
+    """Lua admission script semantics against a real Redis."""
+
+    @pytest.fixture
+    def limiter(self, redis_client):
+        from synde_web.ratelimit import RateLimiter
+
+        return RateLimiter(redis_client, burst=3, per_minute=60, max_concurrent=2)
+
+    def test_token_bucket_allows_burst_then_refuses(self, limiter):
+        user = make_user()
+        results = [limiter.admit(user) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.tokens_remaining for r in results[:3]] == [2, 1, 0]
+        assert results[3].reason == "rate"
+        # One token per second at 60/min
+        assert 0 < results[3].retry_after <= 1
+
+    def test_concurrency_slots(self, limiter):
+        user = make_user()
+        assert limiter.admit(user, slot_id="wf-1").allowed
+        assert limiter.admit(user, slot_id="wf-2").allowed
+
+        refused = limiter.admit(user, slot_id="wf-3")
+        assert not refused.allowed and refused.reason == "concurrency"
+        assert limiter.running(user.id) == 2
+
+        limiter.release(user.id, "wf-1")
+        assert limiter.admit(user, slot_id="wf-3").allowed
+
+    def test_refusals_consume_nothing(self, limiter):
+        user = make_user()
+        limiter.admit(user, slot_id="wf-1")
+        limiter.admit(user, slot_id="wf-2")
+        limiter.admit(user, slot_id="wf-3")  # Refused: concurrency
+
+        assert limiter.drain_pending_usage() == {user.id: 2}
+        # The refused attempt left a token in the bucket
+        assert limiter.admit(user).tokens_remaining == 0
+
+    def test_expired_slots_are_reclaimed(self, redis_client):
+        from synde_web.ratelimit import RateLimiter
+
+        limiter = RateLimiter(redis_client, burst=5, max_concurrent=1, slot_ttl=1)
+        user = make_user()
+        key = limiter._user_keys(user.id)[2]
+
+        assert limiter.admit(user, slot_id="crashed").allowed
+        redis_client.zadd(key, {"crashed": 0})  # Expired long ago
+        assert limiter.admit(user, slot_id="next").allowed
+
+    def test_quota_seeded_from_db_usage(self, limiter):
+        user = make_user(quota=5, usage=4)
+        assert limiter.admit(user).allowed
+
+        refused = limiter.admit(user)
+        assert not refused.allowed and refused.reason == "quota"
+
+    def test_users_are_independent(self, limiter):
+        for _ in range(3):
+            limiter.admit(make_user(1))
+        assert not limiter.admit(make_user(1)).allowed
+        assert limiter.admit(make_user(2)).allowed
+
+    def test_drain_and_restore(self, limiter):
+        limiter.admit(make_user(1))
+        limiter.admit(make_user(1))
+        limiter.admit(make_user(2))
+
+        usage = limiter.drain_pending_usage()
+        assert usage == {1: 2, 2: 1}
+        assert limiter.drain_pending_usage() == {}
+
+        limiter.restore_pending_usage(usage)
+        assert limiter.drain_pending_usage() == usage
+
+    def test_zero_rate_means_no_rate_limit(self, redis_client):
+        from synde_web.ratelimit import RateLimiter
+
+        limiter = RateLimiter(redis_client, burst=1, per_minute=0)
+        results = [limiter.admit(make_user()) for _ in range(5)]
+
+        assert all(r.allowed for r in results)
+        assert results[0].tokens_remaining is None
+        with pytest.raises(ValueError):
+            RateLimiter(redis_client, per_minute=-1)
+
+    def test_keys_share_the_user_slot(self, limiter, redis_client):
+        limiter.admit(make_user(7), slot_id="wf-1")
+
+        keys = set(redis_client.scan_iter(match=f"{limiter.prefix}:*"))
+        assert keys and all("{7}" in key for key in keys)
+
+    def test_quota_mirror_is_per_billing_period(self, limiter, redis_client):
+        from datetime import datetime, timezone
+        from synde_web.ratelimit import billing_period
+
+        limiter.admit(make_user(quota=5, usage=4))
+        assert not limiter.admit(make_user(quota=5, usage=4)).allowed
+
+        # Last month's counter does not carry over once the DB usage is reset
+        redis_client.rename(limiter._user_keys(1)[0], limiter._user_keys(1, "2000-01")[0])
+        assert limiter.admit(make_user(quota=5, usage=0)).allowed
+        assert 0 < redis_client.ttl(limiter._user_keys(1)[0]) <= limiter.quota_ttl
+        assert billing_period(datetime(2026, 12, 31, 23, 59, tzinfo=timezone.utc)) == "2026-12"
+
+
+@pytest.mark.integration
+class TestUsageFlush:
+    """Bulk flush of pending usage into User.current_usage."""
+
+    @pytest.fixture
+    def users(self, db):
+        from synde_web.models import User
+
+        return [
+            User.objects.create_user(username=f"quota-{i}", password="x", current_usage=10)
+            for i in range(4)
+        ]
+
+    def test_one_statement_per_distinct_count(self, users, max_queries):
+        from synde_web.ratelimit import flush_usage
+
+        class DrainedLimiter:
+            def drain_pending_usage(self):
+                return {users[0].id: 3, users[1].id: 3, users[2].id: 1}
+
+        with max_queries(4):  # SAVEPOINT + 2 UPDATEs + RELEASE
+            stats = flush_usage(DrainedLimiter())
+
+        assert stats == {"users": 3, "runs": 7, "statements": 2}
+        for user in users:
+            user.refresh_from_db()
+        assert [u.current_usage for u in users] == [13, 13, 11, 10]
+
+    def test_falls_back_to_db_without_redis(self, users):
+        import redis
+        from redis.backoff import NoBackoff
+        from redis.retry import Retry
+        from synde_web.ratelimit import RateLimiter
+
+        client = redis.Redis(port=1, socket_connect_timeout=0.1, retry=Retry(NoBackoff(), 0),
+                             decode_responses=True)
+        limiter = RateLimiter(client)
+
+        user = users[0]
+        user.monthly_quota = 11
+        user.save(update_fields=["monthly_quota"])
+        admission = limiter.admit(user)
+        assert admission.allowed and admission.fallback
+        user.refresh_from_db()
+        assert user.current_usage == 11
+
+        refused = limiter.admit(user)
+        assert not refused.allowed and refused.reason == "quota"
+
+    def test_refusal_response(self, db):
+        from synde_web.ratelimit import Admission, refusal_response
+
+        response = refusal_response(Admission(allowed=False, reason="rate", retry_after=2.2))
+        assert response.status_code == 429
+        assert response["Retry-After"] == "3"
@@ -0,0 +1,208 @@
+"""
+Integration tests for content-addressed uploads and their reference counts.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+import pytest
+
+
+FASTA = b">a\nMKTVRQERLKSIVRILERSKEPVSGAQ\n>b\nMSDNLKQLAEEIGVSRQTVSKWLNDG\n"
+DIGEST = hashlib.sha256(FASTA).hexdigest()
+
+
+def _client(username):
+    from django.test import Client
+    from synde_web.models import User
+
+    user = User.objects.create_user(username=username, email=f"{username}@example.com", password="pw")
+    client = Client()
+    client.force_login(user)
+    return client, user
+
+
+def _upload(client, content=FASTA, name="library.fasta"):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    return client.post("/api/upload/", {"file": SimpleUploadedFile(name, content)})
+
+
+def _refs(digest=DIGEST):
+    from synde_web.models import UploadedFile
+
+    return UploadedFile.objects.get(digest=digest).ref_count
+
+
+@pytest.fixture
+def uploader(media_root):
+    """Logged-in client and user that have uploaded FASTA."""
+    client, user = _client("uploader")
+    assert _upload(client).status_code == 200
+    return client, user
+
+
+@pytest.fixture
+def workflows(monkeypatch):
+    """Capture workflow tasks instead of queueing them, and admit every run."""
+    from synde_web.ratelimit import Admission
+    from synde_web.tasks import run_workflow
+
+    calls = []
+    limiter = type("Limiter", (), {
+        "admit": lambda self, user, slot_id=None: Admission(True),
+        "release": lambda self, user_id, slot_id: None,
+    })()
+    monkeypatch.setattr(run_workflow, "delay", lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setattr("synde_web.views.api.get_rate_limiter", lambda: limiter)
+    return calls
+
+
+def _send(client, user, file_id=DIGEST):
+    from synde_web.models import Conversation
+
+    conversation = Conversation.objects.create(user=user, title="Screen")
+    return client.post(
+        f"/api/conversations/{conversation.id}/messages/",
+        json.dumps({"content": "Predict Tm", "file_id": file_id, "file_type": "fasta"}),
+        content_type="application/json",
+    )
+
+
+@pytest.mark.integration
+class TestDeduplication:
+    """Identical content is stored once; each uploader holds one reference."""
+
+    def test_same_content_is_stored_once(self, uploader, media_root):
+        from synde_web.models import UploadedFile
+
+        client, _ = uploader
+        again = _upload(client, name="copy.fasta").json()
+        other_client, other = _client("second")
+        third = _upload(other_client).json()
+
+        assert again["file_id"] == third["file_id"] == DIGEST
+        assert again["deduplicated"] and third["deduplicated"]
+        assert UploadedFile.objects.count() == 1
+        assert [p.name for p in (media_root / "uploads" / "fasta").iterdir()] == [f"{DIGEST}.fasta"]
+        # One reference per owner, not per upload
+        assert _refs() == 2
+        assert UploadedFile.objects.get(digest=DIGEST).owners.count() == 2
+
+
+@pytest.mark.integration
+class TestConditionalGet:
+    """Upload details carry the digest as ETag."""
+
+    def test_etag_and_304(self, uploader):
+        client, _ = uploader
+        response = client.get(f"/api/upload/{DIGEST}/")
+
+        assert response.status_code == 200
+        assert response["ETag"] == f'"{DIGEST}"'
+        assert "max-age" in response["Cache-Control"]
+
+        cached = client.get(f"/api/upload/{DIGEST}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        assert cached.status_code == 304
+
+    def test_unknown_file(self, uploader):
+        client, _ = uploader
+        assert client.get(f"/api/upload/{'0' * 64}/").status_code == 404
+
+    def test_other_users_upload_is_not_found(self, uploader):
+        client, _ = uploader
+        etag = client.get(f"/api/upload/{DIGEST}/")["ETag"]
+        other_client, _ = _client("guesser")
+
+        # Knowing the content is not enough to confirm or read the upload
+        assert other_client.get(f"/api/upload/{DIGEST}/").status_code == 404
+        assert other_client.get(f"/api/upload/{DIGEST}/", HTTP_IF_NONE_MATCH=etag).status_code == 404
+
+
+@pytest.mark.integration
+class TestReferences:
+    """Messages and batches hold references; deleting them releases them."""
+
+    def test_message_takes_and_releases_a_reference(self, uploader, workflows):
+        from synde_web.models import Message
+
+        client, user = uploader
+        assert _send(client, user).status_code == 200
+        assert _refs() == 2
+
+        Message.objects.filter(role="user").delete()
+        assert _refs() == 1
+
+    def test_failed_message_creation_takes_no_reference(self, uploader, workflows, monkeypatch):
+        from synde_web.models import Message, WorkflowCheckpoint
+
+        client, user = uploader
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("database went away")
+
+        monkeypatch.setattr(WorkflowCheckpoint.objects, "create", broken)
+        with pytest.raises(RuntimeError):
+            _send(client, user)
+
+        assert _refs() == 1
+        assert not Message.objects.exists()
+        assert not workflows
+
+    def test_foreign_upload_cannot_be_attached(self, uploader, workflows):
+        other_client, other = _client("intruder")
+        assert _send(other_client, other).status_code == 404
+        assert _refs() == 1
+
+    def test_batch_reference_and_owner_account(self, uploader):
+        from synde_web.models import BatchScreen, UploadedFile
+
+        _, user = uploader
+        batch = BatchScreen.objects.create(job_id="batch-refs", user=user, file_id=DIGEST)
+        UploadedFile.acquire(DIGEST)
+        assert _refs() == 2
+
+        batch.delete()
+        assert _refs() == 1
+
+        # Deleting the account drops the owner's reference
+        user.delete()
+        assert _refs() == 0
+
+
+@pytest.mark.integration
+class TestCleanup:
+    """cleanup_unreferenced_uploads removes only stale, unreferenced files."""
+
+    def test_removes_stale_unreferenced(self, uploader, media_root):
+        from django.utils import timezone
+        from synde_web.models import UploadedFile
+        from synde_web.tasks import cleanup_unreferenced_uploads
+
+        client, user = uploader
+        other = b">x\nMSDNLKQLAEEIGVSRQTVSKWLNDGRIPLEH\n"
+        assert _upload(client, other, name="other.fasta").status_code == 200
+        other_digest = hashlib.sha256(other).hexdigest()
+
+        # Both files unused for two days; only the first loses its references
+        UploadedFile.objects.update(last_used_at=timezone.now() - timedelta(days=2))
+        UploadedFile.objects.get(digest=DIGEST).owners.remove(user)
+        UploadedFile.objects.filter(digest=DIGEST).update(last_used_at=timezone.now() - timedelta(days=2))
+
+        cleanup_unreferenced_uploads(hours=24)
+
+        assert list(UploadedFile.objects.values_list("digest", flat=True)) == [other_digest]
+        assert not (media_root / "uploads" / "fasta" / f"{DIGEST}.fasta").exists()
+        assert (media_root / "uploads" / "fasta" / f"{other_digest}.fasta").exists()
+
+    def test_keeps_recent_unreferenced(self, uploader):
+        from synde_web.models import UploadedFile
+        from synde_web.tasks import cleanup_unreferenced_uploads
+
+        _, user = uploader
+        UploadedFile.objects.get(digest=DIGEST).owners.remove(user)
+        assert _refs() == 0
+
+        cleanup_unreferenced_uploads(hours=24)
+        assert UploadedFile.objects.filter(digest=DIGEST).exists()
@@ -0,0 +1,104 @@
+"""
+Unit tests for multi-FASTA batch screening.
+"""
+
+import csv
+import io
+
+import pytest
+
+from synde_graph.batch import (
+    BATCH_COLUMNS,
+    iter_batch_screen,
+    results_to_csv,
+    run_batch_screen,
+    write_results,
+)
+from synde_graph.utils.fasta import parse_fasta
+
+
+SEQ_A = "MKTVRQERLKSIVRILERSKEPVSGAQLAEELSVSRQVIVQDIAYLRSLGYNIVATPRGYVLAGG"
+SEQ_B = "MSDNLKQLAEEIGVSRQTVSKWLNDGRIPLEHALKIAELLGVPVEELLKG"
+
+
+@pytest.mark.unit
+class TestParseFasta:
+    """Tests for the shared FASTA parser."""
+
+    def test_multi_record(self):
+        """Records keep file order, first header word and cleaned residues."""
+        content = f">seq1 first protein\n{SEQ_A[:30]}\n{SEQ_A[30:]}\n\n>seq2\n{SEQ_B.lower()}*\n"
+        records = parse_fasta(content)
+        assert list(records) == ["seq1", "seq2"]
+        assert records["seq1"] == SEQ_A
+        assert records["seq2"] == SEQ_B
+
+
+@pytest.mark.unit
+class TestBatchScreen:
+    """Tests for the batch screening runner in mock mode."""
+
+    def test_results_in_input_order(self):
+        """run_batch_screen returns one row per record, in input order."""
+        records = {"a": SEQ_A, "b": SEQ_B, "short": "MKT"}
+        results = run_batch_screen(records, properties=["ec_number", "tm"], concurrency=2)
+
+        assert [r.record_id for r in results] == ["a", "b", "short"]
+        assert results[0].status == "success"
+        assert results[0].ec_number is not None
+        assert results[0].tm is not None
+        assert results[2].status == "skipped"
+
+    def test_duplicate_sequences_screened_once(self):
+        """Identical sequences reuse the first record's result."""
+        seen = []
+        results = run_batch_screen(
+            {"first": SEQ_A, "copy": SEQ_A},
+            properties=["ec_number"],
+            on_result=seen.append,
+        )
+        first, copy = results
+        assert copy.duplicate_of == "first"
+        assert copy.ec_number == first.ec_number
+        assert len(seen) == 2
+
+    def test_streams_as_completed(self):
+        """iter_batch_screen yields rows incrementally."""
+        rows = iter_batch_screen({"a": SEQ_A, "b": SEQ_B}, concurrency=1)
+        first = next(rows)
+        assert first.record_id in ("a", "b")
+        assert len(list(rows)) == 1
+
+    def test_reads_records_lazily(self):
+        """Records are pulled from an iterator only as far as the pool needs."""
+        read = []
+
+        def records():
+            for i, residue in enumerate("ACDEFGHIKL"):
+                read.append(i)
+                yield f"r{i}", SEQ_A[:-1] + residue
+            yield "again", SEQ_A[:-1] + "A"
+
+        rows = iter_batch_screen(records(), concurrency=1)
+        next(rows)
+        assert len(read) <= 3
+
+        rest = list(rows)
+        assert len(rest) == 10
+        assert [r.duplicate_of for r in rest if r.record_id == "again"] == ["r0"]
+
+
+@pytest.mark.unit
+class TestBatchExport:
+    """Tests for result export."""
+
+    def test_csv_round_trip(self, tmp_path):
+        """CSV output has every column and one row per record."""
+        results = run_batch_screen({"a": SEQ_A, "b": SEQ_B})
+        rows = list(csv.DictReader(io.StringIO(results_to_csv(results))))
+        assert len(rows) == 2
+        assert list(rows[0]) == BATCH_COLUMNS
+
+        out = tmp_path / "results.csv"
+        write_results(results, str(out))
+        assert out.read_bytes().decode() == results_to_csv(results)
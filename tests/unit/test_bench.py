@@ -0,0 +1,92 @@
+"""
+Unit tests for the benchmark suite and node instrumentation.
+"""
+
+import pytest
+
+from synde_cli.bench import (
+    BENCH_CORPUS,
+    compare_to_baseline,
+    load_corpus,
+    percentile,
+    run_benchmark,
+)
+from synde_graph.graph import run_workflow
+from synde_graph.utils.instrumentation import NodeProgress, NodeTimer
+
+
+@pytest.mark.unit
+class TestNodeTimer:
+    """Tests for the NodeTimer callback handler."""
+
+    def test_records_nested_subgraph_nodes(self):
+        """Nodes inside subgraphs invoked by a node are timed too."""
+        timer = NodeTimer()
+        run_workflow("Explain how directed evolution works", callbacks=[timer])
+        run_workflow(BENCH_CORPUS[0]["query"], callbacks=[timer])
+
+        summary = timer.summary()
+        assert summary["intent_router"]["calls"] == 2
+        assert summary["theory_response"]["calls"] == 1
+        assert summary["prediction_subgraph"]["calls"] == 1
+        assert summary["run_esmfold"]["calls"] == 1
+        # Routing functions are not reported as nodes
+        assert "_route_with_error_check" not in summary
+
+
+@pytest.mark.unit
+class TestNodeProgress:
+    """Tests for the NodeProgress callback handler."""
+
+    def test_reports_each_finished_node_in_order(self):
+        """The sink sees every node, subgraph nodes before their parent."""
+        finished = []
+        run_workflow(BENCH_CORPUS[0]["query"], callbacks=[NodeProgress(finished.append)])
+
+        assert finished[0] == "intent_router"
+        assert finished[-1] == "response_formatter"
+        assert finished.index("run_esmfold") < finished.index("prediction_subgraph")
+
+
+@pytest.mark.unit
+class TestBenchStats:
+    """Tests for benchmark statistics and baseline comparison."""
+
+    def test_percentile(self):
+        """Nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+    def test_compare_flags_regressions(self):
+        """Latency increases and throughput drops beyond tolerance regress."""
+        baseline = {"summary": {"latency_s": {"p50": 1.0, "p95": 2.0, "p99": 3.0}, "throughput_wps": 10.0}}
+        report = {"summary": {"latency_s": {"p50": 1.1, "p95": 3.0, "p99": 3.0}, "throughput_wps": 7.0}}
+
+        rows = {row["metric"]: row for row in compare_to_baseline(report, baseline, tolerance=0.2)}
+        assert not rows["latency_p50"]["regression"]
+        assert rows["latency_p95"]["regression"]
+        assert rows["throughput_wps"]["regression"]
+
+    def test_load_corpus_filters_categories(self):
+        """Category filter keeps only matching entries."""
+        corpus = load_corpus(categories=["theory"])
+        assert corpus and all(entry["category"] == "theory" for entry in corpus)
+
+
+@pytest.mark.unit
+class TestRunBenchmark:
+    """Tests for the benchmark runner in mock mode."""
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_report_shape(self, use_async):
+        """A small run produces a complete report."""
+        corpus = load_corpus(categories=["theory", "fallback"])
+        report = run_benchmark(iterations=2, concurrency=2, use_async=use_async, corpus=corpus, warmup=False)
+
+        assert report["summary"]["workflows"] == 2 * len(corpus)
+        assert report["summary"]["errors"] == 0
+        assert report["summary"]["throughput_wps"] > 0
+        assert set(report["by_category"]) == {"theory", "fallback"}
+        assert report["nodes"]["response_formatter"]["calls"] == 2 * len(corpus)
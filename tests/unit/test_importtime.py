@@ -0,0 +1,75 @@
+"""
+Unit tests for lazy package exports and the cold-start import budgets.
+"""
+
+import pytest
+
+from synde_cli.importtime import IMPORT_BUDGETS, measure_import, parse_importtime
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       900 |       1020 | json
+import time:        15 |         15 |     synde_graph._lazy
+import time:       300 |        315 |   synde_graph
+import time:      2000 |       2315 | synde_graph.config
+"""
+
+
+@pytest.mark.unit
+class TestParseImporttime:
+    """-X importtime output parsing."""
+
+    def test_records(self):
+        records = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert [r.module for r in records] == [
+            "_json", "json", "synde_graph._lazy", "synde_graph", "synde_graph.config",
+        ]
+        assert [r.depth for r in records] == [1, 0, 2, 1, 0]
+        assert records[-1].self_us == 2000
+        assert records[-1].cumulative_us == 2315
+
+    def test_skips_other_lines(self):
+        output = "Traceback (most recent call last):\nimport time: bogus | line | x\n"
+        assert parse_importtime(output) == []
+
+
+@pytest.mark.unit
+class TestLazyExports:
+    """Package roots load their exports on first access."""
+
+    def test_exports_resolve(self):
+        import synde_gpu
+        from synde_gpu.tasks import call_esmfold
+
+        assert synde_gpu.call_esmfold is call_esmfold
+        assert "call_esmfold" in dir(synde_gpu)
+
+    def test_unknown_attribute(self):
+        import synde_graph
+
+        with pytest.raises(AttributeError):
+            synde_graph.not_an_export
+
+    def test_celery_app_is_created_once(self):
+        from synde_gpu import tasks
+
+        assert tasks.celery_app is tasks.get_celery_app()
+
+
+@pytest.mark.unit
+class TestImportBudgets:
+    """Cold-start import time of the CLI and worker entry points."""
+
+    @pytest.mark.parametrize("budget", IMPORT_BUDGETS, ids=lambda b: b.module)
+    def test_within_budget(self, budget):
+        report = measure_import(budget.module, runs=3)
+
+        assert report.loaded_packages(budget.forbidden) == []
+        assert report.cumulative_ms <= budget.max_ms, (
+            f"import {budget.module} took {report.cumulative_ms:.0f} ms "
+            f"(budget {budget.max_ms:.0f} ms); slowest: "
+            + ", ".join(f"{r.module} {r.self_us / 1000:.1f} ms" for r in report.slowest(5))
+        )
@@ -0,0 +1,102 @@
+"""
+Unit tests for per-residue pLDDT and confidence-masked mutation targeting.
+"""
+
+import numpy as np
+import pytest
+
+from synde_graph.utils.mutation_targets import candidate_positions, pocket_distances
+from synde_graph.utils.structure import decode_plddt, encode_plddt, residue_plddt_from_pdb
+
+
+# Ten residues 3.8 A apart on a line; the first two and the last are disordered
+PLDDT = [40.0, 45.0, 90.0, 91.0, 92.0, 93.0, 94.0, 95.0, 96.0, 30.0]
+SEQUENCE = "MKTVRQERLK"
+NAMES = ["MET", "LYS", "THR", "VAL", "ARG", "GLN", "GLU", "ARG", "LEU", "LYS"]
+
+
+def _pdb(plddt=PLDDT):
+    return "\n".join(
+        f"ATOM  {i + 1:5d}  CA  {name} A{i + 1:4d}    "
+        f"{3.8 * i:8.3f}{0.0:8.3f}{0.0:8.3f}  1.00{b:6.2f}           C"
+        for i, (name, b) in enumerate(zip(NAMES, plddt))
+    )
+
+
+@pytest.mark.unit
+class TestResiduePlddt:
+    """Compact per-residue pLDDT in state."""
+
+    def test_round_trip(self):
+        encoded = encode_plddt(np.array([0.4, 55.5, 99.6, 120.0]))
+        assert isinstance(encoded, str)
+        assert decode_plddt(encoded).tolist() == [0.0, 56.0, 100.0, 100.0]
+        assert decode_plddt(None) is None
+
+    def test_from_b_factors(self):
+        assert decode_plddt(residue_plddt_from_pdb(_pdb())).tolist() == PLDDT
+
+    def test_unit_scale_is_rescaled(self):
+        plddt = decode_plddt(residue_plddt_from_pdb(_pdb([b / 100 for b in PLDDT])))
+        assert plddt.tolist() == PLDDT
+
+    def test_without_structure(self):
+        assert residue_plddt_from_pdb(None) is None
+        assert residue_plddt_from_pdb("HEADER    EMPTY") is None
+
+    def test_esmfold_node_stores_it(self, sample_state_with_protein):
+        from synde_graph.nodes.prediction import run_esmfold_node
+
+        protein = run_esmfold_node(sample_state_with_protein)["protein"]
+        assert len(decode_plddt(protein["residue_plddt"])) == 2  # Residues in the mock PDB
+
+
+@pytest.mark.unit
+class TestCandidatePositions:
+    """Confident residues near pockets only."""
+
+    def test_confidence_mask(self):
+        positions = candidate_positions(SEQUENCE, residue_plddt_from_pdb(_pdb()))
+        assert positions == [2, 3, 4, 5, 6, 7, 8]
+
+    def test_pocket_proximity(self):
+        pdb = _pdb()
+        pocket = {"1": ["A:6"]}
+
+        assert pocket_distances(pdb, SEQUENCE, pocket)[5] == 0.0
+        # Within 8 A of residue 6: residues 4..8
+        positions = candidate_positions(
+            SEQUENCE, residue_plddt_from_pdb(pdb), pdb, pocket, pocket_radius=8.0
+        )
+        assert positions == [3, 4, 5, 6, 7]
+
+    def test_filters_only_apply_when_they_fit(self):
+        every = list(range(len(SEQUENCE)))
+        assert candidate_positions(SEQUENCE) == every
+        # pLDDT of another length, or a structure of another sequence
+        assert candidate_positions(SEQUENCE, encode_plddt(np.full(4, 90.0))) == every
+        assert candidate_positions("A" * 10, None, _pdb(), {"1": ["A:6"]}) == every
+        # A filter that would leave nothing is dropped
+        assert candidate_positions(SEQUENCE, encode_plddt(np.full(10, 20.0))) == every
+
+    def test_unknown_pocket_labels_are_ignored(self):
+        assert pocket_distances(_pdb(), SEQUENCE, {"1": ["B:6", "A:x", "A:99"]}) is None
+
+    def test_progen2_mutates_candidates_only(self, sample_state_with_protein):
+        from synde_graph.nodes.generation import run_progen2_node
+
+        state = sample_state_with_protein
+        state["protein"] = {
+            "sequence": SEQUENCE,
+            "sequence_length": len(SEQUENCE),
+            "pdb_data": _pdb(),
+            "residue_plddt": residue_plddt_from_pdb(_pdb()),
+        }
+        state["structure"] = {"pocket_residues": {1: ["A:6"]}}
+
+        session_data = run_progen2_node(state)["session_data"]
+
+        allowed = set(session_data["candidate_positions"])
+        assert allowed <= {2, 3, 4, 5, 6, 7, 8}
+        for mutant in session_data["progen2_mutants"]:
+            assert {int(m[1:-1]) - 1 for m in mutant["mutations"]} <= allowed
@@ -0,0 +1,122 @@
+"""
+Unit tests for the streaming FASTA/PDB parsers.
+"""
+
+import hashlib
+import io
+import tracemalloc
+
+import pytest
+
+from synde_graph.utils.fasta import iter_fasta, parse_fasta
+from synde_graph.utils.pdb import extract_sequence_from_pdb, scan_pdb
+from synde_graph.utils.streams import iter_chunks, iter_lines, tee_to_file
+
+
+PDB_LINES = [
+    "HEADER    TEST",
+    "MODEL        1",
+    "ATOM      1  N   MET A   1      11.104  13.207   2.100  1.00 90.00           N",
+    "ATOM      2  CA  MET A   1      12.560  13.207   2.100  1.00 90.00           C",
+    "ATOM      3  CA  LYS A   2      13.560  13.207   2.100  1.00 90.00           C",
+    "ATOM      4  CA  THR A  10      14.560  13.207   2.100  1.00 90.00           C",
+    "HETATM    5  O   HOH A 101      15.560  13.207   2.100  1.00 90.00           O",
+    "ENDMDL",
+]
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.unit
+class TestIterLines:
+    """Tests for chunked line decoding."""
+
+    def test_lines_across_chunk_boundaries(self):
+        """Lines and CRLF endings survive arbitrary chunk splits."""
+        data = b">a\r\nMKTV\r\nRQER\n>b\nLKSI"
+        for size in (1, 2, 3, 7, 64):
+            assert list(iter_lines(_chunks(data, size))) == [">a", "MKTV", "RQER", ">b", "LKSI"]
+
+    def test_multibyte_split_across_chunks(self):
+        """A UTF-8 character split between chunks decodes correctly."""
+        data = ">é protein\nMKT\n".encode("utf-8")
+        assert list(iter_lines(_chunks(data, 2)))[0] == ">é protein"
+
+    def test_overlong_line_rejected(self):
+        """A line longer than the limit raises instead of buffering."""
+        with pytest.raises(ValueError):
+            list(iter_lines([b"A" * 100], max_line_length=10))
+
+    def test_tee_writes_file(self, tmp_path):
+        """tee_to_file writes every chunk it passes through."""
+        out = tmp_path / "upload.fasta"
+        data = b">a\nMKTVRQERLK\n"
+        lines = list(iter_lines(tee_to_file(_chunks(data, 4), out)))
+        assert lines == [">a", "MKTVRQERLK"]
+        assert out.read_bytes() == data
+
+    def test_tee_digest(self, tmp_path):
+        """tee_to_file hashes the content it writes in the same pass."""
+        data = b">a\nMKTVRQERLK\n" * 100
+        sha256 = hashlib.sha256()
+        list(tee_to_file(_chunks(data, 7), tmp_path / "upload.fasta", sha256))
+        assert sha256.hexdigest() == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.unit
+class TestIterFasta:
+    """Tests for the record iterator."""
+
+    def test_matches_parse_fasta(self):
+        """iter_fasta over chunks agrees with parse_fasta on a string."""
+        content = "junk\n>seq1 desc\nMKTV\nRQER\n>\nIGNORED\n>seq2\nlksi*\n"
+        streamed = dict(iter_fasta(iter_lines(_chunks(content.encode(), 5))))
+        assert streamed == parse_fasta(content) == {"seq1": "MKTVRQER", "seq2": "LKSI"}
+
+    def test_max_length_stops_accumulating(self):
+        """Oversized records are truncated just past max_length."""
+        lines = [">big"] + ["A" * 60] * 1000
+        (_, seq), = iter_fasta(lines, max_length=100)
+        assert 100 < len(seq) <= 160
+
+    def test_memory_bounded_by_record(self):
+        """Streaming many records never holds more than one at a time."""
+        record = b">r\n" + b"MKTVRQERLK" * 50 + b"\n"
+        data = io.BytesIO(record * 5000)  # ~2.5 MB
+
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        count = sum(1 for _ in iter_fasta(iter_lines(iter_chunks(data, 64 * 1024))))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert count == 5000
+        assert peak < 1024 * 1024
+
+
+@pytest.mark.unit
+class TestScanPdb:
+    """Tests for the PDB scanner."""
+
+    def test_metadata(self):
+        """Counts atoms, chains, residues and models."""
+        scan = scan_pdb(PDB_LINES)
+        assert scan.metadata() == {
+            "atom_count": 4,
+            "chains": ["A"],
+            "residue_count": 4,
+            "model_count": 1,
+        }
+        assert scan.hetatm_count == 1
+
+    def test_sequence_from_ca(self):
+        """Sequence uses one CA per residue, ordered by residue number."""
+        assert extract_sequence_from_pdb("\n".join(PDB_LINES)) == "MKT"
+
+    def test_no_atoms(self):
+        """A file without coordinates has no sequence."""
+        scan = scan_pdb(["HEADER    EMPTY"])
+        assert scan.atom_count == 0
+        assert scan.sequence is None
@@ -0,0 +1,111 @@
+"""
+Unit tests for the pocket-proximity index.
+"""
+
+import numpy as np
+import pytest
+
+from synde_graph.utils.mutation_targets import mutant_pocket_distance
+from synde_graph.utils.pocket_index import PocketIndex, get_pocket_index, parse_pocket_residue
+from synde_graph.utils.structure import parse_structure
+
+
+SEQUENCE = "MKTVRQERLK"
+NAMES = ["MET", "LYS", "THR", "VAL", "ARG", "GLN", "GLU", "ARG", "LEU", "LYS"]
+
+
+def _pdb():
+    """Ten residues 3.8 A apart on a line."""
+    return "\n".join(
+        f"ATOM  {i + 1:5d}  CA  {name} A{i + 1:4d}    "
+        f"{3.8 * i:8.3f}{0.0:8.3f}{0.0:8.3f}  1.00 90.00           C"
+        for i, name in enumerate(NAMES)
+    )
+
+
+def _brute_within(coords, members, radius):
+    diff = coords[:, None, :] - coords[None, members, :]
+    return np.flatnonzero(np.sqrt((diff ** 2).sum(axis=2)).min(axis=1) <= radius).tolist()
+
+
+@pytest.mark.unit
+class TestPocketIndex:
+    """Grid queries against brute force."""
+
+    @pytest.fixture
+    def random_index(self):
+        rng = np.random.default_rng(0)
+        coords = rng.uniform(-30, 30, (500, 3)).astype(np.float32)
+        pockets = {1: np.arange(0, 12), 2: np.array([100, 250, 499])}
+        return coords, pockets, PocketIndex(coords, pockets)
+
+    @pytest.mark.parametrize("radius", [0.0, 4.0, 8.0, 13.5])
+    def test_within_matches_brute_force(self, random_index, radius):
+        coords, pockets, index = random_index
+        for pocket_id, members in pockets.items():
+            assert index.within(pocket_id, radius) == _brute_within(coords, members, radius)
+
+    def test_nearest_pocket_distance(self, random_index):
+        coords, pockets, index = random_index
+        members = np.concatenate(list(pockets.values()))
+        expected = np.linalg.norm(coords[:, None] - coords[None, members], axis=2).min(axis=1)
+        np.testing.assert_allclose(index.nearest_pocket_distances(), expected, atol=1e-4)
+        assert index.nearest_pocket_distance(100) == 0.0
+
+    def test_unknown_pocket(self, random_index):
+        assert random_index[2].within(7, 10.0) == []
+
+    def test_from_structure_resolves_labels(self):
+        index = PocketIndex.from_structure(parse_structure(_pdb()), {"1": ["A:6", "B:6", "A:x"], "2": ["A:99"]})
+        assert list(index.pockets) == [1]
+        assert index.within(1, 4.0) == [4, 5, 6]
+        assert index.nearest_pocket_distance(0) == pytest.approx(19.0)
+
+    def test_parse_pocket_residue(self):
+        assert parse_pocket_residue("A:45") == ("A", 45)
+        assert parse_pocket_residue("45") == ("", 45)
+        assert parse_pocket_residue("A:x") is None
+
+
+@pytest.mark.unit
+class TestPocketIndexCache:
+    """One build per structure and pocket set."""
+
+    def test_cached(self):
+        pdb = _pdb()
+        index = get_pocket_index(pdb, SEQUENCE, {1: ["A:6"]})
+        assert get_pocket_index(pdb, SEQUENCE, {1: ["A:6"]}) is index
+        assert get_pocket_index(pdb, SEQUENCE, {1: ["A:7"]}) is not index
+
+    def test_requires_matching_structure(self):
+        assert get_pocket_index(_pdb(), "A" * 10, {1: ["A:6"]}) is None
+        assert get_pocket_index(None, SEQUENCE, {1: ["A:6"]}) is None
+        assert get_pocket_index(_pdb(), SEQUENCE, {}) is None
+
+
+@pytest.mark.unit
+class TestRankingByPocketDistance:
+    """The ranking stage scores mutants by distance to the active site."""
+
+    def test_mutant_pocket_distance(self):
+        index = get_pocket_index(_pdb(), SEQUENCE, {1: ["A:6"]})
+        assert mutant_pocket_distance(index, ["M1A", "L9A"]) == pytest.approx(11.4)
+        assert mutant_pocket_distance(index, ["bad", "X99A"]) is None
+        assert mutant_pocket_distance(None, ["M1A"]) is None
+
+    def test_ties_go_to_closer_mutants(self, sample_state_with_protein):
+        from synde_graph.nodes.generation import sort_mutants_node
+
+        state = sample_state_with_protein
+        state["protein"] = {"sequence": SEQUENCE, "pdb_data": _pdb()}
+        state["structure"] = {"pocket_residues": {1: ["A:6"]}}
+        state["session_data"] = {"all_validated_mutants": [
+            {"mutations": ["M1A"], "stability_score": -1.0, "source": "progen2"},
+            {"mutations": ["R5A"], "stability_score": -1.0, "source": "progen2"},
+            {"mutations": ["K10A"], "stability_score": -2.0, "source": "progen2"},
+        ]}
+
+        ranked = sort_mutants_node(state)["mutant"]["validated_mutants"]
+
+        assert [m["mutations"] for m in ranked] == [["K10A"], ["R5A"], ["M1A"]]
+        assert ranked[1]["pocket_distance"] == pytest.approx(3.8)
@@ -0,0 +1,105 @@
+"""
+Unit tests for GPU polling strategies and detection-lag metrics.
+"""
+
+import random
+
+import pytest
+
+from synde_gpu.manager import GpuTaskManager, TaskStatus
+from synde_gpu.polling import (
+    EtaSchedule,
+    ExponentialBackoff,
+    FixedInterval,
+    detection_lag_summary,
+    record_detection_lag,
+    reset_detection_lag,
+    runtime_percentiles,
+)
+from synde_gpu.simulator import GpuSimulator
+
+
+ESMFOLD = "home.tasks.run_esmfold_job"
+SEQUENCE = "MKTVRQERLKSIVRILERSKEPVSGAQLAEELSVSRQVIVQDIAYLRSLGYNIVATPRGYVLAGG"
+
+
+@pytest.fixture(autouse=True)
+def _clean_lags():
+    reset_detection_lag()
+    yield
+    reset_detection_lag()
+
+
+@pytest.mark.unit
+class TestStrategies:
+    """Interval schedules."""
+
+    def test_fixed(self):
+        assert FixedInterval(2).next_interval(0) == FixedInterval(2).next_interval(100) == 2
+
+    def test_backoff_grows_to_cap(self):
+        backoff = ExponentialBackoff(initial=0.5, factor=2, max_interval=3, jitter=0)
+        assert [backoff.next_interval(0) for _ in range(5)] == [0.5, 1, 2, 3, 3]
+
+    def test_backoff_jitter_is_bounded(self):
+        backoff = ExponentialBackoff(initial=1, factor=1, jitter=0.2, rng=random.Random(0))
+        intervals = [backoff.next_interval(0) for _ in range(50)]
+        assert all(0.8 <= i <= 1.2 for i in intervals)
+        assert len(set(intervals)) > 1
+
+    def test_eta_schedule_phases(self):
+        eta = EtaSchedule(p10=10, p90=18, polls_in_window=4, min_interval=0.5, max_interval=30)
+        # Before p10: sleep straight to it
+        assert eta.next_interval(0) == 10
+        assert eta.next_interval(9.9) == 0.5  # Never below min_interval
+        # Inside the window: evenly spaced
+        assert eta.next_interval(10) == 2
+        assert eta.next_interval(17) == 1
+        # Overdue: back off from min_interval
+        overdue = [eta.next_interval(20) for _ in range(3)]
+        assert overdue[0] < overdue[1] < overdue[2]
+        assert overdue[0] == pytest.approx(0.5, rel=0.11)
+
+    def test_percentiles_scale_with_sequence_length(self):
+        short = runtime_percentiles("esmfold", seq_len=50)
+        long = runtime_percentiles("esmfold", seq_len=400)
+        assert short[0] < short[1]
+        assert long[0] - short[0] == pytest.approx(0.03 * 350)
+        assert runtime_percentiles("unknown_model") is None
+
+
+@pytest.mark.unit
+class TestDetectionLag:
+    """Completion detection lag recorded by the manager."""
+
+    def test_summary(self):
+        for lag in [0.1, 0.2, 0.3, 0.4]:
+            record_detection_lag("esmfold", lag)
+        summary = detection_lag_summary()["esmfold"]
+        assert summary["count"] == 4
+        assert summary["mean"] == pytest.approx(0.25)
+        assert summary["max"] == 0.4
+
+    def test_adaptive_polling_detects_sooner_than_fixed(self, monkeypatch):
+        monkeypatch.setattr("synde_gpu.manager.is_mock_mode", lambda: False)
+        sim = GpuSimulator(profile={
+            "time_scale": 1.0, "gpu_slots": 2,
+            "models": {"esmfold": {"distribution": "constant", "value": 0.3, "per_residue": 0}},
+        }, seed=0)
+        monkeypatch.setattr("synde_gpu.polling.is_simulated_mode", lambda: True)
+        monkeypatch.setattr("synde_gpu.polling.get_simulator", lambda: sim)
+
+        def submit(job_id, sequence):
+            return sim.submit(ESMFOLD, (job_id, sequence))
+
+        adaptive = GpuTaskManager("esmfold", timeout=10).execute_sync(submit, ("a", SEQUENCE))
+        fixed = GpuTaskManager("esmfold", timeout=10, poll_interval=1.0).execute_sync(
+            submit, ("b", SEQUENCE)
+        )
+
+        assert adaptive.status == fixed.status == TaskStatus.SUCCESS
+        # Fixed polling notices ~0.7 s late; the ETA schedule polls at 0.3 s
+        # and then every min_interval
+        assert adaptive.detection_lag < 0.5 * fixed.detection_lag
+        assert GpuTaskManager.detection_lag()["esmfold"]["count"] == 2
+        sim.shutdown()
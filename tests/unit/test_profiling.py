@@ -0,0 +1,106 @@
+"""
+Unit tests for per-node workflow profiling.
+"""
+
+import time
+from typing import TypedDict
+
+import pytest
+
+from synde_cli.profiling import NodeProfiler, profile_workflow
+
+
+_kept = []
+
+
+class _State(TypedDict, total=False):
+    value: int
+
+
+def _spin(seconds: float) -> int:
+    total, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def busy_node(state: _State) -> dict:
+    return {"value": _spin(0.3)}
+
+
+def allocating_node(state: _State) -> dict:
+    _kept.append(bytearray(2_000_000))
+    return {"value": 1}
+
+
+def _run(profiler: NodeProfiler):
+    from langgraph.graph import END, StateGraph
+
+    graph = StateGraph(_State)
+    graph.add_node("busy", busy_node)
+    graph.add_node("allocating", allocating_node)
+    graph.set_entry_point("busy")
+    graph.add_edge("busy", "allocating")
+    graph.add_edge("allocating", END)
+
+    profiler.start()
+    try:
+        graph.compile().invoke({"value": 0}, config={"callbacks": [profiler]})
+    finally:
+        profiler.stop()
+    return profiler.report("test", top=5)
+
+
+@pytest.mark.unit
+class TestNodeProfiler:
+    """Attribution of profile data to nodes."""
+
+    def test_sampling_attributes_samples_to_nodes(self):
+        report = _run(NodeProfiler("sampling", interval=0.001))
+        nodes = {node.node: node for node in report.nodes}
+
+        assert report.nodes[0].node == "busy"
+        assert nodes["busy"].calls == 1
+        assert nodes["busy"].profiled_s > 0.1
+        assert any("_spin" in stat.function for stat in nodes["busy"].functions)
+
+        for line in report.collapsed:
+            stack, count = line.rsplit(" ", 1)
+            assert stack.startswith("[") and int(count) > 0
+        assert any(line.startswith("[busy];") and "_spin (" in line for line in report.collapsed)
+
+    def test_cprofile_counts_calls(self):
+        report = _run(NodeProfiler("cprofile"))
+        busy = next(node for node in report.nodes if node.node == "busy")
+
+        spin = next(stat for stat in busy.functions if stat.function.startswith("_spin"))
+        assert spin.calls == 1
+        assert spin.total_s > 0.2
+        assert any(line.startswith("[busy];_spin (") for line in report.collapsed)
+
+    def test_memory_diff_per_node(self):
+        report = _run(NodeProfiler("cprofile", memory=True))
+        nodes = {node.node: node for node in report.nodes}
+
+        top = nodes["allocating"].allocations[0]
+        assert "test_profiling.py" in top.location
+        assert top.size_bytes >= 2_000_000
+        assert all(stat.size_bytes < 2_000_000 for stat in nodes["busy"].allocations)
+
+    def test_unknown_profiler(self):
+        with pytest.raises(ValueError):
+            NodeProfiler("perf")
+
+
+@pytest.mark.unit
+def test_profile_workflow_nests_subgraph_nodes(tmp_path):
+    report = profile_workflow(
+        "Predict EC number for this protein",
+        session_data={"last_protein_sequence": "MKTVRQERLKSIVRILERSKEPVSGAQLAEELSVSRQVIVQDIAYLRSLGYNIVATPRGYVLAGG"},
+    )
+    names = {node.node for node in report.nodes}
+
+    assert {"intent_router", "input_parser", "prediction_subgraph"} <= names
+    assert any(name.startswith("prediction_subgraph/") for name in names)
+    assert report.result.get("response")
+    assert report.write_collapsed(tmp_path / "run.folded").exists()
@@ -0,0 +1,163 @@
+"""
+Unit tests for the GPU runtime history and derived timeouts.
+"""
+
+import json
+
+import pytest
+
+from synde_gpu.manager import GpuTaskManager, TaskStatus, _RunClock
+from synde_gpu.runtime_stats import (
+    RuntimeStatsStore,
+    fit_runtime,
+    predict_runtime,
+    runtime_timeout,
+    set_runtime_stats,
+)
+
+
+SEQUENCE = "M" * 300
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RuntimeStatsStore(tmp_path / "runtime.db", min_samples=5)
+    # 4 s + 0.05 s per residue, with +/- 0.5 s noise
+    for i, seq_len in enumerate([50, 100, 150, 200, 250, 300, 350, 400] * 3):
+        store.record("esmfold", seq_len, 4 + 0.05 * seq_len + (0.5 if i % 2 else -0.5))
+    set_runtime_stats(store)
+    yield store
+    set_runtime_stats(None)
+
+
+@pytest.mark.unit
+class TestRuntimeModel:
+    """Length-aware latency fit and predictions."""
+
+    def test_fit_recovers_linear_model(self):
+        fit = fit_runtime("esmfold", [(100, 9.0), (200, 14.0), (300, 19.0)])
+        assert fit.intercept == pytest.approx(4.0)
+        assert fit.slope == pytest.approx(0.05)
+        assert fit.predict(400) == pytest.approx(24.0)
+
+    def test_single_length_uses_mean(self):
+        fit = fit_runtime("clean_ec", [(100, 4.0), (100, 6.0)])
+        assert fit.slope == 0
+        assert fit.predict(1000) == pytest.approx(5.0)
+
+    def test_predict_is_length_aware(self, store):
+        short = store.predict("esmfold", 50)
+        long = store.predict("esmfold", 400)
+        assert short.expected == pytest.approx(6.5, abs=0.3)
+        assert long.expected == pytest.approx(24.0, abs=0.3)
+        assert long.p10 < long.expected < long.p90
+        assert predict_runtime("esmfold", 400) == pytest.approx(long.expected)
+
+    def test_no_prediction_without_history(self, store):
+        assert store.predict("clean_ec", 100) is None
+        assert predict_runtime("clean_ec", 100) is None
+        assert runtime_timeout("clean_ec", 100, default=180) == 180
+
+    def test_old_samples_are_pruned(self, tmp_path):
+        store = RuntimeStatsStore(tmp_path / "runtime.db", max_samples=10)
+        for i in range(25):
+            store.record("fpocket", 0, float(i))
+        assert sorted(e for _, e in store.samples("fpocket")) == [float(i) for i in range(15, 25)]
+
+    def test_report_buckets(self, store):
+        rows = {row["bucket"]: row for row in store.report() if row["model"] == "esmfold"}
+        assert set(rows) == {"0-99", "100-199", "200-299", "300-399", "400-499"}
+        assert rows["0-99"]["count"] == 3
+        assert rows["400-499"]["max"] == pytest.approx(24.5)
+
+
+@pytest.mark.unit
+class TestDerivedTimeouts:
+    """Timeouts scale with the predicted runtime of each request."""
+
+    def test_timeout_scales_with_length(self, store, monkeypatch):
+        monkeypatch.setattr("synde_graph.config.RuntimeStatsSettings.TIMEOUT_MIN", 10)
+        short = runtime_timeout("esmfold", 50, default=180)
+        long = runtime_timeout("esmfold", 400, default=180)
+        assert 10 <= short < long < 180
+
+    def test_manager_uses_history_unless_fixed(self, store):
+        manager = GpuTaskManager("ESMFold")
+        assert manager.timeout_for(("job", SEQUENCE)) == runtime_timeout("esmfold", 300, 180)
+        assert manager.estimate(("job", SEQUENCE)) == pytest.approx(19.0, abs=0.3)
+
+        assert GpuTaskManager("ESMFold", timeout=42).timeout_for(("job", SEQUENCE)) == 42
+        # Without history the per-model constant applies
+        assert GpuTaskManager("CLEAN_EC").timeout_for((SEQUENCE, "WT")) == 180
+
+    def test_timeout_counts_from_started(self):
+        clock = _RunClock(submitted=0.0, timeout=10, queue_wait=lambda: 25.0)
+        clock.observe("PENDING", 8.0)
+        assert clock.expired(12.0) is None  # Queued: allowed the estimated wait
+        assert clock.expired(36.0) == "Task timed out after 36s in the queue"
+
+        clock.observe("STARTED", 20.0)
+        assert clock.expired(29.0) is None
+        assert clock.expired(31.0) == "Task timed out after 10s"
+        clock.observe("SUCCESS", 31.0)
+        assert clock.runtime(31.0) == 11.0
+
+    def test_finished_between_polls_ran_since_last_queued_poll(self):
+        clock = _RunClock(submitted=0.0, timeout=10, queue_wait=lambda: 0.0)
+        clock.observe("PENDING", 40.0)
+        clock.observe("SUCCESS", 43.0)
+        assert clock.runtime(43.0) == 3.0
+
+    def test_queued_task_is_not_timed_out(self, monkeypatch):
+        from synde_gpu.simulator import GpuSimulator
+
+        monkeypatch.setattr("synde_gpu.manager.is_mock_mode", lambda: False)
+        sim = GpuSimulator(profile={
+            "time_scale": 1.0, "gpu_slots": 1,
+            "models": {"clean_ec": {"distribution": "constant", "value": 0.3}},
+        }, seed=0)
+        manager = GpuTaskManager("CLEAN_EC", timeout=0.45, poll_interval=0.02)
+
+        def submit(sequence):
+            return sim.submit("home.tasks.run_clean_ec_job", (sequence, "WT"))
+
+        blocker = submit("MKTV")
+        result = manager.execute_sync(submit, ("MAAA",))  # 0.3 s queued + 0.3 s running
+        sim.shutdown()
+
+        assert blocker.state == "SUCCESS"
+        assert result.status == TaskStatus.SUCCESS
+        assert result.elapsed_seconds > 0.45
+
+    def test_unwritable_store_does_not_fail_tasks(self, monkeypatch):
+        from synde_gpu import runtime_stats
+        from synde_gpu.simulator import GpuSimulator
+
+        def unwritable():
+            raise PermissionError("read-only file system")
+
+        monkeypatch.setattr(runtime_stats, "get_runtime_stats", unwritable)
+        monkeypatch.setattr("synde_gpu.manager.is_mock_mode", lambda: False)
+        sim = GpuSimulator(profile={
+            "time_scale": 1.0, "gpu_slots": 1,
+            "models": {"clean_ec": {"distribution": "constant", "value": 0.05}},
+        }, seed=0)
+        manager = GpuTaskManager("CLEAN_EC", poll_interval=0.02)
+
+        result = manager.execute_sync(
+            lambda sequence: sim.submit("home.tasks.run_clean_ec_job", (sequence, "WT")), ("MAAA",)
+        )
+        sim.shutdown()
+
+        assert result.status == TaskStatus.SUCCESS
+        assert predict_runtime("clean_ec") is None
+
+    def test_report_command(self, store):
+        from typer.testing import CliRunner
+        from synde_cli.main import app
+
+        result = CliRunner().invoke(app, ["runtime-report", "--db", str(store.db_path), "--json"])
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.output)
+        assert report["fits"]["esmfold"]["slope"] == pytest.approx(0.05, abs=0.005)
+        assert len(report["buckets"]) == 5
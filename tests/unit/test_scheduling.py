@@ -0,0 +1,254 @@
+"""
+Unit tests for GPU queue routing, priorities and admission control.
+"""
+
+import threading
+import time
+
+import pytest
+
+from synde_graph.config import GpuScheduling
+from synde_gpu.manager import GpuTaskManager, TaskStatus
+from synde_gpu import scheduling
+from synde_gpu.scheduling import (
+    PRIORITIES,
+    PRIORITY_BACKGROUND,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    AdmissionController,
+    GpuAdmissionRejected,
+    get_priority_class,
+    priority_class,
+    queue_for,
+)
+from synde_gpu.simulator import GpuSimulator
+
+
+ESMFOLD = "home.tasks.run_esmfold_job"
+CLEAN_EC = "home.tasks.run_clean_ec_job"
+
+
+@pytest.fixture
+def per_model_queues(monkeypatch):
+    monkeypatch.setattr(GpuScheduling, "PER_MODEL_QUEUES", True)
+
+
+def controller(depth: int, runtime: float = 10.0, **kwargs):
+    """Controller over a fixed queue depth, recording its sleeps."""
+    sleeps = []
+    ctrl = AdmissionController(
+        budgets={PRIORITY_INTERACTIVE: 60, PRIORITY_BATCH: 300, PRIORITY_BACKGROUND: 0},
+        depth_fn=lambda queue, priority: depth,
+        runtime_fn=lambda task: runtime,
+        sleep=sleeps.append,
+        **kwargs,
+    )
+    return ctrl, sleeps
+
+
+@pytest.mark.unit
+class TestRoutingAndPriority:
+    """Per-model queues and caller priority classes."""
+
+    def test_shared_queue_by_default(self):
+        assert queue_for(ESMFOLD) == "gpu"
+        assert queue_for(CLEAN_EC) == "gpu"
+
+    def test_models_get_their_own_queue(self, per_model_queues):
+        assert queue_for(ESMFOLD) == "gpu.esmfold"
+        assert queue_for(CLEAN_EC) == "gpu.clean_ec"
+        assert queue_for("home.tasks.unknown") == "gpu"
+
+    def test_priority_class_context(self):
+        assert get_priority_class() == PRIORITY_INTERACTIVE
+        with priority_class(PRIORITY_BATCH):
+            assert get_priority_class() == PRIORITY_BATCH
+        assert get_priority_class() == PRIORITY_INTERACTIVE
+
+        with pytest.raises(ValueError):
+            with priority_class("urgent"):
+                pass
+
+    def test_interactive_runs_first(self):
+        assert PRIORITIES[PRIORITY_INTERACTIVE] < PRIORITIES[PRIORITY_BATCH] < PRIORITIES[PRIORITY_BACKGROUND]
+
+    def test_priorities_use_kombu_default_lists(self, monkeypatch):
+        # Workers started without transport options must read every class
+        assert set(PRIORITIES.values()) <= set(scheduling.PRIORITY_STEPS) == {0, 3, 6, 9}
+        keys = []
+
+        class Pipeline:
+            def llen(self, key):
+                keys.append(key)
+
+            def execute(self):
+                return [1] * len(keys)
+
+        class Broker:
+            def pipeline(self, transaction=True):
+                return Pipeline()
+
+        monkeypatch.setattr(scheduling, "is_simulated_mode", lambda: False)
+        monkeypatch.setattr(scheduling, "_broker", lambda: Broker())
+
+        assert scheduling.queue_depth("gpu", max_priority=6) == 3
+        assert keys == ["gpu", "gpu\x06\x163", "gpu\x06\x166"]
+
+
+@pytest.mark.unit
+class TestAdmissionController:
+    """Admit / defer / reject against latency budgets."""
+
+    def test_admits_within_budget(self, per_model_queues):
+        ctrl, _ = controller(depth=4)  # (4 + 1) x 10s = 50s <= 60s
+        decision = ctrl.admit(CLEAN_EC, PRIORITY_INTERACTIVE)
+        assert decision.action == "admit"
+        assert decision.queue == "gpu.clean_ec"
+        assert decision.priority == 0
+        assert decision.estimated_wait == 50
+
+    def test_rejects_interactive_over_budget(self):
+        ctrl, _ = controller(depth=6)
+        with pytest.raises(GpuAdmissionRejected, match="estimated wait 70s"):
+            ctrl.admit(ESMFOLD, PRIORITY_INTERACTIVE)
+
+    def test_more_workers_shorten_the_wait(self):
+        ctrl, _ = controller(depth=6, workers_per_queue=2)
+        assert ctrl.decide(ESMFOLD, PRIORITY_INTERACTIVE).action == "admit"
+
+    def test_defers_batch_until_queue_drains(self):
+        depths = iter([40, 40, 10])
+        sleeps = []
+        ctrl = AdmissionController(
+            budgets={PRIORITY_BATCH: 300},
+            depth_fn=lambda queue, priority: next(depths),
+            runtime_fn=lambda task: 10.0,
+            defer_poll=5,
+            sleep=sleeps.append,
+        )
+        decision = ctrl.admit(ESMFOLD, PRIORITY_BATCH)
+        assert decision.action == "admit"
+        assert decision.priority == PRIORITIES[PRIORITY_BATCH]
+        assert sleeps == [5, 5]
+
+    def test_deferral_is_bounded(self):
+        ctrl, sleeps = controller(depth=100, max_defer=12, defer_poll=5)
+        decision = ctrl.admit(ESMFOLD, PRIORITY_BATCH)
+        assert decision.action == "defer"  # Submitted anyway
+        assert sleeps == [5, 5, 2]
+
+    def test_zero_budget_skips_depth_lookup(self):
+        def depth_fn(queue, priority):
+            raise AssertionError("depth should not be read")
+
+        ctrl = AdmissionController(budgets={PRIORITY_BACKGROUND: 0}, depth_fn=depth_fn)
+        assert ctrl.admit(ESMFOLD, PRIORITY_BACKGROUND).action == "admit"
+
+    def test_unreadable_depth_admits(self):
+        def depth_fn(queue, priority):
+            raise ConnectionError("broker down")
+
+        ctrl = AdmissionController(budgets={PRIORITY_INTERACTIVE: 1}, depth_fn=depth_fn)
+        assert ctrl.admit(ESMFOLD).action == "admit"
+
+    def test_manager_reports_rejection(self, monkeypatch):
+        monkeypatch.setattr("synde_gpu.manager.is_mock_mode", lambda: False)
+
+        def submit():
+            raise GpuAdmissionRejected(ESMFOLD, 90, 60)
+
+        result = GpuTaskManager("ESMFold").execute_sync(submit)
+        assert result.status == TaskStatus.REJECTED
+        assert "busy" in result.error
+
+    def test_runtime_estimate_prefers_history(self, tmp_path, monkeypatch):
+        from synde_gpu.runtime_stats import RuntimeStatsStore, set_runtime_stats
+        from synde_gpu.simulator import DEFAULT_PROFILE
+
+        monkeypatch.delenv("GPU_BACKEND", raising=False)
+        store = RuntimeStatsStore(tmp_path / "runtime.db", min_samples=3)
+        for seq_len, elapsed in [(100, 20.0), (200, 30.0), (300, 40.0)]:
+            store.record("esmfold", seq_len, elapsed)
+        set_runtime_stats(store)
+        try:
+            assert scheduling.estimate_runtime(ESMFOLD) == pytest.approx(30.0)
+            # No history yet: the default profile's median
+            assert scheduling.estimate_runtime(CLEAN_EC) == DEFAULT_PROFILE["models"]["clean_ec"]["median"]
+        finally:
+            set_runtime_stats(None)
+
+    def test_deferral_does_not_block_the_event_loop(self, monkeypatch):
+        import asyncio
+
+        monkeypatch.setattr("synde_gpu.manager.is_mock_mode", lambda: False)
+
+        def deferred_submit():
+            time.sleep(0.3)  # Admission deferring in the task proxy
+            return {"status": "success"}
+
+        async def run():
+            ticks = [time.monotonic()]
+            done = asyncio.Event()
+
+            async def ticker():
+                while not done.is_set():
+                    await asyncio.sleep(0.01)
+                    ticks.append(time.monotonic())
+
+            tick_task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            result = await GpuTaskManager("ESMFold").execute_async(deferred_submit)
+            done.set()
+            await tick_task
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+        assert result.status == TaskStatus.SUCCESS
+        # The loop kept running while the submission waited
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.2
+
+
+@pytest.mark.unit
+class TestSimulatorPriorities:
+    """The simulator serves queued work in priority order."""
+
+    def test_priority_order_and_depth(self, per_model_queues):
+        sim = GpuSimulator(profile={
+            "time_scale": 1.0, "gpu_slots": 1,
+            "models": {
+                "esmfold": {"distribution": "constant", "value": 0.2},
+                "clean_ec": {"distribution": "constant", "value": 0.01},
+            },
+        }, seed=0)
+        finished = []
+        lock = threading.Lock()
+
+        blocker = sim.submit(ESMFOLD, ("job", "MKTV"))  # Occupies the only slot
+        for _ in range(100):
+            if blocker.state == "STARTED":
+                break
+            time.sleep(0.01)
+
+        handles = {
+            "batch": sim.submit(CLEAN_EC, ("MKTV", "b"), priority=6),
+            "background": sim.submit(CLEAN_EC, ("MKTV", "g"), priority=9),
+            "interactive": sim.submit(CLEAN_EC, ("MKTV", "i"), priority=0),
+        }
+
+        assert sim.queue_depth("gpu.clean_ec") == 3
+        assert sim.queue_depth("gpu.esmfold") == 0
+        assert sim.queue_depth("gpu.clean_ec", max_priority=0) == 1
+
+        def wait(name):
+            handles[name].get(timeout=5)
+            with lock:
+                finished.append((handles[name].date_done, name))
+
+        threads = [threading.Thread(target=wait, args=(name,)) for name in handles]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert [name for _, name in sorted(finished)] == ["interactive", "batch", "background"]
+        sim.shutdown()
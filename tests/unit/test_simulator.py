@@ -0,0 +1,152 @@
+"""
+Unit tests for the simulated GPU backend.
+"""
+
+import json
+import random
+
+import pytest
+
+from synde_gpu.manager import GpuTaskManager, TaskStatus
+from synde_gpu.simulator import (
+    GpuSimulator,
+    SimulatedAsyncResult,
+    load_profile,
+    merge_profile,
+    sample_latency,
+)
+
+
+ESMFOLD = "home.tasks.run_esmfold_job"
+SEQUENCE = "MKTVRQERLKSIVRILERSKEPVSGAQLAEELSVSRQVIVQDIAYLRSLGYNIVATPRGYVLAGG"
+
+FAST_PROFILE = {
+    "time_scale": 0.001,
+    "gpu_slots": 2,
+    "queue_capacity": 8,
+}
+
+
+@pytest.mark.unit
+class TestLatencySampling:
+    """Tests for latency distributions."""
+
+    def test_constant(self):
+        """Constant distribution returns its value plus the per-residue term."""
+        spec = {"distribution": "constant", "value": 2.0, "per_residue": 0.5}
+        assert sample_latency(spec, random.Random(0), seq_len=4) == 4.0
+
+    def test_same_seed_same_samples(self):
+        """Identical seeds draw identical latencies."""
+        spec = {"distribution": "lognormal", "median": 10.0, "sigma": 0.4}
+        a = [sample_latency(spec, random.Random(7)) for _ in range(5)]
+        b = [sample_latency(spec, random.Random(7)) for _ in range(5)]
+        assert a == b
+
+    def test_unknown_distribution(self):
+        """Unknown distributions are rejected."""
+        with pytest.raises(ValueError):
+            sample_latency({"distribution": "pareto"}, random.Random(0))
+
+
+@pytest.mark.unit
+class TestProfiles:
+    """Tests for profile loading and merging."""
+
+    def test_merge_keeps_defaults(self):
+        """Overriding one model field keeps the rest of the defaults."""
+        profile = merge_profile({"gpu_slots": 4, "models": {"esmfold": {"failure_rate": 0.5}}})
+        assert profile["gpu_slots"] == 4
+        assert profile["models"]["esmfold"]["failure_rate"] == 0.5
+        assert profile["models"]["esmfold"]["distribution"] == "lognormal"
+        assert "clean_ec" in profile["models"]
+
+    def test_load_json_profile(self, tmp_path):
+        """JSON profiles load without PyYAML."""
+        path = tmp_path / "profile.json"
+        path.write_text(json.dumps({"seed": 3, "queue_capacity": 2}))
+        profile = load_profile(str(path))
+        assert profile["seed"] == 3
+        assert profile["queue_capacity"] == 2
+
+
+@pytest.mark.unit
+class TestGpuSimulator:
+    """Tests for the in-process simulator."""
+
+    def test_deterministic_runs(self):
+        """Same seed and submission order produce the same ids and payloads."""
+        runs = []
+        for _ in range(2):
+            sim = GpuSimulator(profile=FAST_PROFILE, seed=11)
+            handles = [sim.submit(ESMFOLD, (f"job-{i}", SEQUENCE)) for i in range(3)]
+            runs.append([(h.id, h.get(timeout=5)["avg_plddt"]) for h in handles])
+            sim.shutdown()
+        assert runs[0] == runs[1]
+
+    def test_returns_async_result_lookalike(self):
+        """Handles expose the AsyncResult surface used by the manager."""
+        sim = GpuSimulator(profile=FAST_PROFILE, seed=1)
+        handle = sim.submit("home.tasks.run_temperture_job", (SEQUENCE,))
+        assert isinstance(handle, SimulatedAsyncResult)
+        handle.get(timeout=5)
+        assert handle.ready() and handle.successful()
+        assert handle.state == "SUCCESS"
+        sim.shutdown()
+
+    def test_queue_full_rejects(self):
+        """Submissions beyond queue_capacity fail immediately."""
+        profile = {**FAST_PROFILE, "gpu_slots": 1, "queue_capacity": 1,
+                   "models": {"esmfold": {"timeout_rate": 1.0}}}
+        sim = GpuSimulator(profile=profile, seed=0)
+        first = sim.submit(ESMFOLD, ("a", SEQUENCE))
+        second = sim.submit(ESMFOLD, ("b", SEQUENCE))
+        assert not first.ready()
+        assert second.ready() and second.state == "FAILURE"
+        assert "queue is full" in str(second.result)
+        first.revoke(terminate=True)
+        sim.shutdown()
+
+    def test_failure_injection(self):
+        """failure_rate=1 fails every task."""
+        profile = {**FAST_PROFILE, "models": {"clean_ec": {"failure_rate": 1.0}}}
+        sim = GpuSimulator(profile=profile, seed=0)
+        handle = sim.submit("home.tasks.run_clean_ec_job", (SEQUENCE, "WT"))
+        with pytest.raises(Exception, match="Injected failure"):
+            handle.get(timeout=5)
+        assert handle.state == "FAILURE"
+        sim.shutdown()
+
+    def test_get_result_by_task_id(self):
+        """Earlier submissions can be looked up by id for reattaching."""
+        sim = GpuSimulator(profile=FAST_PROFILE, seed=0)
+        handle = sim.submit(ESMFOLD, ("job", SEQUENCE))
+        assert sim.get_result(handle.id) is handle
+        assert sim.get_result("unknown") is None
+        sim.shutdown()
+
+    def test_unknown_task(self):
+        """Tasks outside SIMULATED_TASKS are rejected."""
+        sim = GpuSimulator(profile=FAST_PROFILE)
+        with pytest.raises(ValueError):
+            sim.submit("home.tasks.run_alphafold_job", ())
+
+    def test_manager_times_out_and_revokes(self, monkeypatch):
+        """A hung simulated task is cancelled by the manager's timeout."""
+        monkeypatch.setattr("synde_gpu.manager.is_mock_mode", lambda: False)
+        profile = {**FAST_PROFILE, "models": {"esmfold": {"timeout_rate": 1.0}}}
+        sim = GpuSimulator(profile=profile, seed=0)
+        handles = []
+
+        def submit(job_id, sequence):
+            handles.append(sim.submit(ESMFOLD, (job_id, sequence)))
+            return handles[-1]
+
+        manager = GpuTaskManager("esmfold", timeout=0.1, poll_interval=0.02)
+        result = manager.execute_sync(submit, args=("job", SEQUENCE))
+
+        assert result.status == TaskStatus.TIMEOUT
+        with pytest.raises(Exception, match="revoked"):
+            handles[0].get(timeout=1)
+        assert handles[0].state == "REVOKED"
+        sim.shutdown()
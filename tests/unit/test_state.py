@@ -151,6 +151,22 @@ class TestUpdateGpuTask:
         assert updates["active_gpu_tasks"][0]["status"] == "success"
         assert updates["active_gpu_tasks"][0]["result"]["pdb_path"] == "/test.pdb"
 
+    def test_stale_fence_is_dropped(self, sample_state):
+        """An update under an older lock fence cannot overwrite a newer one."""
+        sample_state["active_gpu_tasks"] = [{
+            "task_id": "task-123",
+            "task_name": "ESMFold",
+            "status": "success",
+            "fence": 7,
+        }]
+
+        stale = update_gpu_task(sample_state, "task-123", "ESMFold", "failure", fence=6)
+        assert stale == {}
+
+        fresh = update_gpu_task(sample_state, "task-123", "ESMFold", "revoked", fence=8)
+        assert fresh["active_gpu_tasks"][0]["status"] == "revoked"
+        assert fresh["active_gpu_tasks"][0]["fence"] == 8
+
 
 @pytest.mark.unit
 class TestMergeStateUpdates:
@@ -185,6 +201,15 @@ class TestMergeStateUpdates:
         assert merged["protein"]["sequence"] == "MKTVR"
         assert merged["protein"]["pdb_path"] == "/test.pdb"
 
+    def test_gpu_task_merge_respects_fence(self):
+        """Merging keeps the higher-fenced status of a task."""
+        newer = {"active_gpu_tasks": [{"task_id": "t1", "status": "success", "fence": 5}]}
+        stale = {"active_gpu_tasks": [{"task_id": "t1", "status": "failure", "fence": 4}]}
+
+        merged = merge_state_updates(newer, stale)
+
+        assert merged["active_gpu_tasks"] == newer["active_gpu_tasks"]
+
 
 @pytest.mark.unit
 class TestHelperFunctions:
@@ -0,0 +1,111 @@
+"""
+Unit tests for the NumPy-backed PDB structure parser.
+"""
+
+import numpy as np
+import pytest
+
+from synde_graph.utils.pdb import extract_sequence_from_pdb
+from synde_graph.utils.structure import clear_structure_cache, parse_structure
+
+
+def _atom(serial, name, res, chain, resnum, x, bfactor, record="ATOM  ", altloc=" "):
+    return (
+        f"{record}{serial:5d} {name:<4s}{altloc}{res} {chain}{resnum:4d}    "
+        f"{x:8.3f}{0.0:8.3f}{0.0:8.3f}  1.00{bfactor:6.2f}           {name[0]}"
+    )
+
+
+PDB = "\n".join([
+    "HEADER    TWO CHAINS",
+    "MODEL        1",
+    _atom(1, "N", "MET", "A", 1, 0.0, 90.0),
+    _atom(2, "CA", "MET", "A", 1, 1.0, 80.0),
+    _atom(3, "CA", "LYS", "A", 2, 4.8, 70.0),
+    _atom(4, "CA", "LYS", "A", 2, 9.9, 10.0, altloc="B"),
+    _atom(5, "CA", "VAL", "B", 1, -3.0, 50.0),
+    _atom(6, "CA", "THR", "A", 3, 8.6, 60.0),
+    _atom(7, "O", "HOH", "A", 101, 20.0, 30.0, record="HETATM"),
+    _atom(8, "CA", " CA", "A", 102, 25.0, 30.0, record="HETATM"),
+    "ENDMDL",
+    "MODEL        2",
+    _atom(1, "CA", "GLY", "A", 1, 0.0, 90.0),
+    "ENDMDL",
+])
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_structure_cache()
+    yield
+    clear_structure_cache()
+
+
+@pytest.mark.unit
+class TestParseStructure:
+    """Fixed-column parsing into arrays."""
+
+    def test_arrays(self):
+        structure = parse_structure(PDB)
+
+        assert structure.coords.dtype == np.float32
+        assert structure.coords.shape == (8, 3)
+        assert structure.coords[4].tolist() == [-3.0, 0.0, 0.0]
+        assert structure.b_factors[:3].tolist() == [90.0, 80.0, 70.0]
+        assert structure.residue_index.tolist() == [0, 0, 1, 1, 2, 3, 4, 5]
+        assert structure.hetatm.sum() == 2
+
+    def test_summary_first_model_only(self):
+        assert parse_structure(PDB).summary() == {
+            "atom_count": 6,
+            "chains": ["A", "B"],
+            "residue_count": 6,
+            "model_count": 2,
+        }
+
+    def test_sequence_by_chain(self):
+        structure = parse_structure(PDB)
+
+        # Chain order of appearance, then residue number; one CA per residue
+        assert structure.sequence() == "MKTV"
+        assert structure.sequence("A") == "MKT"
+        assert structure.sequence("B") == "V"
+        assert structure.sequence("Z") is None
+
+    def test_matches_line_scanner(self):
+        assert parse_structure(PDB).sequence() == extract_sequence_from_pdb(PDB)
+
+    def test_residue_plddt(self):
+        plddt = parse_structure(PDB).residue_plddt("A")
+        # Mean over each residue's atoms, including alternate locations
+        assert plddt.tolist() == pytest.approx([85.0, 40.0, 60.0])
+
+    def test_ca_distances(self):
+        distances = parse_structure(PDB).ca_distances("A")
+        assert distances.shape == (3, 3)
+        assert distances[0, 1] == pytest.approx(3.8)
+        assert distances[0, 2] == pytest.approx(7.6)
+        assert np.allclose(distances, distances.T)
+
+    def test_irregular_numbers_fall_back(self):
+        line = _atom(1, "CA", "ALA", "A", 1, 0.0, 0.0)
+        odd = line[:30] + "  1.5e+1" + line[38:60] + "      " + line[66:]
+
+        structure = parse_structure(odd)
+
+        assert structure.coords[0, 0] == pytest.approx(15.0)
+        assert structure.b_factors[0] == 0.0
+
+    def test_no_atoms(self):
+        structure = parse_structure("HEADER    EMPTY\nEND\n")
+        assert structure.sequence() is None
+        assert structure.residue_count == 0
+        assert len(structure.residue_plddt()) == 0
+
+    def test_cached_by_content(self):
+        first = parse_structure(PDB)
+
+        assert parse_structure(PDB) is first
+        assert parse_structure(PDB, cache=False) is not first
+        with pytest.raises(ValueError):
+            first.coords[0, 0] = 1.0  # Cached arrays are shared, hence read-only
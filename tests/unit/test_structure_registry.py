@@ -0,0 +1,173 @@
+"""
+Unit tests for the registry of predicted structures.
+"""
+
+import os
+
+import pytest
+
+from synde_graph.utils.structure_registry import (
+    StructureRegistry,
+    sequence_hash,
+    set_structure_registry,
+)
+
+
+SEQUENCE = "MKTVRQERLKSIVRILERSKEPVSGAQLAEYLGDGTRIGGLSLWRDVTRQLLGPKNTSEYLADVITLAEQVERILGTDEVFVNAGRGRTHGGYVGALNYQDSQLTPQQNKLFAFDM"
+PDB = "ATOM      1  N   MET A   1      11.104   6.134  -6.504  1.00 85.00           N\nEND\n"
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    from synde_graph.config import OutputPaths
+
+    monkeypatch.setattr(OutputPaths, "ESMFOLD", tmp_path / "ESMFold")
+    registry = StructureRegistry(tmp_path / "structures")
+    set_structure_registry(registry)
+    yield registry
+    set_structure_registry(None)
+
+
+@pytest.mark.unit
+class TestStructureRegistry:
+    """Lookup, registration and LRU eviction."""
+
+    def test_register_and_lookup(self, registry):
+        assert registry.lookup(SEQUENCE) is None
+
+        registry.register(SEQUENCE, pdb_data=PDB, avg_plddt=84.2)
+        record = registry.lookup(SEQUENCE.lower())
+
+        assert record.pdb_data == PDB
+        assert record.avg_plddt == 84.2
+        assert record.source == "esmfold"
+        assert record.pdb_path == str(registry.root / f"{sequence_hash(SEQUENCE)}.pdb")
+
+    def test_registers_from_pdb_file(self, registry, tmp_path):
+        pdb_path = tmp_path / "fold.pdb"
+        pdb_path.write_text(PDB)
+
+        assert registry.register("MKV" * 5, pdb_path=str(pdb_path)).pdb_data == PDB
+        assert registry.register("MKV" * 6, pdb_path="/missing/fold.pdb") is None
+
+    def test_deleted_file_is_forgotten(self, registry):
+        record = registry.register(SEQUENCE, pdb_data=PDB)
+        os.remove(record.pdb_path)
+
+        assert registry.lookup(SEQUENCE) is None
+        assert registry.stats()["structures"] == 0
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        registry = StructureRegistry(tmp_path / "structures", max_bytes=2 * len(PDB))
+        first = registry.register("A" * 20, pdb_data=PDB)
+        registry.register("C" * 20, pdb_data=PDB)
+        registry.lookup("A" * 20)  # Now C is the least recently used
+
+        registry.register("D" * 20, pdb_data=PDB)
+
+        assert registry.lookup("C" * 20) is None
+        assert registry.lookup("A" * 20) is not None
+        assert registry.lookup("D" * 20) is not None
+        assert os.path.exists(first.pdb_path)
+        assert registry.stats() == {"structures": 2, "bytes": 2 * len(PDB), "max_bytes": 2 * len(PDB)}
+
+    def test_copy_survives_eviction(self, tmp_path):
+        registry = StructureRegistry(tmp_path / "structures", max_bytes=len(PDB))
+        registry.register("A" * 20, pdb_data=PDB)
+
+        record = registry.lookup("A" * 20, copy_to=tmp_path / "job" / "wt.pdb")
+        registry.register("C" * 20, pdb_data=PDB)  # Evicts A
+
+        assert registry.lookup("A" * 20) is None
+        assert record.pdb_path == str(tmp_path / "job" / "wt.pdb")
+        assert open(record.pdb_path).read() == PDB
+
+    def test_namespaces_are_separate(self, registry):
+        registry.register(SEQUENCE, pdb_data=PDB, namespace="mock")
+
+        assert registry.lookup(SEQUENCE) is None
+        assert registry.lookup(SEQUENCE, namespace="mock").pdb_data == PDB
+
+    def test_oversized_structure_is_kept(self, tmp_path):
+        registry = StructureRegistry(tmp_path / "structures", max_bytes=1)
+        registry.register(SEQUENCE, pdb_data=PDB)
+        assert registry.lookup(SEQUENCE) is not None
+
+
+@pytest.mark.unit
+class TestStructureReuse:
+    """A warm registry never runs ESMFold for a repeated sequence."""
+
+    @pytest.fixture
+    def no_esmfold(self, monkeypatch):
+        from synde_gpu.manager import GpuTaskManager
+
+        def fail(self, *args, **kwargs):
+            raise AssertionError(f"{self.task_name} should not run")
+
+        monkeypatch.setattr(GpuTaskManager, "execute_sync", fail)
+
+    def test_esmfold_result_is_registered(self, registry, sample_state_with_protein):
+        from synde_graph.nodes.prediction import run_esmfold_node
+
+        update = run_esmfold_node(sample_state_with_protein)
+
+        # Mock structures are placeholders, kept apart from real predictions
+        assert registry.lookup(SEQUENCE) is None
+        record = registry.lookup(SEQUENCE, namespace="mock")
+        assert record.pdb_data == update["protein"]["pdb_data"]
+        assert record.avg_plddt == update["protein"]["avg_plddt"]
+
+    def test_mock_structure_is_not_served_to_real_runs(
+        self, registry, sample_state_with_protein, monkeypatch
+    ):
+        from synde_graph.nodes.prediction import check_structure_node, run_esmfold_node
+
+        run_esmfold_node(sample_state_with_protein)
+        monkeypatch.setattr("synde_gpu.mocks.is_mock_mode", lambda: False)
+
+        assert "protein" not in check_structure_node(sample_state_with_protein)
+
+    def test_check_structure_reuses_registered_structure(
+        self, registry, sample_state_with_protein, no_esmfold
+    ):
+        from synde_graph.nodes.prediction import check_structure_node
+        from synde_graph.routing.routes import route_structure_prediction
+
+        registry.register(SEQUENCE, pdb_data=PDB, avg_plddt=84.2, namespace="mock")
+
+        update = check_structure_node(sample_state_with_protein)
+        protein = update["protein"]
+
+        assert protein["pdb_data"] == PDB
+        # The job gets its own copy, not the registry's file
+        assert not protein["pdb_file_path"].startswith(str(registry.root))
+        assert protein["avg_plddt"] == 84.2
+        assert protein["structure_source"] == "esmfold"
+        assert route_structure_prediction({**sample_state_with_protein, **update}) == "run_fpocket"
+
+    def test_cold_registry_routes_to_esmfold(self, registry, sample_state_with_protein):
+        from synde_graph.nodes.prediction import check_structure_node
+        from synde_graph.routing.routes import route_structure_prediction
+
+        update = check_structure_node(sample_state_with_protein)
+
+        assert "protein" not in update
+        assert route_structure_prediction({**sample_state_with_protein, **update}) == "run_esmfold"
+
+    def test_generation_reuses_registered_structure(
+        self, registry, sample_state_with_protein, no_esmfold
+    ):
+        from synde_graph.nodes.generation import prepare_wt_metrics_node
+
+        registry.register(SEQUENCE, pdb_data=PDB, avg_plddt=84.2, namespace="mock")
+
+        update = prepare_wt_metrics_node(sample_state_with_protein)
+
+        assert update["protein"]["pdb_data"] == PDB
+        assert not update.get("errors")
+
+    def test_disabled_registry_is_skipped(self, sample_state_with_protein):
+        from synde_graph.nodes.prediction import check_structure_node
+
+        assert "protein" not in check_structure_node(sample_state_with_protein)
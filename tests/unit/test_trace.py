@@ -0,0 +1,150 @@
+"""
+Unit tests for workflow trace recording and replay.
+"""
+
+import time
+
+import pytest
+
+from synde_graph.utils.trace import (
+    KIND_GPU,
+    KIND_SMILES,
+    RecordedCallError,
+    TraceRecorder,
+    TraceReplay,
+    WorkflowTrace,
+    replayed_output,
+    set_trace_recorder,
+    set_trace_replay,
+    traced_call,
+)
+
+
+@pytest.fixture(autouse=True)
+def _no_active_trace():
+    yield
+    set_trace_recorder(None)
+    set_trace_replay(None)
+
+
+def _recorded(*calls) -> WorkflowTrace:
+    recorder = TraceRecorder(meta={"query": "q"})
+    for kind, name, args, output, latency in calls:
+        recorder.record(kind, name, args, None, output, latency)
+    return recorder.trace()
+
+
+@pytest.mark.unit
+class TestWorkflowTrace:
+    """Trace file format."""
+
+    def test_round_trip_keeps_types(self, tmp_path):
+        output = {"pocket_residues": {1: ["A12"], 2: []}, "fields": ("prediction", ["tm"], None)}
+        trace = _recorded(("gpu_call", "call_fpocket", ("wt.pdb",), output, 0.25))
+
+        loaded = WorkflowTrace.load(trace.save(tmp_path / "trace.bin"))
+        event = TraceReplay(loaded, scale=0).take("gpu_call", "call_fpocket", ("wt.pdb",))
+
+        assert loaded.meta == {"query": "q"}
+        assert event.latency == 0.25
+        assert replayed_output(event) == output
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "trace.bin"
+        path.write_text("not a trace")
+
+        with pytest.raises(ValueError):
+            WorkflowTrace.load(path)
+
+
+@pytest.mark.unit
+class TestTraceReplay:
+    """Matching calls to recorded events."""
+
+    def test_prefers_same_arguments_then_recorded_order(self):
+        trace = _recorded(
+            (KIND_GPU, "esmfold", ("job-1", "MKTV"), {"n": 1}, 0.0),
+            (KIND_GPU, "esmfold", ("job-1", "MAAA"), {"n": 2}, 0.0),
+            (KIND_GPU, "esmfold", ("job-1", "MCCC"), {"n": 3}, 0.0),
+        )
+        replay = TraceReplay(trace, scale=0)
+
+        assert replay.take(KIND_GPU, "esmfold", ("job-1", "MAAA")).output == {"n": 2}
+        # Other job id: falls back to the next event in order
+        assert replay.take(KIND_GPU, "esmfold", ("job-2", "MKTV")).output == {"n": 1}
+        assert replay.take(KIND_GPU, "esmfold", ("job-2", "MGGG")).output == {"n": 3}
+        assert replay.take(KIND_GPU, "esmfold", ("job-2", "MKTV")) is None
+        assert replay.misses == [(KIND_GPU, "esmfold")]
+        assert replay.served == 3 and replay.remaining == 0
+
+    def test_traced_call_serves_scaled_latency(self):
+        trace = _recorded((KIND_SMILES, "pubchem", ("caffeine",), "CN1C=NC2=C1C(=O)N(C(=O)N2C)C", 0.2))
+
+        def lookup(name):
+            raise AssertionError("replay must not call out")
+
+        set_trace_replay(TraceReplay(trace, scale=0.5))
+        start = time.perf_counter()
+        smiles = traced_call(KIND_SMILES, "pubchem", lookup, "caffeine")
+
+        assert smiles.startswith("CN1")
+        assert 0.09 <= time.perf_counter() - start < 0.2
+
+    def test_recorded_errors_are_raised(self):
+        recorder = TraceRecorder()
+        set_trace_recorder(recorder)
+
+        def failing(name):
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            traced_call(KIND_SMILES, "pubchem", failing, "caffeine")
+
+        set_trace_recorder(None)
+        set_trace_replay(TraceReplay(recorder.trace(), scale=0))
+        with pytest.raises(RecordedCallError, match="ConnectionError: down"):
+            traced_call(KIND_SMILES, "pubchem", failing, "caffeine")
+
+    def test_negative_scale(self):
+        with pytest.raises(ValueError):
+            TraceReplay(WorkflowTrace(), scale=-1)
+
+
+@pytest.mark.unit
+class TestGpuTaskManagerTracing:
+    """Manager calls are recorded once, with the task result."""
+
+    def test_record_and_replay(self):
+        from synde_gpu.manager import GpuTaskManager, TaskStatus
+        from synde_gpu.tasks import call_clean_ec
+
+        recorder = TraceRecorder()
+        set_trace_recorder(recorder)
+        recorded = GpuTaskManager("CLEAN_EC").execute_sync(call_clean_ec, args=("MKTVRQ",))
+        set_trace_recorder(None)
+
+        trace = recorder.trace()
+        assert [(e.kind, e.name) for e in trace.events] == [(KIND_GPU, "clean_ec")]
+
+        set_trace_replay(TraceReplay(trace, scale=0))
+        replayed = GpuTaskManager("CLEAN_EC").execute_sync(call_clean_ec, args=("MKTVRQ",))
+        missing = GpuTaskManager("CLEAN_EC").execute_sync(call_clean_ec, args=("MKTVRQ",))
+
+        assert replayed.status == TaskStatus.SUCCESS
+        assert replayed.result == recorded.result
+        assert missing.status == TaskStatus.UNAVAILABLE
+
+
+@pytest.mark.unit
+def test_replay_workflow_is_deterministic(tmp_path):
+    from synde_cli.replay import record_workflow, replay_workflow
+
+    sequence = "MKTVRQERLKSIVRILERSKEPVSGAQLAEELSVSRQVIVQDIAYLRSLGYNIVATPRGYVLAGG"
+    result, trace = record_workflow(tmp_path / "trace.bin", f"Generate thermostable variants of {sequence}")
+    assert {e.name for e in trace.events} >= {"esmfold", "call_fpocket"}
+
+    report = replay_workflow(WorkflowTrace.load(tmp_path / "trace.bin"), scale=0, repeat=2)
+
+    assert report.deterministic
+    assert len(report.runs_s) == 2
+    assert report.result["response"] == result["response"]